@@ -23,6 +23,8 @@ urlpatterns = [
     path('dashboard/', views.DashboardDesktopView.as_view(), name='dashboard-desktop'),
     path('estatisticas/', views.EstatisticasDesktopView.as_view(), name='estatisticas-desktop'),
     path('exportar-dados/', views.ExportarDadosView.as_view(), name='exportar-dados'),
+    path('exportacoes/<uuid:token>/', views.ExportacaoStatusView.as_view(), name='exportacao-status'),
+    path('exportacoes/<uuid:token>/download/', views.ExportacaoDownloadView.as_view(), name='exportacao-download'),
     path('configuracoes/', views.ConfiguracoesDesktopView.as_view(), name='configuracoes-desktop'),
     path('backup/', views.BackupDesktopView.as_view(), name='backup-desktop'),
     path('logs/', views.LogsDesktopView.as_view(), name='logs-desktop'),
@@ -7,18 +7,23 @@ from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.db.models import Count, Q, Sum
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils import timezone
 from datetime import datetime, timedelta
 import json
 
 from app_eventos.models import (
     User, EmpresaContratante, Evento, Freelance, Vaga, 
-    Candidatura, Equipamento, DespesaEvento, ReceitaEvento
+    Candidatura, Equipamento, DespesaEvento, ReceitaEvento, ExportacaoDados
 )
 from app_eventos.permissions.permissions_grupos import (
     IsAdminSistema, IsEmpresaUser, PodeGerenciarUsuarios,
     PodeGerenciarEventos, PodeGerenciarFreelancers, PodeVisualizarRelatorios
 )
+from app_eventos.services import exportacao as exportacao_service
+from app_eventos.services.metricas_empresa import obter_metricas
 
 
 class UsuarioDesktopViewSet(viewsets.ModelViewSet):
@@ -174,9 +179,17 @@ class RelatorioDesktopViewSet(viewsets.ViewSet):
     
     @action(detail=False, methods=['get'])
     def financeiro(self, request):
-        """Relatório financeiro"""
+        """Relatório financeiro (com ?formato=csv|ndjson|xlsx|json, os lançamentos em fluxo)"""
         user = request.user
         
+        formato = request.query_params.get('formato')
+        if formato:
+            colunas = [c for c in request.query_params.get('colunas', '').split(',') if c] or None
+            try:
+                return exportacao_service.resposta_streaming('financeiro', user, formato, colunas)
+            except exportacao_service.ExportacaoInvalida as exc:
+                return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
         if user.is_admin_sistema:
             despesas = DespesaEvento.objects.all()
             receitas = ReceitaEvento.objects.all()
@@ -229,11 +242,14 @@ class DashboardDesktopView(APIView):
                 'total_freelancers': Freelance.objects.count(),
             }
         elif user.is_empresa_user:
+            if not user.empresa_contratante_id:
+                return {}
+            metricas = obter_metricas(user.empresa_contratante_id)
             return {
                 'total_usuarios': User.objects.filter(empresa_contratante=user.empresa_contratante).count(),
-                'total_eventos': Evento.objects.filter(empresa_contratante=user.empresa_contratante).count(),
+                'total_eventos': metricas.total_eventos,
                 'total_freelancers': Freelance.objects.count(),
-                'total_vagas': Vaga.objects.filter(setor__evento__empresa_contratante=user.empresa_contratante).count(),
+                'total_vagas': metricas.total_vagas,
             }
         else:
             return {}
@@ -344,51 +360,86 @@ class EstatisticasDesktopView(APIView):
 class ExportarDadosView(APIView):
     """
     View para exportar dados do sistema
+
+    Formatos: json (padrão), csv, ndjson e xlsx, sempre em fluxo. Com
+    ``assincrono`` o arquivo é gerado em segundo plano e a resposta traz o
+    token para acompanhar/baixar em ``exportacoes/<token>/``.
     """
     permission_classes = [IsAuthenticated, PodeVisualizarRelatorios]
     
     def post(self, request):
         tipo_exportacao = request.data.get('tipo')
         formato = request.data.get('formato', 'json')
+        colunas = request.data.get('colunas') or None
+        if isinstance(colunas, str):
+            colunas = [c.strip() for c in colunas.split(',') if c.strip()]
         
-        if tipo_exportacao == 'usuarios':
-            dados = self._exportar_usuarios(request.user)
-        elif tipo_exportacao == 'eventos':
-            dados = self._exportar_eventos(request.user)
-        elif tipo_exportacao == 'freelancers':
-            dados = self._exportar_freelancers()
-        else:
-            return Response({'error': 'Tipo de exportação inválido'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        return Response({
-            'dados': dados,
-            'formato': formato,
-            'timestamp': timezone.now().isoformat(),
-        })
-    
-    def _exportar_usuarios(self, user):
-        """Exporta dados de usuários"""
-        if user.is_admin_sistema:
-            return list(User.objects.values('username', 'email', 'tipo_usuario', 'ativo', 'date_joined'))
-        elif user.is_empresa_user:
-            return list(User.objects.filter(empresa_contratante=user.empresa_contratante).values(
-                'username', 'email', 'tipo_usuario', 'ativo', 'date_joined'
-            ))
-        return []
+        try:
+            if str(request.data.get('assincrono', '')).lower() in ('1', 'true', 'sim'):
+                exportacao = exportacao_service.solicitar_exportacao(tipo_exportacao, request.user, formato, colunas)
+                return Response(_dados_exportacao(exportacao, request), status=status.HTTP_202_ACCEPTED)
+            return exportacao_service.resposta_streaming(tipo_exportacao, request.user, formato, colunas)
+        except exportacao_service.ExportacaoInvalida as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _dados_exportacao(exportacao, request):
+    dados = {
+        'token': str(exportacao.token),
+        'tipo': exportacao.tipo,
+        'formato': exportacao.formato,
+        'status': exportacao.status,
+        'total_linhas': exportacao.total_linhas,
+        'criado_em': exportacao.criado_em.isoformat(),
+        'concluido_em': exportacao.concluido_em.isoformat() if exportacao.concluido_em else None,
+        'url_status': request.build_absolute_uri(
+            reverse('api_desktop:exportacao-status', args=[exportacao.token])
+        ),
+        'url_download': None,
+    }
+    if exportacao.status == 'concluida':
+        dados['url_download'] = request.build_absolute_uri(
+            reverse('api_desktop:exportacao-download', args=[exportacao.token])
+        )
+    elif exportacao.status == 'erro':
+        dados['erro'] = exportacao.erro
+    return dados
+
+
+class ExportacaoStatusView(APIView):
+    """
+    Situação de uma exportação assíncrona (só quem pediu ou admin do sistema)
+    """
+    permission_classes = [IsAuthenticated, PodeVisualizarRelatorios]
     
-    def _exportar_eventos(self, user):
-        """Exporta dados de eventos"""
-        if user.is_admin_sistema:
-            return list(Evento.objects.values('nome', 'data_inicio', 'data_fim', 'ativo'))
-        elif user.is_empresa_user:
-            return list(Evento.objects.filter(empresa_contratante=user.empresa_contratante).values(
-                'nome', 'data_inicio', 'data_fim', 'ativo'
-            ))
-        return []
+    def get(self, request, token):
+        exportacao = _exportacao_do_usuario(request.user, token)
+        return Response(_dados_exportacao(exportacao, request))
+
+
+class ExportacaoDownloadView(APIView):
+    """
+    Download do arquivo de uma exportação assíncrona concluída
+    """
+    permission_classes = [IsAuthenticated, PodeVisualizarRelatorios]
     
-    def _exportar_freelancers(self):
-        """Exporta dados de freelancers"""
-        return list(Freelance.objects.values('nome_completo', 'cpf', 'telefone', 'cadastro_completo'))
+    def get(self, request, token):
+        exportacao = _exportacao_do_usuario(request.user, token)
+        if exportacao.status != 'concluida' or not exportacao.arquivo:
+            return Response({'error': 'Exportação ainda não concluída'}, status=status.HTTP_409_CONFLICT)
+        return FileResponse(
+            exportacao.arquivo.open('rb'),
+            as_attachment=True,
+            filename=exportacao.arquivo.name.rsplit('/', 1)[-1],
+            content_type=exportacao_service.FORMATOS[exportacao.formato],
+        )
+
+
+def _exportacao_do_usuario(user, token):
+    exportacoes = ExportacaoDados.objects.all()
+    if not (user.is_superuser or user.is_admin_sistema):
+        exportacoes = exportacoes.filter(solicitado_por=user)
+    return get_object_or_404(exportacoes, token=token)
 
 
 class ConfiguracoesDesktopView(APIView):
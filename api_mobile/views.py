@@ -18,6 +18,7 @@ from django.db.models import Q, Count
 import logging
 
 from app_eventos.utils_empresa_ativa import empresa_contexto_api, is_api_empresa_actor
+from app_eventos.paginacao import PaginacaoCursorOpcional
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ValidationError as DjangoValidationError
 
@@ -26,6 +27,9 @@ from app_eventos.models import (
     EmpresaContratante, SetorEvento, Funcao, PontoOperacao, FreelancerFuncao,
     RegistroPresencaFreelancer,
 )
+from app_eventos.services.agenda_freelancer import ConflitoAgenda
+from app_eventos.services.busca import CAMPO_RELEVANCIA, aplicar_busca, termos_busca
+from app_eventos.services.geo import coordenadas_de, filtrar_vagas_no_raio
 from app_eventos.services.freelancer_score import aplicar_pontuacao_para_registro
 from app_eventos.services.onboarding_freelance import (
     FREELANCE_ONBOARDING_NIVEL2_WRITE_FIELDS,
@@ -59,6 +63,8 @@ class VagaViewSet(viewsets.ReadOnlyModelViewSet):
     """
     serializer_class = VagaSerializer
     permission_classes = [IsAuthenticated]
+    # Scroll infinito no app: ?cursor= (keyset por data_criacao, id; sem COUNT)
+    pagination_class = PaginacaoCursorOpcional
     
     def get_queryset(self):
         now = timezone.now()
@@ -107,19 +113,8 @@ class VagaViewSet(viewsets.ReadOnlyModelViewSet):
         if funcao_id:
             queryset = queryset.filter(funcao_id=funcao_id)
         
-        if cidade:
-            queryset = queryset.filter(
-                Q(setor__evento__local__cidade__icontains=cidade) |
-                Q(evento__local__cidade__icontains=cidade) |
-                Q(ponto_operacao__cidade__icontains=cidade)
-            )
-        
-        if search:
-            queryset = queryset.filter(
-                Q(titulo__icontains=search) |
-                Q(descricao__icontains=search) |
-                Q(funcao__nome__icontains=search)
-            )
+        # Busca indexada (DocumentoBusca): texto da vaga/função/evento e cidade
+        queryset = aplicar_busca(queryset, 'vaga', busca=search, cidade=cidade)
 
         # Marketplace global para freelancer, mas filtrado por especialidades ativas.
         user = self.request.user
@@ -135,9 +130,28 @@ class VagaViewSet(viewsets.ReadOnlyModelViewSet):
             if not funcao_ids:
                 return Vaga.objects.none()
             queryset = queryset.filter(funcao_id__in=funcao_ids)
-        
+
+        # Raio em km a partir de ?latitude=&longitude= ou, sem eles, das coordenadas do freelancer
+        raio_km = self._float_param('raio_km')
+        if raio_km and raio_km > 0:
+            latitude, longitude = self._float_param('latitude'), self._float_param('longitude')
+            if latitude is not None and longitude is not None:
+                origem = (latitude, longitude)
+            else:
+                origem = coordenadas_de(getattr(user, 'freelance', None)) if getattr(user, 'is_freelancer', False) else None
+            if origem:
+                queryset = filtrar_vagas_no_raio(queryset, origem[0], origem[1], raio_km)
+
+        if termos_busca(search):
+            return queryset.order_by(f'-{CAMPO_RELEVANCIA}', '-data_criacao')
         return queryset.order_by('-data_criacao')
 
+    def _float_param(self, nome):
+        try:
+            return float(self.request.query_params[nome])
+        except (KeyError, TypeError, ValueError):
+            return None
+
 
 class CandidaturaViewSet(viewsets.ModelViewSet):
     """
@@ -237,8 +251,16 @@ class CandidaturaViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        candidatura.status = 'aprovado'
-        candidatura.save()
+        # Mesmo caminho do model: transição condicional, reserva da posição e contrato
+        try:
+            aprovada = candidatura.aprovar(usuario_aprovador=user, levantar_conflito=True)
+        except ConflitoAgenda as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_409_CONFLICT)
+        if not aprovada:
+            return Response(
+                {'error': 'Candidatura já respondida ou vaga sem posições disponíveis.'},
+                status=status.HTTP_409_CONFLICT
+            )
         
         return Response({'message': 'Candidatura aprovada com sucesso'})
     
@@ -636,15 +658,17 @@ class UserProfileView(APIView):
         
         # Dados adicionais da empresa (se disponível no request)
         empresa_data = {}
-        if hasattr(request, 'empresa_contratante') and request.empresa_contratante:
+        contexto = getattr(request, 'contexto_empresa', None)
+        if contexto:
+            empresa = contexto.empresa
             empresa_data = {
-                'empresa_id': getattr(request, 'empresa_contratante_id', None),
-                'empresa_nome': getattr(request, 'empresa_contratante_nome', None),
-                'empresa_cnpj': getattr(request, 'empresa_contratante_cnpj', None),
-                'empresa_ativa': getattr(request, 'empresa_contratante_ativa', None),
-                'plano_limites': getattr(request, 'empresa_plano_limites', {}),
-                'plano_recursos': getattr(request, 'empresa_plano_recursos', {}),
-                'empresas_parceiras_count': getattr(request, 'empresas_parceiras', []).count() if hasattr(request, 'empresas_parceiras') else 0,
+                'empresa_id': empresa.id,
+                'empresa_nome': empresa.nome_fantasia,
+                'empresa_cnpj': empresa.cnpj,
+                'empresa_ativa': empresa.ativo,
+                'plano_limites': contexto.plano_limites,
+                'plano_recursos': contexto.plano_recursos,
+                'empresas_parceiras_count': contexto.empresas_parceiras.count(),
             }
         
         # Dados do usuário
@@ -13,6 +13,7 @@ from app_eventos.models import (
     EmpresaContratante, SetorEvento, Funcao, FreelancerFuncao
 )
 from app_eventos.services.matching_service import MatchingService, VagaRecommendationService
+from app_eventos.services.metricas_empresa import obter_metricas
 from .serializers import (
     VagaSerializer, CandidaturaSerializer, EventoSerializer,
     FreelanceSerializer, EmpresaSerializer, EmpresaContratanteSerializer
@@ -504,15 +505,11 @@ class CandidaturaAvancadaViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Estatísticas gerais
+        # Estatísticas gerais (snapshot materializado em MetricasEmpresa)
         candidaturas = Candidatura.objects.filter(
             vaga__setor__evento__empresa_contratante=user.empresa_contratante
         )
-        
-        total_candidaturas = candidaturas.count()
-        candidaturas_pendentes = candidaturas.filter(status='pendente').count()
-        candidaturas_aprovadas = candidaturas.filter(status='aprovado').count()
-        candidaturas_rejeitadas = candidaturas.filter(status='rejeitado').count()
+        metricas = obter_metricas(user.empresa_contratante_id)
         
         # Candidaturas recentes
         candidaturas_recentes = candidaturas.order_by('-data_candidatura')[:10]
@@ -526,10 +523,10 @@ class CandidaturaAvancadaViewSet(viewsets.ModelViewSet):
         
         return Response({
             'estatisticas': {
-                'total_candidaturas': total_candidaturas,
-                'candidaturas_pendentes': candidaturas_pendentes,
-                'candidaturas_aprovadas': candidaturas_aprovadas,
-                'candidaturas_rejeitadas': candidaturas_rejeitadas,
+                'total_candidaturas': metricas.total_candidaturas,
+                'candidaturas_pendentes': metricas.candidaturas_pendentes,
+                'candidaturas_aprovadas': metricas.candidaturas_aprovadas,
+                'candidaturas_rejeitadas': metricas.candidaturas_rejeitadas,
             },
             'candidaturas_recentes': CandidaturaSerializer(candidaturas_recentes, many=True).data,
             'vagas_populares': VagaSerializer(vagas_populares, many=True).data,
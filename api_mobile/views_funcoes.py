@@ -6,12 +6,15 @@ from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 
 from app_eventos.models import Freelance, Funcao, TipoFuncao, FreelancerFuncao
+from app_eventos.services.cache_respostas import RespostaCondicionalMixin
 from .serializers import FuncaoSerializer, FreelancerFuncaoSerializer
 
-class FuncaoViewSet(viewsets.ReadOnlyModelViewSet):
+class FuncaoViewSet(RespostaCondicionalMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para listar funções disponíveis para freelancers
+    (ETag + cache compartilhado; invalidado pelos signals de Funcao/TipoFuncao)
     """
+    escopo_cache = 'funcoes'
     serializer_class = FuncaoSerializer
     permission_classes = [permissions.IsAuthenticated]
     
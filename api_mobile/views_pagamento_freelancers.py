@@ -3,12 +3,13 @@ from django.db.models import F
 from django.shortcuts import get_object_or_404
 from django.utils.dateparse import parse_date
 from rest_framework import generics, serializers, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from app_eventos.services.atribuicao_vaga_direta import atribuir_freelancer_a_vaga_direto
-from app_eventos.services.tarifa_diaria_turno import parse_hora, resolver_tarifa_diaria
+from app_eventos.services.tarifa_diaria_turno import parse_hora, pre_preencher_fichamento, resolver_tarifa_diaria
 
 from app_eventos.models import ContratoFreelance, Freelance, Funcao, PontoOperacao, Vaga
 from app_eventos.models_freelancer_empresa import FreelancerPrestacaoServico
@@ -74,6 +75,70 @@ class FichamentoSemanaFreelancerViewSet(viewsets.ModelViewSet):
             raise serializers.ValidationError('Sem permissão para alterar fichamentos.')
         serializer.save()
 
+    @action(detail=True, methods=['post'], url_path='sugerir-tarifas')
+    def sugerir_tarifas(self, request, pk=None):
+        """
+        Sugere a diária de toda a semana do fichamento de uma vez (tarifas e calendário carregados uma vez).
+
+        Body opcional: ``itens`` = [{freelance, funcao, data (YYYY-MM-DD), hora_inicio (HH:MM, default 08:00)}];
+        sem ``itens``, usa os contratos ativos do estabelecimento. ``salvar: true`` cria os lançamentos pagos
+        que ainda não existem com o valor sugerido.
+        """
+        fichamento = self.get_object()
+        user = request.user
+        if not getattr(user, 'is_empresa_user', False) and not getattr(user, 'is_admin_sistema', False):
+            raise serializers.ValidationError('Sem permissão.')
+
+        itens = None
+        if request.data.get('itens') is not None:
+            itens = []
+            for i, bruto in enumerate(request.data['itens']):
+                try:
+                    item = {
+                        'freelance': int(bruto['freelance']),
+                        'funcao': int(bruto['funcao']),
+                        'data': parse_date(str(bruto['data'])),
+                        'hora_inicio': parse_hora(str(bruto.get('hora_inicio') or '08:00')),
+                    }
+                except (KeyError, TypeError, ValueError):
+                    return Response(
+                        {'detail': f'Item {i} inválido: informe freelance, funcao, data (YYYY-MM-DD) e hora_inicio (HH:MM).'},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                if not item['data'] or not fichamento.data_inicio_periodo <= item['data'] <= fichamento.data_fechamento:
+                    return Response(
+                        {'detail': f'Item {i}: data fora do período de 7 dias deste fichamento.'},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                itens.append(item)
+            # Só freelancers com histórico ou contrato na empresa do fichamento
+            freelance_ids = {item['freelance'] for item in itens}
+            empresa_id = fichamento.empresa_contratante_id
+            vinculados = set(
+                FreelancerPrestacaoServico.objects.filter(
+                    empresa_contratante_id=empresa_id, freelance_id__in=freelance_ids
+                ).values_list('freelance_id', flat=True)
+            ) | set(
+                ContratoFreelance.objects.filter(
+                    vaga__empresa_contratante_id=empresa_id, freelance_id__in=freelance_ids
+                ).values_list('freelance_id', flat=True)
+            )
+            if freelance_ids - vinculados:
+                return Response(
+                    {'detail': 'Freelancer não encontrado na empresa deste fichamento.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        salvar = str(request.data.get('salvar', '')).lower() in ('1', 'true')
+        resultado = pre_preencher_fichamento(fichamento, itens=itens, salvar=salvar)
+        return Response({
+            'fichamento': fichamento.pk,
+            'data_inicio': fichamento.data_inicio_periodo,
+            'data_fechamento': fichamento.data_fechamento,
+            'itens': resultado['itens'],
+            'criados': resultado['criados'],
+        })
+
 
 class LancamentoPagoDiarioFreelancerViewSet(viewsets.ModelViewSet):
     serializer_class = LancamentoPagoDiarioFreelancerSerializer
@@ -445,7 +445,20 @@ class FornecedorUpdateSerializer(serializers.ModelSerializer):
         ]
 
 
+class EventoCloneDestinoSerializer(serializers.Serializer):
+    nome = serializers.CharField(max_length=200, required=False)
+    data_inicio = serializers.DateField()
+    data_fim = serializers.DateField()
+
+    def validate(self, attrs):
+        if attrs['data_fim'] < attrs['data_inicio']:
+            raise serializers.ValidationError("Data fim não pode ser anterior à data início.")
+        return attrs
+
+
 class EventoCloneSerializer(serializers.Serializer):
+    MAX_DESTINOS = 60
+
     nome = serializers.CharField(max_length=200)
     data_inicio = serializers.DateField()
     data_fim = serializers.DateField()
@@ -458,6 +471,14 @@ class EventoCloneSerializer(serializers.Serializer):
     copy_tarefas = serializers.BooleanField(required=False, default=True)
     copy_insumos = serializers.BooleanField(required=False, default=True)
     copy_financeiro = serializers.BooleanField(required=False, default=True)
+    shift_dates = serializers.BooleanField(required=False, default=False)
+    # Datas adicionais: o mesmo modelo clonado para várias datas numa chamada
+    destinos = EventoCloneDestinoSerializer(many=True, required=False)
+
+    def validate_destinos(self, value):
+        if len(value) > self.MAX_DESTINOS:
+            raise serializers.ValidationError(f"Informe no máximo {self.MAX_DESTINOS} destinos.")
+        return value
 
     def validate(self, attrs):
         if attrs['data_fim'] < attrs['data_inicio']:
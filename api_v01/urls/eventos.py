@@ -1,7 +1,7 @@
 from django.urls import path
 
 from app_briefing.views import BriefingView
-from app_contratos.views import ContratoAssinarView, ContratoGerarView
+from app_contratos.views import ContratoAssinarView, ContratoGerarView, ContratoStatusView
 from app_financeiro.views import OrcamentoOperacionalView
 from app_mise.views import MiseEnPlaceView
 from app_producao.views import CronogramaPreProducaoView
@@ -33,6 +33,11 @@ urlpatterns = [
         OrcamentoOperacionalView.as_view(),
         name="orcamento_gerar",
     ),
+    path(
+        "eventos/<int:evento_id>/contrato",
+        ContratoStatusView.as_view(),
+        name="contrato_status",
+    ),
     path(
         "eventos/<int:evento_id>/contrato/gerar",
         ContratoGerarView.as_view(),
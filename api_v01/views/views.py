@@ -29,7 +29,11 @@ from app_eventos.models import (
     LocalEvento,
     Empresa,
 )
-from app_eventos.services.event_clone_service import EventCloneService, EventCloneOptions, NOT_PROVIDED
+from app_eventos.paginacao import PaginacaoCursorOpcional
+from app_eventos.services.event_clone_service import (
+    EventCloneService, EventCloneOptions, EventCloneTarget, NOT_PROVIDED,
+)
+from app_eventos.services.ultimo_acesso import registrar_acesso
 from ..serializers.serializers import (
     VagaSerializer,
     CandidaturaCreateSerializer,
@@ -75,6 +79,7 @@ class VagaViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ["ativa"]
     search_fields = ["titulo", "descricao", "setor__evento__nome"]
     ordering_fields = ["remuneracao", "id"]
+    pagination_class = PaginacaoCursorOpcional  # ?cursor= → keyset por (data_criacao, id)
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -100,6 +105,8 @@ class CandidaturaViewSet(mixins.CreateModelMixin,
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter, EmpresaScopeFilterBackend]
     search_fields = ["vaga__titulo", "freelance__nome_completo"]
     ordering_fields = ["data_candidatura", "id"]
+    pagination_class = PaginacaoCursorOpcional
+    cursor_campo = "data_candidatura"
 
     def get_permissions(self):
         if self.request.method == "POST":
@@ -142,6 +149,8 @@ class ContratoFreelanceViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter, EmpresaScopeFilterBackend]
     search_fields = ["vaga__titulo", "freelance__nome_completo"]
     ordering_fields = ["data_contratacao", "id"]
+    pagination_class = PaginacaoCursorOpcional
+    cursor_campo = "data_contratacao"
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -220,21 +229,28 @@ def clonar_evento(request, evento_id):
         'copy_tarefas': dados.get('copy_tarefas', True),
         'copy_insumos': dados.get('copy_insumos', True),
         'copy_financeiro': dados.get('copy_financeiro', True),
+        'shift_dates': dados.get('shift_dates', False),
     })
 
+    destinos = [
+        EventCloneTarget(
+            nome=destino.get('nome') or dados['nome'],
+            data_inicio=destino['data_inicio'],
+            data_fim=destino['data_fim'],
+            descricao=dados.get('descricao'),
+            local=local,
+            empresa_produtora=empresa_produtora,
+        )
+        for destino in [dados, *dados.get('destinos', [])]
+    ]
+
     service = EventCloneService(usuario=usuario, evento_origem=evento_origem)
-    resultado = service.clone_event(
-        nome=dados['nome'],
-        data_inicio=dados['data_inicio'],
-        data_fim=dados['data_fim'],
-        descricao=dados.get('descricao'),
-        local=local,
-        empresa_produtora=empresa_produtora,
-        options=options,
-    )
+    resultados = service.clone_events(destinos, options=options)
 
-    resposta = EventoResumoSerializer(resultado.event).data
-    return Response({'success': True, 'evento': resposta})
+    resposta = {'success': True, 'evento': EventoResumoSerializer(resultados[0].event).data}
+    if len(resultados) > 1:
+        resposta['eventos'] = EventoResumoSerializer([r.event for r in resultados], many=True).data
+    return Response(resposta)
 
 
 @api_view(['POST'])
@@ -449,9 +465,8 @@ def perfil_usuario(request):
     """
     user = request.user
     
-    # Atualiza último acesso
-    user.data_ultimo_acesso = timezone.now()
-    user.save(update_fields=['data_ultimo_acesso'])
+    # Último acesso: buffer agrupado (services/ultimo_acesso.py), sem UPDATE por chamada
+    registrar_acesso(user)
     
     serializer = UserProfileSerializer(user)
     
@@ -824,12 +839,30 @@ def atualizar_receita(request, receita_id):
         }, status=status.HTTP_404_NOT_FOUND)
 
 
+def _resumo_fluxo_caixa(evento):
+    """Monta o resumo de fluxo de caixa (use eventos de com_resumo_financeiro())."""
+    return {
+        'evento_id': evento.id,
+        'evento_nome': evento.nome,
+        'total_despesas': evento.total_despesas,
+        'total_receitas': evento.total_receitas,
+        'saldo_financeiro': evento.saldo_financeiro,
+        'despesas_pagas': evento.despesas_pagas,
+        'receitas_recebidas': evento.receitas_recebidas,
+        'saldo_realizado': evento.saldo_realizado,
+        'despesas_pendentes': evento.despesas_pendentes,
+        'receitas_pendentes': evento.receitas_pendentes,
+        'despesas_atrasadas_count': evento.despesas_atrasadas_count,
+        'receitas_atrasadas_count': evento.receitas_atrasadas_count,
+    }
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def fluxo_caixa_evento(request, evento_id):
     """Retorna o resumo do fluxo de caixa de um evento"""
     try:
-        evento = Evento.objects.get(id=evento_id)
+        evento = Evento.objects.com_resumo_financeiro().get(id=evento_id)
         
         # Verificar permissão de acesso ao evento
         user = request.user
@@ -839,22 +872,7 @@ def fluxo_caixa_evento(request, evento_id):
                 'message': 'Acesso negado a este evento.'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        data = {
-            'evento_id': evento.id,
-            'evento_nome': evento.nome,
-            'total_despesas': evento.total_despesas,
-            'total_receitas': evento.total_receitas,
-            'saldo_financeiro': evento.saldo_financeiro,
-            'despesas_pagas': evento.despesas_pagas,
-            'receitas_recebidas': evento.receitas_recebidas,
-            'saldo_realizado': evento.saldo_realizado,
-            'despesas_pendentes': evento.despesas_pendentes,
-            'receitas_pendentes': evento.receitas_pendentes,
-            'despesas_atrasadas_count': evento.despesas_atrasadas.count(),
-            'receitas_atrasadas_count': evento.receitas_atrasadas.count(),
-        }
-        
-        serializer = FluxoCaixaEventoSerializer(data)
+        serializer = FluxoCaixaEventoSerializer(_resumo_fluxo_caixa(evento))
         
         return Response({
             'success': True,
@@ -880,38 +898,19 @@ def fluxo_caixa_empresa(request):
             'message': _msg_sem_empresa_api(request),
         }, status=status.HTTP_400_BAD_REQUEST)
 
-    eventos = Evento.objects.filter(empresa_contratante=empresa, ativo=True)
-    resumos = []
-    
-    for evento in eventos:
-        data = {
-            'evento_id': evento.id,
-            'evento_nome': evento.nome,
-            'total_despesas': evento.total_despesas,
-            'total_receitas': evento.total_receitas,
-            'saldo_financeiro': evento.saldo_financeiro,
-            'despesas_pagas': evento.despesas_pagas,
-            'receitas_recebidas': evento.receitas_recebidas,
-            'saldo_realizado': evento.saldo_realizado,
-            'despesas_pendentes': evento.despesas_pendentes,
-            'receitas_pendentes': evento.receitas_pendentes,
-            'despesas_atrasadas_count': evento.despesas_atrasadas.count(),
-            'receitas_atrasadas_count': evento.receitas_atrasadas.count(),
-        }
-        resumos.append(data)
+    eventos = Evento.objects.filter(empresa_contratante=empresa, ativo=True).com_resumo_financeiro()
+    resumos = [_resumo_fluxo_caixa(evento) for evento in eventos]
     
-    # Calcular totais da empresa
-    total_despesas = sum(r['total_despesas'] for r in resumos)
-    total_receitas = sum(r['total_receitas'] for r in resumos)
-    total_saldo = sum(r['saldo_financeiro'] for r in resumos)
+    # Calcular totais da empresa (no banco, não em Python)
+    totais = eventos.totais_financeiros()
     
     return Response({
         'success': True,
         'eventos': resumos,
         'totais_empresa': {
-            'total_despesas': total_despesas,
-            'total_receitas': total_receitas,
-            'saldo_financeiro': total_saldo,
+            'total_despesas': totais['total_despesas'],
+            'total_receitas': totais['total_receitas'],
+            'saldo_financeiro': totais['saldo_financeiro'],
         }
     })
 
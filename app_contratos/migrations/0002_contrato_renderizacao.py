@@ -0,0 +1,18 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_contratos', '0001_initial'),
+        ('app_eventos', '0051_renderizacao_documentos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contratoevento',
+            name='renderizacao',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='app_eventos.renderizacaodocumento'),
+        ),
+    ]
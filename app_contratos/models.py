@@ -10,6 +10,13 @@ class ContratoEvento(models.Model):
         blank=True,
     )
     pdf_url = models.CharField(max_length=255, blank=True)
+    renderizacao = models.ForeignKey(
+        "app_eventos.RenderizacaoDocumento",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
     assinatura_cliente = models.BooleanField(default=False)
     data_assinatura = models.DateTimeField(null=True, blank=True)
     condicoes_gerais = models.TextField()
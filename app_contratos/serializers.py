@@ -4,6 +4,8 @@ from .models import ContratoEvento
 
 
 class ContratoEventoSerializer(serializers.ModelSerializer):
+    pdf_status = serializers.SerializerMethodField()
+
     class Meta:
         model = ContratoEvento
         fields = [
@@ -11,9 +13,12 @@ class ContratoEventoSerializer(serializers.ModelSerializer):
             "evento",
             "orcamento",
             "pdf_url",
+            "pdf_status",
             "assinatura_cliente",
             "data_assinatura",
             "condicoes_gerais",
         ]
         read_only_fields = ["id", "pdf_url", "assinatura_cliente", "data_assinatura"]
 
+    def get_pdf_status(self, obj):
+        return obj.renderizacao.status if obj.renderizacao_id else None
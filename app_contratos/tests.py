@@ -1,14 +1,16 @@
 import shutil
 import tempfile
 from datetime import date
+from pathlib import Path
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from app_eventos.models import Empresa, EmpresaContratante, Evento, LocalEvento, TipoEmpresa
+from app_eventos.models import Empresa, EmpresaContratante, Evento, LocalEvento, RenderizacaoDocumento, TipoEmpresa
 from app_financeiro.models import OrcamentoOperacional
 from .models import ContratoEvento
 
@@ -104,3 +106,25 @@ class ContratoEventoAPITestCase(APITestCase):
         contrato.refresh_from_db()
         self.assertTrue(contrato.assinatura_cliente)
 
+    @override_settings(RENDERIZACAO_PDF_MODO="sincrono")
+    def test_pdf_reaproveitado_quando_entradas_iguais(self):
+        payload = {"orcamento": self.orcamento.id, "condicoes_gerais": "Pagamento em 30 dias."}
+
+        primeira = self.client.post(self.gerar_url, payload, format="json")
+        self.assertEqual(primeira.data["pdf_status"], "concluida")
+        renderizacao = RenderizacaoDocumento.objects.get()
+        arquivo = Path(settings.MEDIA_ROOT) / renderizacao.caminho
+        self.assertTrue(arquivo.read_bytes().startswith(b"%PDF"))
+        gerado_em = renderizacao.concluido_em
+
+        segunda = self.client.post(self.gerar_url, payload, format="json")
+        self.assertEqual(segunda.status_code, status.HTTP_200_OK)
+        self.assertEqual(segunda.data["pdf_url"], primeira.data["pdf_url"])
+        self.assertEqual(RenderizacaoDocumento.objects.get().concluido_em, gerado_em)
+
+        alterada = self.client.post(self.gerar_url, {**payload, "condicoes_gerais": "Pagamento à vista."}, format="json")
+        self.assertNotEqual(alterada.data["pdf_url"], primeira.data["pdf_url"])
+        self.assertEqual(RenderizacaoDocumento.objects.count(), 2)
+
+        situacao = self.client.get(reverse("api_v01:contrato_status", kwargs={"evento_id": self.evento.id}))
+        self.assertEqual((situacao.data["pdf_url"], situacao.data["pdf_status"]), (alterada.data["pdf_url"], "concluida"))
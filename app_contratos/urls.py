@@ -1,12 +1,17 @@
 from django.urls import path
 
-from .views import ContratoAssinarView, ContratoGerarView
+from .views import ContratoAssinarView, ContratoGerarView, ContratoStatusView
 
 
 app_name = "contratos"
 
 
 urlpatterns = [
+    path(
+        "eventos/<int:evento_id>/contrato",
+        ContratoStatusView.as_view(),
+        name="contrato_status",
+    ),
     path(
         "eventos/<int:evento_id>/contrato/gerar",
         ContratoGerarView.as_view(),
@@ -1,7 +1,3 @@
-import io
-from pathlib import Path
-
-from django.conf import settings
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
@@ -9,18 +5,12 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from app_eventos.models import Evento
+from app_eventos.services.renderizacao_pdf import parametros_contrato, solicitar_renderizacao
 from app_financeiro.models import OrcamentoOperacional
 
 from .models import ContratoEvento
 from .serializers import ContratoEventoSerializer
 
-try:
-    from reportlab.pdfgen import canvas
-
-    REPORTLAB_AVAILABLE = True
-except ImportError:  # pragma: no cover
-    REPORTLAB_AVAILABLE = False
-
 
 class BaseContratoView(APIView):
     permission_classes = [IsAuthenticated]
@@ -56,13 +46,14 @@ class ContratoGerarView(BaseContratoView):
 
         condicoes = request.data.get("condicoes_gerais", "")
 
-        pdf_url = self._gerar_pdf(evento, condicoes)
+        pdf_url, renderizacao = self._gerar_pdf(evento, orcamento, condicoes)
 
         contrato, created = ContratoEvento.objects.update_or_create(
             evento=evento,
             defaults={
                 "orcamento": orcamento,
                 "pdf_url": pdf_url,
+                "renderizacao": renderizacao,
                 "assinatura_cliente": False,
                 "data_assinatura": None,
                 "condicoes_gerais": condicoes,
@@ -73,31 +64,20 @@ class ContratoGerarView(BaseContratoView):
         status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
         return Response(serializer.data, status=status_code)
 
-    def _gerar_pdf(self, evento: Evento, condicoes: str) -> str:
-        relative_path = Path("contratos") / f"contrato_evento_{evento.id}.pdf"
-        output_path = Path(settings.MEDIA_ROOT) / relative_path
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        if REPORTLAB_AVAILABLE:
-            buffer = io.BytesIO()
-            pdf_canvas = canvas.Canvas(str(output_path))
-            pdf_canvas.setFont("Helvetica", 12)
-            pdf_canvas.drawString(50, 800, f"Contrato do Evento: {evento.nome}")
-            pdf_canvas.drawString(50, 780, f"Data: {evento.data_inicio}")
-            pdf_canvas.drawString(50, 760, "Condições Gerais:")
-            text_object = pdf_canvas.beginText(50, 740)
-            for line in condicoes.splitlines() or ["N/A"]:
-                text_object.textLine(line)
-            pdf_canvas.drawText(text_object)
-            pdf_canvas.save()
-            buffer.close()
-        else:  # pragma: no cover - fallback textual
-            output_path.write_text(
-                f"Contrato do evento {evento.nome}\nCondições:\n{condicoes}",
-                encoding="utf-8",
-            )
-
-        return f"{settings.MEDIA_URL}{relative_path.as_posix()}" if settings.MEDIA_URL else str(relative_path)
+    def _gerar_pdf(self, evento: Evento, orcamento, condicoes: str):
+        """
+        Pede o PDF ao serviço de renderização: mesmas entradas → mesmo arquivo, sem refazer.
+        A URL já é a definitiva; ``pdf_status`` informa quando o arquivo está pronto.
+        """
+        renderizacao = solicitar_renderizacao("contrato_evento", parametros_contrato(evento, orcamento, condicoes))
+        return renderizacao.url, renderizacao
+
+
+class ContratoStatusView(BaseContratoView):
+    def get(self, request, evento_id: int):
+        evento = self.get_evento(request, evento_id)
+        contrato = get_object_or_404(ContratoEvento.objects.select_related("renderizacao"), evento=evento)
+        return Response(ContratoEventoSerializer(contrato).data, status=status.HTTP_200_OK)
 
 
 class ContratoAssinarView(BaseContratoView):
@@ -14,6 +14,7 @@ from .models_globais import (
     LogSistema, BackupGlobal,
     CategoriaFreelancerGlobal, HabilidadeGlobal, FornecedorGlobal
 )
+from .models_webhooks import EntregaWebhook
 from .permissions.permissions_globais import (
     PodeGerenciarModelosGlobaisMixin,
     PodeGerenciarConfiguracoesMixin,
@@ -195,7 +196,7 @@ class WebhookGlobalAdmin(PodeGerenciarModelosGlobaisMixin, admin.ModelAdmin):
             'fields': ('integracao', 'evento', 'ativo')
         }),
         ('Configuração', {
-            'fields': ('url', 'metodo', 'headers')
+            'fields': ('url', 'metodo', 'headers', 'segredo', 'max_lote')
         }),
         ('Metadados', {
             'fields': ('data_criacao', 'data_atualizacao', 'criado_por'),
@@ -204,6 +205,25 @@ class WebhookGlobalAdmin(PodeGerenciarModelosGlobaisMixin, admin.ModelAdmin):
     )
 
 
+@admin.register(EntregaWebhook)
+class EntregaWebhookAdmin(PodeGerenciarModelosGlobaisMixin, admin.ModelAdmin):
+    list_display = ('id', 'webhook', 'evento', 'status', 'tentativas', 'status_http', 'proxima_tentativa', 'data_entrega')
+    list_filter = ('status', 'evento', 'webhook__integracao')
+    search_fields = ('evento', 'webhook__url', 'ultimo_erro')
+    list_select_related = ('webhook__integracao',)
+    readonly_fields = (
+        'webhook', 'evento', 'payload', 'status', 'tentativas', 'proxima_tentativa', 'claim_token',
+        'reservado_ate', 'status_http', 'ultimo_erro', 'data_criacao', 'data_entrega',
+    )
+    actions = ['reenviar']
+
+    @admin.action(description="Reenviar entregas que falharam")
+    def reenviar(self, request, queryset):
+        from .services.webhooks import reenviar_falhas
+        quantidade = reenviar_falhas(ids=list(queryset.values_list('id', flat=True)))
+        self.message_user(request, f"{quantidade} entrega(s) devolvida(s) à fila.")
+
+
 # ============================================================================
 # TEMPLATES
 # ============================================================================
@@ -9,4 +9,12 @@ class AppEventosConfig(AppConfig):
         import app_eventos.signals_notificacoes
         import app_eventos.signals_documentos  # Signals do sistema de documentos
         import app_eventos.signals_freelancer_empresa
+        import app_eventos.signals_metricas  # Métricas materializadas dos dashboards
+        import app_eventos.signals_acesso  # Invalidação do cache de tenant/permissões
+        import app_eventos.signals_busca  # Documentos de busca (full-text)
+        import app_eventos.signals_geo  # Coordenadas/geohash dos endereços
+        import app_eventos.signals_estoque  # Saldos de insumos (livro-razão de estoque)
+        import app_eventos.signals_agenda  # Agenda de compromissos dos freelancers
+        import app_eventos.signals_cache_respostas  # Invalidação do cache de respostas (ETag)
+        import app_eventos.signals_parametros_sistema  # Versão do registro de parâmetros globais
 
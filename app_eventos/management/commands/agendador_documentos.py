@@ -0,0 +1,64 @@
+"""
+Agendador da varredura de vencimento de documentos (services/vencimento_documentos.py).
+
+Processo de longa duração que substitui o cron diário de verificar_documentos_vencimento
+(declarado como processo `clock` no Procfile — uma única instância).
+
+Uso:
+  python manage.py agendador_documentos                  # roda continuamente (DOCUMENTOS_VARREDURA_INTERVALO_MINUTOS, padrão 1440)
+  python manage.py agendador_documentos --uma-vez        # executa uma varredura e sai
+  python manage.py agendador_documentos --intervalo 60   # a cada 60 minutos
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app_eventos.services.vencimento_documentos import executar_varredura
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Executa periodicamente a varredura de documentos a vencer e expirados.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--uma-vez', action='store_true', help='Executa uma varredura e termina.')
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=getattr(settings, 'DOCUMENTOS_VARREDURA_INTERVALO_MINUTOS', 1440),
+            help='Minutos entre varreduras (modo contínuo).',
+        )
+        parser.add_argument('--lote', type=int, default=None, help='Documentos por lote de notificações.')
+
+    def handle(self, *args, **options):
+        intervalo = max(1.0, options['intervalo']) * 60
+        self.stdout.write(f'📅 Agendador de documentos iniciado (intervalo: {intervalo / 60:g} min)')
+
+        if options['uma_vez']:
+            self._varrer(options['lote'])
+            return
+
+        try:
+            while True:
+                inicio = time.monotonic()
+                try:
+                    self._varrer(options['lote'])
+                except Exception as e:
+                    logger.exception("Falha na varredura de documentos")
+                    self.stdout.write(self.style.ERROR(f'❌ Erro na varredura: {e}'))
+                time.sleep(max(0.0, intervalo - (time.monotonic() - inicio)))
+        except KeyboardInterrupt:
+            self.stdout.write('\n⏹️ Agendador finalizado')
+
+    def _varrer(self, lote):
+        stats = executar_varredura(tamanho_lote=lote)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{timezone.localtime():%d/%m/%Y %H:%M} avisos={stats['avisos']} "
+                f"expirados={stats['expirados']} notificacoes_expirados={stats['notificacoes_expirados']}"
+            )
+        )
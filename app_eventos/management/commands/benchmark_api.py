@@ -0,0 +1,81 @@
+"""
+Benchmark dos endpoints quentes da API (consultas, p50/p95, pico de memória).
+
+Roda num banco descartável criado a partir da conexão configurada (SQLite ou
+Postgres local — o mesmo mecanismo do test runner), semeia o cenário, mede e
+grava o relatório em JSON. Sai com erro se algum limiar for ultrapassado.
+
+  python manage.py benchmark_api                       # escala padrão (50k freelancers, 200k candidaturas)
+  python manage.py benchmark_api --escala mini --repeticoes 3
+  python manage.py benchmark_api --saida benchmark.json --limiares meus_limiares.json
+  python manage.py benchmark_api --manter-banco        # reaproveita o banco semeado na próxima execução
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from app_eventos.services.benchmark_api import (
+    ARQUIVO_LIMIARES,
+    ESCALAS,
+    carregar_limiares,
+    comparar_limiares,
+    executar_benchmarks,
+    montar_relatorio,
+    semear_cenario,
+)
+
+
+class Command(BaseCommand):
+    help = 'Mede consultas, latência e memória dos endpoints quentes e compara com os limiares'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escala', choices=sorted(ESCALAS), default='padrao')
+        parser.add_argument('--repeticoes', type=int, default=10, help='Chamadas por endpoint.')
+        parser.add_argument('--saida', default='benchmark_api.json', help='Arquivo JSON do relatório.')
+        parser.add_argument('--limiares', default=ARQUIVO_LIMIARES, help='JSON com os máximos por endpoint.')
+        parser.add_argument('--sem-limiares', action='store_true', help='Só mede, não compara.')
+        parser.add_argument('--somente', action='append', help='Endpoint a medir (pode repetir).')
+        parser.add_argument(
+            '--manter-banco',
+            action='store_true',
+            help='Não apaga o banco de benchmark ao final (e reaproveita se já existir).',
+        )
+
+    def handle(self, *args, **options):
+        limiares = {} if options['sem_limiares'] else carregar_limiares(options['limiares'])
+
+        setup_test_environment()
+        nome_original = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['manter_banco'])
+        try:
+            self.stdout.write(f"\n🌱 Semeando cenário '{options['escala']}' ({connection.vendor})...")
+            cenario = semear_cenario(options['escala'])
+            self.stdout.write(f'   {cenario.volumes}')
+
+            self.stdout.write('⏱️ Medindo endpoints...')
+            resultados = executar_benchmarks(cenario, options['repeticoes'], options['somente'])
+            violacoes = comparar_limiares(resultados, limiares.get(options['escala'], {}))
+            relatorio = montar_relatorio(cenario, resultados, violacoes, options['repeticoes'])
+        finally:
+            connection.creation.destroy_test_db(nome_original, verbosity=0, keepdb=options['manter_banco'])
+            teardown_test_environment()
+
+        with open(options['saida'], 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+        for nome, r in resultados.items():
+            self.stdout.write(
+                f"  {nome:<34} {r['consultas']:>4} consultas  p50={r['p50_ms']:>8}ms  "
+                f"p95={r['p95_ms']:>8}ms  mem={r['memoria_pico_kb']:>9}KB  (HTTP {r['status']})"
+            )
+        self.stdout.write(f"\n📄 Relatório: {options['saida']}")
+
+        if violacoes:
+            for v in violacoes:
+                self.stdout.write(self.style.ERROR(
+                    f"❌ {v['endpoint']}: {v['metrica']} = {v['medido']} (limite {v['limite']})"
+                ))
+            raise CommandError(f'{len(violacoes)} limiar(es) ultrapassado(s)')
+        self.stdout.write(self.style.SUCCESS('✅ Nenhuma regressão acima dos limiares'))
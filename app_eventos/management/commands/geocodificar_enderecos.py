@@ -0,0 +1,40 @@
+"""
+Preenche latitude/longitude/geohash de freelancers, locais de evento e pontos de
+operação a partir da tabela de centroides (CEP / cidade).
+
+Necessário uma vez após a migração (carga inicial) e depois de atualizar
+``services/centroides_cidades.json``. Coordenadas manuais são preservadas:
+
+  python manage.py geocodificar_enderecos
+  python manage.py geocodificar_enderecos --modelo Freelance
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app_eventos.services.geo import CAMPOS_ENDERECO, _centroides, geocodificar_todos
+
+MODELOS = {modelo.__name__: modelo for modelo in CAMPOS_ENDERECO}
+
+
+class Command(BaseCommand):
+    help = 'Geocodifica endereços (coordenadas + geohash) pela tabela offline de centroides'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--modelo',
+            action='append',
+            choices=sorted(MODELOS),
+            help='Modelo a processar (pode repetir). Padrão: todos.',
+        )
+        parser.add_argument('--lote', type=int, default=1000, help='Registros por UPDATE em lote.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'\n🌎 Geocodificando endereços... ({timezone.now()})\n')
+
+        _centroides.cache_clear()  # relê o arquivo, caso tenha sido atualizado
+        modelos = [MODELOS[nome] for nome in options['modelo']] if options['modelo'] else None
+        stats = geocodificar_todos(modelos, lote=max(1, options['lote']))
+
+        for modelo, total in stats.items():
+            self.stdout.write(f'  {modelo}: {total} registro(s) atualizado(s)')
+        self.stdout.write(self.style.SUCCESS(f'✅ Concluído: {sum(stats.values())} registro(s) atualizado(s)'))
@@ -5,10 +5,13 @@ Uso:
   python manage.py gerar_turnos_operacao --unidade-id 1
   python manage.py gerar_turnos_operacao --unidade-id 1 --dias 14
   python manage.py gerar_turnos_operacao --todas-unidades --dias 7
+  python manage.py gerar_turnos_operacao --todas-unidades --dias 90 --workers 4
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from django.core.management.base import BaseCommand
+from django.db import connection
 from django.utils import timezone
 
 from app_eventos.models_operacao_continua import UnidadeOperacional
@@ -22,6 +25,17 @@ class Command(BaseCommand):
         parser.add_argument('--unidade-id', type=int, default=None)
         parser.add_argument('--todas-unidades', action='store_true')
         parser.add_argument('--dias', type=int, default=7)
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Unidades processadas em paralelo (cada thread usa sua própria conexão).',
+        )
+        parser.add_argument(
+            '--dia-a-dia',
+            action='store_true',
+            help='Usa o caminho antigo (uma consulta por dia/regra) em vez do modo em lote.',
+        )
         parser.add_argument(
             '--data-inicio',
             type=str,
@@ -46,15 +60,34 @@ class Command(BaseCommand):
             self.stderr.write(self.style.ERROR('Use --unidade-id N ou --todas-unidades.'))
             return
 
-        total_turnos = 0
-        total_vagas = 0
-        for uid in ids:
+        em_lote = not options['dia_a_dia']
+
+        def processar(uid):
             try:
                 u = UnidadeOperacional.objects.get(pk=uid)
             except UnidadeOperacional.DoesNotExist:
+                return uid, None, None
+            return uid, u, gerar_turnos_janela(u, dias_a_frente=dias, data_referencia=data_ref, em_lote=em_lote)
+
+        def processar_em_thread(uid):
+            try:
+                return processar(uid)
+            finally:
+                connection.close()
+
+        workers = max(1, options['workers'])
+        if workers == 1 or len(ids) <= 1:
+            resultados = map(processar, ids)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                resultados = list(pool.map(processar_em_thread, ids))
+
+        total_turnos = 0
+        total_vagas = 0
+        for uid, u, r in resultados:
+            if u is None:
                 self.stderr.write(self.style.ERROR(f'Unidade id={uid} não encontrada.'))
                 continue
-            r = gerar_turnos_janela(u, dias_a_frente=dias, data_referencia=data_ref)
             if r.get('erro'):
                 self.stdout.write(self.style.WARNING(f'Unidade {uid}: {r["erro"]}'))
                 continue
@@ -0,0 +1,51 @@
+"""
+Worker das exportações assíncronas (ExportacaoDados).
+
+Uso:
+  python manage.py processar_exportacoes            # roda continuamente
+  python manage.py processar_exportacoes --uma-vez  # gera as pendentes e sai
+  python manage.py processar_exportacoes --intervalo 10
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_eventos.services.exportacao import processar_pendentes
+
+
+class Command(BaseCommand):
+    help = 'Gera em MEDIA_ROOT/exportacoes/ os arquivos das exportações pedidas em modo assíncrono.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--uma-vez', action='store_true', help='Processa as pendentes e termina.')
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=5.0,
+            help='Segundos de espera quando não há exportações pendentes (modo contínuo).',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('📦 Worker de exportações iniciado')
+
+        if options['uma_vez']:
+            self._resumo(processar_pendentes())
+            return
+
+        try:
+            while True:
+                stats = processar_pendentes(limite=1)
+                if stats['processadas']:
+                    self._resumo(stats)
+                else:
+                    time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            self.stdout.write('\n⏹️ Worker finalizado')
+
+    def _resumo(self, stats):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"processadas={stats['processadas']} concluidas={stats['concluidas']} "
+                f"erros={stats['erros']} linhas={stats['linhas']}"
+            )
+        )
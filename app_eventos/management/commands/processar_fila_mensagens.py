@@ -0,0 +1,60 @@
+"""
+Worker da fila de mensagens WhatsApp/SMS (BroadcastOutbox).
+
+Uso:
+  python manage.py processar_fila_mensagens            # roda continuamente
+  python manage.py processar_fila_mensagens --uma-vez  # drena o que estiver pronto e sai
+  python manage.py processar_fila_mensagens --workers 16 --lote 200 --intervalo 2
+  python manage.py processar_fila_mensagens --uma-vez --fake   # sem Twilio (desenvolvimento)
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_eventos.services.fila_mensagens import ClienteTwilioFake, ProcessadorFilaMensagens
+
+
+class Command(BaseCommand):
+    help = 'Envia as mensagens enfileiradas (WhatsApp/SMS) com pool de threads, rate limit e retry.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--uma-vez', action='store_true', help='Processa o que está pronto e termina.')
+        parser.add_argument('--workers', type=int, default=None, help='Threads de envio em paralelo.')
+        parser.add_argument('--lote', type=int, default=100, help='Mensagens reservadas por lote.')
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=5.0,
+            help='Segundos de espera quando a fila está vazia (modo contínuo).',
+        )
+        parser.add_argument('--fake', action='store_true', help='Usa o cliente fake (não envia de verdade).')
+
+    def handle(self, *args, **options):
+        processador = ProcessadorFilaMensagens(
+            cliente=ClienteTwilioFake() if options['fake'] else None,
+            max_workers=options['workers'],
+            tamanho_lote=max(1, options['lote']),
+        )
+        self.stdout.write(f'📤 Worker {processador.worker_id} iniciado')
+
+        if options['uma_vez']:
+            self._resumo(processador.processar_pendentes())
+            return
+
+        try:
+            while True:
+                stats = processador.processar_lote()
+                if stats['processadas']:
+                    self._resumo(stats)
+                else:
+                    time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            self.stdout.write('\n⏹️ Worker finalizado')
+
+    def _resumo(self, stats):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"processadas={stats['processadas']} enviadas={stats['enviadas']} "
+                f"reagendadas={stats['reagendadas']} falhas={stats['falhas']}"
+            )
+        )
@@ -0,0 +1,53 @@
+"""
+Worker da outbox de notificações (NotificacaoOutbox).
+
+Uso:
+  python manage.py processar_notificacoes            # roda continuamente
+  python manage.py processar_notificacoes --uma-vez  # drena o que estiver na fila e sai
+  python manage.py processar_notificacoes --lote 500 --intervalo 2
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_eventos.services.outbox_notificacoes import ProcessadorOutboxNotificacoes
+
+
+class Command(BaseCommand):
+    help = 'Gera as notificações in-app e envia os emails enfileirados pelos signals, em lotes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--uma-vez', action='store_true', help='Processa o que está na fila e termina.')
+        parser.add_argument('--lote', type=int, default=200, help='Eventos reservados por lote.')
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=5.0,
+            help='Segundos de espera quando a fila está vazia (modo contínuo).',
+        )
+
+    def handle(self, *args, **options):
+        processador = ProcessadorOutboxNotificacoes(tamanho_lote=max(1, options['lote']))
+        self.stdout.write(f'🔔 Worker de notificações {processador.worker_id} iniciado')
+
+        if options['uma_vez']:
+            self._resumo(processador.processar_pendentes())
+            return
+
+        try:
+            while True:
+                stats = processador.processar_lote()
+                if stats['processados']:
+                    self._resumo(stats)
+                else:
+                    time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            self.stdout.write('\n⏹️ Worker finalizado')
+
+    def _resumo(self, stats):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"processados={stats['processados']} notificacoes={stats['notificacoes']} "
+                f"emails={stats['emails']} falhas={stats['falhas']}"
+            )
+        )
@@ -0,0 +1,56 @@
+"""
+Worker das renderizações de PDF (RenderizacaoDocumento).
+
+Necessário com RENDERIZACAO_PDF_MODO = 'fila'; no modo 'thread' serve para
+recuperar pedidos que ficaram pendentes (processo web reiniciado no meio).
+
+Uso:
+  python manage.py processar_renderizacoes                # roda continuamente
+  python manage.py processar_renderizacoes --uma-vez      # renderiza as pendentes e sai
+  python manage.py processar_renderizacoes --workers 4 --intervalo 2
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_eventos.services.renderizacao_pdf import processar_pendentes
+
+
+class Command(BaseCommand):
+    help = 'Renderiza os PDFs pendentes (contratos, documentos gerados) em MEDIA_ROOT/renderizacoes/.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--uma-vez', action='store_true', help='Processa as pendentes e termina.')
+        parser.add_argument('--workers', type=int, default=2, help='Threads de renderização em paralelo.')
+        parser.add_argument('--lote', type=int, default=50, help='Pedidos reservados por rodada (modo contínuo).')
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=5.0,
+            help='Segundos de espera quando não há renderizações pendentes (modo contínuo).',
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        self.stdout.write(f'🖨️ Worker de renderização iniciado ({workers} thread(s))')
+
+        if options['uma_vez']:
+            self._resumo(processar_pendentes(workers=workers))
+            return
+
+        try:
+            while True:
+                stats = processar_pendentes(limite=max(1, options['lote']), workers=workers)
+                if stats['processadas']:
+                    self._resumo(stats)
+                else:
+                    time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            self.stdout.write('\n⏹️ Worker finalizado')
+
+    def _resumo(self, stats):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"processadas={stats['processadas']} concluidas={stats['concluidas']} erros={stats['erros']}"
+            )
+        )
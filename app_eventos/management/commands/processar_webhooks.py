@@ -0,0 +1,65 @@
+"""
+Worker das entregas de webhooks globais (EntregaWebhook).
+
+Uso:
+  python manage.py processar_webhooks                    # roda continuamente
+  python manage.py processar_webhooks --uma-vez          # entrega o que estiver pronto e sai
+  python manage.py processar_webhooks --workers 16 --lote 500 --intervalo 2
+  python manage.py processar_webhooks --reenviar-falhas  # devolve a fila de mortos à fila e sai
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_eventos.services.webhooks import ProcessadorWebhooks, reenviar_falhas
+
+
+class Command(BaseCommand):
+    help = 'Entrega os eventos enfileirados aos webhooks globais (assinatura HMAC, lotes e retry).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--uma-vez', action='store_true', help='Processa o que está pronto e termina.')
+        parser.add_argument('--workers', type=int, default=None, help='Threads de envio em paralelo.')
+        parser.add_argument('--lote', type=int, default=200, help='Entregas reservadas por lote.')
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=5.0,
+            help='Segundos de espera quando a fila está vazia (modo contínuo).',
+        )
+        parser.add_argument(
+            '--reenviar-falhas',
+            action='store_true',
+            help='Devolve à fila as entregas que falharam definitivamente e termina.',
+        )
+
+    def handle(self, *args, **options):
+        if options['reenviar_falhas']:
+            self.stdout.write(self.style.SUCCESS(f'🔁 {reenviar_falhas()} entregas devolvidas à fila'))
+            return
+
+        processador = ProcessadorWebhooks(max_workers=options['workers'], tamanho_lote=max(1, options['lote']))
+        self.stdout.write(f'🔗 Worker {processador.worker_id} iniciado')
+
+        try:
+            if options['uma_vez']:
+                self._resumo(processador.processar_pendentes())
+                return
+            while True:
+                stats = processador.processar_lote()
+                if stats['processadas']:
+                    self._resumo(stats)
+                else:
+                    time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            self.stdout.write('\n⏹️ Worker finalizado')
+        finally:
+            processador.cliente.fechar()
+
+    def _resumo(self, stats):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"processadas={stats['processadas']} entregues={stats['entregues']} "
+                f"reagendadas={stats['reagendadas']} falhas={stats['falhas']}"
+            )
+        )
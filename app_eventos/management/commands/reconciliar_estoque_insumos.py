@@ -0,0 +1,50 @@
+"""
+Reconcilia os saldos desnormalizados de estoque dos insumos.
+
+Recalcula os totais por evento de cada Insumo (e, com ``--setores``, o
+distribuído/utilizado de cada InsumoEvento a partir dos setores), corrige a
+deriva e atualiza os contadores de insumos dos dashboards de estoque.
+Execute periodicamente via cron:
+
+  python manage.py reconciliar_estoque_insumos
+  python manage.py reconciliar_estoque_insumos --insumo 12 --setores
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app_eventos.models import EmpresaContratante
+from app_eventos.services.estoque_insumos import atualizar_dashboard_estoque, reconciliar_estoque
+
+
+class Command(BaseCommand):
+    help = 'Recalcula os saldos de estoque dos insumos e corrige divergências'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--insumo',
+            type=int,
+            action='append',
+            help='ID do insumo (pode repetir). Padrão: todos.',
+        )
+        parser.add_argument(
+            '--setores',
+            action='store_true',
+            help='Também recalcula distribuído/utilizado dos eventos a partir dos setores.',
+        )
+        parser.add_argument('--lote', type=int, default=1000, help='Insumos por lote.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'\n📦 Reconciliando estoque de insumos... ({timezone.now()})\n')
+
+        divergencias = reconciliar_estoque(
+            options['insumo'], incluir_setores=options['setores'], tamanho_lote=max(1, options['lote'])
+        )
+        for modelo, pk, diff in divergencias:
+            campos = ', '.join(f'{campo}: {antes} → {depois}' for campo, (antes, depois) in diff.items())
+            self.stdout.write(self.style.WARNING(f'⚠️ {modelo} {pk}: {campos}'))
+
+        dashboards = atualizar_dashboard_estoque(EmpresaContratante.objects.values_list('pk', flat=True))
+        self.stdout.write(f'  Dashboards de estoque atualizados: {dashboards}')
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Concluído: {len(divergencias)} saldo(s) com divergência corrigido(s)')
+        )
@@ -0,0 +1,39 @@
+"""
+Reconcilia as métricas materializadas dos dashboards (MetricasEmpresa).
+
+Recalcula os contadores a partir das tabelas transacionais e corrige qualquer
+deriva dos deltas aplicados pelos signals. Execute periodicamente via cron:
+
+  python manage.py reconciliar_metricas_empresa
+  python manage.py reconciliar_metricas_empresa --empresa 3 --empresa 7
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app_eventos.services.metricas_empresa import reconciliar_metricas
+
+
+class Command(BaseCommand):
+    help = 'Recalcula as métricas de dashboard por empresa e corrige divergências'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--empresa',
+            type=int,
+            action='append',
+            help='ID da empresa contratante (pode repetir). Padrão: todas.',
+        )
+        parser.add_argument('--lote', type=int, default=500, help='Empresas por lote.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'\n📊 Reconciliando métricas das empresas... ({timezone.now()})\n')
+
+        divergencias = reconciliar_metricas(options['empresa'], tamanho_lote=max(1, options['lote']))
+
+        for empresa_id, diff in divergencias:
+            campos = ', '.join(f'{campo}: {antes} → {depois}' for campo, (antes, depois) in diff.items())
+            self.stdout.write(self.style.WARNING(f'⚠️ Empresa {empresa_id}: {campos}'))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Concluído: {len(divergencias)} empresa(s) com divergência corrigida(s)')
+        )
@@ -0,0 +1,26 @@
+"""
+Reconstrói a agenda de compromissos dos freelancers (CompromissoAgenda).
+
+Os signals mantêm a agenda em dia; use este comando depois de cargas em massa
+(update/bulk_create não disparam signals) ou para corrigir deriva:
+
+  python manage.py reconstruir_agenda_freelancers
+  python manage.py reconstruir_agenda_freelancers --lote 5000
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app_eventos.services.agenda_freelancer import reconstruir_agenda
+
+
+class Command(BaseCommand):
+    help = 'Recria os compromissos de agenda a partir de contratos, candidaturas aprovadas e alocações em turnos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000, help='Linhas por lote de gravação.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'\n📅 Reconstruindo agenda dos freelancers... ({timezone.now()})\n')
+        stats = reconstruir_agenda(tamanho_lote=max(1, options['lote']))
+        self.stdout.write(f"  Compromissos anteriores removidos: {stats['removidos']}")
+        self.stdout.write(self.style.SUCCESS(f"✅ Concluído: {stats['compromissos']} compromisso(s) na agenda"))
@@ -0,0 +1,37 @@
+"""
+Reconstrói os documentos de busca (DocumentoBusca) de vagas, eventos e freelancers.
+
+A carga inicial é feita pela migração 0053_popular_documentos_busca; o comando
+serve para corrigir deriva, ex.: alterações feitas com ``QuerySet.update`` que
+não disparam signals:
+
+  python manage.py reindexar_busca
+  python manage.py reindexar_busca --tipo vaga --tipo evento
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app_eventos.models_busca import DocumentoBusca
+from app_eventos.services.busca import reindexar
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói os documentos da busca textual (vagas, eventos e freelancers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tipo',
+            action='append',
+            choices=[tipo for tipo, _ in DocumentoBusca.TIPO_CHOICES],
+            help='Tipo a reindexar (pode repetir). Padrão: todos.',
+        )
+        parser.add_argument('--lote', type=int, default=500, help='Objetos por lote.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'\n🔎 Reindexando busca... ({timezone.now()})\n')
+
+        stats = reindexar(options['tipo'], lote=max(1, options['lote']))
+
+        for tipo, total in stats.items():
+            self.stdout.write(f'  {tipo}: {total} documento(s)')
+        self.stdout.write(self.style.SUCCESS(f'✅ Concluído: {sum(stats.values())} documento(s) indexado(s)'))
@@ -1,6 +1,6 @@
 """
 Comando para verificar documentos próximos ao vencimento e expirados
-Execute diariamente via cron
+Execute diariamente via cron (ou mantenha rodando o agendador_documentos)
 """
 from django.core.management.base import BaseCommand
 from django.utils import timezone
@@ -5,6 +5,9 @@ from django.utils.deprecation import MiddlewareMixin
 from django.conf import settings
 from django.db import DatabaseError
 
+from .services.cache_acesso import AcessoUsuario, empresa_do_usuario
+from .services.ultimo_acesso import rastreador, registrar_acesso
+
 
 class EmpresaContratanteMiddleware(MiddlewareMixin):
     """
@@ -50,6 +53,9 @@ class EmpresaContratanteMiddleware(MiddlewareMixin):
             # Se o usuário não está autenticado, redireciona para login
             if not request.user.is_authenticated:
                 return redirect('admin:login')
+
+            # Empresa do usuário via cache de tenant (evita consulta a cada request)
+            empresa_do_usuario(request.user)
                 
             # Se é admin do sistema, tem acesso total
             if request.user.tipo_usuario == 'admin_sistema':
@@ -124,61 +130,39 @@ class EmpresaContratanteMiddleware(MiddlewareMixin):
 
 class EmpresaContextMiddleware(MiddlewareMixin):
     """
-    Middleware para adicionar contexto completo da empresa contratante
+    Middleware para adicionar contexto da empresa contratante ao request
+
+    Nada é consultado aqui: ``request.contexto_empresa`` (empresa ativa, plano,
+    limites) e ``request.acesso`` (permissões) resolvem na primeira leitura, e o
+    último acesso vai para o buffer de services/ultimo_acesso.py em vez de um
+    UPDATE por request.
     """
-    
+
     def process_request(self, request):
         try:
             if not request.user.is_authenticated:
                 return None
-            from .utils_empresa_ativa import empresa_ativa
+            from .utils_empresa_ativa import ContextoEmpresa
 
-            empresa = empresa_ativa(request)
-            if empresa:
-                # Adiciona dados da empresa ao request
-                request.empresa_contratante = empresa
-                request.empresa_contratante_id = empresa.id
-                request.empresa_contratante_nome = empresa.nome_fantasia
-                request.empresa_contratante_cnpj = empresa.cnpj
-                request.empresa_contratante_plano = empresa.plano_contratado
-                request.empresa_contratante_ativa = empresa.ativo
+            # Permissões/empresa resolvidas uma vez por request (servidas pelo cache de acesso)
+            request.acesso = AcessoUsuario(request.user)
+            request.contexto_empresa = ContextoEmpresa(request)
 
-                # Carrega dados do plano contratado
-                if hasattr(empresa, 'plano_contratado') and empresa.plano_contratado:
-                    plano = empresa.plano_contratado
-                    request.empresa_plano_nome = plano.nome
-                    request.empresa_plano_tipo = plano.tipo_plano
-                    request.empresa_plano_limites = {
-                        'max_eventos_mes': plano.max_eventos_mes,
-                        'max_usuarios': plano.max_usuarios,
-                        'max_freelancers': plano.max_freelancers,
-                        'max_equipamentos': plano.max_equipamentos,
-                        'max_locais': plano.max_locais,
-                    }
-                    request.empresa_plano_recursos = {
-                        'suporte_24h': plano.suporte_24h,
-                        'relatorios_avancados': plano.relatorios_avancados,
-                        'integracao_api': plano.integracao_api,
-                        'backup_automatico': plano.backup_automatico,
-                        'ssl_certificado': plano.ssl_certificado,
-                        'dominio_personalizado': plano.dominio_personalizado,
-                    }
+            # Dados do usuário (já carregados pela autenticação)
+            request.usuario_tipo = request.user.tipo_usuario
+            request.usuario_ativo = request.user.ativo
+            request.usuario_ultimo_acesso = request.user.data_ultimo_acesso
 
-                # Carrega empresas parceiras da empresa contratante
-                from .models import Empresa
-                empresas_parceiras = Empresa.objects.filter(ativo=True)
-                request.empresas_parceiras = empresas_parceiras
+            registrar_acesso(request.user)
+        except Exception:
+            # Em caso de erro, não bloqueia o acesso
+            request.contexto_empresa = None
 
-                # Carrega dados do usuário
-                request.usuario_tipo = request.user.tipo_usuario
-                request.usuario_ativo = request.user.ativo
-                request.usuario_ultimo_acesso = request.user.data_ultimo_acesso
+        return None
 
-                # Atualiza último acesso
-                from django.utils import timezone
-                request.user.data_ultimo_acesso = timezone.now()
-                request.user.save(update_fields=['data_ultimo_acesso'])
-                    
+    def process_response(self, request, response):
+        try:
+            rastreador().descarregar_se_devido()
         except Exception:
-            # Em caso de erro, não bloqueia o acesso
-            request.empresa_contratante = None
+            pass
+        return response
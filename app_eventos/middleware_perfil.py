@@ -0,0 +1,40 @@
+"""
+Middleware de perfil de consultas (opcional, PERFIL_CONSULTAS_ATIVO)
+"""
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from .services.perfil_consultas import registro
+
+
+class PerfilConsultasMiddleware:
+    """
+    Conta consultas, tempo de banco e N+1 por rota (services/perfil_consultas.py)
+
+    Fica logo no início da cadeia para medir também os outros middlewares.
+    Desligado, levanta MiddlewareNotUsed e o Django o remove da cadeia.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERFIL_CONSULTAS_ATIVO', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        registro_perfil = registro()
+        perfil = registro_perfil.novo_perfil()
+        inicio = time.perf_counter()
+        if perfil is None:
+            response = self.get_response(request)
+        else:
+            with connection.execute_wrapper(perfil):
+                response = self.get_response(request)
+        duracao = time.perf_counter() - inicio
+
+        match = getattr(request, 'resolver_match', None)
+        rota = ('/' + match.route) if match and match.route else 'nao_resolvida'
+        registro_perfil.registrar(rota, request.method, request.path, response.status_code, duracao, perfil)
+        return response
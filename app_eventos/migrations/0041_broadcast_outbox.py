@@ -0,0 +1,40 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0040_ponto_operacao_empresa_onetoone_field'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BroadcastOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idempotency_key', models.CharField(help_text='Impede que a mesma mensagem seja enfileirada/enviada duas vezes', max_length=64, unique=True, verbose_name='Chave de Idempotência')),
+                ('to_address', models.CharField(max_length=20, verbose_name='Número Destinatário')),
+                ('body', models.TextField(verbose_name='Corpo da Mensagem')),
+                ('channel_preferred', models.CharField(choices=[('whatsapp', 'WhatsApp'), ('sms', 'SMS'), ('both', 'Ambos (com fallback)')], default='sms', max_length=20, verbose_name='Canal Preferencial')),
+                ('status', models.CharField(choices=[('queued', 'Na Fila'), ('sending', 'Enviando'), ('sent', 'Enviado'), ('failed', 'Falhou')], default='queued', max_length=20, verbose_name='Status')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Tentativas')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próxima Tentativa')),
+                ('claim_token', models.CharField(blank=True, default='', max_length=36, verbose_name='Lote do Worker')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Reservado Até')),
+                ('channel_used', models.CharField(blank=True, choices=[('whatsapp', 'WhatsApp'), ('sms', 'SMS')], default='', max_length=20, verbose_name='Canal Utilizado')),
+                ('message_sid', models.CharField(blank=True, default='', max_length=100, verbose_name='Twilio Message SID')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='Último Erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('broadcast', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox', to='app_eventos.broadcastlog', verbose_name='Broadcast')),
+            ],
+            options={
+                'verbose_name': 'Mensagem na Fila',
+                'verbose_name_plural': 'Fila de Mensagens',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='app_eventos_status_f08e19_idx'), models.Index(fields=['claim_token'], name='app_eventos_claim_t_dbf4cd_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0041_broadcast_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricasEmpresa',
+            fields=[
+                ('empresa_contratante', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='metricas', serialize=False, to='app_eventos.empresacontratante', verbose_name='Empresa Contratante')),
+                ('total_eventos', models.IntegerField(default=0)),
+                ('eventos_ativos', models.IntegerField(default=0)),
+                ('total_vagas', models.IntegerField(default=0)),
+                ('vagas_ativas', models.IntegerField(default=0)),
+                ('vagas_quantidade', models.IntegerField(default=0, help_text='Soma de Vaga.quantidade')),
+                ('vagas_ativas_quantidade', models.IntegerField(default=0, help_text='Soma de Vaga.quantidade das vagas ativas')),
+                ('total_candidaturas', models.IntegerField(default=0)),
+                ('candidaturas_pendentes', models.IntegerField(default=0)),
+                ('candidaturas_em_analise', models.IntegerField(default=0)),
+                ('candidaturas_aprovadas', models.IntegerField(default=0)),
+                ('candidaturas_rejeitadas', models.IntegerField(default=0)),
+                ('candidaturas_canceladas', models.IntegerField(default=0)),
+                ('candidaturas_contratadas', models.IntegerField(default=0)),
+                ('total_freelancers', models.IntegerField(default=0, help_text='Freelancers distintos com candidatura na empresa')),
+                ('total_contratos', models.IntegerField(default=0)),
+                ('contratos_ativos', models.IntegerField(default=0)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+                ('reconciliado_em', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Métricas da Empresa',
+                'verbose_name_plural': 'Métricas das Empresas',
+            },
+        ),
+    ]
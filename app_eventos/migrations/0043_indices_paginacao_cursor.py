@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0042_metricas_empresa'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidatura',
+            index=models.Index(fields=['freelance', '-data_candidatura', '-id'], name='app_eventos_freelan_a7cda7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidatura',
+            index=models.Index(fields=['-data_candidatura', '-id'], name='app_eventos_data_ca_c77b1d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contratofreelance',
+            index=models.Index(fields=['freelance', '-data_contratacao', '-id'], name='app_eventos_freelan_a108cc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaga',
+            index=models.Index(fields=['ativa', '-data_criacao', '-id'], name='app_eventos_ativa_4d8143_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaga',
+            index=models.Index(fields=['empresa_contratante', '-data_criacao', '-id'], name='app_eventos_empresa_0defb4_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0043_indices_paginacao_cursor'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificacaoOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('evento', models.CharField(choices=[('nova_candidatura', 'Nova Candidatura'), ('status_candidatura', 'Mudança de Status da Candidatura'), ('vaga_publicada', 'Vaga Publicada'), ('contrato_criado', 'Contrato Criado'), ('documento_enviado', 'Documento Enviado'), ('documento_validado', 'Documento Validado')], max_length=30, verbose_name='Evento')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Dados do Evento')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('processado', 'Processado'), ('falhou', 'Falhou')], default='pendente', max_length=20, verbose_name='Status')),
+                ('tentativas', models.PositiveIntegerField(default=0, verbose_name='Tentativas')),
+                ('claim_token', models.CharField(blank=True, default='', max_length=36, verbose_name='Lote do Worker')),
+                ('reservado_ate', models.DateTimeField(blank=True, null=True, verbose_name='Reservado Até')),
+                ('ultimo_erro', models.TextField(blank=True, default='', verbose_name='Último Erro')),
+                ('data_criacao', models.DateTimeField(auto_now_add=True, verbose_name='Data de Criação')),
+                ('data_processamento', models.DateTimeField(blank=True, null=True, verbose_name='Data de Processamento')),
+            ],
+            options={
+                'verbose_name': 'Evento de Notificação na Fila',
+                'verbose_name_plural': 'Fila de Notificações',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'id'], name='app_eventos_status_64b7d1_idx'), models.Index(fields=['claim_token'], name='app_eventos_claim_t_b8b561_idx')],
+            },
+        ),
+    ]
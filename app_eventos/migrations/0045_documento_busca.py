@@ -0,0 +1,79 @@
+from django.db import migrations, models
+
+# Índices de texto dependem do banco: GIN (full-text + trigram) no Postgres,
+# tabela FTS5 de conteúdo externo (sincronizada por triggers) no SQLite.
+SQL_POSTGRES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS documento_busca_fts_idx ON app_eventos_documentobusca "
+    "USING gin (to_tsvector('portuguese', texto))",
+    "CREATE INDEX IF NOT EXISTS documento_busca_trgm_idx ON app_eventos_documentobusca "
+    "USING gin (texto gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS documento_busca_cidade_trgm_idx ON app_eventos_documentobusca "
+    "USING gin (cidade gin_trgm_ops)",
+]
+SQL_POSTGRES_REVERSO = [
+    "DROP INDEX IF EXISTS documento_busca_fts_idx",
+    "DROP INDEX IF EXISTS documento_busca_trgm_idx",
+    "DROP INDEX IF EXISTS documento_busca_cidade_trgm_idx",
+]
+
+SQL_SQLITE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS app_eventos_documentobusca_fts USING fts5("
+    "texto, content='app_eventos_documentobusca', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS app_eventos_documentobusca_fts_ai AFTER INSERT ON app_eventos_documentobusca "
+    "BEGIN INSERT INTO app_eventos_documentobusca_fts(rowid, texto) VALUES (new.id, new.texto); END",
+    "CREATE TRIGGER IF NOT EXISTS app_eventos_documentobusca_fts_ad AFTER DELETE ON app_eventos_documentobusca "
+    "BEGIN INSERT INTO app_eventos_documentobusca_fts(app_eventos_documentobusca_fts, rowid, texto) "
+    "VALUES ('delete', old.id, old.texto); END",
+    "CREATE TRIGGER IF NOT EXISTS app_eventos_documentobusca_fts_au AFTER UPDATE ON app_eventos_documentobusca "
+    "BEGIN INSERT INTO app_eventos_documentobusca_fts(app_eventos_documentobusca_fts, rowid, texto) "
+    "VALUES ('delete', old.id, old.texto); "
+    "INSERT INTO app_eventos_documentobusca_fts(rowid, texto) VALUES (new.id, new.texto); END",
+]
+SQL_SQLITE_REVERSO = [
+    "DROP TRIGGER IF EXISTS app_eventos_documentobusca_fts_ai",
+    "DROP TRIGGER IF EXISTS app_eventos_documentobusca_fts_ad",
+    "DROP TRIGGER IF EXISTS app_eventos_documentobusca_fts_au",
+    "DROP TABLE IF EXISTS app_eventos_documentobusca_fts",
+]
+
+
+def _executar(schema_editor, por_banco):
+    for sql in por_banco.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def criar_indices_texto(apps, schema_editor):
+    _executar(schema_editor, {'postgresql': SQL_POSTGRES, 'sqlite': SQL_SQLITE})
+
+
+def remover_indices_texto(apps, schema_editor):
+    _executar(schema_editor, {'postgresql': SQL_POSTGRES_REVERSO, 'sqlite': SQL_SQLITE_REVERSO})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0044_outbox_notificacoes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentoBusca',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('vaga', 'Vaga'), ('evento', 'Evento'), ('freelance', 'Freelancer')], max_length=10, verbose_name='Tipo')),
+                ('objeto_id', models.BigIntegerField(verbose_name='ID do Objeto')),
+                ('texto', models.TextField(blank=True, default='', verbose_name='Texto Pesquisável')),
+                ('cidade', models.CharField(blank=True, default='', max_length=255, verbose_name='Cidade (normalizada)')),
+                ('atualizado_em', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Documento de Busca',
+                'verbose_name_plural': 'Documentos de Busca',
+                'constraints': [models.UniqueConstraint(fields=('tipo', 'objeto_id'), name='documento_busca_tipo_objeto_unico')],
+            },
+        ),
+        migrations.RunPython(criar_indices_texto, remover_indices_texto),
+    ]
@@ -0,0 +1,71 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0045_documento_busca'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='freelance',
+            name='coordenadas_origem',
+            field=models.CharField(blank=True, choices=[('cep', 'CEP'), ('cidade', 'Cidade'), ('manual', 'Manual')], default='', max_length=10, verbose_name='Origem das Coordenadas'),
+        ),
+        migrations.AddField(
+            model_name='freelance',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=12, verbose_name='Geohash'),
+        ),
+        migrations.AddField(
+            model_name='freelance',
+            name='latitude',
+            field=models.DecimalField(blank=True, decimal_places=8, max_digits=10, null=True, verbose_name='Latitude'),
+        ),
+        migrations.AddField(
+            model_name='freelance',
+            name='longitude',
+            field=models.DecimalField(blank=True, decimal_places=8, max_digits=11, null=True, verbose_name='Longitude'),
+        ),
+        migrations.AddField(
+            model_name='localevento',
+            name='coordenadas_origem',
+            field=models.CharField(blank=True, choices=[('cep', 'CEP'), ('cidade', 'Cidade'), ('manual', 'Manual')], default='', max_length=10, verbose_name='Origem das Coordenadas'),
+        ),
+        migrations.AddField(
+            model_name='localevento',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=12, verbose_name='Geohash'),
+        ),
+        migrations.AddField(
+            model_name='localevento',
+            name='latitude',
+            field=models.DecimalField(blank=True, decimal_places=8, max_digits=10, null=True, verbose_name='Latitude'),
+        ),
+        migrations.AddField(
+            model_name='localevento',
+            name='longitude',
+            field=models.DecimalField(blank=True, decimal_places=8, max_digits=11, null=True, verbose_name='Longitude'),
+        ),
+        migrations.AddField(
+            model_name='pontooperacao',
+            name='coordenadas_origem',
+            field=models.CharField(blank=True, choices=[('cep', 'CEP'), ('cidade', 'Cidade'), ('manual', 'Manual')], default='', max_length=10, verbose_name='Origem das Coordenadas'),
+        ),
+        migrations.AddField(
+            model_name='pontooperacao',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=12, verbose_name='Geohash'),
+        ),
+        migrations.AddField(
+            model_name='pontooperacao',
+            name='latitude',
+            field=models.DecimalField(blank=True, decimal_places=8, max_digits=10, null=True, verbose_name='Latitude'),
+        ),
+        migrations.AddField(
+            model_name='pontooperacao',
+            name='longitude',
+            field=models.DecimalField(blank=True, decimal_places=8, max_digits=11, null=True, verbose_name='Longitude'),
+        ),
+    ]
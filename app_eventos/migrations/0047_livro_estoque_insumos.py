@@ -0,0 +1,79 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def forwards_saldos_iniciais(apps, schema_editor):
+    """Totais por evento desnormalizados e o estoque atual como entrada inicial do livro-razão."""
+    Insumo = apps.get_model('app_eventos', 'Insumo')
+    InsumoEvento = apps.get_model('app_eventos', 'InsumoEvento')
+    MovimentacaoInsumo = apps.get_model('app_eventos', 'MovimentacaoInsumo')
+
+    def soma(campo):
+        return Coalesce(
+            Subquery(
+                InsumoEvento.objects.filter(insumo=OuterRef('pk'))
+                .values('insumo').annotate(total=Sum(campo)).values('total')[:1],
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        )
+
+    Insumo.objects.update(
+        quantidade_alocada_eventos=soma('quantidade_alocada_evento'),
+        quantidade_utilizada_eventos=soma('quantidade_utilizada_evento'),
+    )
+    MovimentacaoInsumo.objects.bulk_create(
+        [
+            MovimentacaoInsumo(insumo_id=pk, tipo='entrada', quantidade=estoque, observacao='Saldo inicial')
+            for pk, estoque in Insumo.objects.filter(estoque_atual__gt=0).values_list('pk', 'estoque_atual')
+        ],
+        batch_size=1000,
+    )
+
+
+def backwards_noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0046_coordenadas_geograficas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='insumo',
+            name='quantidade_alocada_eventos',
+            field=models.PositiveIntegerField(default=0, verbose_name='Quantidade Alocada em Eventos'),
+        ),
+        migrations.AddField(
+            model_name='insumo',
+            name='quantidade_utilizada_eventos',
+            field=models.PositiveIntegerField(default=0, verbose_name='Quantidade Utilizada em Eventos'),
+        ),
+        migrations.CreateModel(
+            name='MovimentacaoInsumo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('entrada', 'Entrada'), ('alocacao', 'Alocação'), ('utilizacao', 'Utilização'), ('devolucao', 'Devolução'), ('ajuste', 'Ajuste')], max_length=20, verbose_name='Tipo')),
+                ('quantidade', models.IntegerField(help_text='Sempre positiva, exceto em ajustes (com sinal)', verbose_name='Quantidade')),
+                ('observacao', models.TextField(blank=True, default='', verbose_name='Observação')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('insumo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movimentacoes', to='app_eventos.insumo', verbose_name='Insumo')),
+                ('insumo_evento', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movimentacoes', to='app_eventos.insumoevento', verbose_name='Insumo do Evento')),
+                ('insumo_setor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movimentacoes', to='app_eventos.insumosetor', verbose_name='Insumo do Setor')),
+                ('responsavel', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movimentacoes_insumos', to=settings.AUTH_USER_MODEL, verbose_name='Responsável')),
+            ],
+            options={
+                'verbose_name': 'Movimentação de Insumo',
+                'verbose_name_plural': 'Movimentações de Insumos',
+                'ordering': ['-criado_em', '-id'],
+                'indexes': [models.Index(fields=['insumo', 'criado_em'], name='mov_insumo_insumo_data_idx')],
+            },
+        ),
+        migrations.RunPython(forwards_saldos_iniciais, backwards_noop),
+    ]
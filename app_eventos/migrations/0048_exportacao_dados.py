@@ -0,0 +1,39 @@
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0047_livro_estoque_insumos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportacaoDados',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True, verbose_name='Token')),
+                ('tipo', models.CharField(max_length=30, verbose_name='Tipo')),
+                ('formato', models.CharField(max_length=10, verbose_name='Formato')),
+                ('colunas', models.JSONField(blank=True, default=list, verbose_name='Colunas')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluida', 'Concluída'), ('erro', 'Erro')], default='pendente', max_length=15, verbose_name='Status')),
+                ('arquivo', models.FileField(blank=True, upload_to='exportacoes/%Y/%m/', verbose_name='Arquivo')),
+                ('total_linhas', models.PositiveIntegerField(default=0, verbose_name='Total de Linhas')),
+                ('erro', models.TextField(blank=True, default='', verbose_name='Erro')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('iniciado_em', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em')),
+                ('concluido_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+                ('empresa_contratante', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='exportacoes', to='app_eventos.empresacontratante', verbose_name='Empresa Contratante')),
+                ('solicitado_por', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exportacoes', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Exportação de Dados',
+                'verbose_name_plural': 'Exportações de Dados',
+                'ordering': ['-criado_em'],
+                'indexes': [models.Index(fields=['status', 'criado_em'], name='exportacao_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def forwards_compromissos(apps, schema_editor):
+    """Compromissos atuais: contratos ativos/candidaturas aprovadas em vagas com data e alocações não canceladas."""
+    Vaga = apps.get_model('app_eventos', 'Vaga')
+    ContratoFreelance = apps.get_model('app_eventos', 'ContratoFreelance')
+    Candidatura = apps.get_model('app_eventos', 'Candidatura')
+    AlocacaoTurno = apps.get_model('app_eventos', 'AlocacaoTurno')
+    CompromissoAgenda = apps.get_model('app_eventos', 'CompromissoAgenda')
+
+    pares = set(
+        ContratoFreelance.objects.filter(status='ativo', vaga__data_inicio_trabalho__isnull=False)
+        .values_list('freelance_id', 'vaga_id')
+    )
+    pares.update(
+        Candidatura.objects.filter(status__in=['aprovado', 'contratado'], vaga__data_inicio_trabalho__isnull=False)
+        .values_list('freelance_id', 'vaga_id')
+    )
+    janelas = {}
+    for pk, inicio, fim in Vaga.objects.filter(pk__in={v for _, v in pares}).values_list(
+        'pk', 'data_inicio_trabalho', 'data_fim_trabalho'
+    ):
+        janelas[pk] = (inicio, fim if fim and fim > inicio else inicio + timedelta(hours=8))
+    novos = [
+        CompromissoAgenda(freelance_id=f, origem='vaga', objeto_id=v, inicio=janelas[v][0], fim=janelas[v][1])
+        for f, v in pares
+    ]
+    for pk, freelance_id, data, hora_inicio, hora_fim in AlocacaoTurno.objects.exclude(status='cancelado').values_list(
+        'pk', 'freelance_id', 'vaga_turno__turno__data', 'vaga_turno__turno__hora_inicio', 'vaga_turno__turno__hora_fim'
+    ):
+        inicio = timezone.make_aware(datetime.combine(data, hora_inicio))
+        fim = timezone.make_aware(datetime.combine(data, hora_fim))
+        if fim <= inicio:
+            fim += timedelta(days=1)
+        novos.append(CompromissoAgenda(freelance_id=freelance_id, origem='alocacao', objeto_id=pk, inicio=inicio, fim=fim))
+    CompromissoAgenda.objects.bulk_create(novos, batch_size=1000)
+
+
+def backwards_noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0048_exportacao_dados'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompromissoAgenda',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('origem', models.CharField(choices=[('vaga', 'Vaga'), ('alocacao', 'Alocação em turno')], max_length=10, verbose_name='Origem')),
+                ('objeto_id', models.PositiveBigIntegerField(verbose_name='ID do objeto')),
+                ('inicio', models.DateTimeField(verbose_name='Início')),
+                ('fim', models.DateTimeField(verbose_name='Fim')),
+                ('atualizado_em', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('freelance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='compromissos_agenda', to='app_eventos.freelance', verbose_name='Freelancer')),
+            ],
+            options={
+                'verbose_name': 'Compromisso de Agenda',
+                'verbose_name_plural': 'Compromissos de Agenda',
+                'ordering': ['freelance', 'inicio'],
+                'indexes': [models.Index(fields=['freelance', 'fim'], name='compromisso_freelance_fim_idx'), models.Index(fields=['fim', 'inicio'], name='compromisso_fim_inicio_idx'), models.Index(fields=['origem', 'objeto_id'], name='compromisso_origem_idx')],
+                'constraints': [models.UniqueConstraint(fields=('freelance', 'origem', 'objeto_id'), name='uniq_compromisso_agenda'), models.CheckConstraint(condition=models.Q(('fim__gt', models.F('inicio'))), name='compromisso_fim_apos_inicio')],
+            },
+        ),
+        migrations.RunPython(forwards_compromissos, backwards_noop),
+    ]
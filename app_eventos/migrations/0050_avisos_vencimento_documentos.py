@@ -0,0 +1,81 @@
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def forwards_avisos(apps, schema_editor):
+    """Avisos já enviados pela varredura antiga ("... vence em N dias. Doc ID: X") viram linhas do registro."""
+    Notificacao = apps.get_model('app_eventos', 'Notificacao')
+    DocumentoFreelancerEmpresa = apps.get_model('app_eventos', 'DocumentoFreelancerEmpresa')
+    AvisoVencimentoDocumento = apps.get_model('app_eventos', 'AvisoVencimentoDocumento')
+
+    padrao = re.compile(r'vence em (30|15|7) dias.*Doc ID: (\d+)')
+    avisos = {}
+    for pk, mensagem in Notificacao.objects.filter(
+        tipo='lembrete_candidatura', mensagem__contains='Doc ID:'
+    ).values_list('pk', 'mensagem').iterator():
+        encontrado = padrao.search(mensagem)
+        if encontrado:
+            avisos[(int(encontrado.group(2)), int(encontrado.group(1)))] = pk
+    vencimentos = dict(
+        DocumentoFreelancerEmpresa.objects.filter(pk__in={documento for documento, _ in avisos})
+        .values_list('pk', 'data_vencimento')
+    )
+    AvisoVencimentoDocumento.objects.bulk_create(
+        [
+            AvisoVencimentoDocumento(
+                documento_id=documento, marco=marco, data_vencimento=vencimentos[documento], notificacao_id=notificacao
+            )
+            for (documento, marco), notificacao in avisos.items()
+            if vencimentos.get(documento)
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def backwards_noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0049_agenda_freelancers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AvisoVencimentoDocumento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('marco', models.PositiveSmallIntegerField(choices=[(30, '30 dias'), (15, '15 dias'), (7, '7 dias'), (0, 'Expirado')], verbose_name='Marco (dias)')),
+                ('data_vencimento', models.DateTimeField(verbose_name='Data de Vencimento Avisada')),
+                ('enviado_em', models.DateTimeField(auto_now_add=True, verbose_name='Enviado em')),
+            ],
+            options={
+                'verbose_name': 'Aviso de Vencimento de Documento',
+                'verbose_name_plural': 'Avisos de Vencimento de Documentos',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='documentofreelancerempresa',
+            index=models.Index(fields=['status', 'data_vencimento'], name='doc_empresa_status_venc_idx'),
+        ),
+        migrations.AddField(
+            model_name='avisovencimentodocumento',
+            name='documento',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='avisos_vencimento', to='app_eventos.documentofreelancerempresa', verbose_name='Documento'),
+        ),
+        migrations.AddField(
+            model_name='avisovencimentodocumento',
+            name='notificacao',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='app_eventos.notificacao', verbose_name='Notificação'),
+        ),
+        migrations.AddConstraint(
+            model_name='avisovencimentodocumento',
+            constraint=models.UniqueConstraint(fields=('documento', 'marco', 'data_vencimento'), name='uniq_aviso_vencimento_documento'),
+        ),
+        migrations.RunPython(forwards_avisos, backwards_noop),
+    ]
@@ -0,0 +1,40 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0050_avisos_vencimento_documentos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderizacaoDocumento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash', models.CharField(max_length=64, unique=True, verbose_name='Hash do conteúdo')),
+                ('tipo', models.CharField(max_length=30, verbose_name='Tipo')),
+                ('versao', models.PositiveSmallIntegerField(default=1, verbose_name='Versão do layout')),
+                ('parametros', models.JSONField(default=dict, verbose_name='Parâmetros')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluida', 'Concluída'), ('erro', 'Erro')], default='pendente', max_length=15, verbose_name='Status')),
+                ('arquivo', models.FileField(blank=True, max_length=200, upload_to='renderizacoes/', verbose_name='Arquivo')),
+                ('tamanho', models.PositiveIntegerField(default=0, verbose_name='Tamanho (bytes)')),
+                ('erro', models.TextField(blank=True, default='', verbose_name='Erro')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('iniciado_em', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em')),
+                ('concluido_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+            ],
+            options={
+                'verbose_name': 'Renderização de Documento',
+                'verbose_name_plural': 'Renderizações de Documentos',
+                'ordering': ['-criado_em'],
+                'indexes': [models.Index(fields=['status', 'criado_em'], name='renderizacao_status_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='documentogerado',
+            name='renderizacao',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='documentos_gerados', to='app_eventos.renderizacaodocumento'),
+        ),
+    ]
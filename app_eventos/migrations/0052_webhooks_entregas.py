@@ -0,0 +1,47 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0051_renderizacao_documentos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhookglobal',
+            name='max_lote',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Acima de 1, eventos pendentes do mesmo webhook vão juntos num único envio', verbose_name='Eventos por Requisição'),
+        ),
+        migrations.AddField(
+            model_name='webhookglobal',
+            name='segredo',
+            field=models.CharField(blank=True, default='', help_text='Assina o corpo (X-Eventix-Assinatura); vazio usa WEBHOOKS_SEGREDO_PADRAO', max_length=128, verbose_name='Segredo HMAC'),
+        ),
+        migrations.CreateModel(
+            name='EntregaWebhook',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('evento', models.CharField(max_length=100, verbose_name='Evento')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Dados do Evento')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('enviando', 'Enviando'), ('entregue', 'Entregue'), ('falhou', 'Falhou')], default='pendente', max_length=20, verbose_name='Status')),
+                ('tentativas', models.PositiveIntegerField(default=0, verbose_name='Tentativas')),
+                ('proxima_tentativa', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próxima Tentativa')),
+                ('claim_token', models.CharField(blank=True, default='', max_length=36, verbose_name='Lote do Worker')),
+                ('reservado_ate', models.DateTimeField(blank=True, null=True, verbose_name='Reservado Até')),
+                ('status_http', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Última Resposta HTTP')),
+                ('ultimo_erro', models.TextField(blank=True, default='', verbose_name='Último Erro')),
+                ('data_criacao', models.DateTimeField(auto_now_add=True, verbose_name='Data de Criação')),
+                ('data_entrega', models.DateTimeField(blank=True, null=True, verbose_name='Data de Entrega')),
+                ('webhook', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entregas', to='app_eventos.webhookglobal', verbose_name='Webhook')),
+            ],
+            options={
+                'verbose_name': 'Entrega de Webhook',
+                'verbose_name_plural': 'Entregas de Webhooks',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'proxima_tentativa'], name='app_eventos_status_755e5f_idx'), models.Index(fields=['claim_token'], name='app_eventos_claim_t_293070_idx')],
+            },
+        ),
+    ]
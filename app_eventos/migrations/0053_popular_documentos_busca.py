@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def popular_documentos_busca(apps, schema_editor):
+    # Carga inicial do índice criado na 0045: sem ela a busca e o filtro por
+    # cidade não encontram nada até alguém rodar reindexar_busca
+    from app_eventos.services.busca import reindexar
+
+    reindexar(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_eventos', '0052_webhooks_entregas'),
+    ]
+
+    operations = [
+        migrations.RunPython(popular_documentos_busca, migrations.RunPython.noop),
+    ]
@@ -36,6 +36,7 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from django.db.models import Q, F
+from django.db.models.functions import Coalesce
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 
@@ -280,11 +281,13 @@ class User(AbstractUser):
         Para freelancers, sempre retorna a Eventix.
         Para usuários de empresa, retorna sua empresa contratante.
         """
+        from app_eventos.services.cache_acesso import empresa_do_usuario, empresa_eventix
+
         if self.is_freelancer:
             # Sempre retorna a Eventix para freelancers
-            return EmpresaContratante.objects.filter(nome_fantasia__icontains='Eventix').first()
+            return empresa_eventix()
         elif self.is_empresa_user:
-            return self.empresa_contratante
+            return empresa_do_usuario(self)
         return None
 
     @property
@@ -338,11 +341,8 @@ class User(AbstractUser):
         if self.is_superuser:
             return True
         
-        grupos_ativos = self.get_grupos_ativos()
-        for usuario_grupo in grupos_ativos:
-            if usuario_grupo.grupo.tem_permissao(codigo_permissao):
-                return True
-        return False
+        from app_eventos.services.cache_acesso import permissoes_usuario
+        return codigo_permissao in permissoes_usuario(self)
     
     def adicionar_ao_grupo(self, grupo, ativo=True):
         """Adiciona o usuário a um grupo"""
@@ -367,13 +367,9 @@ class User(AbstractUser):
             return False
     
     def get_permissoes(self):
-        """Retorna todas as permissões do usuário através dos grupos"""
-        permissoes = set()
-        grupos_ativos = self.get_grupos_ativos()
-        for usuario_grupo in grupos_ativos:
-            for permissao in usuario_grupo.grupo.permissoes.filter(ativo=True):
-                permissoes.add(permissao.codigo)
-        return list(permissoes)
+        """Retorna todas as permissões do usuário através dos grupos (cacheadas)"""
+        from app_eventos.services.cache_acesso import permissoes_usuario
+        return list(permissoes_usuario(self))
 
 
 class PermissaoSistema(models.Model):
@@ -809,7 +805,36 @@ class Empresa(models.Model):
         return self.nome
 
 
-class LocalEvento(models.Model):
+class CoordenadasGeograficas(models.Model):
+    """
+    Coordenadas (centroide do CEP/cidade ou informadas) e geohash para busca por raio.
+
+    Preenchidas no pre_save a partir da tabela offline de centroides
+    (ver app_eventos/services/geo.py); ``coordenadas_origem='manual'`` impede
+    que o endereço sobrescreva coordenadas informadas (ex.: GPS do app).
+    """
+    ORIGEM_COORDENADAS_CHOICES = [
+        ('cep', 'CEP'),
+        ('cidade', 'Cidade'),
+        ('manual', 'Manual'),
+    ]
+
+    latitude = models.DecimalField(max_digits=10, decimal_places=8, null=True, blank=True, verbose_name="Latitude")
+    longitude = models.DecimalField(max_digits=11, decimal_places=8, null=True, blank=True, verbose_name="Longitude")
+    geohash = models.CharField(max_length=12, blank=True, default='', db_index=True, verbose_name="Geohash")
+    coordenadas_origem = models.CharField(
+        max_length=10,
+        choices=ORIGEM_COORDENADAS_CHOICES,
+        blank=True,
+        default='',
+        verbose_name="Origem das Coordenadas"
+    )
+
+    class Meta:
+        abstract = True
+
+
+class LocalEvento(CoordenadasGeograficas):
     nome                 = models.CharField(max_length=200)
     endereco             = models.CharField(max_length=255)
     capacidade           = models.IntegerField()
@@ -826,6 +851,66 @@ class LocalEvento(models.Model):
         return f"{self.nome} - {self.empresa_proprietaria.nome}"
 
 
+class EventoQuerySet(models.QuerySet):
+    """QuerySet de Evento com os agregados de fluxo de caixa."""
+
+    def com_resumo_financeiro(self):
+        """
+        Anota cada evento com os totais de despesas/receitas (geral, realizado,
+        pendente e atrasados) numa única consulta.
+
+        Cada agregado é uma subconsulta correlacionada por evento, então
+        despesas e receitas não se multiplicam no JOIN. As properties de
+        fluxo de caixa do modelo reaproveitam esses valores quando presentes.
+        """
+        hoje = timezone.now().date()
+        atrasado = Q(status='pendente', data_vencimento__lt=hoje)
+        valor = models.DecimalField(max_digits=14, decimal_places=2)
+
+        def soma(modelo, filtro=None):
+            qs = modelo.objects.filter(evento=models.OuterRef('pk'))
+            if filtro is not None:
+                qs = qs.filter(filtro)
+            qs = qs.order_by().values('evento').annotate(total=models.Sum('valor')).values('total')
+            return Coalesce(
+                models.Subquery(qs, output_field=valor), models.Value(0), output_field=valor
+            )
+
+        def contagem(modelo, filtro):
+            qs = (
+                modelo.objects.filter(filtro, evento=models.OuterRef('pk'))
+                .order_by().values('evento').annotate(total=models.Count('pk')).values('total')
+            )
+            return Coalesce(
+                models.Subquery(qs, output_field=models.IntegerField()), models.Value(0)
+            )
+
+        return self.annotate(
+            resumo_total_despesas=soma(DespesaEvento),
+            resumo_total_receitas=soma(ReceitaEvento),
+            resumo_despesas_pagas=soma(DespesaEvento, Q(status='pago')),
+            resumo_receitas_recebidas=soma(ReceitaEvento, Q(status='recebido')),
+            resumo_despesas_pendentes=soma(DespesaEvento, Q(status='pendente')),
+            resumo_receitas_pendentes=soma(ReceitaEvento, Q(status='pendente')),
+            resumo_despesas_atrasadas=contagem(DespesaEvento, atrasado),
+            resumo_receitas_atrasadas=contagem(ReceitaEvento, atrasado),
+        )
+
+    def totais_financeiros(self):
+        """Soma, no banco, os totais de todos os eventos do queryset."""
+        qs = self if 'resumo_total_despesas' in self.query.annotations else self.com_resumo_financeiro()
+        totais = qs.aggregate(
+            total_despesas=models.Sum('resumo_total_despesas'),
+            total_receitas=models.Sum('resumo_total_receitas'),
+            despesas_pagas=models.Sum('resumo_despesas_pagas'),
+            receitas_recebidas=models.Sum('resumo_receitas_recebidas'),
+        )
+        totais = {chave: v or 0 for chave, v in totais.items()}
+        totais['saldo_financeiro'] = totais['total_receitas'] - totais['total_despesas']
+        totais['saldo_realizado'] = totais['receitas_recebidas'] - totais['despesas_pagas']
+        return totais
+
+
 class Evento(models.Model):
     """
     Modelo para eventos do sistema.
@@ -858,6 +943,8 @@ class Evento(models.Model):
     ativo         = models.BooleanField(default=True)
     data_criacao  = models.DateTimeField(auto_now_add=True, null=True, blank=True)
 
+    objects = EventoQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Evento"
         verbose_name_plural = "Eventos"
@@ -870,19 +957,27 @@ class Evento(models.Model):
         return f"{self.nome} - {empresa}"
     
     # Métodos para fluxo de caixa
+    # Quando o evento vem de Evento.objects.com_resumo_financeiro(), os valores
+    # já estão anotados (resumo_*) e nenhuma consulta extra é feita.
+    def _resumo(self, nome, calcular):
+        anotado = self.__dict__.get(f'resumo_{nome}')
+        if anotado is not None:
+            return anotado
+        return calcular()
+
     @property
     def total_despesas(self):
         """Retorna o total de despesas do evento"""
-        return self.despesas.aggregate(
+        return self._resumo('total_despesas', lambda: self.despesas.aggregate(
             total=models.Sum('valor')
-        )['total'] or 0
+        )['total'] or 0)
     
     @property
     def total_receitas(self):
         """Retorna o total de receitas do evento"""
-        return self.receitas.aggregate(
+        return self._resumo('total_receitas', lambda: self.receitas.aggregate(
             total=models.Sum('valor')
-        )['total'] or 0
+        )['total'] or 0)
     
     @property
     def saldo_financeiro(self):
@@ -892,16 +987,16 @@ class Evento(models.Model):
     @property
     def despesas_pagas(self):
         """Retorna o total de despesas pagas"""
-        return self.despesas.filter(status='pago').aggregate(
+        return self._resumo('despesas_pagas', lambda: self.despesas.filter(status='pago').aggregate(
             total=models.Sum('valor')
-        )['total'] or 0
+        )['total'] or 0)
     
     @property
     def receitas_recebidas(self):
         """Retorna o total de receitas recebidas"""
-        return self.receitas.filter(status='recebido').aggregate(
+        return self._resumo('receitas_recebidas', lambda: self.receitas.filter(status='recebido').aggregate(
             total=models.Sum('valor')
-        )['total'] or 0
+        )['total'] or 0)
     
     @property
     def saldo_realizado(self):
@@ -911,16 +1006,16 @@ class Evento(models.Model):
     @property
     def despesas_pendentes(self):
         """Retorna o total de despesas pendentes"""
-        return self.despesas.filter(status='pendente').aggregate(
+        return self._resumo('despesas_pendentes', lambda: self.despesas.filter(status='pendente').aggregate(
             total=models.Sum('valor')
-        )['total'] or 0
+        )['total'] or 0)
     
     @property
     def receitas_pendentes(self):
         """Retorna o total de receitas pendentes"""
-        return self.receitas.filter(status='pendente').aggregate(
+        return self._resumo('receitas_pendentes', lambda: self.receitas.filter(status='pendente').aggregate(
             total=models.Sum('valor')
-        )['total'] or 0
+        )['total'] or 0)
     
     @property
     def despesas_atrasadas(self):
@@ -936,7 +1031,17 @@ class Evento(models.Model):
         return self.receitas.filter(
             status='pendente',
             data_vencimento__lt=timezone.now().date()
-        ) 
+        )
+
+    @property
+    def despesas_atrasadas_count(self):
+        """Retorna a quantidade de despesas atrasadas"""
+        return self._resumo('despesas_atrasadas', self.despesas_atrasadas.count)
+
+    @property
+    def receitas_atrasadas_count(self):
+        """Retorna a quantidade de receitas atrasadas"""
+        return self._resumo('receitas_atrasadas', self.receitas_atrasadas.count)
 
 class EventoFreelancerInfo(models.Model):
     """
@@ -1260,7 +1365,7 @@ class SetorEvento(models.Model):
 from .models_pagamento_freelancers import DIA_SEMANA_FECHAMENTO_CHOICES
 
 
-class PontoOperacao(models.Model):
+class PontoOperacao(CoordenadasGeograficas):
     """
     Estabelecimento fixo da empresa contratante (um por tenant).
     Ex.: restaurante, operação diária. Vagas podem ser criadas no ponto sem evento nem setor.
@@ -1682,6 +1787,11 @@ class Vaga(models.Model):
                 name='vaga_evento_ou_ponto_operacao'
             ),
         ]
+        indexes = [
+            # Feed / paginação por cursor: (data_criacao, id) decrescente
+            models.Index(fields=['ativa', '-data_criacao', '-id']),
+            models.Index(fields=['empresa_contratante', '-data_criacao', '-id']),
+        ]
     
     def __str__(self):
         if self.ponto_operacao:
@@ -1725,17 +1835,36 @@ class Vaga(models.Model):
         """Verifica se um freelancer pode se candidatar a esta vaga"""
         return self.esta_aberta_candidatura and self.tem_vagas_disponiveis
     
+    def reservar_preenchida(self):
+        """
+        Reserva uma posição com UPDATE condicional no banco (sem lock de linha):
+        quantidade_preenchida = quantidade_preenchida + 1 WHERE quantidade_preenchida < quantidade.
+
+        Retorna True se reservou, False se a vaga já estava completa.
+        """
+        reservou = Vaga.objects.filter(
+            pk=self.pk, quantidade_preenchida__lt=F('quantidade')
+        ).update(quantidade_preenchida=F('quantidade_preenchida') + 1) == 1
+        if reservou:
+            self.quantidade_preenchida = min(self.quantidade_preenchida + 1, self.quantidade)
+        return reservou
+    
+    def liberar_preenchida(self):
+        """Libera uma posição reservada (UPDATE condicional, nunca abaixo de zero)."""
+        liberou = Vaga.objects.filter(
+            pk=self.pk, quantidade_preenchida__gt=0
+        ).update(quantidade_preenchida=F('quantidade_preenchida') - 1) == 1
+        if liberou:
+            self.quantidade_preenchida = max(self.quantidade_preenchida - 1, 0)
+        return liberou
+    
     def incrementar_preenchida(self):
         """Incrementa o contador de vagas preenchidas"""
-        if self.quantidade_preenchida < self.quantidade:
-            self.quantidade_preenchida += 1
-            self.save(update_fields=['quantidade_preenchida'])
+        return self.reservar_preenchida()
     
     def decrementar_preenchida(self):
         """Decrementa o contador de vagas preenchidas"""
-        if self.quantidade_preenchida > 0:
-            self.quantidade_preenchida -= 1
-            self.save(update_fields=['quantidade_preenchida'])
+        return self.liberar_preenchida()
     
     def clean(self):
         from django.core.exceptions import ValidationError
@@ -1770,7 +1899,7 @@ class Vaga(models.Model):
         return "—"
 
 
-class Freelance(models.Model):
+class Freelance(CoordenadasGeograficas):
     VINCULO_CHOICES = [
         ('intermitente', 'Intermitente'),
         ('freelancer', 'Freelancer'),
@@ -2091,6 +2220,10 @@ class Candidatura(models.Model):
                 name='nota_empresa_range'
             ),
         ]
+        indexes = [
+            models.Index(fields=['freelance', '-data_candidatura', '-id']),
+            models.Index(fields=['-data_candidatura', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.freelance.nome_completo} → {self.vaga.titulo} ({self.get_status_display()})"
@@ -2113,24 +2246,56 @@ class Candidatura(models.Model):
         """Verifica se a candidatura pode ser cancelada"""
         return self.status in ['pendente', 'em_analise']
     
-    def aprovar(self, usuario_aprovador=None):
-        """Aprova a candidatura"""
+    def aprovar(self, usuario_aprovador=None, levantar_conflito=False):
+        """
+        Aprova a candidatura
+
+        Retorna False se ela já foi respondida, se a vaga lotou ou se o freelancer
+        tem conflito de agenda (com ``levantar_conflito`` o ConflitoAgenda sobe,
+        para a view mostrar o horário em conflito).
+        """
         if self.pode_ser_aprovada:
+            from django.db import transaction
             from django.utils import timezone
-            self.status = 'aprovado'
-            self.data_resposta = timezone.now()
-            self.analisado_por = usuario_aprovador
-            self.save()
-            
-            # Incrementa contador de vagas preenchidas
-            self.vaga.incrementar_preenchida()
-            
-            # Cria contrato automaticamente
-            ContratoFreelance.objects.get_or_create(
-                freelance=self.freelance,
-                vaga=self.vaga,
-                defaults={'status': 'ativo'}
-            )
+            from app_eventos.services.agenda_freelancer import ConflitoAgenda, garantir_disponibilidade, janela_vaga
+            from app_eventos.services.outbox_notificacoes import registrar_evento
+            from app_eventos.signals_metricas import estado_salvo, lembrar_estado_anterior
+            with transaction.atomic():
+                # Freelancer já comprometido no mesmo horário (outra vaga ou turno)
+                try:
+                    garantir_disponibilidade(self.freelance_id, janela_vaga(self.vaga), ignorar=('vaga', self.vaga_id))
+                except ConflitoAgenda:
+                    if levantar_conflito:
+                        raise
+                    return False
+                # Assume a transição com UPDATE condicional: aprovações simultâneas da
+                # mesma candidatura não reservam duas posições
+                agora = timezone.now()
+                anterior = estado_salvo(Candidatura, self.pk)
+                assumiu = Candidatura.objects.filter(
+                    pk=self.pk, status__in=['pendente', 'em_analise']
+                ).update(status='aprovado', data_resposta=agora, analisado_por=usuario_aprovador)
+                if not assumiu:
+                    return False
+                # Reserva atômica da posição: aprovações concorrentes não passam do limite
+                if not self.vaga.reservar_preenchida():
+                    transaction.set_rollback(True)  # devolve a candidatura ao status anterior
+                    return False
+                self.status = 'aprovado'
+                self.data_resposta = agora
+                self.analisado_por = usuario_aprovador
+                # O banco já está 'aprovado': o pre_save não vê a mudança, então o aviso
+                # e o estado anterior das métricas vêm de antes do UPDATE
+                registrar_evento('status_candidatura', candidatura_id=self.pk, status='aprovado')
+                lembrar_estado_anterior(self, anterior)
+                self.save()
+                
+                # Cria contrato automaticamente
+                ContratoFreelance.objects.get_or_create(
+                    freelance=self.freelance,
+                    vaga=self.vaga,
+                    defaults={'status': 'ativo'}
+                )
             return True
         return False
     
@@ -2177,6 +2342,11 @@ class ContratoFreelance(models.Model):
         ('cancelado', 'Cancelado'),
     ], default='ativo')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['freelance', '-data_contratacao', '-id']),
+        ]
+
     def __str__(self):
         return f"{self.freelance} contratado para {self.vaga} ({self.status})"
 
@@ -2469,6 +2639,13 @@ class DocumentoGerado(models.Model):
     titulo = models.CharField(max_length=200)
     conteudo = models.TextField()
     arquivo = models.FileField(upload_to='documentos/gerados/', blank=True, null=True)
+    renderizacao = models.ForeignKey(
+        'RenderizacaoDocumento',
+        on_delete=models.SET_NULL,
+        related_name="documentos_gerados",
+        null=True,
+        blank=True
+    )
     variaveis_utilizadas = models.JSONField(default=dict)
     gerado_por = models.ForeignKey(
         User,
@@ -2705,6 +2882,9 @@ class Insumo(models.Model):
     preco_unitario = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     estoque_minimo = models.PositiveIntegerField(default=0, verbose_name="Estoque Mínimo")
     estoque_atual = models.PositiveIntegerField(default=0, verbose_name="Estoque Atual")
+    # Saldos desnormalizados (soma de InsumoEvento), mantidos pelo livro-razão (models_estoque.py)
+    quantidade_alocada_eventos = models.PositiveIntegerField(default=0, verbose_name="Quantidade Alocada em Eventos")
+    quantidade_utilizada_eventos = models.PositiveIntegerField(default=0, verbose_name="Quantidade Utilizada em Eventos")
     local_armazenamento = models.CharField(max_length=200, blank=True, null=True)
     data_validade = models.DateField(blank=True, null=True)
     foto = models.ImageField(upload_to='insumos/fotos/', blank=True, null=True)
@@ -2734,40 +2914,22 @@ class Insumo(models.Model):
     def alocar_para_evento(self, evento, quantidade, responsavel=None):
         """
         Aloca uma quantidade do estoque geral para um evento específico.
-        Cria ou atualiza o InsumoEvento correspondente.
+        Cria ou atualiza o InsumoEvento correspondente e registra a movimentação.
         """
-        if quantidade > self.estoque_disponivel:
+        from app_eventos.services.estoque_insumos import EstoqueInsuficiente, alocar_para_evento
+
+        try:
+            return True, alocar_para_evento(self, evento, quantidade, responsavel)
+        except EstoqueInsuficiente:
             return False, "Estoque insuficiente"
-        
-        insumo_evento, created = InsumoEvento.objects.get_or_create(
-            evento=evento,
-            insumo=self,
-            defaults={
-                'quantidade_alocada_evento': quantidade,
-                'responsavel_alocacao': responsavel
-            }
-        )
-        
-        if not created:
-            insumo_evento.quantidade_alocada_evento += quantidade
-            insumo_evento.responsavel_alocacao = responsavel
-        
-        insumo_evento.save()
-        return True, insumo_evento
     
     def get_quantidade_alocada_eventos(self):
-        """Retorna a quantidade total alocada para todos os eventos"""
-        return sum(
-            ie.quantidade_alocada_evento 
-            for ie in self.eventos_utilizacao.all()
-        )
+        """Retorna a quantidade total alocada para todos os eventos (saldo desnormalizado)"""
+        return self.quantidade_alocada_eventos
     
     def get_quantidade_utilizada_eventos(self):
-        """Retorna a quantidade total utilizada em todos os eventos"""
-        return sum(
-            ie.quantidade_utilizada_evento 
-            for ie in self.eventos_utilizacao.all()
-        )
+        """Retorna a quantidade total utilizada em todos os eventos (saldo desnormalizado)"""
+        return self.quantidade_utilizada_eventos
     
     @property
     def estoque_real_disponivel(self):
@@ -2899,25 +3061,25 @@ class InsumoSetor(models.Model):
         """Retorna a quantidade que não foi utilizada no setor"""
         return max(0, self.quantidade_alocada - self.quantidade_utilizada)
     
-    def alocar_quantidade(self, quantidade):
+    def alocar_quantidade(self, quantidade, responsavel=None):
         """Aloca uma quantidade do estoque do evento para este setor"""
-        if quantidade <= self.insumo_evento.quantidade_disponivel_distribuicao:
-            self.quantidade_alocada += quantidade
-            self.insumo_evento.quantidade_distribuida_setores += quantidade
-            self.insumo_evento.save()
-            self.save()
-            return True
-        return False
+        from app_eventos.services.estoque_insumos import EstoqueInsuficiente, alocar_para_setor
+
+        try:
+            alocar_para_setor(self, quantidade, responsavel)
+        except EstoqueInsuficiente:
+            return False
+        return True
     
-    def registrar_utilizacao(self, quantidade):
+    def registrar_utilizacao(self, quantidade, responsavel=None):
         """Registra a utilização de uma quantidade no setor"""
-        if quantidade <= self.quantidade_alocada:
-            self.quantidade_utilizada += quantidade
-            self.insumo_evento.quantidade_utilizada_evento += quantidade
-            self.insumo_evento.save()
-            self.save()
-            return True
-        return False
+        from app_eventos.services.estoque_insumos import EstoqueInsuficiente, registrar_utilizacao
+
+        try:
+            registrar_utilizacao(self, quantidade, responsavel)
+        except EstoqueInsuficiente:
+            return False
+        return True
     
     @property
     def quantidade_transporte_pendente(self):
@@ -5338,7 +5500,7 @@ from .models_operacao_continua import (
 from .models_tarifa_diaria_turno import DataCalendarioTarifa, TarifaDiariaPorFuncaoPonto
 
 # Importar modelos de notificação
-from .models_notificacoes import Notificacao, ConfiguracaoNotificacao
+from .models_notificacoes import Notificacao, ConfiguracaoNotificacao, NotificacaoOutbox
 
 # Importar modelos de freelancers
 from .models_freelancers import *
@@ -5347,7 +5509,28 @@ from .models_freelancers import *
 from .models_documentos import *
 
 # Importar modelos de Twilio (WhatsApp + SMS)
-from .models_twilio import UserContact, OtpLog, BroadcastLog, BroadcastMessage
+from .models_twilio import UserContact, OtpLog, BroadcastLog, BroadcastMessage, BroadcastOutbox
 
 # Grupo empresarial (vários CNPJs; gestores do grupo)
-from .models_grupo_empresarial import GrupoEmpresarial
\ No newline at end of file
+from .models_grupo_empresarial import GrupoEmpresarial
+
+# Métricas materializadas dos dashboards (por empresa)
+from .models_metricas import MetricasEmpresa
+
+# Documentos de busca (full-text) de vagas, eventos e freelancers
+from .models_busca import DocumentoBusca
+
+# Livro-razão de movimentações de estoque dos insumos
+from .models_estoque import MovimentacaoInsumo
+
+# Exportações de dados geradas em segundo plano
+from .models_exportacao import ExportacaoDados
+
+# Agenda de compromissos dos freelancers (índice de intervalos)
+from .models_agenda import CompromissoAgenda
+
+# PDFs endereçados por conteúdo (contratos, documentos gerados)
+from .models_renderizacao import RenderizacaoDocumento
+
+# Entregas assíncronas dos webhooks globais
+from .models_webhooks import EntregaWebhook
@@ -0,0 +1,49 @@
+"""
+Agenda de compromissos dos freelancers (índice de intervalos).
+
+Uma linha por compromisso que ocupa o freelancer num intervalo [inicio, fim):
+- ``vaga``: contrato ativo ou candidatura aprovada/contratada numa vaga com
+  data de trabalho (``objeto_id`` = id da vaga; contrato e candidatura da mesma
+  vaga são um único compromisso);
+- ``alocacao``: alocação não cancelada num turno operacional (``objeto_id`` =
+  id da AlocacaoTurno).
+
+As linhas são mantidas pelos signals de signals_agenda.py e consultadas por
+app_eventos/services/agenda_freelancer.py (conflitos, freelancers livres,
+pontuação de disponibilidade no matching).
+"""
+from django.db import models
+
+
+class CompromissoAgenda(models.Model):
+    ORIGEM_CHOICES = [
+        ('vaga', 'Vaga'),
+        ('alocacao', 'Alocação em turno'),
+    ]
+
+    freelance = models.ForeignKey(
+        'Freelance', on_delete=models.CASCADE, related_name='compromissos_agenda', verbose_name="Freelancer"
+    )
+    origem = models.CharField(max_length=10, choices=ORIGEM_CHOICES, verbose_name="Origem")
+    objeto_id = models.PositiveBigIntegerField(verbose_name="ID do objeto")
+    inicio = models.DateTimeField(verbose_name="Início")
+    fim = models.DateTimeField(verbose_name="Fim")
+    atualizado_em = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Compromisso de Agenda"
+        verbose_name_plural = "Compromissos de Agenda"
+        ordering = ['freelance', 'inicio']
+        constraints = [
+            models.UniqueConstraint(fields=['freelance', 'origem', 'objeto_id'], name='uniq_compromisso_agenda'),
+            models.CheckConstraint(check=models.Q(fim__gt=models.F('inicio')), name='compromisso_fim_apos_inicio'),
+        ]
+        indexes = [
+            # Sobreposição com [a, b): fim > a AND inicio < b — compromissos futuros são poucos
+            models.Index(fields=['freelance', 'fim'], name='compromisso_freelance_fim_idx'),
+            models.Index(fields=['fim', 'inicio'], name='compromisso_fim_inicio_idx'),
+            models.Index(fields=['origem', 'objeto_id'], name='compromisso_origem_idx'),
+        ]
+
+    def __str__(self):
+        return f"Freelancer #{self.freelance_id}: {self.inicio:%d/%m/%Y %H:%M} – {self.fim:%d/%m/%Y %H:%M}"
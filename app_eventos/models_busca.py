@@ -0,0 +1,36 @@
+"""
+Documento de busca desnormalizado por Vaga, Evento e Freelance.
+
+Cada linha junta num texto só (minúsculo e sem acentos) os campos pesquisáveis
+do objeto e dos relacionados (função, setor, evento, local, ponto de operação),
+além da cidade normalizada. Os índices de texto são criados na migração conforme
+o banco: GIN (to_tsvector + pg_trgm) no Postgres, tabela FTS5 no SQLite.
+
+Mantido pelos signals em signals_busca.py e reconstruído pelo comando
+``reindexar_busca`` (ver app_eventos/services/busca.py).
+"""
+from django.db import models
+
+
+class DocumentoBusca(models.Model):
+    TIPO_CHOICES = [
+        ('vaga', 'Vaga'),
+        ('evento', 'Evento'),
+        ('freelance', 'Freelancer'),
+    ]
+
+    tipo = models.CharField(max_length=10, choices=TIPO_CHOICES, verbose_name="Tipo")
+    objeto_id = models.BigIntegerField(verbose_name="ID do Objeto")
+    texto = models.TextField(blank=True, default='', verbose_name="Texto Pesquisável")
+    cidade = models.CharField(max_length=255, blank=True, default='', verbose_name="Cidade (normalizada)")
+    atualizado_em = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
+
+    class Meta:
+        verbose_name = "Documento de Busca"
+        verbose_name_plural = "Documentos de Busca"
+        constraints = [
+            models.UniqueConstraint(fields=['tipo', 'objeto_id'], name='documento_busca_tipo_objeto_unico'),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} #{self.objeto_id}"
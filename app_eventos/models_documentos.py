@@ -115,6 +115,10 @@ class DocumentoFreelancerEmpresa(models.Model):
         verbose_name = "Documento do Freelancer por Empresa"
         verbose_name_plural = "Documentos dos Freelancers por Empresa"
         unique_together = ('empresa_contratante', 'freelancer', 'tipo_documento')
+        indexes = [
+            # Varredura de vencimentos (services/vencimento_documentos.py)
+            models.Index(fields=['status', 'data_vencimento'], name='doc_empresa_status_venc_idx'),
+        ]
     
     def __str__(self):
         return f"{self.get_tipo_documento_display()} - {self.freelancer.usuario.username} - {self.empresa_contratante.nome_fantasia}"
@@ -271,3 +275,50 @@ class ReutilizacaoDocumento(models.Model):
     
     def __str__(self):
         return f"Reutilização - {self.documento_original.get_tipo_documento_display()} - {self.vaga_utilizada.titulo}"
+
+
+class AvisoVencimentoDocumento(models.Model):
+    """
+    Registro dos avisos de vencimento já enviados (um por documento, marco e data de vencimento)
+
+    A varredura diária usa esta tabela como anti-join: só recebe aviso quem ainda
+    não tem linha para o marco. Renovar o documento (nova data de vencimento)
+    libera um novo ciclo de avisos.
+    """
+    MARCO_EXPIRADO = 0
+    MARCO_CHOICES = [
+        (30, '30 dias'),
+        (15, '15 dias'),
+        (7, '7 dias'),
+        (MARCO_EXPIRADO, 'Expirado'),
+    ]
+
+    documento = models.ForeignKey(
+        DocumentoFreelancerEmpresa,
+        on_delete=models.CASCADE,
+        related_name="avisos_vencimento",
+        verbose_name="Documento"
+    )
+    marco = models.PositiveSmallIntegerField(choices=MARCO_CHOICES, verbose_name="Marco (dias)")
+    data_vencimento = models.DateTimeField(verbose_name="Data de Vencimento Avisada")
+    notificacao = models.ForeignKey(
+        'app_eventos.Notificacao',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Notificação"
+    )
+    enviado_em = models.DateTimeField(auto_now_add=True, verbose_name="Enviado em")
+
+    class Meta:
+        verbose_name = "Aviso de Vencimento de Documento"
+        verbose_name_plural = "Avisos de Vencimento de Documentos"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['documento', 'marco', 'data_vencimento'], name='uniq_aviso_vencimento_documento'
+            ),
+        ]
+
+    def __str__(self):
+        return f"Aviso {self.get_marco_display()} - documento #{self.documento_id}"
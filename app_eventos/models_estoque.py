@@ -0,0 +1,59 @@
+"""
+Livro-razão de movimentações de estoque dos insumos.
+
+Cada entrada, alocação (para evento ou setor), utilização, devolução e ajuste
+gera uma linha que nunca é alterada. Os saldos correntes ficam desnormalizados
+em Insumo, InsumoEvento e InsumoSetor e são atualizados na mesma transação,
+com UPDATE condicional (ver app_eventos/services/estoque_insumos.py);
+o comando ``reconciliar_estoque_insumos`` corrige qualquer deriva.
+"""
+from django.conf import settings
+from django.db import models
+
+
+class MovimentacaoInsumo(models.Model):
+    TIPO_CHOICES = [
+        ('entrada', 'Entrada'),
+        ('alocacao', 'Alocação'),
+        ('utilizacao', 'Utilização'),
+        ('devolucao', 'Devolução'),
+        ('ajuste', 'Ajuste'),
+    ]
+
+    insumo = models.ForeignKey(
+        'Insumo', on_delete=models.CASCADE, related_name='movimentacoes', verbose_name="Insumo"
+    )
+    insumo_evento = models.ForeignKey(
+        'InsumoEvento', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='movimentacoes', verbose_name="Insumo do Evento"
+    )
+    insumo_setor = models.ForeignKey(
+        'InsumoSetor', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='movimentacoes', verbose_name="Insumo do Setor"
+    )
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES, verbose_name="Tipo")
+    quantidade = models.IntegerField(
+        verbose_name="Quantidade", help_text="Sempre positiva, exceto em ajustes (com sinal)"
+    )
+    responsavel = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='movimentacoes_insumos', verbose_name="Responsável"
+    )
+    observacao = models.TextField(blank=True, default='', verbose_name="Observação")
+    criado_em = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+
+    class Meta:
+        verbose_name = "Movimentação de Insumo"
+        verbose_name_plural = "Movimentações de Insumos"
+        ordering = ['-criado_em', '-id']
+        indexes = [
+            models.Index(fields=['insumo', 'criado_em'], name='mov_insumo_insumo_data_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} {self.quantidade} - insumo #{self.insumo_id}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Movimentações de estoque não podem ser alteradas; registre um ajuste.")
+        super().save(*args, **kwargs)
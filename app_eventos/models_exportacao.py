@@ -0,0 +1,52 @@
+"""
+Exportações de dados geradas em segundo plano.
+
+Exportações grandes são pedidas com ``assincrono`` na API: a linha nasce
+``pendente``, o comando ``processar_exportacoes`` gera o arquivo em
+MEDIA_ROOT/exportacoes/ (em fluxo, sem carregar a tabela em memória) e o
+cliente acompanha/baixa pelo ``token``. Ver app_eventos/services/exportacao.py.
+"""
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class ExportacaoDados(models.Model):
+    STATUS_CHOICES = [
+        ('pendente', 'Pendente'),
+        ('processando', 'Processando'),
+        ('concluida', 'Concluída'),
+        ('erro', 'Erro'),
+    ]
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False, verbose_name="Token")
+    tipo = models.CharField(max_length=30, verbose_name="Tipo")
+    formato = models.CharField(max_length=10, verbose_name="Formato")
+    colunas = models.JSONField(default=list, blank=True, verbose_name="Colunas")
+    solicitado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        related_name='exportacoes', verbose_name="Solicitado por"
+    )
+    empresa_contratante = models.ForeignKey(
+        'EmpresaContratante', on_delete=models.CASCADE, null=True, blank=True,
+        related_name='exportacoes', verbose_name="Empresa Contratante"
+    )
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='pendente', verbose_name="Status")
+    arquivo = models.FileField(upload_to='exportacoes/%Y/%m/', blank=True, verbose_name="Arquivo")
+    total_linhas = models.PositiveIntegerField(default=0, verbose_name="Total de Linhas")
+    erro = models.TextField(blank=True, default='', verbose_name="Erro")
+    criado_em = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+    iniciado_em = models.DateTimeField(null=True, blank=True, verbose_name="Iniciado em")
+    concluido_em = models.DateTimeField(null=True, blank=True, verbose_name="Concluído em")
+
+    class Meta:
+        verbose_name = "Exportação de Dados"
+        verbose_name_plural = "Exportações de Dados"
+        ordering = ['-criado_em']
+        indexes = [
+            models.Index(fields=['status', 'criado_em'], name='exportacao_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo}.{self.formato} ({self.get_status_display()})"
@@ -231,6 +231,18 @@ class WebhookGlobal(ModeloGlobal):
         verbose_name="Método HTTP"
     )
     headers = models.JSONField(default=dict, blank=True, verbose_name="Headers")
+    segredo = models.CharField(
+        max_length=128,
+        blank=True,
+        default='',
+        verbose_name="Segredo HMAC",
+        help_text="Assina o corpo (X-Eventix-Assinatura); vazio usa WEBHOOKS_SEGREDO_PADRAO"
+    )
+    max_lote = models.PositiveSmallIntegerField(
+        default=1,
+        verbose_name="Eventos por Requisição",
+        help_text="Acima de 1, eventos pendentes do mesmo webhook vão juntos num único envio"
+    )
     ativo = models.BooleanField(default=True, verbose_name="Ativo")
 
     class Meta:
@@ -0,0 +1,54 @@
+"""
+Snapshot materializado das métricas de dashboard por empresa contratante.
+
+Mantido por deltas (signals em Evento, Vaga, Candidatura e ContratoFreelance)
+e corrigido periodicamente pelo comando ``reconciliar_metricas_empresa``.
+"""
+from django.db import models
+
+
+class MetricasEmpresa(models.Model):
+    """
+    Contadores agregados de uma empresa, lidos pelos dashboards em O(1).
+    """
+    empresa_contratante = models.OneToOneField(
+        'EmpresaContratante',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='metricas',
+        verbose_name="Empresa Contratante"
+    )
+
+    # Eventos
+    total_eventos = models.IntegerField(default=0)
+    eventos_ativos = models.IntegerField(default=0)
+
+    # Vagas (registros e soma de posições)
+    total_vagas = models.IntegerField(default=0)
+    vagas_ativas = models.IntegerField(default=0)
+    vagas_quantidade = models.IntegerField(default=0, help_text="Soma de Vaga.quantidade")
+    vagas_ativas_quantidade = models.IntegerField(default=0, help_text="Soma de Vaga.quantidade das vagas ativas")
+
+    # Candidaturas por status
+    total_candidaturas = models.IntegerField(default=0)
+    candidaturas_pendentes = models.IntegerField(default=0)
+    candidaturas_em_analise = models.IntegerField(default=0)
+    candidaturas_aprovadas = models.IntegerField(default=0)
+    candidaturas_rejeitadas = models.IntegerField(default=0)
+    candidaturas_canceladas = models.IntegerField(default=0)
+    candidaturas_contratadas = models.IntegerField(default=0)
+    total_freelancers = models.IntegerField(default=0, help_text="Freelancers distintos com candidatura na empresa")
+
+    # Contratos
+    total_contratos = models.IntegerField(default=0)
+    contratos_ativos = models.IntegerField(default=0)
+
+    atualizado_em = models.DateTimeField(auto_now=True)
+    reconciliado_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Métricas da Empresa"
+        verbose_name_plural = "Métricas das Empresas"
+
+    def __str__(self):
+        return f"Métricas - {self.empresa_contratante_id}"
@@ -162,3 +162,59 @@ class ConfiguracaoNotificacao(models.Model):
     
     def __str__(self):
         return f"Configurações de {self.usuario.username}"
+
+
+class NotificacaoOutbox(models.Model):
+    """
+    Fila persistente (outbox) dos eventos que geram notificações.
+
+    Os signals de candidatura, vaga, contrato e documentos só gravam aqui uma
+    linha compacta (tipo do evento + ids) em ``transaction.on_commit``; quem
+    resolve destinatários, cria as ``Notificacao`` e envia os e-mails é o
+    worker ``processar_notificacoes`` (ver app_eventos/services/outbox_notificacoes.py).
+    """
+    EVENTO_CHOICES = [
+        ('nova_candidatura', 'Nova Candidatura'),
+        ('status_candidatura', 'Mudança de Status da Candidatura'),
+        ('vaga_publicada', 'Vaga Publicada'),
+        ('contrato_criado', 'Contrato Criado'),
+        ('documento_enviado', 'Documento Enviado'),
+        ('documento_validado', 'Documento Validado'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pendente', 'Pendente'),
+        ('processando', 'Processando'),
+        ('processado', 'Processado'),
+        ('falhou', 'Falhou'),
+    ]
+
+    evento = models.CharField(max_length=30, choices=EVENTO_CHOICES, verbose_name="Evento")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Dados do Evento")
+
+    # Controle da fila
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pendente',
+        verbose_name="Status"
+    )
+    tentativas = models.PositiveIntegerField(default=0, verbose_name="Tentativas")
+    claim_token = models.CharField(max_length=36, blank=True, default='', verbose_name="Lote do Worker")
+    reservado_ate = models.DateTimeField(null=True, blank=True, verbose_name="Reservado Até")
+    ultimo_erro = models.TextField(blank=True, default='', verbose_name="Último Erro")
+
+    data_criacao = models.DateTimeField(auto_now_add=True, verbose_name="Data de Criação")
+    data_processamento = models.DateTimeField(null=True, blank=True, verbose_name="Data de Processamento")
+
+    class Meta:
+        verbose_name = "Evento de Notificação na Fila"
+        verbose_name_plural = "Fila de Notificações"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id']),
+            models.Index(fields=['claim_token']),
+        ]
+
+    def __str__(self):
+        return f"{self.evento} {self.payload} - {self.status}"
@@ -267,15 +267,29 @@ class VagaTurno(models.Model):
     def vagas_disponiveis(self):
         return self.quantidade_total - self.quantidade_preenchida
 
+    def reservar_preenchida(self):
+        """Reserva um lugar com UPDATE condicional (sem lock); False se a vaga está completa."""
+        reservou = VagaTurno.objects.filter(
+            pk=self.pk, quantidade_preenchida__lt=models.F('quantidade_total')
+        ).update(quantidade_preenchida=models.F('quantidade_preenchida') + 1) == 1
+        if reservou:
+            self.quantidade_preenchida = min(self.quantidade_preenchida + 1, self.quantidade_total)
+        return reservou
+
+    def liberar_preenchida(self):
+        """Libera um lugar reservado (UPDATE condicional, nunca abaixo de zero)."""
+        liberou = VagaTurno.objects.filter(
+            pk=self.pk, quantidade_preenchida__gt=0
+        ).update(quantidade_preenchida=models.F('quantidade_preenchida') - 1) == 1
+        if liberou:
+            self.quantidade_preenchida = max(self.quantidade_preenchida - 1, 0)
+        return liberou
+
     def incrementar_preenchida(self):
-        if self.quantidade_preenchida < self.quantidade_total:
-            self.quantidade_preenchida += 1
-            self.save(update_fields=['quantidade_preenchida'])
+        return self.reservar_preenchida()
 
     def decrementar_preenchida(self):
-        if self.quantidade_preenchida > 0:
-            self.quantidade_preenchida -= 1
-            self.save(update_fields=['quantidade_preenchida'])
+        return self.liberar_preenchida()
 
 
 class AlocacaoTurno(models.Model):
@@ -0,0 +1,52 @@
+"""
+PDFs endereçados por conteúdo (contratos de evento, documentos gerados por template).
+
+Cada linha é um PDF identificado pelo SHA-256 das entradas que o produzem
+(tipo, versão do layout e ``parametros``). Pedir de novo o mesmo documento com
+os mesmos dados reaproveita a linha e o arquivo; só um hash novo é renderizado,
+fora da requisição, por um pool de threads do processo ou pelo comando
+``processar_renderizacoes``. Ver app_eventos/services/renderizacao_pdf.py.
+"""
+from django.conf import settings
+from django.db import models
+
+
+class RenderizacaoDocumento(models.Model):
+    STATUS_CHOICES = [
+        ('pendente', 'Pendente'),
+        ('processando', 'Processando'),
+        ('concluida', 'Concluída'),
+        ('erro', 'Erro'),
+    ]
+
+    hash = models.CharField(max_length=64, unique=True, verbose_name="Hash do conteúdo")
+    tipo = models.CharField(max_length=30, verbose_name="Tipo")
+    versao = models.PositiveSmallIntegerField(default=1, verbose_name="Versão do layout")
+    parametros = models.JSONField(default=dict, verbose_name="Parâmetros")
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='pendente', verbose_name="Status")
+    arquivo = models.FileField(upload_to='renderizacoes/', max_length=200, blank=True, verbose_name="Arquivo")
+    tamanho = models.PositiveIntegerField(default=0, verbose_name="Tamanho (bytes)")
+    erro = models.TextField(blank=True, default='', verbose_name="Erro")
+    criado_em = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+    iniciado_em = models.DateTimeField(null=True, blank=True, verbose_name="Iniciado em")
+    concluido_em = models.DateTimeField(null=True, blank=True, verbose_name="Concluído em")
+
+    class Meta:
+        verbose_name = "Renderização de Documento"
+        verbose_name_plural = "Renderizações de Documentos"
+        ordering = ['-criado_em']
+        indexes = [
+            models.Index(fields=['status', 'criado_em'], name='renderizacao_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} {self.hash[:12]} ({self.get_status_display()})"
+
+    @property
+    def caminho(self) -> str:
+        """Nome do arquivo no storage, determinado só pelo hash."""
+        return f"renderizacoes/{self.hash[:2]}/{self.hash}.pdf"
+
+    @property
+    def url(self) -> str:
+        return f"{settings.MEDIA_URL}{self.caminho}" if settings.MEDIA_URL else self.caminho
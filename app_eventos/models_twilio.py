@@ -3,6 +3,7 @@ Modelos para Sistema de Notificações via Twilio (WhatsApp + SMS)
 """
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class UserContact(models.Model):
@@ -351,3 +352,102 @@ class BroadcastMessage(models.Model):
     def __str__(self):
         return f"{self.to_address} - {self.status}"
 
+
+
+class BroadcastOutbox(models.Model):
+    """
+    Fila persistente (outbox) de mensagens a enviar por WhatsApp/SMS.
+
+    As views apenas enfileiram linhas aqui e respondem com o ``BroadcastLog`` (job);
+    o envio é feito pelo worker ``processar_fila_mensagens``
+    (ver app_eventos/services/fila_mensagens.py). Ao enviar com sucesso, o worker
+    cria o ``BroadcastMessage`` correspondente, que continua a ser atualizado pelo
+    webhook de status do Twilio.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Na Fila'),
+        ('sending', 'Enviando'),
+        ('sent', 'Enviado'),
+        ('failed', 'Falhou'),
+    ]
+
+    broadcast = models.ForeignKey(
+        BroadcastLog,
+        on_delete=models.CASCADE,
+        related_name='outbox',
+        verbose_name="Broadcast"
+    )
+    idempotency_key = models.CharField(
+        max_length=64,
+        unique=True,
+        verbose_name="Chave de Idempotência",
+        help_text="Impede que a mesma mensagem seja enfileirada/enviada duas vezes"
+    )
+
+    # Destinatário e conteúdo
+    to_address = models.CharField(
+        max_length=20,
+        verbose_name="Número Destinatário"
+    )
+    body = models.TextField(verbose_name="Corpo da Mensagem")
+    channel_preferred = models.CharField(
+        max_length=20,
+        choices=BroadcastLog.CHANNEL_CHOICES,
+        default='sms',
+        verbose_name="Canal Preferencial"
+    )
+
+    # Controle da fila
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='queued',
+        verbose_name="Status"
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Tentativas")
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Próxima Tentativa"
+    )
+    claim_token = models.CharField(
+        max_length=36,
+        blank=True,
+        default='',
+        verbose_name="Lote do Worker"
+    )
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Reservado Até"
+    )
+
+    # Resultado
+    channel_used = models.CharField(
+        max_length=20,
+        choices=UserContact.CHANNEL_CHOICES,
+        blank=True,
+        default='',
+        verbose_name="Canal Utilizado"
+    )
+    message_sid = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+        verbose_name="Twilio Message SID"
+    )
+    last_error = models.TextField(blank=True, default='', verbose_name="Último Erro")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Mensagem na Fila"
+        verbose_name_plural = "Fila de Mensagens"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['claim_token']),
+        ]
+
+    def __str__(self):
+        return f"{self.to_address} - {self.status} (tentativa {self.attempts})"
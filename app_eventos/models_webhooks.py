@@ -0,0 +1,60 @@
+# app_eventos/models_webhooks.py
+from django.db import models
+from django.utils import timezone
+
+from .models_globais import WebhookGlobal
+
+
+class EntregaWebhook(models.Model):
+    """
+    Fila persistente das entregas de eventos para os ``WebhookGlobal``.
+
+    Cada linha é um evento a entregar a um webhook; quem faz o HTTP é o worker
+    ``processar_webhooks`` (ver app_eventos/services/webhooks.py), nunca o save
+    que originou o evento. ``falhou`` é a fila de mortos: esgotou as tentativas
+    ou o destino recusou definitivamente (4xx), e só volta com ``--reenviar-falhas``.
+    """
+    STATUS_CHOICES = [
+        ('pendente', 'Pendente'),
+        ('enviando', 'Enviando'),
+        ('entregue', 'Entregue'),
+        ('falhou', 'Falhou'),
+    ]
+
+    webhook = models.ForeignKey(
+        WebhookGlobal,
+        on_delete=models.CASCADE,
+        related_name='entregas',
+        verbose_name="Webhook"
+    )
+    evento = models.CharField(max_length=100, verbose_name="Evento")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Dados do Evento")
+
+    # Controle da fila
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pendente',
+        verbose_name="Status"
+    )
+    tentativas = models.PositiveIntegerField(default=0, verbose_name="Tentativas")
+    proxima_tentativa = models.DateTimeField(default=timezone.now, verbose_name="Próxima Tentativa")
+    claim_token = models.CharField(max_length=36, blank=True, default='', verbose_name="Lote do Worker")
+    reservado_ate = models.DateTimeField(null=True, blank=True, verbose_name="Reservado Até")
+    status_http = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name="Última Resposta HTTP")
+    ultimo_erro = models.TextField(blank=True, default='', verbose_name="Último Erro")
+
+    data_criacao = models.DateTimeField(auto_now_add=True, verbose_name="Data de Criação")
+    data_entrega = models.DateTimeField(null=True, blank=True, verbose_name="Data de Entrega")
+
+    class Meta:
+        verbose_name = "Entrega de Webhook"
+        verbose_name_plural = "Entregas de Webhooks"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'proxima_tentativa']),
+            models.Index(fields=['claim_token']),
+        ]
+
+    def __str__(self):
+        return f"{self.evento} -> {self.webhook_id} - {self.status}"
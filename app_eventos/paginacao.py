@@ -0,0 +1,84 @@
+"""
+Paginação por cursor (keyset) para as listagens da API.
+
+Modo opt-in: sem ``cursor`` na query a view continua com PageNumberPagination
+(``?page=N``, com ``count``). Com ``?cursor=`` (vazio na primeira página) a listagem
+passa a ser ordenada por ``(<campo>, id)`` decrescente e cada página filtra
+``WHERE (campo, id) < (último campo, último id)`` — sem COUNT(*) e sem OFFSET, então
+a página 500 custa o mesmo que a página 1. Os índices compostos correspondentes estão
+em Vaga, Candidatura e ContratoFreelance.
+
+A view define o campo com ``cursor_campo`` (padrão: ``data_criacao``).
+"""
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class PaginacaoCursorOpcional(PageNumberPagination):
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    campo_padrao = 'data_criacao'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.modo_cursor = self.cursor_query_param in request.query_params
+        if not self.modo_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.campo = getattr(view, 'cursor_campo', self.campo_padrao)
+        tamanho = self.get_page_size(request) or 20
+
+        # Ordenação estável; ignora ?ordering nesse modo
+        queryset = queryset.order_by(f'-{self.campo}', '-id')
+        posicao = self._decodificar(request.query_params.get(self.cursor_query_param), queryset.model)
+        if posicao is not None:
+            valor, pk = posicao
+            queryset = queryset.filter(Q(**{f'{self.campo}__lt': valor}) | Q(**{self.campo: valor, 'id__lt': pk}))
+
+        itens = list(queryset[:tamanho + 1])
+        self.tem_proxima = len(itens) > tamanho
+        itens = itens[:tamanho]
+        self.ultimo = itens[-1] if itens else None
+        return itens
+
+    def get_paginated_response(self, data):
+        if not self.modo_cursor:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self._url_proxima(),
+            'previous': None,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties'].pop('count', None)
+        return schema
+
+    # --- cursor ---------------------------------------------------------
+
+    def _url_proxima(self):
+        if not self.tem_proxima or self.ultimo is None:
+            return None
+        valor = getattr(self.ultimo, self.campo)
+        bruto = json.dumps({'v': valor.isoformat() if hasattr(valor, 'isoformat') else valor, 'id': self.ultimo.pk})
+        cursor = base64.urlsafe_b64encode(bruto.encode()).decode().rstrip('=')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def _decodificar(self, cursor, model):
+        if not cursor:
+            return None
+        try:
+            bruto = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+            dados = json.loads(bruto)
+            valor = model._meta.get_field(self.campo).to_python(dados['v'])
+            return valor, int(dados['id'])
+        except Exception:
+            raise NotFound('Cursor inválido.')
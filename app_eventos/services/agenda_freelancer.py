@@ -0,0 +1,263 @@
+"""
+Agenda dos freelancers: conflitos de horário e disponibilidade.
+
+Os compromissos (contratos ativos, candidaturas aprovadas e alocações em
+turnos) ficam materializados em ``CompromissoAgenda`` como intervalos
+[inicio, fim), mantidos pelos signals de signals_agenda.py. Daqui saem:
+- ``conflitos`` / ``esta_livre``: sobreposição para um freelancer, pelo índice
+  (freelance, fim) — só os compromissos que ainda não terminaram são lidos;
+- ``freelancers_livres``: queryset de freelancers sem compromisso no intervalo;
+- ``garantir_disponibilidade``: usado na aprovação de candidaturas, atribuição
+  direta e alocação em turnos; trava a linha do freelancer e levanta
+  ``ConflitoAgenda`` se o intervalo colide com outro compromisso;
+- ``AgendaFreelancers``: índice em memória (inícios ordenados + máximo
+  acumulado dos fins) carregado numa consulta e consultado com bisect, usado
+  pelo matching para pontuar muitos pares freelancer × vaga.
+
+Vagas sem ``data_inicio_trabalho`` não ocupam agenda. Sem ``data_fim_trabalho``,
+vale a duração padrão ``AGENDA_DURACAO_PADRAO_HORAS`` (8h).
+"""
+import logging
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from app_eventos.models import (
+    AlocacaoTurno,
+    Candidatura,
+    CompromissoAgenda,
+    ContratoFreelance,
+    Freelance,
+    Vaga,
+)
+
+logger = logging.getLogger(__name__)
+
+STATUS_CANDIDATURA_COMPROMETIDA = ('aprovado', 'contratado')
+STATUS_ALOCACAO_LIVRE = (AlocacaoTurno.STATUS_CANCELADO,)
+
+Janela = Tuple[datetime, datetime]
+
+
+class ConflitoAgenda(ValidationError):
+    """O freelancer já tem compromisso no intervalo pedido."""
+
+    def __init__(self, compromisso: CompromissoAgenda):
+        self.compromisso = compromisso
+        super().__init__(
+            f"O freelancer já tem compromisso entre "
+            f"{timezone.localtime(compromisso.inicio):%d/%m/%Y %H:%M} e "
+            f"{timezone.localtime(compromisso.fim):%d/%m/%Y %H:%M}."
+        )
+
+
+def _duracao_padrao() -> timedelta:
+    return timedelta(hours=getattr(settings, 'AGENDA_DURACAO_PADRAO_HORAS', 8))
+
+
+def margem_deslocamento() -> timedelta:
+    """Folga mínima desejável entre dois compromissos (pontua 'apertado' no matching)."""
+    return timedelta(hours=getattr(settings, 'AGENDA_MARGEM_HORAS', 2))
+
+
+# ---------------------------------------------------------------------------
+# Janelas
+# ---------------------------------------------------------------------------
+
+def janela_vaga(vaga: Vaga) -> Optional[Janela]:
+    inicio = vaga.data_inicio_trabalho
+    if inicio is None:
+        return None
+    fim = vaga.data_fim_trabalho
+    if fim is None or fim <= inicio:
+        fim = inicio + _duracao_padrao()
+    return inicio, fim
+
+
+def janela_turno(turno) -> Janela:
+    """Turno em horário local; ``hora_fim`` menor ou igual ao início atravessa a meia-noite."""
+    inicio = timezone.make_aware(datetime.combine(turno.data, turno.hora_inicio))
+    fim = timezone.make_aware(datetime.combine(turno.data, turno.hora_fim))
+    if fim <= inicio:
+        fim += timedelta(days=1)
+    return inicio, fim
+
+
+# ---------------------------------------------------------------------------
+# Consultas
+# ---------------------------------------------------------------------------
+
+def conflitos(freelance_id: int, inicio: datetime, fim: datetime, ignorar: Optional[Tuple[str, int]] = None):
+    """Compromissos do freelancer que se sobrepõem a [inicio, fim)."""
+    qs = CompromissoAgenda.objects.filter(freelance_id=freelance_id, fim__gt=inicio, inicio__lt=fim)
+    if ignorar:
+        qs = qs.exclude(origem=ignorar[0], objeto_id=ignorar[1])
+    return qs.order_by('inicio')
+
+
+def esta_livre(freelance_id: int, inicio: datetime, fim: datetime, ignorar: Optional[Tuple[str, int]] = None) -> bool:
+    return not conflitos(freelance_id, inicio, fim, ignorar).exists()
+
+
+def freelancers_livres(inicio: datetime, fim: datetime, queryset=None):
+    """Freelancers (de ``queryset``) sem compromisso sobreposto a [inicio, fim)."""
+    queryset = Freelance.objects.all() if queryset is None else queryset
+    ocupado = CompromissoAgenda.objects.filter(freelance=OuterRef('pk'), fim__gt=inicio, inicio__lt=fim)
+    return queryset.filter(~Exists(ocupado))
+
+
+def garantir_disponibilidade(freelance_id: int, janela: Optional[Janela], ignorar: Optional[Tuple[str, int]] = None):
+    """
+    Levanta ConflitoAgenda se ``janela`` colide com outro compromisso do freelancer.
+
+    Deve ser chamada dentro da transação que grava o novo compromisso: a linha do
+    freelancer é travada, então duas aprovações simultâneas não passam juntas.
+    """
+    if janela is None:
+        return
+    list(Freelance.objects.select_for_update().filter(pk=freelance_id).values_list('pk', flat=True))
+    conflito = conflitos(freelance_id, *janela, ignorar=ignorar).first()
+    if conflito is not None:
+        raise ConflitoAgenda(conflito)
+
+
+class AgendaFreelancers:
+    """
+    Índice em memória dos compromissos, por freelancer.
+
+    Para cada freelancer guarda os inícios ordenados e o máximo acumulado dos
+    fins; existe sobreposição com [a, b) se, entre os compromissos que começam
+    antes de b (bisect), o maior fim passa de a. Cada consulta é O(log n).
+    """
+
+    def __init__(self, compromissos: Iterable[Tuple[int, datetime, datetime]] = ()):
+        por_freelancer: Dict[int, List[Tuple[datetime, datetime]]] = defaultdict(list)
+        for freelance_id, inicio, fim in compromissos:
+            por_freelancer[freelance_id].append((inicio, fim))
+        self._inicios: Dict[int, List[datetime]] = {}
+        self._fins_max: Dict[int, List[datetime]] = {}
+        for freelance_id, intervalos in por_freelancer.items():
+            intervalos.sort()
+            self._inicios[freelance_id] = [inicio for inicio, _ in intervalos]
+            self._fins_max[freelance_id] = list(accumulate((fim for _, fim in intervalos), max))
+
+    @classmethod
+    def carregar(cls, freelance_ids=None, desde: Optional[datetime] = None, ate: Optional[datetime] = None):
+        """Uma consulta: compromissos (dos freelancers dados) que tocam [desde, ate)."""
+        qs = CompromissoAgenda.objects.all()
+        if freelance_ids is not None:
+            qs = qs.filter(freelance_id__in=freelance_ids)
+        if desde is not None:
+            qs = qs.filter(fim__gt=desde)
+        if ate is not None:
+            qs = qs.filter(inicio__lt=ate)
+        return cls(qs.values_list('freelance_id', 'inicio', 'fim'))
+
+    def ocupado(self, freelance_id: int, inicio: datetime, fim: datetime) -> bool:
+        inicios = self._inicios.get(freelance_id)
+        if not inicios:
+            return False
+        posicao = bisect_left(inicios, fim)
+        return posicao > 0 and self._fins_max[freelance_id][posicao - 1] > inicio
+
+    def situacao(self, freelance_id: int, janela: Optional[Janela], margem: Optional[timedelta] = None) -> Optional[str]:
+        """'ocupado', 'apertado' (compromisso a menos de ``margem``), 'livre' ou None sem janela."""
+        if janela is None:
+            return None
+        inicio, fim = janela
+        if self.ocupado(freelance_id, inicio, fim):
+            return 'ocupado'
+        margem = margem_deslocamento() if margem is None else margem
+        if margem and self.ocupado(freelance_id, inicio - margem, fim + margem):
+            return 'apertado'
+        return 'livre'
+
+
+# ---------------------------------------------------------------------------
+# Sincronização (signals)
+# ---------------------------------------------------------------------------
+
+def _gravar(freelance_id: int, origem: str, objeto_id: int, janela: Optional[Janela]):
+    if janela is None:
+        CompromissoAgenda.objects.filter(freelance_id=freelance_id, origem=origem, objeto_id=objeto_id).delete()
+        return
+    CompromissoAgenda.objects.update_or_create(
+        freelance_id=freelance_id, origem=origem, objeto_id=objeto_id,
+        defaults={'inicio': janela[0], 'fim': janela[1]},
+    )
+
+
+def sincronizar_vaga_freelancer(freelance_id: int, vaga_id: int):
+    """Recalcula o compromisso do freelancer na vaga (contrato ativo ou candidatura aprovada)."""
+    comprometido = (
+        ContratoFreelance.objects.filter(freelance_id=freelance_id, vaga_id=vaga_id, status='ativo').exists()
+        or Candidatura.objects.filter(
+            freelance_id=freelance_id, vaga_id=vaga_id, status__in=STATUS_CANDIDATURA_COMPROMETIDA
+        ).exists()
+    )
+    janela = None
+    if comprometido:
+        vaga = Vaga.objects.filter(pk=vaga_id).only('data_inicio_trabalho', 'data_fim_trabalho').first()
+        janela = janela_vaga(vaga) if vaga else None
+    _gravar(freelance_id, 'vaga', vaga_id, janela)
+
+
+def sincronizar_alocacao(alocacao: AlocacaoTurno):
+    janela = None
+    if alocacao.status not in STATUS_ALOCACAO_LIVRE:
+        janela = janela_turno(alocacao.vaga_turno.turno)
+    _gravar(alocacao.freelance_id, 'alocacao', alocacao.pk, janela)
+
+
+def atualizar_janela_vaga(vaga: Vaga) -> int:
+    """Move os compromissos existentes na vaga para as datas atuais dela (um UPDATE)."""
+    compromissos = CompromissoAgenda.objects.filter(origem='vaga', objeto_id=vaga.pk)
+    janela = janela_vaga(vaga)
+    if janela is None:
+        return compromissos.delete()[0]
+    return compromissos.exclude(inicio=janela[0], fim=janela[1]).update(inicio=janela[0], fim=janela[1])
+
+
+def atualizar_janela_turno(turno) -> int:
+    inicio, fim = janela_turno(turno)
+    alocacoes = AlocacaoTurno.objects.filter(vaga_turno__turno=turno).values('pk')
+    return CompromissoAgenda.objects.filter(origem='alocacao', objeto_id__in=alocacoes).exclude(
+        inicio=inicio, fim=fim
+    ).update(inicio=inicio, fim=fim)
+
+
+@transaction.atomic
+def reconstruir_agenda(tamanho_lote: int = 1000) -> Dict[str, int]:
+    """Apaga e recria todos os compromissos a partir de contratos, candidaturas e alocações."""
+    pares = set(
+        ContratoFreelance.objects.filter(status='ativo', vaga__data_inicio_trabalho__isnull=False)
+        .values_list('freelance_id', 'vaga_id')
+    )
+    pares.update(
+        Candidatura.objects.filter(
+            status__in=STATUS_CANDIDATURA_COMPROMETIDA, vaga__data_inicio_trabalho__isnull=False
+        ).values_list('freelance_id', 'vaga_id')
+    )
+    vagas = Vaga.objects.only('data_inicio_trabalho', 'data_fim_trabalho').in_bulk({vaga_id for _, vaga_id in pares})
+    novos = []
+    for freelance_id, vaga_id in pares:
+        inicio, fim = janela_vaga(vagas[vaga_id])
+        novos.append(CompromissoAgenda(freelance_id=freelance_id, origem='vaga', objeto_id=vaga_id, inicio=inicio, fim=fim))
+    alocacoes = AlocacaoTurno.objects.exclude(status__in=STATUS_ALOCACAO_LIVRE).select_related('vaga_turno__turno')
+    for alocacao in alocacoes.iterator(chunk_size=tamanho_lote):
+        inicio, fim = janela_turno(alocacao.vaga_turno.turno)
+        novos.append(CompromissoAgenda(
+            freelance_id=alocacao.freelance_id, origem='alocacao', objeto_id=alocacao.pk, inicio=inicio, fim=fim
+        ))
+    removidos = CompromissoAgenda.objects.all().delete()[0]
+    CompromissoAgenda.objects.bulk_create(novos, batch_size=tamanho_lote)
+    logger.info("Agenda reconstruída: %s compromisso(s), %s removido(s)", len(novos), removidos)
+    return {'compromissos': len(novos), 'removidos': removidos}
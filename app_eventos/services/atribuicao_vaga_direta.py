@@ -1,13 +1,14 @@
 """
 Atribuição de freelancer a uma vaga de estabelecimento (ponto de operação) sem candidatura.
 
-Cria ContratoFreelance ativo e incrementa quantidade_preenchida da vaga, como em Candidatura.aprovar().
+Cria ContratoFreelance ativo e reserva uma posição da vaga (Vaga.reservar_preenchida), como em Candidatura.aprovar().
 """
 from django.core.exceptions import ValidationError
 from django.db import transaction
 
 from app_eventos.models import ContratoFreelance, Freelance, Vaga
 from app_eventos.models_freelancer_empresa import FreelancerPrestacaoServico
+from app_eventos.services.agenda_freelancer import garantir_disponibilidade, janela_vaga
 
 
 def atribuir_freelancer_a_vaga_direto(
@@ -26,6 +27,7 @@ def atribuir_freelancer_a_vaga_direto(
     - Opcionalmente exige registo em FreelancerPrestacaoServico para o mesmo tenant.
     - Não duplica contrato ativo para o mesmo par (freelance, vaga).
     - Respeita limite quantidade / quantidade_preenchida salvo se ignorar_limite_vagas=False.
+    - Recusa (ConflitoAgenda, um ValidationError) se o freelancer já tem compromisso no horário da vaga.
 
     Returns:
         tuple: (ContratoFreelance, dict meta) onde meta inclui 'criado' (bool) e 'mensagem' (str).
@@ -66,18 +68,19 @@ def atribuir_freelancer_a_vaga_direto(
         raise ValidationError('Não há vagas disponíveis nesta posição (limite preenchido).')
 
     with transaction.atomic():
-        vaga_locked = Vaga.objects.select_for_update().get(pk=vaga.pk)
-        if not ignorar_limite_vagas and not (
-            vaga_locked.quantidade_preenchida < vaga_locked.quantidade
-        ):
+        # Conflito de horário com outro compromisso do freelancer (levanta ConflitoAgenda)
+        garantir_disponibilidade(freelance.pk, janela_vaga(vaga), ignorar=('vaga', vaga.pk))
+
+        # Reserva atômica (UPDATE condicional): sem lock na linha da vaga
+        reservou = vaga.reservar_preenchida()
+        if not reservou and not ignorar_limite_vagas:
             raise ValidationError('Não há vagas disponíveis nesta posição (limite preenchido).')
 
         contrato = ContratoFreelance.objects.create(
             freelance=freelance,
-            vaga=vaga_locked,
+            vaga=vaga,
             status='ativo',
         )
-        vaga_locked.incrementar_preenchida()
 
     return contrato, {
         'criado': True,
@@ -0,0 +1,405 @@
+"""
+Benchmark dos endpoints quentes da API (consultas, latência p50/p95 e pico de memória).
+
+Fluxo (comando ``benchmark_api``):
+- ``semear_cenario`` popula o banco com volumes realistas (empresas, eventos, vagas,
+  freelancers, candidaturas e lançamentos financeiros) via ``bulk_create``;
+- ``executar_benchmarks`` chama cada endpoint ``repeticoes`` vezes com o test client
+  (depois de uma chamada de aquecimento), medindo consultas (CaptureQueriesContext),
+  latência (perf_counter) e memória (tracemalloc, na primeira chamada medida);
+- ``comparar_limiares`` confronta o resultado com ``benchmark_limiares.json`` (máximos por
+  endpoint) e devolve as violações — o comando falha se houver regressão.
+
+O comando roda num banco descartável criado a partir da conexão configurada
+(SQLite ou Postgres local); nunca semeia o banco de produção.
+"""
+import json
+import logging
+import os
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app_eventos.models import (
+    Candidatura,
+    CategoriaFinanceira,
+    DespesaEvento,
+    Empresa,
+    EmpresaContratante,
+    Evento,
+    Freelance,
+    FreelancerFuncao,
+    Funcao,
+    LocalEvento,
+    PlanoContratacao,
+    ReceitaEvento,
+    SetorEvento,
+    TipoEmpresa,
+    TipoFuncao,
+    User,
+    Vaga,
+)
+from app_eventos.services.matching_service import MatchingService
+from app_eventos.services.metricas_empresa import reconciliar_metricas
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_LIMIARES = os.path.join(os.path.dirname(__file__), 'benchmark_limiares.json')
+PREFIXO_CNPJ = '99.'  # marca as empresas do cenário (reuso com --manter-banco)
+
+ESCALAS = {
+    # Volumes de produção que queremos proteger
+    'padrao': {
+        'empresas': 5, 'eventos_por_empresa': 20, 'vagas_por_evento': 20,
+        'freelancers': 50000, 'candidaturas': 200000, 'lancamentos_por_evento': 30,
+    },
+    'media': {
+        'empresas': 3, 'eventos_por_empresa': 10, 'vagas_por_evento': 10,
+        'freelancers': 5000, 'candidaturas': 20000, 'lancamentos_por_evento': 10,
+    },
+    # Para testes e CI rápido
+    'mini': {
+        'empresas': 2, 'eventos_por_empresa': 3, 'vagas_por_evento': 5,
+        'freelancers': 60, 'candidaturas': 150, 'lancamentos_por_evento': 4,
+    },
+}
+
+LOTE = 2000
+
+
+class Cenario:
+    """Objetos de referência do cenário semeado (usados para montar as requisições)."""
+
+    def __init__(self, empresa, usuario_empresa, usuario_freelancer, evento, vaga, freelancer, volumes):
+        self.empresa = empresa
+        self.usuario_empresa = usuario_empresa
+        self.usuario_freelancer = usuario_freelancer
+        self.evento = evento
+        self.vaga = vaga
+        self.freelancer = freelancer
+        self.volumes = volumes
+
+
+# ---------------------------------------------------------------------------
+# Cenário
+# ---------------------------------------------------------------------------
+
+def semear_cenario(escala='padrao', volumes=None):
+    """
+    Popula o banco com o cenário da escala (ou ``volumes`` explícitos) e devolve o Cenario.
+    Se o cenário já existe (banco mantido entre execuções), só o recarrega.
+    """
+    volumes = dict(volumes or ESCALAS[escala])
+    existente = carregar_cenario(volumes)
+    if existente:
+        return existente
+
+    senha = make_password('benchmark')
+    agora = timezone.now()
+    hoje = date.today()
+
+    plano = PlanoContratacao.objects.create(
+        nome='Plano Benchmark', tipo_plano='enterprise', descricao='',
+        max_eventos_mes=10000, max_usuarios=10000, max_freelancers=1000000,
+        max_equipamentos=10000, max_locais=10000,
+        valor_mensal=Decimal('1000.00'), valor_anual=Decimal('10000.00'),
+        desconto_anual=Decimal('10.00'), percentual_comissao=Decimal('5.00'), ativo=True,
+    )
+    produtora = Empresa.objects.create(
+        nome='Produtora Benchmark', cnpj=f'{PREFIXO_CNPJ}000.000/0000-00',
+        tipo_empresa=TipoEmpresa.objects.create(nome='Benchmark', descricao=''),
+        email='produtora@benchmark.local',
+    )
+    local = LocalEvento.objects.create(
+        nome='Arena Benchmark', endereco='Rua Benchmark', capacidade=10000, empresa_proprietaria=produtora,
+    )
+    tipo_funcao = TipoFuncao.objects.create(nome='Benchmark')
+    funcoes = [Funcao.objects.create(nome=f'Função {i}', tipo_funcao=tipo_funcao, ativo=True) for i in range(5)]
+
+    EmpresaContratante.objects.bulk_create([
+        EmpresaContratante(
+            nome=f'Empresa Benchmark {i}', nome_fantasia=f'Empresa Benchmark {i}',
+            razao_social=f'Empresa Benchmark {i} LTDA', cnpj=f'{PREFIXO_CNPJ}{i:03d}.000/0001-00',
+            email=f'empresa{i}@benchmark.local', data_vencimento=hoje + timedelta(days=365),
+            plano_contratado=plano, valor_mensal=Decimal('1000.00'),
+        )
+        for i in range(volumes['empresas'])
+    ])
+    empresas = list(EmpresaContratante.objects.filter(cnpj__startswith=PREFIXO_CNPJ).order_by('pk'))
+
+    User.objects.bulk_create([
+        User(username=f'admin{e.pk}@benchmark.local', email=f'admin{e.pk}@benchmark.local', password=senha,
+             tipo_usuario='admin_empresa', empresa_contratante=e)
+        for e in empresas
+    ])
+
+    Evento.objects.bulk_create([
+        Evento(nome=f'Evento {e.pk}-{j}', data_inicio=hoje + timedelta(days=30 + j),
+               data_fim=hoje + timedelta(days=31 + j), local=local, empresa_contratante=e)
+        for e in empresas for j in range(volumes['eventos_por_empresa'])
+    ], batch_size=LOTE)
+    eventos = list(Evento.objects.filter(empresa_contratante__in=empresas).order_by('pk'))
+
+    SetorEvento.objects.bulk_create([SetorEvento(nome='Geral', evento=ev) for ev in eventos], batch_size=LOTE)
+    setores = {s.evento_id: s for s in SetorEvento.objects.filter(evento__in=eventos)}
+
+    Vaga.objects.bulk_create([
+        Vaga(
+            evento=ev, setor=setores[ev.pk], empresa_contratante_id=ev.empresa_contratante_id,
+            titulo=f'Vaga {ev.pk}-{k}', funcao=funcoes[k % len(funcoes)], quantidade=10,
+            remuneracao=Decimal('150.00'), descricao='Vaga do cenário de benchmark',
+            ativa=True, publicada=True,
+            data_limite_candidatura=agora + timedelta(days=20),
+            data_inicio_trabalho=agora + timedelta(days=30),
+        )
+        for ev in eventos for k in range(volumes['vagas_por_evento'])
+    ], batch_size=LOTE)
+    vagas = list(Vaga.objects.filter(evento__in=eventos).order_by('pk').values_list('pk', flat=True))
+
+    CategoriaFinanceira.objects.bulk_create([
+        CategoriaFinanceira(empresa_contratante=e, nome='Geral') for e in empresas
+    ])
+    categorias = {c.empresa_contratante_id: c for c in CategoriaFinanceira.objects.filter(empresa_contratante__in=empresas)}
+    despesas, receitas = [], []
+    for ev in eventos:
+        for n in range(volumes['lancamentos_por_evento']):
+            vencimento = hoje + timedelta(days=(n % 20) - 10)
+            pago = n % 3 == 0
+            despesas.append(DespesaEvento(
+                evento=ev, categoria=categorias[ev.empresa_contratante_id], descricao='Despesa',
+                valor=Decimal('100.00') + n, data_vencimento=vencimento,
+                status='pago' if pago else 'pendente', data_pagamento=hoje if pago else None,
+            ))
+            receitas.append(ReceitaEvento(
+                evento=ev, categoria=categorias[ev.empresa_contratante_id], descricao='Receita',
+                valor=Decimal('180.00') + n, data_vencimento=vencimento,
+                status='recebido' if pago else 'pendente', data_recebimento=hoje if pago else None,
+            ))
+    DespesaEvento.objects.bulk_create(despesas, batch_size=LOTE)
+    ReceitaEvento.objects.bulk_create(receitas, batch_size=LOTE)
+
+    _semear_freelancers(volumes['freelancers'], senha, funcoes)
+    _semear_candidaturas(volumes['candidaturas'], vagas)
+
+    reconciliar_metricas([e.pk for e in empresas])
+    logger.info("Cenário de benchmark semeado: %s", volumes)
+    return carregar_cenario(volumes)
+
+
+def _semear_freelancers(total, senha, funcoes):
+    cidades = ['Porto Alegre', 'Canoas', 'São Paulo', 'Curitiba', 'Florianópolis']
+    for inicio in range(0, total, LOTE):
+        fim = min(inicio + LOTE, total)
+        User.objects.bulk_create([
+            User(username=f'freela{i}@benchmark.local', email=f'freela{i}@benchmark.local',
+                 password=senha, tipo_usuario='freelancer')
+            for i in range(inicio, fim)
+        ])
+        usuarios = User.objects.filter(
+            username__in=[f'freela{i}@benchmark.local' for i in range(inicio, fim)]
+        ).values_list('pk', flat=True)
+        Freelance.objects.bulk_create([
+            Freelance(usuario_id=pk, nome_completo=f'Freelancer {pk}', cidade=cidades[pk % len(cidades)],
+                      telefone=f'5199{pk:07d}'[-11:], cadastro_completo=True)
+            for pk in usuarios
+        ])
+        FreelancerFuncao.objects.bulk_create([
+            FreelancerFuncao(freelancer_id=pk, funcao=funcoes[pk % len(funcoes)], nivel='intermediario', ativo=True)
+            for pk in Freelance.objects.filter(usuario_id__in=list(usuarios)).values_list('pk', flat=True)
+        ])
+
+
+def _semear_candidaturas(total, vagas):
+    freelancers = list(
+        Freelance.objects.filter(usuario__username__endswith='@benchmark.local')
+        .order_by('pk').values_list('pk', flat=True)
+    )
+    if not freelancers or not vagas:
+        return
+    # Cada freelancer se candidata a vagas distintas (unique freelance+vaga)
+    por_freelancer = -(-total // len(freelancers))
+    status = ['pendente', 'em_analise', 'aprovado', 'rejeitado']
+    lote, criadas = [], 0
+    for i, freelancer_id in enumerate(freelancers):
+        for k in range(min(por_freelancer, len(vagas))):
+            if criadas >= total:
+                break
+            lote.append(Candidatura(
+                freelance_id=freelancer_id, vaga_id=vagas[(i * por_freelancer + k) % len(vagas)],
+                status=status[(i + k) % len(status)],
+            ))
+            criadas += 1
+        if len(lote) >= LOTE:
+            Candidatura.objects.bulk_create(lote, ignore_conflicts=True)
+            lote = []
+    Candidatura.objects.bulk_create(lote, ignore_conflicts=True)
+
+
+def carregar_cenario(volumes=None):
+    empresa = EmpresaContratante.objects.filter(cnpj__startswith=PREFIXO_CNPJ).order_by('pk').first()
+    if empresa is None:
+        return None
+    evento = Evento.objects.filter(empresa_contratante=empresa).order_by('pk').first()
+    vaga = Vaga.objects.filter(empresa_contratante=empresa).order_by('pk').first()
+    freelancer = (
+        Freelance.objects.filter(usuario__username__endswith='@benchmark.local', candidaturas__isnull=False)
+        .select_related('usuario').order_by('pk').first()
+    )
+    return Cenario(
+        empresa=empresa,
+        usuario_empresa=User.objects.get(username=f'admin{empresa.pk}@benchmark.local'),
+        usuario_freelancer=freelancer.usuario,
+        evento=evento,
+        vaga=vaga,
+        freelancer=freelancer,
+        volumes={
+            'empresas': EmpresaContratante.objects.filter(cnpj__startswith=PREFIXO_CNPJ).count(),
+            'eventos': Evento.objects.count(),
+            'vagas': Vaga.objects.count(),
+            'freelancers': Freelance.objects.count(),
+            'candidaturas': Candidatura.objects.count(),
+            **({'escala': volumes} if volumes else {}),
+        },
+    )
+
+
+# ---------------------------------------------------------------------------
+# Medição
+# ---------------------------------------------------------------------------
+
+def _casos(cenario):
+    """(nome, chamada) de cada endpoint medido; a chamada devolve o status HTTP (ou 200)."""
+    api_freela = APIClient()
+    api_freela.force_authenticate(user=cenario.usuario_freelancer)
+    api_empresa = APIClient()
+    api_empresa.force_authenticate(user=cenario.usuario_empresa)
+    web_empresa = Client()
+    web_empresa.force_login(cenario.usuario_empresa)
+
+    def get(cliente, url):
+        return lambda: cliente.get(url).status_code
+
+    def matching_vaga():
+        MatchingService.encontrar_freelancers_para_vaga(cenario.vaga)
+        return 200
+
+    def matching_freelancer():
+        MatchingService.encontrar_vagas_para_freelancer(cenario.freelancer)
+        return 200
+
+    return [
+        ('feed_vagas_mobile', get(api_freela, reverse('vaga-list'))),
+        ('feed_vagas_mobile_cursor', get(api_freela, reverse('vaga-list') + '?cursor=')),
+        ('candidaturas_freelancer', get(api_freela, reverse('candidatura-list'))),
+        ('candidaturas_empresa', get(api_empresa, reverse('candidatura-list'))),
+        ('matching_freelancers_para_vaga', matching_vaga),
+        ('matching_vagas_para_freelancer', matching_freelancer),
+        ('fluxo_caixa_evento', get(api_empresa, reverse('api_v01_auth:fluxo_caixa_evento', args=[cenario.evento.pk]))),
+        ('fluxo_caixa_empresa', get(api_empresa, reverse('api_v01_auth:fluxo_caixa_empresa'))),
+        ('dashboard_empresa_web', get(web_empresa, reverse('dashboard_empresa'))),
+        ('dashboard_desktop', get(api_empresa, reverse('api_desktop:dashboard-desktop'))),
+    ]
+
+
+def medir(chamada, repeticoes=10):
+    """
+    Mede uma chamada em regime (após uma execução de aquecimento, que popula caches):
+    consultas e memória na primeira execução medida, latência em todas.
+    """
+    chamada()
+    # O log de consultas tem tamanho máximo; depois da semeadura ele está cheio
+    reset_queries()
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as consultas:
+            inicio = time.perf_counter()
+            status_http = chamada()
+            tempos = [(time.perf_counter() - inicio) * 1000]
+        # Lido já: cada requisição seguinte limpa o log (signal request_started)
+        total_consultas = len(consultas.captured_queries)
+        _atual, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    for _ in range(max(repeticoes, 1) - 1):
+        inicio = time.perf_counter()
+        chamada()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+
+    return {
+        'status': status_http,
+        'consultas': total_consultas,
+        'p50_ms': round(statistics.median(tempos), 2),
+        'p95_ms': round(_percentil(tempos, 95), 2),
+        'memoria_pico_kb': round(pico / 1024, 1),
+        'repeticoes': len(tempos),
+    }
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    if len(ordenados) == 1:
+        return ordenados[0]
+    posicao = (len(ordenados) - 1) * p / 100
+    base = int(posicao)
+    fracao = posicao - base
+    if base + 1 < len(ordenados):
+        return ordenados[base] + (ordenados[base + 1] - ordenados[base]) * fracao
+    return ordenados[base]
+
+
+def executar_benchmarks(cenario, repeticoes=10, somente=None):
+    """Executa os casos e devolve {nome: métricas}."""
+    resultados = {}
+    for nome, chamada in _casos(cenario):
+        if somente and nome not in somente:
+            continue
+        resultados[nome] = medir(chamada, repeticoes)
+        logger.info("Benchmark %s: %s", nome, resultados[nome])
+    return resultados
+
+
+# ---------------------------------------------------------------------------
+# Limiares
+# ---------------------------------------------------------------------------
+
+def carregar_limiares(caminho=None):
+    with open(caminho or ARQUIVO_LIMIARES, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def comparar_limiares(resultados, limiares):
+    """
+    Lista de violações (dicts) dos máximos definidos em ``limiares``
+    ({endpoint: {'consultas': N, 'p95_ms': X, 'memoria_pico_kb': Y}}).
+    Status HTTP diferente de 200 também conta como violação.
+    """
+    violacoes = []
+    for nome, medido in resultados.items():
+        if medido['status'] != 200:
+            violacoes.append({'endpoint': nome, 'metrica': 'status', 'limite': 200, 'medido': medido['status']})
+        for metrica, limite in limiares.get(nome, {}).items():
+            if metrica in medido and medido[metrica] > limite:
+                violacoes.append({'endpoint': nome, 'metrica': metrica, 'limite': limite, 'medido': medido[metrica]})
+    return violacoes
+
+
+def montar_relatorio(cenario, resultados, violacoes, repeticoes):
+    return {
+        'gerado_em': timezone.now().isoformat(),
+        'banco': connection.vendor,
+        'volumes': cenario.volumes,
+        'repeticoes': repeticoes,
+        'resultados': resultados,
+        'violacoes': violacoes,
+    }
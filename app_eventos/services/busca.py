@@ -0,0 +1,238 @@
+"""
+Busca textual indexada de vagas, eventos e freelancers.
+
+Em vez de ``icontains`` encadeados em vários JOINs (seq scan a cada busca), cada
+Vaga, Evento e Freelance tem um ``DocumentoBusca`` com o texto pesquisável já
+normalizado (minúsculo, sem acentos) e a cidade.
+
+- Postgres: ``to_tsvector('portuguese', texto) @@ to_tsquery(...)`` com prefixo
+  (``termo:*``), mais ``LIKE`` acelerado por pg_trgm; relevância =
+  ``ts_rank`` + ``similarity``.
+- SQLite (desenvolvimento/testes): tabela FTS5 ``app_eventos_documentobusca_fts``;
+  relevância = ``-bm25``.
+- Cidade: ``LIKE '%cidade%'`` sobre a coluna normalizada (trigram no Postgres).
+
+``aplicar_busca`` filtra um queryset qualquer do modelo (mantendo os demais
+filtros da view) e anota ``relevancia_busca`` quando há termos. Os documentos
+são mantidos pelos signals em signals_busca.py (após o commit) e reconstruídos
+pelo comando ``reindexar_busca`` (e carregados pela migração 0053 com os
+modelos históricos, via ``apps``).
+"""
+import logging
+import re
+import unicodedata
+from typing import Dict, Iterable
+
+from django.db import connection, transaction
+from django.db.models import BooleanField, FloatField, OuterRef, Subquery, Value
+from django.db.models.expressions import RawSQL
+
+from app_eventos.models import Evento, Freelance, Vaga
+from app_eventos.models_busca import DocumentoBusca
+
+logger = logging.getLogger(__name__)
+
+CAMPO_RELEVANCIA = 'relevancia_busca'
+LOTE_INDEXACAO = 500
+TABELA_FTS = 'app_eventos_documentobusca_fts'
+
+
+def normalizar(texto) -> str:
+    """Minúsculo, sem acentos e com espaços simples ('São  José' -> 'sao jose')."""
+    decomposto = unicodedata.normalize('NFKD', str(texto or ''))
+    sem_acento = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acento.lower().split())
+
+
+def termos_busca(busca) -> list:
+    return re.findall(r'\w+', normalizar(busca))
+
+
+def _juntar(*partes) -> str:
+    return normalizar(' '.join(str(p) for p in partes if p))
+
+
+# ----- documentos -----
+
+def documento_vaga(vaga) -> Dict[str, str]:
+    evento = vaga.evento or (vaga.setor.evento if vaga.setor_id else None)
+    ponto = vaga.ponto_operacao
+    local = evento.local if evento else (ponto.local if ponto else None)
+    return {
+        'texto': _juntar(
+            vaga.titulo,
+            vaga.descricao,
+            vaga.requisitos,
+            vaga.funcao.nome if vaga.funcao_id else '',
+            vaga.setor.nome if vaga.setor_id else '',
+            evento.nome if evento else '',
+            ponto.nome if ponto else '',
+            local.nome if local else '',
+        ),
+        # LocalEvento não tem coluna de cidade: o endereço entra inteiro
+        'cidade': _juntar(ponto.cidade if ponto else '', ponto.uf if ponto else '', local.endereco if local else ''),
+    }
+
+
+def documento_evento(evento) -> Dict[str, str]:
+    local = evento.local
+    return {
+        'texto': _juntar(evento.nome, evento.descricao, local.nome if local else ''),
+        'cidade': _juntar(local.endereco if local else ''),
+    }
+
+
+def documento_freelance(freelance) -> Dict[str, str]:
+    funcoes = [ff.funcao.nome for ff in freelance.funcoes.all() if ff.ativo]
+    return {
+        'texto': _juntar(freelance.nome_completo, freelance.habilidades, freelance.bairro, freelance.cidade, *funcoes),
+        'cidade': _juntar(freelance.cidade, freelance.uf),
+    }
+
+
+def _modelo_documento(apps=None):
+    return apps.get_model('app_eventos', 'DocumentoBusca') if apps else DocumentoBusca
+
+
+def _fontes(apps=None):
+    """
+    tipo -> (queryset com os relacionados que o documento usa, função que monta o documento).
+
+    ``apps`` (registro de uma migração) troca os modelos pelos históricos.
+    """
+    if apps:
+        vaga, evento, freelance = (apps.get_model('app_eventos', nome) for nome in ('Vaga', 'Evento', 'Freelance'))
+    else:
+        vaga, evento, freelance = Vaga, Evento, Freelance
+    return {
+        'vaga': (
+            vaga.objects.select_related(
+                'funcao', 'setor__evento__local', 'evento__local', 'ponto_operacao__local'
+            ),
+            documento_vaga,
+        ),
+        'evento': (evento.objects.select_related('local'), documento_evento),
+        'freelance': (freelance.objects.prefetch_related('funcoes__funcao'), documento_freelance),
+    }
+
+
+# ----- indexação -----
+
+def indexar(tipo: str, ids: Iterable[int], apps=None) -> int:
+    """
+    Recalcula (upsert) os documentos de ``ids``; ids que não existem mais têm o
+    documento removido. Retorna quantos documentos foram gravados.
+    """
+    ids = set(ids)
+    if not ids:
+        return 0
+    queryset, montar = _fontes(apps)[tipo]
+    modelo = _modelo_documento(apps)
+    documentos = [
+        modelo(tipo=tipo, objeto_id=obj.pk, **montar(obj))
+        for obj in queryset.filter(pk__in=ids)
+    ]
+    removidos = ids - {d.objeto_id for d in documentos}
+    if removidos:
+        modelo.objects.filter(tipo=tipo, objeto_id__in=list(removidos)).delete()
+    modelo.objects.bulk_create(
+        documentos,
+        batch_size=LOTE_INDEXACAO,
+        update_conflicts=True,
+        unique_fields=['tipo', 'objeto_id'],
+        update_fields=['texto', 'cidade', 'atualizado_em'],
+    )
+    return len(documentos)
+
+
+def remover(tipo: str, ids: Iterable[int]) -> int:
+    return DocumentoBusca.objects.filter(tipo=tipo, objeto_id__in=list(ids)).delete()[0]
+
+
+def agendar_indexacao(tipo: str, ids: Iterable[int]):
+    """Reindexa depois do commit (usado pelos signals)."""
+    ids = [pk for pk in ids if pk]
+    if ids:
+        transaction.on_commit(lambda: indexar(tipo, ids))
+
+
+def reindexar(tipos=None, lote=LOTE_INDEXACAO, apps=None) -> Dict[str, int]:
+    """Reconstrói os documentos (todos ou só ``tipos``), em lotes; remove órfãos."""
+    stats = {}
+    modelo = _modelo_documento(apps)
+    for tipo, (queryset, _) in _fontes(apps).items():
+        if tipos and tipo not in tipos:
+            continue
+        ids = list(queryset.model.objects.order_by('pk').values_list('pk', flat=True))
+        total = 0
+        for inicio in range(0, len(ids), lote):
+            total += indexar(tipo, ids[inicio:inicio + lote], apps=apps)
+        modelo.objects.filter(tipo=tipo).exclude(
+            objeto_id__in=queryset.model.objects.values('pk')
+        ).delete()
+        stats[tipo] = total
+        logger.info("Busca: %s documento(s) de %s reindexado(s)", total, tipo)
+    return stats
+
+
+# ----- consulta -----
+
+def documentos(tipo: str, busca=None, cidade=None):
+    """``DocumentoBusca`` do ``tipo`` que casam com ``busca``/``cidade``, anotados com ``relevancia``."""
+    queryset = DocumentoBusca.objects.filter(tipo=tipo)
+    cidade = normalizar(cidade)
+    if cidade:
+        queryset = queryset.filter(cidade__contains=cidade)
+
+    termos = termos_busca(busca)
+    if not termos:
+        return queryset.annotate(relevancia=Value(0.0, output_field=FloatField()))
+
+    # Colunas sem qualificar: o queryset vira subconsulta (alias U0) nas views
+    if connection.vendor == 'postgresql':
+        consulta_ts = ' & '.join(f'{t}:*' for t in termos)
+        frase = ' '.join(termos)
+        casa = RawSQL(
+            "(to_tsvector('portuguese', texto) @@ to_tsquery('portuguese', %s) OR texto LIKE %s)",
+            (consulta_ts, f'%{frase}%'),
+            output_field=BooleanField(),
+        )
+        relevancia = RawSQL(
+            "ts_rank(to_tsvector('portuguese', texto), to_tsquery('portuguese', %s)) + similarity(texto, %s)",
+            (consulta_ts, frase),
+            output_field=FloatField(),
+        )
+    else:
+        consulta_fts = ' '.join(f'"{t}"*' for t in termos)
+        casa = RawSQL(
+            f"id IN (SELECT rowid FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s)",
+            (consulta_fts,),
+            output_field=BooleanField(),
+        )
+        relevancia = RawSQL(
+            f"(SELECT -bm25({TABELA_FTS}) FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s AND rowid = id)",
+            (consulta_fts,),
+            output_field=FloatField(),
+        )
+    return queryset.filter(casa).annotate(relevancia=relevancia)
+
+
+def aplicar_busca(queryset, tipo: str, busca=None, cidade=None):
+    """
+    Restringe ``queryset`` (de Vaga, Evento ou Freelance) aos objetos que casam
+    com ``busca``/``cidade``. Com termos de busca, anota ``relevancia_busca``
+    para a view ordenar (``-relevancia_busca``). Sem busca nem cidade, devolve
+    o queryset intacto.
+    """
+    if not termos_busca(busca) and not normalizar(cidade):
+        return queryset
+    encontrados = documentos(tipo, busca, cidade)
+    queryset = queryset.filter(pk__in=encontrados.values('objeto_id'))
+    if termos_busca(busca):
+        queryset = queryset.annotate(**{
+            CAMPO_RELEVANCIA: Subquery(
+                encontrados.filter(objeto_id=OuterRef('pk')).values('relevancia')[:1],
+                output_field=FloatField(),
+            )
+        })
+    return queryset
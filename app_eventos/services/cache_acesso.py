@@ -0,0 +1,178 @@
+"""
+Cache de resolução de tenant e permissões (framework de cache do Django).
+
+O que fica em cache (alias ``ACESSO_CACHE_ALIAS``, TTL ``ACESSO_CACHE_TIMEOUT``):
+- conjunto de códigos de permissão de cada usuário (via UsuarioGrupo → GrupoUsuario → PermissaoSistema);
+- instância de EmpresaContratante por id (com plano_contratado), usada por empresa_ativa,
+  empresa_contexto_api e pelos middlewares;
+- id da empresa "Eventix" (empresa_owner dos freelancers).
+
+Além disso, cada instância de User memoriza o próprio conjunto de permissões, então
+chamadas repetidas de tem_permissao/get_permissoes no mesmo request não tocam nem o cache.
+
+Invalidação: signals_acesso.py apaga a chave do usuário (User, UsuarioGrupo) ou incrementa
+a versão global (PermissaoSistema, GrupoUsuario, PlanoContratacao) — todas as chaves levam a
+versão, então um incremento invalida tudo de uma vez.
+
+Os signals só apagam no cache do processo que gravou. Com LocMem (sem CACHE_ACESSO_DIR) cada
+worker tem o seu, então o TTL cai para ``ACESSO_CACHE_TIMEOUT_LOCAL`` (poucos segundos): uma
+permissão revogada deixa de valer em todos os workers nesse prazo, em vez de ``ACESSO_CACHE_TIMEOUT``.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from app_eventos.models import EmpresaContratante, PermissaoSistema
+
+logger = logging.getLogger(__name__)
+
+CHAVE_VERSAO = 'acesso:versao'
+_ATRIBUTO_PERMISSOES = '_acesso_permissoes'
+_SEM_EMPRESA = 0  # sentinela: "consultado, não existe"
+
+
+def _cache():
+    return caches[getattr(settings, 'ACESSO_CACHE_ALIAS', 'default')]
+
+
+def _timeout():
+    timeout = getattr(settings, 'ACESSO_CACHE_TIMEOUT', 120)
+    if isinstance(_cache(), LocMemCache):  # por processo: invalidação não chega aos outros workers
+        return min(timeout, getattr(settings, 'ACESSO_CACHE_TIMEOUT_LOCAL', 5))
+    return timeout
+
+
+def _versao():
+    versao = _cache().get(CHAVE_VERSAO)
+    if versao is None:
+        versao = 1
+        _cache().add(CHAVE_VERSAO, versao, None)
+    return versao
+
+
+def _chave(*partes):
+    return f"acesso:v{_versao()}:" + ':'.join(str(p) for p in partes)
+
+
+# ---------------------------------------------------------------------------
+# Permissões
+# ---------------------------------------------------------------------------
+
+def permissoes_usuario(user):
+    """
+    Códigos de PermissaoSistema ativos nos grupos ativos do usuário (frozenset).
+    """
+    if not getattr(user, 'pk', None):
+        return frozenset()
+    memo = user.__dict__.get(_ATRIBUTO_PERMISSOES)
+    if memo is not None:
+        return memo
+
+    chave = _chave('perm', user.pk)
+    permissoes = _cache().get(chave)
+    if permissoes is None:
+        permissoes = frozenset(
+            PermissaoSistema.objects.filter(
+                ativo=True,
+                grupos__usuarios_grupo__usuario_id=user.pk,
+                grupos__usuarios_grupo__ativo=True,
+            ).values_list('codigo', flat=True).distinct()
+        )
+        _cache().set(chave, permissoes, _timeout())
+    user.__dict__[_ATRIBUTO_PERMISSOES] = permissoes
+    return permissoes
+
+
+def invalidar_usuario(user_id, user=None):
+    if user_id:
+        _cache().delete(_chave('perm', user_id))
+    if user is not None:
+        user.__dict__.pop(_ATRIBUTO_PERMISSOES, None)
+
+
+def invalidar_tudo():
+    """Invalida todas as chaves (incrementa a versão global)."""
+    try:
+        _cache().incr(CHAVE_VERSAO)
+    except ValueError:
+        _cache().set(CHAVE_VERSAO, 2, None)
+
+
+# ---------------------------------------------------------------------------
+# Tenant
+# ---------------------------------------------------------------------------
+
+def empresa_por_id(empresa_id):
+    """EmpresaContratante (com plano_contratado) a partir do cache; None se não existe."""
+    if not empresa_id:
+        return None
+    chave = _chave('empresa', empresa_id)
+    empresa = _cache().get(chave)
+    if empresa is None:
+        empresa = (
+            EmpresaContratante.objects.select_related('plano_contratado').filter(pk=empresa_id).first()
+            or _SEM_EMPRESA
+        )
+        _cache().set(chave, empresa, _timeout())
+    return empresa or None
+
+
+def invalidar_empresa(empresa_id):
+    _cache().delete_many([_chave('empresa', empresa_id), _chave('empresa_eventix')])
+
+
+def empresa_do_usuario(user):
+    """
+    ``user.empresa_contratante`` servido pelo cache; a instância fica no cache do FK do
+    próprio usuário, então acessos seguintes a ``user.empresa_contratante`` não consultam.
+    """
+    empresa_id = getattr(user, 'empresa_contratante_id', None)
+    if not empresa_id:
+        return None
+    campo = type(user).empresa_contratante.field
+    if campo.is_cached(user):
+        return user.empresa_contratante
+    empresa = empresa_por_id(empresa_id)
+    if empresa is not None:
+        campo.set_cached_value(user, empresa)
+    return empresa
+
+
+def empresa_eventix():
+    """Empresa "Eventix" (dona dos freelancers), sem o icontains a cada acesso."""
+    chave = _chave('empresa_eventix')
+    empresa_id = _cache().get(chave)
+    if empresa_id is None:
+        empresa_id = (
+            EmpresaContratante.objects.filter(nome_fantasia__icontains='Eventix')
+            .values_list('pk', flat=True)
+            .first()
+            or _SEM_EMPRESA
+        )
+        _cache().set(chave, empresa_id, _timeout())
+    return empresa_por_id(empresa_id)
+
+
+class AcessoUsuario:
+    """
+    Permissões e empresa resolvidas de um usuário, memorizadas no request
+    (``request.acesso``, definido pelo EmpresaContextMiddleware).
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @property
+    def permissoes(self):
+        return permissoes_usuario(self.user)
+
+    @property
+    def empresa(self):
+        return empresa_do_usuario(self.user)
+
+    def tem(self, codigo_permissao):
+        if getattr(self.user, 'is_superuser', False):
+            return True
+        return codigo_permissao in self.permissoes
@@ -0,0 +1,168 @@
+"""
+GET condicional (ETag) e cache compartilhado de respostas de leitura frequente.
+
+Cada resposta cacheável pertence a um escopo (``'funcoes'``, ``'vaga_publica'``,
+``'evento_publico'``) e, opcionalmente, a uma chave dentro dele (id da vaga, do
+evento, da empresa). A versão de uma resposta é a combinação de dois contadores
+no cache (alias ``RESPOSTAS_CACHE_ALIAS``): o do escopo inteiro e o da chave.
+signals_cache_respostas.py incrementa o contador certo a cada escrita — as funções
+não têm ``data_atualizacao``, então um contador é o único carimbo barato comum a
+todos os escopos, e custa uma leitura de cache em vez de um MAX() no banco.
+
+Com a versão em mãos (antes de chamar a view):
+- o ETag é o hash de escopo, chave, versão e caminho com query string;
+  ``If-None-Match`` igual responde 304 sem consultar nem serializar nada;
+- senão o corpo já renderizado (views de função) ou o ``response.data`` (viewsets
+  DRF) sai do cache, guardado sob o próprio ETag por ``RESPOSTAS_CACHE_TIMEOUT``;
+- só no último caso a view roda, e o resultado 200 vai para o cache.
+
+Uso: ``@resposta_condicional('vaga_publica', chave='vaga_id', somente_anonimo=True)``
+em views de função, ou ``RespostaCondicionalMixin`` com ``escopo_cache`` em viewsets.
+"""
+import hashlib
+import logging
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+_GLOBAL = '*'
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPOSTAS_CACHE_ALIAS', 'default')]
+
+
+def _timeout():
+    return getattr(settings, 'RESPOSTAS_CACHE_TIMEOUT', 300)
+
+
+def _chave_versao(escopo, chave):
+    return f"respostas:{escopo}:{_GLOBAL if chave is None else chave}:versao"
+
+
+def versao(escopo, chave=None) -> str:
+    """Carimbo atual do escopo/chave (``"<global>.<chave>"``), normalmente numa ida ao cache."""
+    cache = _cache()
+    chaves = [_chave_versao(escopo, None), _chave_versao(escopo, chave)]
+    valores = cache.get_many(chaves)
+    for nome in chaves:
+        if nome not in valores:
+            valores[nome] = _semear(cache, nome)
+    return '.'.join(str(valores[nome]) for nome in chaves)
+
+
+def _semear(cache, nome):
+    # Contadores expiram junto com as respostas: sem cache compartilhado entre
+    # workers, um processo que não viu a invalidação fica no máximo um timeout
+    # atrasado. O valor inicial vem do relógio para nunca repetir um ETag antigo.
+    semente = time.time_ns()
+    cache.add(nome, semente, _timeout())
+    return cache.get(nome, semente)
+
+
+def invalidar(escopo, chave=None):
+    """Nova versão para a chave do escopo ou, sem chave, para o escopo inteiro."""
+    cache = _cache()
+    nome = _chave_versao(escopo, chave)
+    try:
+        cache.incr(nome)
+    except ValueError:
+        _semear(cache, nome)
+
+
+def calcular_etag(escopo, chave, versao_atual, request) -> str:
+    base = '|'.join(str(p) for p in (escopo, chave, versao_atual, request.get_full_path()))
+    return '"%s"' % hashlib.sha1(base.encode()).hexdigest()
+
+
+def _etag_confere(request, etag) -> bool:
+    recebidos = parse_etags(request.headers.get('If-None-Match', ''))
+    return '*' in recebidos or etag in recebidos or f'W/{etag}' in recebidos
+
+
+def _marcar(response, etag, privado):
+    response['ETag'] = etag
+    # Pode guardar, mas sempre revalidar com If-None-Match
+    patch_cache_control(response, no_cache=True, private=privado)
+    return response
+
+
+def resposta_condicional(escopo, chave=None, somente_anonimo=False):
+    """
+    Decorator para views de função (GET/HEAD) que devolvem HTML/JSON já renderizado.
+
+    ``chave`` é o nome de um kwarg da URL (ex.: ``'vaga_id'``) ou um callable
+    ``(request, *args, **kwargs) -> chave``. Com ``somente_anonimo`` o cache só vale
+    para visitantes sem login (a página muda conforme o usuário logado).
+    """
+    def decorator(view):
+        @wraps(view)
+        def _view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or (somente_anonimo and request.user.is_authenticated):
+                return view(request, *args, **kwargs)
+
+            valor_chave = chave(request, *args, **kwargs) if callable(chave) else kwargs.get(chave) if chave else None
+            etag = calcular_etag(escopo, valor_chave, versao(escopo, valor_chave), request)
+            if _etag_confere(request, etag):
+                return _marcar(HttpResponseNotModified(), etag, not somente_anonimo)
+
+            cache = _cache()
+            guardada = cache.get(f"respostas:corpo:{etag}")
+            if guardada is not None:
+                content_type, conteudo = guardada
+                return _marcar(HttpResponse(conteudo, content_type=content_type), etag, not somente_anonimo)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                if hasattr(response, 'render') and not response.is_rendered:
+                    response.render()
+                cache.set(f"respostas:corpo:{etag}", (response['Content-Type'], response.content), _timeout())
+                _marcar(response, etag, not somente_anonimo)
+            return response
+        return _view
+    return decorator
+
+
+class RespostaCondicionalMixin:
+    """
+    ETag + cache de ``response.data`` para ``list``/``retrieve`` de viewsets DRF.
+
+    A view define ``escopo_cache`` e, se o conteúdo depender de um tenant ou objeto,
+    ``chave_cache()``. As permissões já foram checadas quando ``list``/``retrieve``
+    rodam, então o cache é compartilhado entre todos os usuários autorizados.
+    """
+    escopo_cache = None
+
+    def chave_cache(self):
+        return None
+
+    def list(self, request, *args, **kwargs):
+        return self._resposta_condicional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._resposta_condicional(super().retrieve, request, *args, **kwargs)
+
+    def _resposta_condicional(self, handler, request, *args, **kwargs):
+        chave = self.chave_cache()
+        etag = calcular_etag(self.escopo_cache, chave, versao(self.escopo_cache, chave), request)
+        if _etag_confere(request, etag):
+            return _marcar(Response(status=304), etag, True)
+
+        cache = _cache()
+        dados = cache.get(f"respostas:dados:{etag}")
+        if dados is not None:
+            return _marcar(Response(dados), etag, True)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(f"respostas:dados:{etag}", response.data, _timeout())
+            _marcar(response, etag, True)
+        return response
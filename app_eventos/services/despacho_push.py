@@ -0,0 +1,217 @@
+"""
+Despacho em lote de notificações push (FCM, API HTTP legada).
+
+- Uma única ``requests.Session`` por processo, com pool de conexões keep-alive
+  (nada de abrir conexão TLS nova a cada envio).
+- Tokens divididos em lotes de até 500 (limite do multicast do FCM) enviados em
+  paralelo por um pool de threads limitado (``FCM_CONCORRENCIA``).
+- Tokens que o FCM reporta como mortos (NotRegistered, InvalidRegistration,
+  MismatchSenderId) são removidos de ``Freelance.device_token`` com um único
+  UPDATE; tokens canônicos (``registration_id`` na resposta) substituem os antigos.
+- ``despachar`` devolve as estatísticas do envio (por lote e totais).
+
+URL, chave e limites vêm de settings (FCM_URL, FCM_SERVER_KEY, FCM_LOTE_MAX,
+FCM_CONCORRENCIA); os testes apontam FCM_URL para um servidor local.
+"""
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from app_eventos.models import Freelance
+
+logger = logging.getLogger(__name__)
+
+FCM_URL_PADRAO = "https://fcm.googleapis.com/fcm/send"
+LOTE_MAX_FCM = 500  # limite de registration_ids por requisição multicast
+CONCORRENCIA_PADRAO = 4
+TIMEOUT_SEGUNDOS = 10
+
+# Erros por token que significam "esse token nunca mais vai funcionar"
+ERROS_TOKEN_MORTO = {'NotRegistered', 'InvalidRegistration', 'MismatchSenderId'}
+
+_sessao = None
+_sessao_lock = threading.Lock()
+
+
+def sessao_http():
+    """Session compartilhada (pool de conexões) para o FCM."""
+    global _sessao
+    if _sessao is None:
+        with _sessao_lock:
+            if _sessao is None:
+                pool = max(_concorrencia(), 1)
+                sessao = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool)
+                sessao.mount('https://', adapter)
+                sessao.mount('http://', adapter)
+                _sessao = sessao
+    return _sessao
+
+
+def _concorrencia():
+    return getattr(settings, 'FCM_CONCORRENCIA', CONCORRENCIA_PADRAO)
+
+
+def _lote_max():
+    return min(getattr(settings, 'FCM_LOTE_MAX', LOTE_MAX_FCM), LOTE_MAX_FCM)
+
+
+def dividir_em_lotes(tokens, tamanho):
+    return [tokens[i:i + tamanho] for i in range(0, len(tokens), tamanho)]
+
+
+def payload_vaga(vaga):
+    """Notificação + dados de "nova vaga" (mesmo formato usado pelo app)."""
+    notificacao = {
+        "title": "Nova Vaga Disponível!",
+        "body": f"{vaga.titulo} - R$ {vaga.remuneracao}",
+        "sound": "default",
+        "badge": "1",
+        "icon": "ic_notification",
+        "color": "#667eea",
+    }
+    dados = {
+        'vaga_id': str(vaga.id),
+        'titulo': vaga.titulo,
+        'remuneracao': str(vaga.remuneracao),
+        'tipo_remuneracao': vaga.tipo_remuneracao,
+        'evento_nome': vaga.setor.evento.nome if vaga.setor and vaga.setor.evento else '',
+        'setor_nome': vaga.setor.nome if vaga.setor else '',
+    }
+    return notificacao, dados
+
+
+class DespachantePush:
+    """
+    Envia uma mesma notificação para muitos device tokens.
+
+    ``remover_tokens_mortos=False`` desliga a limpeza em ``Freelance`` (ex.: testes
+    de carga ou tokens que não vêm do cadastro de freelancers).
+    """
+
+    def __init__(self, server_key=None, url=None, remover_tokens_mortos=True):
+        self.server_key = server_key if server_key is not None else getattr(settings, 'FCM_SERVER_KEY', None)
+        self.url = url or getattr(settings, 'FCM_URL', FCM_URL_PADRAO)
+        self.remover_tokens_mortos = remover_tokens_mortos
+
+    def configurado(self):
+        return bool(self.server_key)
+
+    def despachar(self, tokens, notificacao, dados=None, prioridade='high'):
+        """
+        Envia para todos os ``tokens`` (duplicados e vazios são ignorados).
+
+        Returns:
+            dict: total, lotes, enviados, falhas, tokens_removidos, tokens_atualizados,
+            lotes_com_erro e ``detalhes_lotes`` (enviados/falhas/erro por lote)
+        """
+        tokens = list(dict.fromkeys(t for t in tokens if t))
+        stats = {
+            'total': len(tokens),
+            'lotes': 0,
+            'enviados': 0,
+            'falhas': 0,
+            'tokens_removidos': 0,
+            'tokens_atualizados': 0,
+            'lotes_com_erro': 0,
+            'detalhes_lotes': [],
+        }
+        if not tokens:
+            return stats
+        if not self.configurado():
+            logger.warning("FCM_SERVER_KEY não configurado - push não enviado")
+            stats['falhas'] = len(tokens)
+            return stats
+
+        lotes = dividir_em_lotes(tokens, _lote_max())
+        stats['lotes'] = len(lotes)
+        corpo_base = {"notification": notificacao, "data": dados or {}, "priority": prioridade}
+
+        workers = min(_concorrencia(), len(lotes))
+        if workers <= 1:
+            resultados = [self._enviar_lote(lote, corpo_base) for lote in lotes]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='push') as pool:
+                resultados = list(pool.map(lambda lote: self._enviar_lote(lote, corpo_base), lotes))
+
+        mortos, canonicos = [], {}
+        for resultado in resultados:
+            stats['enviados'] += resultado['enviados']
+            stats['falhas'] += resultado['falhas']
+            if resultado['erro']:
+                stats['lotes_com_erro'] += 1
+            mortos.extend(resultado['mortos'])
+            canonicos.update(resultado['canonicos'])
+            stats['detalhes_lotes'].append({
+                'tokens': resultado['tokens'],
+                'enviados': resultado['enviados'],
+                'falhas': resultado['falhas'],
+                'erro': resultado['erro'],
+            })
+
+        if self.remover_tokens_mortos:
+            stats['tokens_removidos'] = self._remover_tokens(mortos)
+            stats['tokens_atualizados'] = self._atualizar_tokens(canonicos)
+
+        logger.info(
+            "Push: %s/%s enviados em %s lote(s), %s token(s) removido(s)",
+            stats['enviados'], stats['total'], stats['lotes'], stats['tokens_removidos'],
+        )
+        return stats
+
+    def _enviar_lote(self, lote, corpo_base):
+        resultado = {'tokens': len(lote), 'enviados': 0, 'falhas': len(lote), 'erro': None,
+                     'mortos': [], 'canonicos': {}}
+        corpo = dict(corpo_base, registration_ids=lote)
+        headers = {"Authorization": f"key={self.server_key}", "Content-Type": "application/json"}
+        try:
+            response = sessao_http().post(self.url, data=json.dumps(corpo), headers=headers, timeout=TIMEOUT_SEGUNDOS)
+        except requests.RequestException as e:
+            resultado['erro'] = str(e)
+            logger.warning("Push: falha de rede no lote de %s token(s): %s", len(lote), e)
+            return resultado
+        if response.status_code != 200:
+            resultado['erro'] = f"HTTP {response.status_code}"
+            logger.warning("Push: HTTP %s no lote de %s token(s): %s", response.status_code, len(lote), response.text[:200])
+            return resultado
+
+        try:
+            itens = response.json().get('results') or []
+        except ValueError:
+            resultado['erro'] = 'Resposta inválida do FCM'
+            return resultado
+
+        resultado['falhas'] = 0
+        for token, item in zip(lote, itens):
+            if 'message_id' in item:
+                resultado['enviados'] += 1
+                if item.get('registration_id'):
+                    resultado['canonicos'][token] = item['registration_id']
+            else:
+                resultado['falhas'] += 1
+                if item.get('error') in ERROS_TOKEN_MORTO:
+                    resultado['mortos'].append(token)
+        # Resposta com menos itens que tokens: o resto conta como falha
+        resultado['falhas'] += max(len(lote) - len(itens), 0)
+        return resultado
+
+    def _remover_tokens(self, tokens):
+        if not tokens:
+            return 0
+        return Freelance.objects.filter(device_token__in=tokens).update(device_token=None)
+
+    def _atualizar_tokens(self, canonicos):
+        atualizados = 0
+        for antigo, novo in canonicos.items():
+            atualizados += Freelance.objects.filter(device_token=antigo).update(device_token=novo)
+        return atualizados
+
+    def despachar_vaga(self, tokens, vaga):
+        """Atalho para a notificação de nova vaga."""
+        notificacao, dados = payload_vaga(vaga)
+        return self.despachar(tokens, notificacao, dados)
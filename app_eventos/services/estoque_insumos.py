@@ -0,0 +1,390 @@
+"""
+Movimentações de estoque dos insumos com saldos desnormalizados.
+
+Toda operação grava uma linha em ``MovimentacaoInsumo`` (livro-razão, só
+inclusão) e atualiza os saldos correntes na mesma transação com
+``UPDATE ... SET campo = campo + n WHERE <há saldo>``: a checagem e a baixa
+acontecem numa única instrução, então duas alocações concorrentes não
+conseguem reservar o mesmo estoque (sem read-modify-write em Python).
+
+Saldos por nível:
+- Insumo: ``estoque_atual`` (entradas/ajustes), ``quantidade_alocada_eventos``
+  e ``quantidade_utilizada_eventos`` (somas de InsumoEvento);
+- InsumoEvento: alocada para o evento, distribuída aos setores e utilizada;
+- InsumoSetor: alocada e utilizada.
+
+Com isso ``Insumo.estoque_real_disponivel`` é O(1) e listagens/relatórios
+leem a disponibilidade direto das colunas (``insumos_com_disponibilidade``).
+Saves diretos de InsumoEvento recalculam os totais do insumo (signals_estoque.py)
+e o comando ``reconciliar_estoque_insumos`` corrige qualquer outra deriva.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from app_eventos.models import (
+    DashboardEstoque,
+    Insumo,
+    InsumoEvento,
+    InsumoSetor,
+    MovimentacaoInsumo,
+    RelatorioEstoque,
+)
+
+logger = logging.getLogger(__name__)
+
+DIAS_ALERTA_VALIDADE = 30
+
+
+class EstoqueInsuficiente(Exception):
+    """Não há saldo para a movimentação pedida."""
+
+
+def _validar_quantidade(quantidade):
+    if not isinstance(quantidade, int) or quantidade <= 0:
+        raise ValueError("A quantidade deve ser um inteiro positivo.")
+
+
+def _movimentar(modelo, pk, condicao, **deltas):
+    """UPDATE condicional de saldos; levanta EstoqueInsuficiente se a condição não vale."""
+    atualizados = modelo.objects.filter(condicao, pk=pk).update(
+        **{campo: F(campo) + delta for campo, delta in deltas.items()}
+    )
+    if not atualizados:
+        raise EstoqueInsuficiente("Estoque insuficiente")
+
+
+def _recarregar(*objetos):
+    campos = {
+        Insumo: ['estoque_atual', 'quantidade_alocada_eventos', 'quantidade_utilizada_eventos'],
+        InsumoEvento: ['quantidade_alocada_evento', 'quantidade_distribuida_setores', 'quantidade_utilizada_evento'],
+        InsumoSetor: ['quantidade_alocada', 'quantidade_utilizada'],
+    }
+    for obj in objetos:
+        obj.refresh_from_db(fields=campos[type(obj)])
+
+
+def _registrar(insumo_id, tipo, quantidade, responsavel=None, observacao='', insumo_evento_id=None,
+               insumo_setor_id=None) -> MovimentacaoInsumo:
+    return MovimentacaoInsumo.objects.create(
+        insumo_id=insumo_id,
+        insumo_evento_id=insumo_evento_id,
+        insumo_setor_id=insumo_setor_id,
+        tipo=tipo,
+        quantidade=quantidade,
+        responsavel=responsavel,
+        observacao=observacao or '',
+    )
+
+
+# ----- movimentações -----
+
+def registrar_entrada(insumo, quantidade, responsavel=None, observacao='') -> MovimentacaoInsumo:
+    """Entrada no estoque geral (compra, doação, retorno do fornecedor...)."""
+    _validar_quantidade(quantidade)
+    with transaction.atomic():
+        _movimentar(Insumo, insumo.pk, Q(), estoque_atual=quantidade)
+        movimentacao = _registrar(insumo.pk, 'entrada', quantidade, responsavel, observacao)
+    _recarregar(insumo)
+    return movimentacao
+
+
+def ajustar_estoque(insumo, diferenca, responsavel=None, observacao='') -> MovimentacaoInsumo:
+    """Ajuste (inventário, perda) de ``diferenca`` unidades, com sinal; o estoque não fica negativo."""
+    if not isinstance(diferenca, int) or diferenca == 0:
+        raise ValueError("A diferença do ajuste deve ser um inteiro diferente de zero.")
+    with transaction.atomic():
+        _movimentar(Insumo, insumo.pk, Q(estoque_atual__gte=-diferenca), estoque_atual=diferenca)
+        movimentacao = _registrar(insumo.pk, 'ajuste', diferenca, responsavel, observacao)
+    _recarregar(insumo)
+    return movimentacao
+
+
+def alocar_para_evento(insumo, evento, quantidade, responsavel=None, observacao='') -> InsumoEvento:
+    """
+    Reserva ``quantidade`` do estoque realmente disponível (atual - mínimo -
+    já alocado) para o evento, criando o InsumoEvento se preciso.
+    """
+    _validar_quantidade(quantidade)
+    with transaction.atomic():
+        insumo_evento, _ = InsumoEvento.objects.get_or_create(
+            evento=evento, insumo=insumo, defaults={'responsavel_alocacao': responsavel}
+        )
+        _movimentar(
+            Insumo, insumo.pk,
+            Q(estoque_atual__gte=F('estoque_minimo') + F('quantidade_alocada_eventos') + quantidade),
+            quantidade_alocada_eventos=quantidade,
+        )
+        InsumoEvento.objects.filter(pk=insumo_evento.pk).update(
+            quantidade_alocada_evento=F('quantidade_alocada_evento') + quantidade,
+            responsavel_alocacao=responsavel,
+            atualizado_em=timezone.now(),
+        )
+        _registrar(insumo.pk, 'alocacao', quantidade, responsavel, observacao, insumo_evento_id=insumo_evento.pk)
+    insumo_evento.responsavel_alocacao = responsavel
+    _recarregar(insumo, insumo_evento)
+    return insumo_evento
+
+
+def alocar_para_setor(insumo_setor, quantidade, responsavel=None, observacao='') -> InsumoSetor:
+    """Distribui ``quantidade`` do estoque alocado ao evento para o setor."""
+    _validar_quantidade(quantidade)
+    insumo_evento = insumo_setor.insumo_evento
+    with transaction.atomic():
+        _movimentar(
+            InsumoEvento, insumo_evento.pk,
+            Q(quantidade_alocada_evento__gte=F('quantidade_distribuida_setores') + quantidade),
+            quantidade_distribuida_setores=quantidade,
+        )
+        _movimentar(InsumoSetor, insumo_setor.pk, Q(), quantidade_alocada=quantidade)
+        _registrar(
+            insumo_evento.insumo_id, 'alocacao', quantidade, responsavel, observacao,
+            insumo_evento_id=insumo_evento.pk, insumo_setor_id=insumo_setor.pk,
+        )
+    _recarregar(insumo_setor, insumo_evento)
+    return insumo_setor
+
+
+def registrar_utilizacao(insumo_setor, quantidade, responsavel=None, observacao='') -> InsumoSetor:
+    """Consome ``quantidade`` do que foi alocado ao setor (até o total alocado)."""
+    _validar_quantidade(quantidade)
+    insumo_evento = insumo_setor.insumo_evento
+    with transaction.atomic():
+        _movimentar(
+            InsumoSetor, insumo_setor.pk,
+            Q(quantidade_alocada__gte=F('quantidade_utilizada') + quantidade),
+            quantidade_utilizada=quantidade,
+        )
+        _movimentar(InsumoEvento, insumo_evento.pk, Q(), quantidade_utilizada_evento=quantidade)
+        _movimentar(Insumo, insumo_evento.insumo_id, Q(), quantidade_utilizada_eventos=quantidade)
+        _registrar(
+            insumo_evento.insumo_id, 'utilizacao', quantidade, responsavel, observacao,
+            insumo_evento_id=insumo_evento.pk, insumo_setor_id=insumo_setor.pk,
+        )
+    _recarregar(insumo_setor, insumo_evento)
+    return insumo_setor
+
+
+def devolver_ao_evento(insumo_setor, quantidade, responsavel=None, observacao='') -> InsumoSetor:
+    """Devolve ao estoque do evento uma quantidade não utilizada no setor."""
+    _validar_quantidade(quantidade)
+    insumo_evento = insumo_setor.insumo_evento
+    with transaction.atomic():
+        _movimentar(
+            InsumoSetor, insumo_setor.pk,
+            Q(quantidade_alocada__gte=F('quantidade_utilizada') + quantidade),
+            quantidade_alocada=-quantidade,
+        )
+        _movimentar(
+            InsumoEvento, insumo_evento.pk,
+            Q(quantidade_distribuida_setores__gte=quantidade),
+            quantidade_distribuida_setores=-quantidade,
+        )
+        _registrar(
+            insumo_evento.insumo_id, 'devolucao', quantidade, responsavel, observacao,
+            insumo_evento_id=insumo_evento.pk, insumo_setor_id=insumo_setor.pk,
+        )
+    _recarregar(insumo_setor, insumo_evento)
+    return insumo_setor
+
+
+def devolver_ao_estoque(insumo_evento, quantidade, responsavel=None, observacao='') -> InsumoEvento:
+    """Libera para o estoque geral uma quantidade alocada ao evento e não distribuída."""
+    _validar_quantidade(quantidade)
+    with transaction.atomic():
+        _movimentar(
+            InsumoEvento, insumo_evento.pk,
+            Q(quantidade_alocada_evento__gte=F('quantidade_distribuida_setores') + quantidade),
+            quantidade_alocada_evento=-quantidade,
+        )
+        _movimentar(
+            Insumo, insumo_evento.insumo_id,
+            Q(quantidade_alocada_eventos__gte=quantidade),
+            quantidade_alocada_eventos=-quantidade,
+        )
+        _registrar(
+            insumo_evento.insumo_id, 'devolucao', quantidade, responsavel, observacao,
+            insumo_evento_id=insumo_evento.pk,
+        )
+    _recarregar(insumo_evento)
+    return insumo_evento
+
+
+# ----- totais e reconciliação -----
+
+def _soma_eventos(campo):
+    return Coalesce(
+        Subquery(
+            InsumoEvento.objects.filter(insumo=OuterRef('pk'))
+            .values('insumo').annotate(total=Sum(campo)).values('total')[:1],
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def recalcular_totais_insumos(insumo_ids) -> int:
+    """Recalcula os totais por evento dos insumos informados num único UPDATE."""
+    return Insumo.objects.filter(pk__in=list(insumo_ids)).update(
+        quantidade_alocada_eventos=_soma_eventos('quantidade_alocada_evento'),
+        quantidade_utilizada_eventos=_soma_eventos('quantidade_utilizada_evento'),
+    )
+
+
+def reconciliar_estoque(insumo_ids=None, incluir_setores=False, tamanho_lote=1000):
+    """
+    Recalcula os saldos desnormalizados a partir das linhas de origem e corrige a deriva.
+
+    - Insumo: totais alocado/utilizado = soma de InsumoEvento;
+    - com ``incluir_setores``, antes disso, InsumoEvento distribuído/utilizado =
+      soma de InsumoSetor (para eventos que têm setores).
+
+    Retorna a lista de (modelo, id, {campo: (materializado, real)}) divergentes.
+    """
+    if insumo_ids is None:
+        insumo_ids = Insumo.objects.order_by('pk').values_list('pk', flat=True)
+    insumo_ids = list(insumo_ids)
+    divergencias = []
+
+    for inicio in range(0, len(insumo_ids), tamanho_lote):
+        lote = insumo_ids[inicio:inicio + tamanho_lote]
+        with transaction.atomic():
+            if incluir_setores:
+                eventos = (
+                    InsumoEvento.objects.select_for_update()
+                    .filter(insumo_id__in=lote, setores_distribuicao__isnull=False)
+                    .annotate(
+                        real_distribuida=Sum('setores_distribuicao__quantidade_alocada'),
+                        real_utilizada=Sum('setores_distribuicao__quantidade_utilizada'),
+                    )
+                )
+                corrigidos = []
+                for ie in eventos:
+                    reais = {
+                        'quantidade_distribuida_setores': ie.real_distribuida,
+                        'quantidade_utilizada_evento': ie.real_utilizada,
+                    }
+                    diff = {c: (getattr(ie, c), v) for c, v in reais.items() if getattr(ie, c) != v}
+                    if diff:
+                        divergencias.append(('InsumoEvento', ie.pk, diff))
+                        for campo, valor in reais.items():
+                            setattr(ie, campo, valor)
+                        corrigidos.append(ie)
+                InsumoEvento.objects.bulk_update(corrigidos, ['quantidade_distribuida_setores', 'quantidade_utilizada_evento'])
+
+            insumos = Insumo.objects.select_for_update().filter(pk__in=lote).annotate(
+                real_alocada=_soma_eventos('quantidade_alocada_evento'),
+                real_utilizada=_soma_eventos('quantidade_utilizada_evento'),
+            )
+            corrigidos = []
+            for insumo in insumos:
+                reais = {
+                    'quantidade_alocada_eventos': insumo.real_alocada,
+                    'quantidade_utilizada_eventos': insumo.real_utilizada,
+                }
+                diff = {c: (getattr(insumo, c), v) for c, v in reais.items() if getattr(insumo, c) != v}
+                if diff:
+                    divergencias.append(('Insumo', insumo.pk, diff))
+                    for campo, valor in reais.items():
+                        setattr(insumo, campo, valor)
+                    corrigidos.append(insumo)
+            Insumo.objects.bulk_update(corrigidos, ['quantidade_alocada_eventos', 'quantidade_utilizada_eventos'])
+
+    if divergencias:
+        logger.warning("Estoque de insumos: %s saldo(s) divergente(s) corrigido(s)", len(divergencias))
+    return divergencias
+
+
+# ----- leitura (listagens, dashboard e relatórios) -----
+
+def insumos_com_disponibilidade(queryset=None):
+    """Anota ``disponivel_real`` (atual - mínimo - alocado, >= 0) direto das colunas."""
+    queryset = queryset if queryset is not None else Insumo.objects.all()
+    return queryset.annotate(
+        disponivel_real=Greatest(
+            F('estoque_atual') - F('estoque_minimo') - F('quantidade_alocada_eventos'),
+            Value(0),
+            output_field=IntegerField(),
+        )
+    )
+
+
+def atualizar_dashboard_estoque(empresa_ids) -> int:
+    """Atualiza os contadores de insumos de DashboardEstoque com uma consulta agrupada por empresa."""
+    empresa_ids = list(empresa_ids)
+    hoje = timezone.localdate()
+    contagens = {
+        linha['empresa_contratante_id']: linha
+        for linha in Insumo.objects.filter(empresa_contratante_id__in=empresa_ids, ativo=True)
+        .values('empresa_contratante_id')
+        .annotate(
+            total=Count('id'),
+            baixo=Count('id', filter=Q(estoque_atual__lte=F('estoque_minimo'))),
+            vencendo=Count('id', filter=Q(
+                data_validade__gte=hoje, data_validade__lte=hoje + timedelta(days=DIAS_ALERTA_VALIDADE)
+            )),
+        )
+    }
+    with transaction.atomic():
+        existentes = {d.empresa_contratante_id: d for d in DashboardEstoque.objects.filter(empresa_contratante_id__in=empresa_ids)}
+        novos, alterados = [], []
+        for empresa_id in empresa_ids:
+            linha = contagens.get(empresa_id, {})
+            valores = {
+                'total_insumos': linha.get('total', 0),
+                'insumos_estoque_baixo': linha.get('baixo', 0),
+                'insumos_vencendo': linha.get('vencendo', 0),
+            }
+            dashboard = existentes.get(empresa_id)
+            if dashboard is None:
+                novos.append(DashboardEstoque(empresa_contratante_id=empresa_id, **valores))
+                continue
+            for campo, valor in valores.items():
+                setattr(dashboard, campo, valor)
+            dashboard.data_atualizacao = timezone.now()
+            alterados.append(dashboard)
+        DashboardEstoque.objects.bulk_create(novos, ignore_conflicts=True)
+        DashboardEstoque.objects.bulk_update(
+            alterados, ['total_insumos', 'insumos_estoque_baixo', 'insumos_vencendo', 'data_atualizacao']
+        )
+    return len(novos) + len(alterados)
+
+
+def gerar_relatorio_estoque(empresa, usuario, tipo_relatorio='estoque_geral', evento=None) -> RelatorioEstoque:
+    """
+    Gera um RelatorioEstoque ('estoque_geral' ou 'estoque_baixo') com a
+    disponibilidade de cada insumo lida das colunas de saldo (uma consulta).
+    Com ``evento``, lista os saldos do evento por insumo.
+    """
+    if evento is not None:
+        itens = list(
+            InsumoEvento.objects.filter(evento=evento).order_by('insumo__nome').values(
+                'insumo_id', 'insumo__codigo', 'insumo__nome', 'quantidade_total_necessaria',
+                'quantidade_alocada_evento', 'quantidade_distribuida_setores', 'quantidade_utilizada_evento',
+            )
+        )
+        titulo = f"Estoque do evento {evento.nome}"
+    else:
+        queryset = insumos_com_disponibilidade(Insumo.objects.filter(empresa_contratante=empresa, ativo=True))
+        if tipo_relatorio == 'estoque_baixo':
+            queryset = queryset.filter(estoque_atual__lte=F('estoque_minimo'))
+        itens = list(
+            queryset.order_by('nome').values(
+                'id', 'codigo', 'nome', 'unidade_medida', 'estoque_atual', 'estoque_minimo',
+                'quantidade_alocada_eventos', 'quantidade_utilizada_eventos', 'disponivel_real',
+            )
+        )
+        titulo = dict(RelatorioEstoque.TIPO_RELATORIO_CHOICES).get(tipo_relatorio, tipo_relatorio)
+
+    return RelatorioEstoque.objects.create(
+        empresa_contratante=empresa,
+        evento=evento,
+        tipo_relatorio=tipo_relatorio,
+        titulo=titulo,
+        dados_relatorio={'gerado_em': timezone.now().isoformat(), 'total_itens': len(itens), 'itens': itens},
+        gerado_por=usuario,
+    )
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Any
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Any, Iterable, List
 
 from django.db import transaction
 
@@ -17,6 +19,8 @@ from app_eventos.models import (
     DespesaEvento,
     ReceitaEvento,
 )
+from app_eventos.services.busca import agendar_indexacao
+from app_eventos.services.metricas_empresa import aplicar_deltas, diferenca_contribuicoes
 
 
 @dataclass
@@ -27,6 +31,9 @@ class EventCloneOptions:
     copy_tarefas: bool = True
     copy_insumos: bool = True
     copy_financeiro: bool = True
+    # Desloca as datas copiadas (vagas, prazos, vencimentos) pela diferença entre
+    # o início do clone e o do evento de origem
+    shift_dates: bool = False
 
     @classmethod
     def from_dict(cls, data: Optional[Dict[str, Any]]) -> "EventCloneOptions":
@@ -39,22 +46,57 @@ class EventCloneOptions:
         return options
 
 
+NOT_PROVIDED = object()
+
+
+@dataclass
+class EventCloneTarget:
+    nome: str
+    data_inicio: Any
+    data_fim: Any
+    descricao: Optional[str] = None
+    local: Any = NOT_PROVIDED
+    empresa_produtora: Any = NOT_PROVIDED
+
+
 @dataclass
 class EventCloneResult:
     event: Evento
     setor_map: Dict[int, SetorEvento] = field(default_factory=dict)
     insumo_evento_map: Dict[int, InsumoEvento] = field(default_factory=dict)
+    vaga_map: Dict[int, Vaga] = field(default_factory=dict)
+    checklist_map: Dict[int, ChecklistEvento] = field(default_factory=dict)
+    counts: Counter = field(default_factory=Counter)
 
 
-NOT_PROVIDED = object()
+@dataclass
+class _SourceGraph:
+    """Grafo do evento de origem, carregado uma única vez (uma consulta por tabela)."""
+    setores: List[SetorEvento]
+    vagas: List[Vaga]
+    checklists: List[ChecklistEvento]
+    tarefas: List[Tarefa]
+    insumos_evento: List[InsumoEvento]
+    insumos_setor: List[InsumoSetor]
+    despesas: List[DespesaEvento]
+    receitas: List[ReceitaEvento]
 
 
 class EventCloneService:
+    """
+    Clona um evento (setores, vagas, checklists, tarefas, insumos e financeiro).
+
+    O grafo de origem é lido em um número fixo de consultas e cada nível é
+    inserido com ``bulk_create`` para todos os destinos de uma vez, usando os
+    mapas id antigo → objeto novo para religar as FKs (setor da vaga, evento do
+    insumo, checklist do item). ``clone_events`` clona o mesmo modelo para
+    várias datas numa chamada.
+    """
+
     def __init__(self, *, usuario, evento_origem: Evento):
         self.usuario = usuario
         self.evento_origem = evento_origem
 
-    @transaction.atomic
     def clone_event(
         self,
         *,
@@ -66,181 +108,308 @@ class EventCloneService:
         empresa_produtora=NOT_PROVIDED,
         options: Optional[EventCloneOptions] = None,
     ) -> EventCloneResult:
-        options = options or EventCloneOptions()
-
-        evento_clone = Evento.objects.create(
-            empresa_contratante=self.evento_origem.empresa_contratante,
+        target = EventCloneTarget(
             nome=nome,
             data_inicio=data_inicio,
             data_fim=data_fim,
-            descricao=descricao if descricao is not None else self.evento_origem.descricao,
-            local=self.evento_origem.local if local is NOT_PROVIDED else local,
-            empresa_produtora=(
-                self.evento_origem.empresa_produtora if empresa_produtora is NOT_PROVIDED else empresa_produtora
-            ),
-            ativo=True,
+            descricao=descricao,
+            local=local,
+            empresa_produtora=empresa_produtora,
         )
+        return self.clone_events([target], options=options)[0]
+
+    @transaction.atomic
+    def clone_events(
+        self,
+        targets: Iterable[EventCloneTarget],
+        *,
+        options: Optional[EventCloneOptions] = None,
+    ) -> List[EventCloneResult]:
+        options = options or EventCloneOptions()
+        targets = list(targets)
+        if not targets:
+            return []
 
-        result = EventCloneResult(event=evento_clone)
+        source = self._load_source(options)
+        results = [EventCloneResult(event=self._create_event(target)) for target in targets]
+        offsets = [self._offset(result.event, options) for result in results]
 
         if options.copy_setores:
-            self._clone_setores(evento_clone, result)
+            self._clone_setores(source, results)
 
         if options.copy_insumos:
-            self._clone_insumos(evento_clone, result)
+            self._clone_insumos(source, results, offsets)
 
         if options.copy_vagas:
-            self._clone_vagas(evento_clone, result)
+            self._clone_vagas(source, results, offsets)
 
         if options.copy_checklists:
-            self._clone_checklists(evento_clone, result)
+            self._clone_checklists(source, results, offsets)
 
         if options.copy_tarefas:
-            self._clone_tarefas(evento_clone)
+            self._clone_tarefas(source, results, offsets)
 
         if options.copy_financeiro:
-            self._clone_financeiro(evento_clone)
-
-        return result
-
-    def _clone_setores(self, evento_clone: Evento, result: EventCloneResult) -> None:
-        for setor in self.evento_origem.setores.all():
-            novo_setor = SetorEvento.objects.create(
-                evento=evento_clone,
-                nome=setor.nome,
-                descricao=setor.descricao,
-                capacidade=setor.capacidade,
-                ativo=setor.ativo,
-            )
-            result.setor_map[setor.id] = novo_setor
-
-    def _clone_vagas(self, evento_clone: Evento, result: EventCloneResult) -> None:
-        for vaga in self.evento_origem.vagas_diretas.all():
-            setor_original_id = vaga.setor_id
-            setor_destino = result.setor_map.get(setor_original_id)
-
-            Vaga.objects.create(
-                evento=evento_clone,
-                setor=setor_destino,
-                empresa_contratante=vaga.empresa_contratante,
-                titulo=vaga.titulo,
-                funcao=vaga.funcao,
-                quantidade=vaga.quantidade,
-                quantidade_preenchida=0,
-                remuneracao=vaga.remuneracao,
-                tipo_remuneracao=vaga.tipo_remuneracao,
-                descricao=vaga.descricao,
-                requisitos=vaga.requisitos,
-                responsabilidades=vaga.responsabilidades,
-                beneficios=vaga.beneficios,
-                nivel_experiencia=vaga.nivel_experiencia,
-                experiencia_minima=vaga.experiencia_minima,
-                data_limite_candidatura=vaga.data_limite_candidatura,
-                data_inicio_trabalho=vaga.data_inicio_trabalho,
-                data_fim_trabalho=vaga.data_fim_trabalho,
-                ativa=False,
-                publicada=False,
-                urgente=vaga.urgente,
-                criado_por=vaga.criado_por,
-            )
-
-    def _clone_checklists(self, evento_clone: Evento, result: EventCloneResult) -> None:
-        for checklist in self.evento_origem.checklists.all():
-            novo_checklist = ChecklistEvento.objects.create(
-                empresa_contratante=checklist.empresa_contratante,
-                evento=evento_clone,
-                titulo=checklist.titulo,
-                descricao=checklist.descricao,
-                responsavel=checklist.responsavel,
-                data_limite=checklist.data_limite,
-                concluido=False,
-            )
-
-            for item in checklist.itens.all():
-                ItemChecklist.objects.create(
-                    checklist=novo_checklist,
-                    descricao=item.descricao,
-                    ordem=item.ordem,
-                    responsavel=item.responsavel,
-                    concluido=False,
-                    observacoes=item.observacoes,
-                )
-
-    def _clone_tarefas(self, evento_clone: Evento) -> None:
-        for tarefa in self.evento_origem.tarefas.all():
-            Tarefa.objects.create(
-                empresa_contratante=tarefa.empresa_contratante,
-                titulo=tarefa.titulo,
-                descricao=tarefa.descricao,
-                responsavel=tarefa.responsavel,
-                criado_por=tarefa.criado_por,
-                prioridade=tarefa.prioridade,
-                status='pendente',
-                data_limite=tarefa.data_limite,
-                evento_relacionado=evento_clone,
-            )
-
-    def _clone_insumos(self, evento_clone: Evento, result: EventCloneResult) -> None:
-        for insumo_evento in self.evento_origem.insumos_evento.all():
-            novo_insumo_evento = InsumoEvento.objects.create(
-                evento=evento_clone,
-                insumo=insumo_evento.insumo,
-                quantidade_total_necessaria=insumo_evento.quantidade_total_necessaria,
-                quantidade_alocada_evento=0,
-                quantidade_distribuida_setores=0,
-                quantidade_utilizada_evento=0,
-                responsavel_alocacao=insumo_evento.responsavel_alocacao,
-                observacoes=insumo_evento.observacoes,
-                status='pendente',
-            )
-            result.insumo_evento_map[insumo_evento.id] = novo_insumo_evento
-
-        if not result.insumo_evento_map:
+            self._clone_financeiro(source, results, offsets)
+
+        return results
+
+    # ------------------------------------------------------------------
+    # Origem e destinos
+    # ------------------------------------------------------------------
+
+    def _load_source(self, options: EventCloneOptions) -> _SourceGraph:
+        origem = self.evento_origem
+        return _SourceGraph(
+            setores=list(origem.setores.order_by('pk')) if options.copy_setores else [],
+            vagas=list(origem.vagas_diretas.order_by('pk')) if options.copy_vagas else [],
+            checklists=(
+                list(origem.checklists.order_by('pk').prefetch_related('itens')) if options.copy_checklists else []
+            ),
+            tarefas=list(origem.tarefas.order_by('pk')) if options.copy_tarefas else [],
+            insumos_evento=list(origem.insumos_evento.order_by('pk')) if options.copy_insumos else [],
+            insumos_setor=(
+                list(InsumoSetor.objects.filter(setor__evento=origem).order_by('pk'))
+                if options.copy_insumos and options.copy_setores else []
+            ),
+            despesas=list(origem.despesas.order_by('pk')) if options.copy_financeiro else [],
+            receitas=list(origem.receitas.order_by('pk')) if options.copy_financeiro else [],
+        )
+
+    def _create_event(self, target: EventCloneTarget) -> Evento:
+        # Um create por destino: mantém os signals de Evento (busca, métricas)
+        origem = self.evento_origem
+        return Evento.objects.create(
+            empresa_contratante=origem.empresa_contratante,
+            nome=target.nome,
+            data_inicio=target.data_inicio,
+            data_fim=target.data_fim,
+            descricao=target.descricao if target.descricao is not None else origem.descricao,
+            local=origem.local if target.local is NOT_PROVIDED else target.local,
+            empresa_produtora=(
+                origem.empresa_produtora if target.empresa_produtora is NOT_PROVIDED else target.empresa_produtora
+            ),
+            ativo=True,
+        )
+
+    def _offset(self, evento_clone: Evento, options: EventCloneOptions) -> timedelta:
+        if not options.shift_dates:
+            return timedelta(0)
+        inicio = evento_clone.data_inicio
+        if isinstance(inicio, str):
+            inicio = date.fromisoformat(inicio)
+        return inicio - self.evento_origem.data_inicio
+
+    @staticmethod
+    def _shift(valor, offset: timedelta):
+        if valor is None or not offset:
+            return valor
+        if isinstance(valor, (date, datetime)):
+            return valor + offset
+        return valor
+
+    @staticmethod
+    def _bulk(model, objs: list, result_maps=None):
+        """``bulk_create`` de ``objs``; ``result_maps`` = [(mapa, id_origem)] paralelo a ``objs``."""
+        if not objs:
+            return []
+        created = model.objects.bulk_create(objs)
+        if result_maps:
+            for obj, (mapa, origem_id) in zip(created, result_maps):
+                mapa[origem_id] = obj
+        return created
+
+    # ------------------------------------------------------------------
+    # Níveis
+    # ------------------------------------------------------------------
+
+    def _clone_setores(self, source: _SourceGraph, results: List[EventCloneResult]) -> None:
+        novos, mapas = [], []
+        for result in results:
+            for setor in source.setores:
+                novos.append(SetorEvento(
+                    evento=result.event,
+                    nome=setor.nome,
+                    descricao=setor.descricao,
+                    capacidade=setor.capacidade,
+                    ativo=setor.ativo,
+                ))
+                mapas.append((result.setor_map, setor.id))
+            result.counts['setores'] = len(source.setores)
+        self._bulk(SetorEvento, novos, mapas)
+
+    def _clone_vagas(self, source: _SourceGraph, results: List[EventCloneResult], offsets) -> None:
+        novas, mapas = [], []
+        for result, offset in zip(results, offsets):
+            for vaga in source.vagas:
+                novas.append(Vaga(
+                    evento=result.event,
+                    setor=result.setor_map.get(vaga.setor_id),
+                    empresa_contratante_id=vaga.empresa_contratante_id,
+                    titulo=vaga.titulo,
+                    funcao_id=vaga.funcao_id,
+                    quantidade=vaga.quantidade,
+                    quantidade_preenchida=0,
+                    remuneracao=vaga.remuneracao,
+                    tipo_remuneracao=vaga.tipo_remuneracao,
+                    descricao=vaga.descricao,
+                    requisitos=vaga.requisitos,
+                    responsabilidades=vaga.responsabilidades,
+                    beneficios=vaga.beneficios,
+                    nivel_experiencia=vaga.nivel_experiencia,
+                    experiencia_minima=vaga.experiencia_minima,
+                    data_limite_candidatura=self._shift(vaga.data_limite_candidatura, offset),
+                    data_inicio_trabalho=self._shift(vaga.data_inicio_trabalho, offset),
+                    data_fim_trabalho=self._shift(vaga.data_fim_trabalho, offset),
+                    ativa=False,
+                    publicada=False,
+                    urgente=vaga.urgente,
+                    criado_por_id=vaga.criado_por_id,
+                ))
+                mapas.append((result.vaga_map, vaga.id))
+            result.counts['vagas'] = len(source.vagas)
+        criadas = self._bulk(Vaga, novas, mapas)
+        if not criadas:
             return
 
-        for insumo_setor in InsumoSetor.objects.filter(setor__evento=self.evento_origem):
-            novo_setor = result.setor_map.get(insumo_setor.setor_id)
-            novo_insumo_evento = result.insumo_evento_map.get(insumo_setor.insumo_evento_id)
-
-            if not novo_insumo_evento:
-                continue
-
-            InsumoSetor.objects.create(
-                setor=novo_setor,
-                insumo_evento=novo_insumo_evento,
-                quantidade_necessaria=insumo_setor.quantidade_necessaria,
-                quantidade_alocada=0,
-                quantidade_transportada=0,
-                quantidade_utilizada=0,
-                observacoes=insumo_setor.observacoes,
-                data_necessidade=insumo_setor.data_necessidade,
-                responsavel_insumo=insumo_setor.responsavel_insumo,
-                status='pendente',
-            )
-
-    def _clone_financeiro(self, evento_clone: Evento) -> None:
-        for despesa in self.evento_origem.despesas.all():
-            DespesaEvento.objects.create(
-                evento=evento_clone,
-                categoria=despesa.categoria,
-                descricao=despesa.descricao,
-                valor=despesa.valor,
-                data_vencimento=despesa.data_vencimento,
-                fornecedor=despesa.fornecedor,
-                numero_documento=despesa.numero_documento,
-                status='pendente',
-                observacoes=despesa.observacoes,
-            )
-
-        for receita in self.evento_origem.receitas.all():
-            ReceitaEvento.objects.create(
-                evento=evento_clone,
-                categoria=receita.categoria,
-                descricao=receita.descricao,
-                valor=receita.valor,
-                data_vencimento=receita.data_vencimento,
-                cliente=receita.cliente,
-                numero_documento=receita.numero_documento,
-                status='pendente',
-                observacoes=receita.observacoes,
-            )
+        # bulk_create não dispara signals: métricas da empresa e busca são atualizadas aqui
+        from app_eventos.signals_metricas import RASTREADOS
+
+        _, _, contribuicao = RASTREADOS[Vaga]
+        aplicar_deltas(diferenca_contribuicoes([], [
+            parcela
+            for vaga in criadas
+            for parcela in contribuicao({
+                'empresa_contratante_id': vaga.empresa_contratante_id,
+                'ativa': vaga.ativa,
+                'quantidade': vaga.quantidade,
+            })
+        ]))
+        agendar_indexacao('vaga', [vaga.pk for vaga in criadas])
+
+    def _clone_checklists(self, source: _SourceGraph, results: List[EventCloneResult], offsets) -> None:
+        novos, mapas = [], []
+        for result, offset in zip(results, offsets):
+            for checklist in source.checklists:
+                novos.append(ChecklistEvento(
+                    empresa_contratante_id=checklist.empresa_contratante_id,
+                    evento=result.event,
+                    titulo=checklist.titulo,
+                    descricao=checklist.descricao,
+                    responsavel_id=checklist.responsavel_id,
+                    data_limite=self._shift(checklist.data_limite, offset),
+                    concluido=False,
+                ))
+                mapas.append((result.checklist_map, checklist.id))
+            result.counts['checklists'] = len(source.checklists)
+        self._bulk(ChecklistEvento, novos, mapas)
+
+        itens = []
+        for result in results:
+            for checklist in source.checklists:
+                novo_checklist = result.checklist_map[checklist.id]
+                for item in checklist.itens.all():
+                    itens.append(ItemChecklist(
+                        checklist=novo_checklist,
+                        descricao=item.descricao,
+                        ordem=item.ordem,
+                        responsavel_id=item.responsavel_id,
+                        concluido=False,
+                        observacoes=item.observacoes,
+                    ))
+            result.counts['itens_checklist'] = sum(len(c.itens.all()) for c in source.checklists)
+        self._bulk(ItemChecklist, itens)
+
+    def _clone_tarefas(self, source: _SourceGraph, results: List[EventCloneResult], offsets) -> None:
+        novas = []
+        for result, offset in zip(results, offsets):
+            for tarefa in source.tarefas:
+                novas.append(Tarefa(
+                    empresa_contratante_id=tarefa.empresa_contratante_id,
+                    titulo=tarefa.titulo,
+                    descricao=tarefa.descricao,
+                    responsavel_id=tarefa.responsavel_id,
+                    criado_por_id=tarefa.criado_por_id,
+                    prioridade=tarefa.prioridade,
+                    status='pendente',
+                    data_limite=self._shift(tarefa.data_limite, offset),
+                    evento_relacionado=result.event,
+                ))
+            result.counts['tarefas'] = len(source.tarefas)
+        self._bulk(Tarefa, novas)
+
+    def _clone_insumos(self, source: _SourceGraph, results: List[EventCloneResult], offsets) -> None:
+        novos, mapas = [], []
+        for result in results:
+            for insumo_evento in source.insumos_evento:
+                novos.append(InsumoEvento(
+                    evento=result.event,
+                    insumo_id=insumo_evento.insumo_id,
+                    quantidade_total_necessaria=insumo_evento.quantidade_total_necessaria,
+                    quantidade_alocada_evento=0,
+                    quantidade_distribuida_setores=0,
+                    quantidade_utilizada_evento=0,
+                    responsavel_alocacao_id=insumo_evento.responsavel_alocacao_id,
+                    observacoes=insumo_evento.observacoes,
+                    status='pendente',
+                ))
+                mapas.append((result.insumo_evento_map, insumo_evento.id))
+            result.counts['insumos_evento'] = len(source.insumos_evento)
+        # Saldos zerados: os totais do insumo (livro-razão de estoque) não mudam
+        self._bulk(InsumoEvento, novos, mapas)
+
+        novos = []
+        for result, offset in zip(results, offsets):
+            total = 0
+            for insumo_setor in source.insumos_setor:
+                novo_setor = result.setor_map.get(insumo_setor.setor_id)
+                novo_insumo_evento = result.insumo_evento_map.get(insumo_setor.insumo_evento_id)
+                if not novo_setor or not novo_insumo_evento:
+                    continue
+                novos.append(InsumoSetor(
+                    setor=novo_setor,
+                    insumo_evento=novo_insumo_evento,
+                    quantidade_necessaria=insumo_setor.quantidade_necessaria,
+                    quantidade_alocada=0,
+                    quantidade_transportada=0,
+                    quantidade_utilizada=0,
+                    observacoes=insumo_setor.observacoes,
+                    data_necessidade=self._shift(insumo_setor.data_necessidade, offset),
+                    responsavel_insumo_id=insumo_setor.responsavel_insumo_id,
+                    status='pendente',
+                ))
+                total += 1
+            result.counts['insumos_setor'] = total
+        self._bulk(InsumoSetor, novos)
+
+    def _clone_financeiro(self, source: _SourceGraph, results: List[EventCloneResult], offsets) -> None:
+        despesas, receitas = [], []
+        for result, offset in zip(results, offsets):
+            for despesa in source.despesas:
+                despesas.append(DespesaEvento(
+                    evento=result.event,
+                    categoria_id=despesa.categoria_id,
+                    descricao=despesa.descricao,
+                    valor=despesa.valor,
+                    data_vencimento=self._shift(despesa.data_vencimento, offset),
+                    fornecedor_id=despesa.fornecedor_id,
+                    numero_documento=despesa.numero_documento,
+                    status='pendente',
+                    observacoes=despesa.observacoes,
+                ))
+            for receita in source.receitas:
+                receitas.append(ReceitaEvento(
+                    evento=result.event,
+                    categoria_id=receita.categoria_id,
+                    descricao=receita.descricao,
+                    valor=receita.valor,
+                    data_vencimento=self._shift(receita.data_vencimento, offset),
+                    cliente=receita.cliente,
+                    numero_documento=receita.numero_documento,
+                    status='pendente',
+                    observacoes=receita.observacoes,
+                ))
+            result.counts['despesas'] = len(source.despesas)
+            result.counts['receitas'] = len(source.receitas)
+        self._bulk(DespesaEvento, despesas)
+        self._bulk(ReceitaEvento, receitas)
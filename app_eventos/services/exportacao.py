@@ -0,0 +1,399 @@
+"""
+Exportação de dados em fluxo (CSV, NDJSON, JSON e XLSX).
+
+Cada tipo exportável é uma ``FonteExportacao``: colunas permitidas
+(rótulo → caminho no ORM), colunas padrão e o escopo por usuário (admin do
+sistema vê tudo, usuário de empresa só a própria empresa, demais nada).
+
+As linhas saem de ``values_list(...).iterator(chunk_size=...)`` e os
+escritores produzem blocos de bytes conforme leem, então a memória fica
+constante qualquer que seja o tamanho da tabela:
+- ``resposta_streaming`` devolve um ``StreamingHttpResponse``;
+- ``solicitar_exportacao`` + ``processar_pendentes`` (comando
+  ``processar_exportacoes``) gravam exportações grandes em MEDIA_ROOT e o
+  cliente baixa pelo token de ``ExportacaoDados``. Exportações que ficam em
+  'processando' além de ``EXPORTACOES_TIMEOUT_PROCESSANDO`` (worker que caiu)
+  voltam para a fila.
+
+O XLSX é escrito à mão (planilha única, strings inline, sem tabela de strings
+compartilhadas) dentro de um zip em fluxo — não depende de openpyxl.
+"""
+import csv
+import json
+import logging
+import re
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import CharField, QuerySet, Value
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from app_eventos.models import DespesaEvento, Evento, ExportacaoDados, Freelance, ReceitaEvento, User
+
+logger = logging.getLogger(__name__)
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'json': 'application/json',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+LINHAS_POR_BLOCO = 500
+
+
+class ExportacaoInvalida(ValueError):
+    """Tipo, formato ou coluna não suportados."""
+
+
+# ---------------------------------------------------------------------------
+# Fontes
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class FonteExportacao:
+    colunas: Dict[str, str]
+    padrao: Tuple[str, ...]
+    escopo: Callable[[User], List[QuerySet]]
+
+
+def _por_empresa(queryset, campo_empresa):
+    def escopo(usuario):
+        if usuario.is_superuser or usuario.is_admin_sistema:
+            return [queryset()]
+        if usuario.is_empresa_user and usuario.empresa_contratante_id:
+            return [queryset().filter(**{campo_empresa: usuario.empresa_contratante_id})]
+        return []
+    return escopo
+
+
+def _freelancers(usuario):
+    # Freelancers são o banco global da plataforma (mesma regra do FreelancerDesktopViewSet)
+    if usuario.is_superuser or usuario.is_admin_sistema or usuario.is_empresa_user:
+        return [Freelance.objects.all()]
+    return []
+
+
+def _financeiro(usuario):
+    querysets = []
+    for modelo, natureza in ((DespesaEvento, 'despesa'), (ReceitaEvento, 'receita')):
+        escopo = _por_empresa(
+            lambda modelo=modelo, natureza=natureza: modelo.objects.annotate(
+                natureza=Value(natureza, output_field=CharField())
+            ),
+            'evento__empresa_contratante',
+        )
+        querysets.extend(escopo(usuario))
+    return querysets
+
+
+FONTES: Dict[str, FonteExportacao] = {
+    'usuarios': FonteExportacao(
+        colunas={
+            'username': 'username', 'email': 'email', 'nome': 'first_name', 'sobrenome': 'last_name',
+            'tipo_usuario': 'tipo_usuario', 'ativo': 'ativo', 'date_joined': 'date_joined',
+            'ultimo_acesso': 'data_ultimo_acesso',
+        },
+        padrao=('username', 'email', 'tipo_usuario', 'ativo', 'date_joined'),
+        escopo=_por_empresa(lambda: User.objects.all(), 'empresa_contratante'),
+    ),
+    'eventos': FonteExportacao(
+        colunas={
+            'id': 'id', 'nome': 'nome', 'data_inicio': 'data_inicio', 'data_fim': 'data_fim',
+            'ativo': 'ativo', 'local': 'local__nome', 'descricao': 'descricao', 'data_criacao': 'data_criacao',
+        },
+        padrao=('nome', 'data_inicio', 'data_fim', 'ativo'),
+        escopo=_por_empresa(lambda: Evento.objects.all(), 'empresa_contratante'),
+    ),
+    'freelancers': FonteExportacao(
+        colunas={
+            'id': 'id', 'nome_completo': 'nome_completo', 'cpf': 'cpf', 'telefone': 'telefone',
+            'email': 'usuario__email', 'cidade': 'cidade', 'uf': 'uf',
+            'cadastro_completo': 'cadastro_completo', 'score_confiabilidade': 'score_confiabilidade',
+        },
+        padrao=('nome_completo', 'cpf', 'telefone', 'cadastro_completo'),
+        escopo=_freelancers,
+    ),
+    'financeiro': FonteExportacao(
+        colunas={
+            'natureza': 'natureza', 'evento': 'evento__nome', 'categoria': 'categoria__nome',
+            'descricao': 'descricao', 'valor': 'valor', 'data_vencimento': 'data_vencimento', 'status': 'status',
+        },
+        padrao=('natureza', 'evento', 'categoria', 'descricao', 'valor', 'data_vencimento', 'status'),
+        escopo=_financeiro,
+    ),
+}
+
+
+def _fonte_e_colunas(tipo: str, colunas: Optional[Sequence[str]]) -> Tuple[FonteExportacao, Tuple[str, ...]]:
+    fonte = FONTES.get(tipo)
+    if fonte is None:
+        raise ExportacaoInvalida('Tipo de exportação inválido')
+    if not colunas:
+        return fonte, fonte.padrao
+    desconhecidas = [c for c in colunas if c not in fonte.colunas]
+    if desconhecidas:
+        raise ExportacaoInvalida(f"Colunas inválidas: {', '.join(desconhecidas)}")
+    return fonte, tuple(dict.fromkeys(colunas))
+
+
+def validar_pedido(tipo: str, formato: str, colunas: Optional[Sequence[str]] = None) -> Tuple[FonteExportacao, Tuple[str, ...]]:
+    """Confere tipo/formato/colunas e devolve (fonte, colunas escolhidas). Levanta ExportacaoInvalida."""
+    if formato not in FORMATOS:
+        raise ExportacaoInvalida(f"Formato inválido. Use: {', '.join(FORMATOS)}")
+    return _fonte_e_colunas(tipo, colunas)
+
+
+def linhas(tipo: str, usuario, colunas: Optional[Sequence[str]] = None, tamanho_lote: Optional[int] = None) -> Iterator[tuple]:
+    """Tuplas na ordem de ``colunas``, lidas do banco em lotes de ``tamanho_lote``."""
+    fonte, colunas = _fonte_e_colunas(tipo, colunas)
+    caminhos = [fonte.colunas[c] for c in colunas]
+    tamanho_lote = tamanho_lote or getattr(settings, 'EXPORTACAO_TAMANHO_LOTE', 2000)
+    return chain.from_iterable(
+        qs.order_by('pk').values_list(*caminhos).iterator(chunk_size=tamanho_lote)
+        for qs in fonte.escopo(usuario)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Escritores (iteráveis de bytes)
+# ---------------------------------------------------------------------------
+
+def _em_blocos(partes: Iterable[str]) -> Iterator[bytes]:
+    bloco = []
+    for parte in partes:
+        bloco.append(parte)
+        if len(bloco) >= LINHAS_POR_BLOCO:
+            yield ''.join(bloco).encode('utf-8')
+            bloco = []
+    if bloco:
+        yield ''.join(bloco).encode('utf-8')
+
+
+class _Eco:
+    """Pseudo-arquivo para o csv.writer: devolve a linha formatada em vez de guardá-la."""
+
+    def write(self, valor):
+        return valor
+
+
+def escrever_csv(colunas, registros) -> Iterator[bytes]:
+    escritor = csv.writer(_Eco())
+    return _em_blocos(chain([escritor.writerow(colunas)], (escritor.writerow(r) for r in registros)))
+
+
+def escrever_ndjson(colunas, registros) -> Iterator[bytes]:
+    return _em_blocos(
+        json.dumps(dict(zip(colunas, r)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n' for r in registros
+    )
+
+
+def escrever_json(colunas, registros) -> Iterator[bytes]:
+    """Mesmo formato de resposta que a exportação JSON sempre teve ({'dados': [...], ...}), em fluxo."""
+    def partes():
+        yield '{"formato": "json", "timestamp": %s, "dados": [' % json.dumps(timezone.now().isoformat())
+        for indice, registro in enumerate(registros):
+            yield (',' if indice else '') + json.dumps(dict(zip(colunas, registro)), cls=DjangoJSONEncoder, ensure_ascii=False)
+        yield ']}'
+    return _em_blocos(partes())
+
+
+_XML_INVALIDO = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_PARTES_XLSX = (
+    ('[Content_Types].xml',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+     '<Default Extension="xml" ContentType="application/xml"/>'
+     '<Override PartName="/xl/workbook.xml" '
+     'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+     '<Override PartName="/xl/worksheets/sheet1.xml" '
+     'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+     '</Types>'),
+    ('_rels/.rels',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+     '<Relationship Id="rId1" '
+     'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+     'Target="xl/workbook.xml"/></Relationships>'),
+    ('xl/workbook.xml',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+     'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+     '<sheets><sheet name="Dados" sheetId="1" r:id="rId1"/></sheets></workbook>'),
+    ('xl/_rels/workbook.xml.rels',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+     '<Relationship Id="rId1" '
+     'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+     'Target="worksheets/sheet1.xml"/></Relationships>'),
+)
+
+
+class _SaidaZip:
+    """Destino só-escrita do ZipFile: acumula os bytes até o gerador recolhê-los."""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, dados):
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def recolher(self) -> bytes:
+        dados = b''.join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+def _celula_xlsx(valor) -> str:
+    if valor is None:
+        return '<c/>'
+    if isinstance(valor, bool):
+        return f'<c t="b"><v>{int(valor)}</v></c>'
+    if isinstance(valor, (int, float, Decimal)):
+        return f'<c><v>{valor}</v></c>'
+    if isinstance(valor, (date, datetime)):
+        valor = valor.isoformat()
+    texto = escape(_XML_INVALIDO.sub('', str(valor)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{texto}</t></is></c>'
+
+
+def _linha_xlsx(numero, valores) -> bytes:
+    return f'<row r="{numero}">{"".join(_celula_xlsx(v) for v in valores)}</row>'.encode('utf-8')
+
+
+def escrever_xlsx(colunas, registros) -> Iterator[bytes]:
+    saida = _SaidaZip()
+    with zipfile.ZipFile(saida, 'w', zipfile.ZIP_DEFLATED) as pacote:
+        for nome, conteudo in _PARTES_XLSX:
+            pacote.writestr(nome, conteudo)
+        with pacote.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as planilha:
+            planilha.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            planilha.write(_linha_xlsx(1, colunas))
+            for numero, registro in enumerate(registros, start=2):
+                planilha.write(_linha_xlsx(numero, registro))
+                if numero % LINHAS_POR_BLOCO == 0:
+                    yield saida.recolher()
+            planilha.write(b'</sheetData></worksheet>')
+    yield saida.recolher()
+
+
+ESCRITORES = {
+    'csv': escrever_csv,
+    'ndjson': escrever_ndjson,
+    'json': escrever_json,
+    'xlsx': escrever_xlsx,
+}
+
+
+def gerar_conteudo(tipo: str, usuario, formato: str, colunas: Optional[Sequence[str]] = None) -> Iterator[bytes]:
+    """Arquivo de exportação como iterável de blocos de bytes."""
+    _, colunas = validar_pedido(tipo, formato, colunas)
+    return ESCRITORES[formato](colunas, linhas(tipo, usuario, colunas))
+
+
+def nome_arquivo(tipo: str, formato: str) -> str:
+    return f"{tipo}_{timezone.localtime():%Y%m%d_%H%M%S}.{formato}"
+
+
+def resposta_streaming(tipo: str, usuario, formato: str, colunas: Optional[Sequence[str]] = None) -> StreamingHttpResponse:
+    """StreamingHttpResponse com o arquivo; validação acontece antes do primeiro byte."""
+    conteudo = gerar_conteudo(tipo, usuario, formato, colunas)
+    resposta = StreamingHttpResponse(conteudo, content_type=FORMATOS[formato])
+    if formato != 'json':
+        resposta['Content-Disposition'] = f'attachment; filename="{nome_arquivo(tipo, formato)}"'
+    return resposta
+
+
+# ---------------------------------------------------------------------------
+# Modo assíncrono
+# ---------------------------------------------------------------------------
+
+def solicitar_exportacao(tipo: str, usuario, formato: str, colunas: Optional[Sequence[str]] = None) -> ExportacaoDados:
+    """Registra uma exportação pendente (gerada depois pelo comando ``processar_exportacoes``)."""
+    _, colunas = validar_pedido(tipo, formato, colunas)
+    return ExportacaoDados.objects.create(
+        tipo=tipo,
+        formato=formato,
+        colunas=list(colunas),
+        solicitado_por=usuario,
+        empresa_contratante_id=usuario.empresa_contratante_id,
+    )
+
+
+def processar_exportacao(exportacao: ExportacaoDados) -> ExportacaoDados:
+    """Gera o arquivo de uma exportação já reservada, contando as linhas no caminho."""
+    contador = {'linhas': 0}
+
+    def contando(registros):
+        for registro in registros:
+            contador['linhas'] += 1
+            yield registro
+
+    try:
+        _, colunas = validar_pedido(exportacao.tipo, exportacao.formato, exportacao.colunas)
+        registros = contando(linhas(exportacao.tipo, exportacao.solicitado_por, colunas))
+        with tempfile.TemporaryFile() as temporario:
+            for bloco in ESCRITORES[exportacao.formato](colunas, registros):
+                temporario.write(bloco)
+            temporario.seek(0)
+            exportacao.arquivo.save(nome_arquivo(exportacao.tipo, exportacao.formato), File(temporario), save=False)
+        exportacao.status = 'concluida'
+        exportacao.total_linhas = contador['linhas']
+        exportacao.erro = ''
+    except Exception as exc:
+        logger.exception("Falha na exportação %s", exportacao.token)
+        exportacao.status = 'erro'
+        exportacao.erro = str(exc)[:1000]
+    exportacao.concluido_em = timezone.now()
+    exportacao.save(update_fields=['arquivo', 'status', 'total_linhas', 'erro', 'concluido_em'])
+    return exportacao
+
+
+def liberar_travadas() -> int:
+    """Devolve para 'pendente' as exportações presas em 'processando' (worker que caiu no meio)."""
+    limite = timezone.now() - timedelta(seconds=getattr(settings, 'EXPORTACOES_TIMEOUT_PROCESSANDO', 3600))
+    liberadas = ExportacaoDados.objects.filter(status='processando', iniciado_em__lt=limite).update(
+        status='pendente', iniciado_em=None
+    )
+    if liberadas:
+        logger.warning("♻️ %s exportação(ões) presas em 'processando' voltaram para a fila", liberadas)
+    return liberadas
+
+
+def _reservar_proxima() -> Optional[ExportacaoDados]:
+    for pk in ExportacaoDados.objects.filter(status='pendente').order_by('criado_em').values_list('pk', flat=True)[:10]:
+        if ExportacaoDados.objects.filter(pk=pk, status='pendente').update(status='processando', iniciado_em=timezone.now()):
+            return ExportacaoDados.objects.select_related('solicitado_por').get(pk=pk)
+    return None
+
+
+def processar_pendentes(limite: Optional[int] = None) -> Dict[str, int]:
+    """Gera as exportações pendentes, uma por vez. Retorna {'processadas', 'concluidas', 'erros', 'linhas'}."""
+    liberar_travadas()
+    stats = {'processadas': 0, 'concluidas': 0, 'erros': 0, 'linhas': 0}
+    while limite is None or stats['processadas'] < limite:
+        exportacao = _reservar_proxima()
+        if exportacao is None:
+            break
+        processar_exportacao(exportacao)
+        stats['processadas'] += 1
+        stats['concluidas' if exportacao.status == 'concluida' else 'erros'] += 1
+        stats['linhas'] += exportacao.total_linhas
+    return stats
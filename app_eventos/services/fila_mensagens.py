@@ -0,0 +1,431 @@
+"""
+Fila persistente (outbox) para envio em massa de WhatsApp/SMS.
+
+Fluxo:
+- As views chamam ``enfileirar_broadcast`` e respondem na hora com o id do
+  ``BroadcastLog`` (job); nenhuma chamada ao Twilio acontece no request.
+- O comando ``processar_fila_mensagens`` reserva lotes de ``BroadcastOutbox``,
+  envia com um pool de threads limitado, respeitando o limite de mensagens por
+  segundo de cada canal, e reagenda falhas com backoff exponencial.
+- ``progresso_broadcast`` devolve o estado do job para polling.
+
+O cliente de envio é escolhido pelo provedor gravado no job (``meta['provedor']``):
+``ClienteTwilio`` usa o TwilioService (messaging service de produção, padrão dos
+broadcasts da API) e ``ClienteTwilioSandbox`` o TwilioServiceSandbox (número do
+sandbox/trial, usado pelas notificações de vagas). Um cliente injetado no
+processador, como o ``ClienteTwilioFake``, atende todos os jobs e permite testar
+o fluxo sem rede.
+"""
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from app_eventos.models_twilio import BroadcastLog, BroadcastMessage, BroadcastOutbox
+
+logger = logging.getLogger(__name__)
+
+# Valores padrão; podem ser sobrescritos em settings (FILA_MENSAGENS_*)
+RATE_LIMITS_PADRAO = {'sms': 10.0, 'whatsapp': 20.0}  # mensagens por segundo, por canal
+MAX_TENTATIVAS_PADRAO = 5
+BACKOFF_BASE_SEGUNDOS = 30
+BACKOFF_MAX_SEGUNDOS = 3600
+RESERVA_SEGUNDOS = 300
+
+
+class ErroEnvio(Exception):
+    """Falha ao enviar uma mensagem; ``definitivo`` indica que não vale a pena tentar de novo."""
+
+    def __init__(self, mensagem, definitivo=False):
+        super().__init__(mensagem)
+        self.definitivo = definitivo
+
+
+# ========== CLIENTES DE ENVIO ==========
+
+class ClienteTwilio:
+    """Envia pelo TwilioService (messaging service de produção)."""
+
+    def __init__(self):
+        from app_eventos.services.twilio_service import TwilioService
+        self.twilio = TwilioService()
+
+    def _enviar_whatsapp(self, to_address, body):
+        return self.twilio.send_whatsapp(to_address, body)
+
+    def enviar(self, to_address, body, channel):
+        """Envia uma mensagem e retorna o SID; levanta ErroEnvio em caso de falha."""
+        if not self.twilio.is_configured():
+            # Configuração não se resolve com nova tentativa
+            raise ErroEnvio('Twilio não configurado', definitivo=True)
+        if channel == 'whatsapp':
+            message = self._enviar_whatsapp(to_address, body)
+        else:
+            message = self.twilio.send_sms(to_address, body)
+        if not message:
+            raise ErroEnvio(f'Falha no envio por {channel} - resultado None')
+        return message.sid
+
+
+class ClienteTwilioSandbox(ClienteTwilio):
+    """Envia pelo TwilioServiceSandbox (número do sandbox/trial)."""
+
+    def __init__(self):
+        from app_eventos.services.twilio_service_sandbox import TwilioServiceSandbox
+        self.twilio = TwilioServiceSandbox()
+
+    def _enviar_whatsapp(self, to_address, body):
+        return self.twilio.send_whatsapp_sandbox(to_address, body)
+
+
+class ClienteTwilioFake:
+    """
+    Cliente em memória para testes e desenvolvimento (não acessa a rede).
+
+    ``falhas`` mapeia número → quantidade de falhas temporárias antes do sucesso;
+    números em ``invalidos`` falham definitivamente.
+    """
+
+    def __init__(self, falhas=None, invalidos=None):
+        self.falhas = dict(falhas or {})
+        self.invalidos = set(invalidos or [])
+        self.enviadas = []
+        self._lock = threading.Lock()
+
+    def enviar(self, to_address, body, channel):
+        with self._lock:
+            if to_address in self.invalidos:
+                raise ErroEnvio(f'Número inválido: {to_address}', definitivo=True)
+            if self.falhas.get(to_address, 0) > 0:
+                self.falhas[to_address] -= 1
+                raise ErroEnvio(f'Falha temporária para {to_address}')
+            self.enviadas.append((to_address, body, channel))
+            return f'SMfake{len(self.enviadas):08d}'
+
+
+PROVEDORES = {'twilio': ClienteTwilio, 'sandbox': ClienteTwilioSandbox}
+
+
+def obter_cliente_padrao(provedor='twilio'):
+    """
+    Cliente do ``provedor`` do job ('twilio' ou 'sandbox').
+
+    Com settings.FILA_MENSAGENS_CLIENTE = 'fake' todos os jobs usam o ClienteTwilioFake.
+    """
+    if getattr(settings, 'FILA_MENSAGENS_CLIENTE', 'twilio') == 'fake':
+        return ClienteTwilioFake()
+    return PROVEDORES.get(provedor, ClienteTwilio)()
+
+
+class LimitadorTaxa:
+    """Token bucket thread-safe por canal (mensagens por segundo)."""
+
+    def __init__(self, limites: Dict[str, float]):
+        self.limites = {canal: float(taxa) for canal, taxa in limites.items() if taxa}
+        self._proximo = {canal: 0.0 for canal in self.limites}
+        self._lock = threading.Lock()
+
+    def aguardar(self, canal):
+        taxa = self.limites.get(canal)
+        if not taxa:
+            return
+        with self._lock:
+            agora = time.monotonic()
+            inicio = max(agora, self._proximo[canal])
+            self._proximo[canal] = inicio + 1.0 / taxa
+        if inicio > agora:
+            time.sleep(inicio - agora)
+
+
+# ========== ENFILEIRAMENTO ==========
+
+def chave_idempotencia(chave_job, to_address, body):
+    """Chave estável por (job, destinatário, mensagem)."""
+    return hashlib.sha256(f'{chave_job}|{to_address}|{body}'.encode('utf-8')).hexdigest()
+
+
+@transaction.atomic
+def enfileirar_broadcast(
+    *,
+    empresa_contratante,
+    campaign_name,
+    mensagens: Iterable[tuple],
+    channel_preferred='sms',
+    evento=None,
+    created_by=None,
+    chave_job=None,
+    body_template='',
+    provedor='twilio',
+):
+    """
+    Cria o job (BroadcastLog) e as linhas da fila numa única transação.
+
+    Args:
+        mensagens: pares (to_address, body); destinatários repetidos são ignorados.
+        chave_job: identifica a solicitação para idempotência; reenviar o mesmo
+            pedido com a mesma chave devolve o job existente sem duplicar mensagens.
+        provedor: 'twilio' (produção) ou 'sandbox'; define o cliente usado pelo worker.
+
+    Returns:
+        BroadcastLog: o job criado (``id`` é o identificador para polling).
+    """
+    if chave_job:
+        existente = BroadcastLog.objects.filter(meta__chave_job=chave_job).first()
+        if existente:
+            return existente  # Solicitação repetida: devolve o mesmo job
+    chave_job = chave_job or uuid.uuid4().hex
+    linhas = {}
+    for to_address, body in mensagens:
+        chave = chave_idempotencia(chave_job, to_address, body)
+        linhas.setdefault(chave, (to_address, body))
+
+    broadcast = BroadcastLog.objects.create(
+        empresa_contratante=empresa_contratante,
+        campaign_name=campaign_name,
+        body_template=body_template or (next(iter(linhas.values()))[1] if linhas else ''),
+        channel_preferred=channel_preferred,
+        evento=evento,
+        total_targets=0,
+        created_by=created_by,
+        meta={'chave_job': chave_job, 'origem': 'fila_mensagens', 'provedor': provedor},
+    )
+    BroadcastOutbox.objects.bulk_create(
+        [
+            BroadcastOutbox(
+                broadcast=broadcast,
+                idempotency_key=chave,
+                to_address=to_address,
+                body=body,
+                channel_preferred=channel_preferred,
+            )
+            for chave, (to_address, body) in linhas.items()
+        ],
+        ignore_conflicts=True,
+        batch_size=1000,
+    )
+    # Conta o que realmente entrou (chaves já existentes foram ignoradas)
+    broadcast.total_targets = broadcast.outbox.count()
+    if broadcast.total_targets == 0:
+        broadcast.completed_at = timezone.now()
+    broadcast.save(update_fields=['total_targets', 'completed_at'])
+    logger.info(f"📥 Broadcast {broadcast.id} enfileirado: {broadcast.total_targets} mensagens")
+    return broadcast
+
+
+def progresso_broadcast(broadcast: BroadcastLog) -> Dict:
+    """Estado do job para polling (uma consulta agregada)."""
+    contagem = broadcast.outbox.aggregate(
+        total=Count('id'),
+        enviados=Count('id', filter=Q(status='sent')),
+        falhas=Count('id', filter=Q(status='failed')),
+    )
+    pendentes = contagem['total'] - contagem['enviados'] - contagem['falhas']
+    return {
+        'job_id': broadcast.id,
+        'status': 'concluido' if pendentes == 0 else 'processando',
+        'concluido': pendentes == 0,
+        'total': contagem['total'],
+        'enviados': contagem['enviados'],
+        'falhas': contagem['falhas'],
+        'pendentes': pendentes,
+        'concluido_em': broadcast.completed_at.isoformat() if broadcast.completed_at else None,
+    }
+
+
+# ========== WORKER ==========
+
+class ProcessadorFilaMensagens:
+    """
+    Drena a fila em lotes: reserva, envia em paralelo e grava os resultados.
+
+    As threads fazem apenas a chamada ao provedor; toda escrita no banco acontece
+    na thread principal.
+    """
+
+    def __init__(
+        self,
+        cliente=None,
+        max_workers=None,
+        tamanho_lote=100,
+        rate_limits=None,
+        max_tentativas=None,
+    ):
+        # Injetado: atende todos os jobs; senão um cliente por provedor, criado sob demanda
+        self.cliente = cliente
+        self._clientes = {}
+        self.max_workers = max_workers or getattr(settings, 'FILA_MENSAGENS_WORKERS', 8)
+        self.tamanho_lote = tamanho_lote
+        self.limitador = LimitadorTaxa(
+            rate_limits or getattr(settings, 'FILA_MENSAGENS_RATE_LIMITS', RATE_LIMITS_PADRAO)
+        )
+        self.max_tentativas = max_tentativas or getattr(
+            settings, 'FILA_MENSAGENS_MAX_TENTATIVAS', MAX_TENTATIVAS_PADRAO
+        )
+        self.worker_id = uuid.uuid4().hex[:8]
+
+    def processar_lote(self) -> Dict[str, int]:
+        """Reserva e processa um lote. Retorna {'processadas', 'enviadas', 'reagendadas', 'falhas'}."""
+        self._liberar_reservas_expiradas()
+        lote = self._reservar_lote()
+        stats = {'processadas': len(lote), 'enviadas': 0, 'reagendadas': 0, 'falhas': 0}
+        if not lote:
+            return stats
+
+        # Clientes criados aqui, antes das threads, que só os leem
+        for item in lote:
+            self._cliente(item.broadcast.meta.get('provedor'))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            resultados = list(pool.map(self._enviar, lote))
+
+        broadcasts = set()
+        for item, (sid, canal, erro) in zip(lote, resultados):
+            broadcasts.add(item.broadcast_id)
+            if erro is None:
+                if self._marcar_enviada(item, sid, canal):
+                    stats['enviadas'] += 1
+            elif self._registrar_falha(item, erro):
+                stats['reagendadas'] += 1
+            else:
+                stats['falhas'] += 1
+
+        self._atualizar_broadcasts(broadcasts)
+        return stats
+
+    def processar_pendentes(self, max_lotes=None) -> Dict[str, int]:
+        """Processa lotes até a fila (disponível agora) esvaziar."""
+        total = {'processadas': 0, 'enviadas': 0, 'reagendadas': 0, 'falhas': 0}
+        lotes = 0
+        while max_lotes is None or lotes < max_lotes:
+            stats = self.processar_lote()
+            if not stats['processadas']:
+                break
+            for chave, valor in stats.items():
+                total[chave] += valor
+            lotes += 1
+        return total
+
+    def _cliente(self, provedor):
+        if self.cliente is not None:
+            return self.cliente
+        provedor = provedor or 'twilio'
+        if provedor not in self._clientes:
+            self._clientes[provedor] = obter_cliente_padrao(provedor)
+        return self._clientes[provedor]
+
+    # ----- reserva -----
+
+    def _reservar_lote(self) -> List[BroadcastOutbox]:
+        agora = timezone.now()
+        token = uuid.uuid4().hex
+        ids = list(
+            BroadcastOutbox.objects.filter(status='queued', next_attempt_at__lte=agora)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:self.tamanho_lote]
+        )
+        if not ids:
+            return []
+        # UPDATE condicional: se outro worker reservou primeiro, a linha não é reservada aqui
+        BroadcastOutbox.objects.filter(id__in=ids, status='queued').update(
+            status='sending',
+            claim_token=token,
+            locked_until=agora + timedelta(seconds=RESERVA_SEGUNDOS),
+        )
+        return list(
+            BroadcastOutbox.objects.filter(claim_token=token, status='sending')
+            .select_related('broadcast')
+            .order_by('id')
+        )
+
+    def _liberar_reservas_expiradas(self):
+        """Devolve à fila linhas de workers que morreram no meio do envio."""
+        liberadas = BroadcastOutbox.objects.filter(
+            status='sending', locked_until__lt=timezone.now()
+        ).update(status='queued', claim_token='', locked_until=None)
+        if liberadas:
+            logger.warning(f"⚠️ {liberadas} mensagens com reserva expirada devolvidas à fila")
+
+    # ----- envio -----
+
+    def _enviar(self, item: BroadcastOutbox):
+        """Executado nas threads: retorna (sid, canal, erro)."""
+        canais = ['whatsapp', 'sms'] if item.channel_preferred in ('whatsapp', 'both') else ['sms']
+        cliente = self._cliente(item.broadcast.meta.get('provedor'))
+        erro = None
+        for canal in canais:
+            self.limitador.aguardar(canal)
+            try:
+                return cliente.enviar(item.to_address, item.body, canal), canal, None
+            except ErroEnvio as e:
+                erro = e
+            except Exception as e:  # falha inesperada do provedor: trata como temporária
+                erro = ErroEnvio(str(e))
+            if erro.definitivo:
+                break
+        return None, None, erro
+
+    def _marcar_enviada(self, item, sid, canal) -> bool:
+        """Grava o envio; retorna False se a reserva já não era deste worker."""
+        agora = timezone.now()
+        atualizadas = BroadcastOutbox.objects.filter(pk=item.pk, claim_token=item.claim_token).update(
+            status='sent',
+            message_sid=sid,
+            channel_used=canal,
+            attempts=item.attempts + 1,
+            sent_at=agora,
+            locked_until=None,
+            last_error='',
+        )
+        if not atualizadas:
+            # Reserva expirou e outro worker reassumiu a linha: o registro fica com ele
+            logger.warning(f"⚠️ Mensagem {item.pk} enviada após perder a reserva (SID {sid}); registro ignorado")
+            return False
+        # Mantém o registro usado pelo webhook de status do Twilio
+        BroadcastMessage.objects.get_or_create(
+            message_sid=sid,
+            defaults={
+                'broadcast_id': item.broadcast_id,
+                'to_address': item.to_address,
+                'channel_used': canal,
+                'status': 'sent',
+            },
+        )
+        return True
+
+    def _registrar_falha(self, item, erro: ErroEnvio) -> bool:
+        """Reagenda com backoff exponencial; retorna False quando a falha é definitiva."""
+        tentativas = item.attempts + 1
+        if erro.definitivo or tentativas >= self.max_tentativas:
+            BroadcastOutbox.objects.filter(pk=item.pk, claim_token=item.claim_token).update(
+                status='failed', attempts=tentativas, last_error=str(erro), locked_until=None,
+            )
+            logger.error(f"❌ Mensagem {item.pk} para {item.to_address} falhou definitivamente: {erro}")
+            return False
+        espera = min(BACKOFF_BASE_SEGUNDOS * (2 ** (tentativas - 1)), BACKOFF_MAX_SEGUNDOS)
+        BroadcastOutbox.objects.filter(pk=item.pk, claim_token=item.claim_token).update(
+            status='queued',
+            attempts=tentativas,
+            last_error=str(erro),
+            next_attempt_at=timezone.now() + timedelta(seconds=espera),
+            claim_token='',
+            locked_until=None,
+        )
+        return True
+
+    def _atualizar_broadcasts(self, broadcast_ids):
+        """Atualiza os contadores do BroadcastLog a partir da fila."""
+        for broadcast in BroadcastLog.objects.filter(id__in=broadcast_ids):
+            progresso = progresso_broadcast(broadcast)
+            broadcast.sent = progresso['enviados']
+            broadcast.failed = progresso['falhas']
+            if progresso['concluido'] and not broadcast.completed_at:
+                broadcast.completed_at = timezone.now()
+            broadcast.save(update_fields=['sent', 'failed', 'completed_at'])
@@ -0,0 +1,314 @@
+"""
+Índice espacial sem PostGIS: coordenadas + geohash em Freelance, LocalEvento e PontoOperacao.
+
+- Coordenadas vêm da tabela offline ``centroides_cidades.json`` (faixas de CEP e
+  centroide da sede municipal), a menos que tenham sido informadas
+  (``coordenadas_origem='manual'``).
+- O geohash (9 caracteres, coluna indexada) permite consultar "tudo num raio de
+  R km" com poucas faixas ``geohash >= p AND geohash < próximo(p)`` sobre o índice
+  B-tree: escolhe-se a precisão cuja célula tem lado >= R e consulta-se a célula
+  do ponto + as 8 vizinhas; a distância exata (haversine) corta o excesso.
+- ``freelancers_mais_proximos`` expande o bloco de células (precisão decrescente)
+  até ter K candidatos dentro do raio garantido pelo bloco.
+
+Funciona igual no SQLite e no Postgres (só comparações de string).
+"""
+import bisect
+import json
+import logging
+import math
+import os
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+
+from app_eventos.models import Freelance, LocalEvento, PontoOperacao
+from app_eventos.services.busca import normalizar
+
+logger = logging.getLogger(__name__)
+
+RAIO_TERRA_KM = 6371.0088
+KM_POR_GRAU = 111.32
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+PRECISAO_GEOHASH = 9
+PRECISAO_MAX_BUSCA = 7  # célula de ~150 m: ponto de partida do "K mais próximos"
+CAMINHO_CENTROIDES = os.path.join(os.path.dirname(__file__), 'centroides_cidades.json')
+
+# Campos de endereço que disparam nova geocodificação, por modelo
+CAMPOS_ENDERECO = {
+    Freelance: ('cep', 'cidade', 'uf'),
+    LocalEvento: ('endereco',),
+    PontoOperacao: ('cep', 'cidade', 'uf', 'endereco'),
+}
+CAMPOS_COORDENADAS = ['latitude', 'longitude', 'geohash', 'coordenadas_origem']
+
+
+# ----- geometria -----
+
+def distancia_km(lat1, lon1, lat2, lon2) -> float:
+    """Distância em km pela fórmula de haversine."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (float(lat1), float(lon1), float(lat2), float(lon2)))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RAIO_TERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def codificar_geohash(lat, lon, precisao=PRECISAO_GEOHASH) -> str:
+    lat_int, lon_int = [-90.0, 90.0], [-180.0, 180.0]
+    lat, lon = float(lat), float(lon)
+    bits, bit, usar_lon, codigo = 0, 0, True, []
+    while len(codigo) < precisao:
+        intervalo, valor = (lon_int, lon) if usar_lon else (lat_int, lat)
+        meio = (intervalo[0] + intervalo[1]) / 2
+        if valor >= meio:
+            bits = (bits << 1) | 1
+            intervalo[0] = meio
+        else:
+            bits <<= 1
+            intervalo[1] = meio
+        usar_lon = not usar_lon
+        bit += 1
+        if bit == 5:
+            codigo.append(BASE32[bits])
+            bits, bit = 0, 0
+    return ''.join(codigo)
+
+
+def _graus_celula(precisao) -> Tuple[float, float]:
+    """(altura, largura) da célula em graus."""
+    bits_lon = math.ceil(5 * precisao / 2)
+    bits_lat = 5 * precisao - bits_lon
+    return 180.0 / 2 ** bits_lat, 360.0 / 2 ** bits_lon
+
+
+def lado_celula_km(precisao, lat) -> float:
+    """Menor lado (km) da célula de ``precisao`` na latitude ``lat``."""
+    altura, largura = _graus_celula(precisao)
+    return min(altura * KM_POR_GRAU, largura * KM_POR_GRAU * math.cos(math.radians(float(lat))))
+
+
+def precisao_para_raio(raio_km, lat) -> int:
+    """Maior precisão cuja célula tem lado >= ``raio_km`` (o bloco 3x3 cobre o círculo)."""
+    for precisao in range(PRECISAO_GEOHASH, 0, -1):
+        if lado_celula_km(precisao, lat) >= raio_km:
+            return precisao
+    return 0  # raio maior que qualquer célula: sem filtro por geohash
+
+
+def celulas_vizinhanca(lat, lon, precisao) -> List[str]:
+    """Célula do ponto + 8 vizinhas (sem repetição)."""
+    altura, largura = _graus_celula(precisao)
+    lat, lon = float(lat), float(lon)
+    celulas = []
+    for dlat in (-altura, 0, altura):
+        for dlon in (-largura, 0, largura):
+            lat_v = max(-90.0, min(90.0, lat + dlat))
+            lon_v = (lon + dlon + 180.0) % 360.0 - 180.0
+            celula = codificar_geohash(lat_v, lon_v, precisao)
+            if celula not in celulas:
+                celulas.append(celula)
+    return celulas
+
+
+def _proximo_prefixo(prefixo) -> Optional[str]:
+    """Menor string maior que todas as que começam com ``prefixo`` (no alfabeto do geohash)."""
+    for i in range(len(prefixo) - 1, -1, -1):
+        posicao = BASE32.index(prefixo[i])
+        if posicao < len(BASE32) - 1:
+            return prefixo[:i] + BASE32[posicao + 1]
+    return None
+
+
+def filtro_celulas(celulas, campo='geohash') -> Q:
+    """OR de faixas (usa o índice B-tree de ``campo``; ``startswith`` não usa no SQLite)."""
+    filtro = Q()
+    for celula in celulas:
+        faixa = Q(**{f'{campo}__gte': celula})
+        fim = _proximo_prefixo(celula)
+        if fim:
+            faixa &= Q(**{f'{campo}__lt': fim})
+        filtro |= faixa
+    return filtro
+
+
+# ----- centroides (CEP / cidade) -----
+
+@lru_cache(maxsize=1)
+def _centroides():
+    caminho = getattr(settings, 'CENTROIDES_CIDADES_ARQUIVO', CAMINHO_CENTROIDES)
+    with open(caminho, encoding='utf-8') as arquivo:
+        cidades = json.load(arquivo)['cidades']
+
+    por_cidade_uf, por_nome, faixas = {}, {}, []
+    for item in cidades:
+        nome = normalizar(item['cidade'])
+        coordenadas = (item['latitude'], item['longitude'])
+        por_cidade_uf[(nome, item['uf'].upper())] = coordenadas
+        por_nome.setdefault(nome, []).append((item['uf'].upper(), coordenadas))
+        for inicio, fim in item.get('ceps', []):
+            faixas.append((int(inicio), int(fim), coordenadas))
+    faixas.sort()
+    # Nomes mais longos primeiro ao procurar dentro de um endereço ("sao leopoldo" antes de "sao")
+    nomes = sorted(por_nome, key=len, reverse=True)
+    return por_cidade_uf, por_nome, faixas, [f[0] for f in faixas], nomes
+
+
+def centroide_cep(cep) -> Optional[Tuple[float, float]]:
+    digitos = ''.join(c for c in str(cep or '') if c.isdigit())
+    if len(digitos) != 8:
+        return None
+    _, _, faixas, inicios, _ = _centroides()
+    numero = int(digitos)
+    i = bisect.bisect_right(inicios, numero) - 1
+    if i >= 0 and faixas[i][0] <= numero <= faixas[i][1]:
+        return faixas[i][2]
+    return None
+
+
+def centroide_cidade(cidade, uf=None) -> Optional[Tuple[float, float]]:
+    nome = normalizar(cidade)
+    if not nome:
+        return None
+    por_cidade_uf, por_nome, _, _, _ = _centroides()
+    if uf:
+        return por_cidade_uf.get((nome, str(uf).strip().upper()))
+    candidatos = por_nome.get(nome, [])
+    return candidatos[0][1] if len(candidatos) == 1 else None
+
+
+def centroide_endereco(endereco) -> Optional[Tuple[float, float]]:
+    """Procura uma cidade conhecida dentro de um endereço livre ("Av. X, 100 - Canoas/RS")."""
+    texto = f" {' '.join(normalizar(endereco).replace('/', ' ').replace('-', ' ').replace(',', ' ').split())} "
+    if not texto.strip():
+        return None
+    _, por_nome, _, _, nomes = _centroides()
+    for nome in nomes:
+        if f' {nome} ' in texto:
+            candidatos = por_nome[nome]
+            # Com homônimos, prefere a UF citada no endereço
+            for uf, coordenadas in candidatos:
+                if f' {uf.lower()} ' in texto:
+                    return coordenadas
+            return candidatos[0][1]
+    return None
+
+
+def geocodificar(cep=None, cidade=None, uf=None, endereco=None) -> Optional[Tuple[float, float, str]]:
+    """(latitude, longitude, origem) pelo CEP, pela cidade/UF ou pelo endereço livre."""
+    coordenadas = centroide_cep(cep)
+    if coordenadas:
+        return coordenadas[0], coordenadas[1], 'cep'
+    coordenadas = centroide_cidade(cidade, uf) or centroide_endereco(endereco)
+    if coordenadas:
+        return coordenadas[0], coordenadas[1], 'cidade'
+    return None
+
+
+def atualizar_coordenadas(obj) -> bool:
+    """
+    Preenche latitude/longitude/geohash de ``obj`` (sem salvar). Coordenadas
+    informadas (origem manual, ou latitude sem origem) não são sobrescritas.
+    Retorna True se algum campo mudou.
+    """
+    antes = tuple(getattr(obj, campo) for campo in CAMPOS_COORDENADAS)
+    manual = obj.coordenadas_origem == 'manual' or (not obj.coordenadas_origem and obj.latitude is not None)
+    if manual:
+        obj.coordenadas_origem = 'manual'
+    else:
+        resultado = geocodificar(
+            cep=getattr(obj, 'cep', None),
+            cidade=getattr(obj, 'cidade', None),
+            uf=getattr(obj, 'uf', None),
+            endereco=getattr(obj, 'endereco', None),
+        )
+        if resultado:
+            lat, lon, origem = resultado
+            obj.latitude, obj.longitude, obj.coordenadas_origem = Decimal(str(lat)), Decimal(str(lon)), origem
+        else:
+            obj.latitude = obj.longitude = None
+            obj.coordenadas_origem = ''
+    obj.geohash = codificar_geohash(obj.latitude, obj.longitude) if obj.latitude is not None else ''
+    return antes != tuple(getattr(obj, campo) for campo in CAMPOS_COORDENADAS)
+
+
+def geocodificar_todos(modelos=None, lote=1000) -> Dict[str, int]:
+    """Recalcula as coordenadas de todos os registros (carga inicial); grava só os que mudaram."""
+    stats = {}
+    for modelo in modelos or CAMPOS_ENDERECO:
+        alterados, pendentes = 0, []
+        campos = [*CAMPOS_COORDENADAS, *CAMPOS_ENDERECO[modelo]]
+        for obj in modelo.objects.only(*campos).order_by('pk').iterator(chunk_size=lote):
+            if atualizar_coordenadas(obj):
+                pendentes.append(obj)
+            if len(pendentes) >= lote:
+                alterados += modelo.objects.bulk_update(pendentes, CAMPOS_COORDENADAS)
+                pendentes = []
+        if pendentes:
+            alterados += modelo.objects.bulk_update(pendentes, CAMPOS_COORDENADAS)
+        stats[modelo.__name__] = alterados
+    return stats
+
+
+# ----- consultas -----
+
+def coordenadas_de(obj) -> Optional[Tuple[float, float]]:
+    if obj is None or obj.latitude is None or obj.longitude is None:
+        return None
+    return float(obj.latitude), float(obj.longitude)
+
+
+def no_raio(queryset, lat, lon, raio_km) -> Dict[int, float]:
+    """{pk: distância_km} dos registros de ``queryset`` a até ``raio_km`` do ponto."""
+    precisao = precisao_para_raio(raio_km, lat)
+    queryset = queryset.exclude(geohash='')
+    if precisao:
+        queryset = queryset.filter(filtro_celulas(celulas_vizinhanca(lat, lon, precisao)))
+    resultado = {}
+    for pk, lat_r, lon_r in queryset.values_list('pk', 'latitude', 'longitude'):
+        distancia = distancia_km(lat, lon, lat_r, lon_r)
+        if distancia <= raio_km:
+            resultado[pk] = distancia
+    return resultado
+
+
+def filtrar_vagas_no_raio(queryset, lat, lon, raio_km):
+    """Vagas cujo ponto de operação ou local do evento está a até ``raio_km`` do ponto."""
+    locais = list(no_raio(LocalEvento.objects.all(), lat, lon, raio_km))
+    pontos = list(no_raio(PontoOperacao.objects.all(), lat, lon, raio_km))
+    return queryset.filter(
+        Q(ponto_operacao_id__in=pontos) | Q(evento__local_id__in=locais) | Q(setor__evento__local_id__in=locais)
+    )
+
+
+def freelancers_mais_proximos(lat, lon, k=10, queryset=None, raio_max_km=None) -> List[Tuple[Freelance, float]]:
+    """
+    Os ``k`` freelancers (de ``queryset``) mais próximos do ponto, com a distância.
+
+    Começa por um bloco 3x3 de células pequenas e reduz a precisão até que o
+    bloco contenha ``k`` candidatos dentro do raio que ele garante cobrir.
+    """
+    queryset = (queryset if queryset is not None else Freelance.objects.all()).exclude(geohash='')
+    distancias = []
+    for precisao in range(PRECISAO_MAX_BUSCA, 0, -1):
+        raio_garantido = lado_celula_km(precisao, lat)
+        linhas = queryset.filter(
+            filtro_celulas(celulas_vizinhanca(lat, lon, precisao))
+        ).values_list('pk', 'latitude', 'longitude')
+        distancias = sorted((distancia_km(lat, lon, la, lo), pk) for pk, la, lo in linhas)
+        if sum(1 for d, _ in distancias if d <= raio_garantido) >= k:
+            break
+        if raio_max_km is not None and raio_garantido >= raio_max_km:
+            break
+    else:
+        # Nem o bloco de células de maior lado bastou: compara com todos
+        distancias = sorted(
+            (distancia_km(lat, lon, la, lo), pk) for pk, la, lo in queryset.values_list('pk', 'latitude', 'longitude')
+        )
+
+    if raio_max_km is not None:
+        distancias = [(d, pk) for d, pk in distancias if d <= raio_max_km]
+    melhores = distancias[:k]
+    objetos = queryset.in_bulk([pk for _, pk in melhores])
+    return [(objetos[pk], d) for d, pk in melhores if pk in objetos]
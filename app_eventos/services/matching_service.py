@@ -1,10 +1,22 @@
 # app_eventos/services/matching_service.py
-from django.db.models import Q, F, Count
+from django.db.models import Q, F, Count, Exists, OuterRef, Value, BooleanField
 from django.utils import timezone
-from typing import List, Dict, Any
+from django.conf import settings
+from typing import List, Dict, Any, Optional, Tuple
+import heapq
 import logging
+import math
 
-from app_eventos.models import Vaga, Freelance, Candidatura, Funcao, SetorEvento
+from app_eventos.models import Vaga, Freelance, Candidatura, CompromissoAgenda, Funcao, SetorEvento
+from app_eventos.services.agenda_freelancer import (
+    AgendaFreelancers,
+    conflitos,
+    freelancers_livres,
+    janela_vaga,
+    margem_deslocamento,
+)
+from app_eventos.services.busca import aplicar_busca
+from app_eventos.services.geo import coordenadas_de, distancia_km
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +24,20 @@ logger = logging.getLogger(__name__)
 class MatchingService:
     """
     Serviço para matching inteligente entre freelancers e vagas
+
+    As recomendações são calculadas em lote: os atributos de cada candidato
+    (cidade, histórico de candidaturas, confiabilidade) são carregados em poucas
+    consultas agregadas, pontuados numa única passagem e apenas os ``limite``
+    melhores são mantidos num heap limitado. Os métodos ``_score_*`` por instância
+    continuam disponíveis e usam as mesmas funções de pontuação.
+
+    Quando freelancer e vaga têm coordenadas (services/geo.py), a localização é
+    pontuada pela distância real com decaimento exponencial; sem coordenadas,
+    vale a comparação de cidades.
+
+    A disponibilidade vem da agenda de compromissos (services/agenda_freelancer.py):
+    freelancers já comprometidos no horário da vaga ficam de fora, compromisso
+    colado ao horário pontua menos e vaga sem data de trabalho pontua neutro.
     """
     
     @staticmethod
@@ -29,7 +55,7 @@ class MatchingService:
                 ativa=True,
                 publicada=True,
                 data_limite_candidatura__gte=timezone.now()
-            ).select_related('setor__evento', 'funcao', 'ponto_operacao')
+            ).select_related('setor__evento__local', 'evento__local', 'funcao', 'ponto_operacao')
             
             # Filtrar vagas que o freelancer já se candidatou
             candidaturas_existentes = Candidatura.objects.filter(
@@ -37,24 +63,42 @@ class MatchingService:
             ).values_list('vaga_id', flat=True)
             
             vagas_base = vagas_base.exclude(id__in=candidaturas_existentes)
-            
-            # Calcular score para cada vaga
-            vagas_com_score = []
-            
-            for vaga in vagas_base:
-                score = MatchingService._calcular_score_freelancer_vaga(freelancer, vaga)
-                
-                if score > 0:  # Só incluir vagas com score positivo
-                    vagas_com_score.append({
-                        'vaga': vaga,
-                        'score': score,
-                        'motivos': MatchingService._obter_motivos_score(freelancer, vaga)
-                    })
-            
-            # Ordenar por score (maior primeiro)
-            vagas_com_score.sort(key=lambda x: x['score'], reverse=True)
-            
-            return vagas_com_score[:limite]
+
+            # Atributos do freelancer são os mesmos para todas as vagas: uma única agregação
+            historico = Candidatura.objects.filter(freelance=freelancer).aggregate(
+                total=Count('id'),
+                aprovadas=Count('id', filter=Q(status='aprovado')),
+            )
+            cidade_freelancer = MatchingService._normalizar_cidade(freelancer.cidade)
+            coordenadas_freelancer = coordenadas_de(freelancer)
+            performance = MatchingService._pontuar_performance(historico['total'], historico['aprovadas'])
+            confiabilidade = getattr(freelancer, 'score_confiabilidade', None)
+            # Compromissos futuros do freelancer: uma consulta (só se alguma vaga tem horário), depois bisect
+            agenda = None
+
+            def pontuar(vaga):
+                nonlocal agenda
+                janela = janela_vaga(vaga)
+                if janela and agenda is None:
+                    agenda = AgendaFreelancers.carregar([freelancer.pk], desde=timezone.now() - margem_deslocamento())
+                situacao = agenda.situacao(freelancer.pk, janela) if janela else None
+                if situacao == 'ocupado':
+                    return None
+                linha = MatchingService._montar_linha(
+                    vaga, cidade_freelancer, performance, confiabilidade,
+                    coordenadas_freelancer=coordenadas_freelancer,
+                    disponibilidade=MatchingService._pontuar_disponibilidade(situacao),
+                )
+                return {'vaga': vaga, 'score': linha['score'], 'motivos': linha['motivos']}
+
+            vagas_com_score = (pontuar(vaga) for vaga in vagas_base.iterator(chunk_size=500))
+
+            # Heap limitado; nlargest é estável, preservando a ordem da consulta nos empates
+            return heapq.nlargest(
+                limite,
+                (item for item in vagas_com_score if item and item['score'] > 0),  # Só vagas com score positivo
+                key=lambda x: x['score'],
+            )
             
         except Exception as e:
             logger.error(f"Erro ao encontrar vagas para freelancer {freelancer.id}: {e}")
@@ -75,7 +119,7 @@ class MatchingService:
                 usuario__is_active=True,
                 cadastro_completo=True,
                 bloqueado=False,
-            ).select_related('usuario')
+            )
             
             # Filtrar freelancers que já se candidataram
             candidaturas_existentes = Candidatura.objects.filter(
@@ -83,57 +127,144 @@ class MatchingService:
             ).values_list('freelance_id', flat=True)
             
             freelancers_base = freelancers_base.exclude(id__in=candidaturas_existentes)
-            
-            # Calcular score para cada freelancer
-            freelancers_com_score = []
-            
-            for freelancer in freelancers_base:
-                score = MatchingService._calcular_score_vaga_freelancer(vaga, freelancer)
-                
-                if score > 0:  # Só incluir freelancers com score positivo
-                    freelancers_com_score.append({
-                        'freelancer': freelancer,
-                        'score': score,
-                        'motivos': MatchingService._obter_motivos_score(freelancer, vaga)
-                    })
-            
+
+            # Quem já tem compromisso no horário da vaga não é recomendado; compromisso
+            # colado ao horário (dentro da margem) vem anotado na mesma consulta
+            janela = janela_vaga(vaga)
+            if janela:
+                margem = margem_deslocamento()
+                freelancers_base = freelancers_livres(*janela, queryset=freelancers_base).annotate(
+                    agenda_apertada=Exists(CompromissoAgenda.objects.filter(
+                        freelance=OuterRef('pk'), fim__gt=janela[0] - margem, inicio__lt=janela[1] + margem,
+                    ))
+                )
+            else:
+                freelancers_base = freelancers_base.annotate(agenda_apertada=Value(None, output_field=BooleanField()))
+
+            # Uma linha de atributos por candidato, com o histórico agregado na mesma consulta
+            linhas = freelancers_base.annotate(
+                total_candidaturas=Count('candidaturas'),
+                candidaturas_aprovadas=Count('candidaturas', filter=Q(candidaturas__status='aprovado')),
+            ).values_list(
+                'id', 'cidade', 'latitude', 'longitude',
+                'score_confiabilidade', 'total_candidaturas', 'candidaturas_aprovadas', 'agenda_apertada',
+            ).order_by('id')
+
+            # Componentes que dependem apenas da vaga são calculados uma única vez
+            parcial_vaga = MatchingService._pontuar_vaga(vaga)
+
+            def pontuar(linha):
+                freelancer_id, cidade, latitude, longitude, confiabilidade, total, aprovadas, apertada = linha
+                situacao = None if apertada is None else ('apertado' if apertada else 'livre')
+                resultado = MatchingService._montar_linha(
+                    vaga,
+                    MatchingService._normalizar_cidade(cidade),
+                    MatchingService._pontuar_performance(total, aprovadas),
+                    confiabilidade,
+                    parcial_vaga=parcial_vaga,
+                    coordenadas_freelancer=(
+                        (float(latitude), float(longitude)) if latitude is not None and longitude is not None else None
+                    ),
+                    disponibilidade=MatchingService._pontuar_disponibilidade(situacao),
+                )
+                resultado['freelancer_id'] = freelancer_id
+                resultado['confiabilidade'] = confiabilidade
+                return resultado
+
             # Ordenar por score (maior primeiro); desempate por confiabilidade operacional
-            freelancers_com_score.sort(
-                key=lambda x: (x['score'], x['freelancer'].score_confiabilidade),
-                reverse=True,
+            melhores = heapq.nlargest(
+                limite,
+                (r for r in map(pontuar, linhas.iterator(chunk_size=2000)) if r['score'] > 0),
+                key=lambda r: (r['score'], r['confiabilidade']),
             )
 
-            return freelancers_com_score[:limite]
+            freelancers = Freelance.objects.select_related('usuario').in_bulk(
+                [r['freelancer_id'] for r in melhores]
+            )
+            return [
+                {
+                    'freelancer': freelancers[r['freelancer_id']],
+                    'score': r['score'],
+                    'motivos': r['motivos'],
+                }
+                for r in melhores
+                if r['freelancer_id'] in freelancers
+            ]
             
         except Exception as e:
             logger.error(f"Erro ao encontrar freelancers para vaga {vaga.id}: {e}")
             return []
-    
+
+    # ------------------------------------------------------------------
+    # Pontuação em lote
+    # ------------------------------------------------------------------
+
     @staticmethod
-    def _calcular_score_freelancer_vaga(freelancer: Freelance, vaga: Vaga) -> float:
-        """
-        Calcula score de compatibilidade entre freelancer e vaga
-        Score de 0 a 100
-        """
+    def _pontuar_vaga(vaga: Vaga) -> Dict[str, Any]:
+        """Componentes do score que dependem apenas da vaga."""
+        try:
+            cidade_vaga = MatchingService._cidade_vaga(vaga)
+        except Exception:
+            cidade_vaga = None  # Localização indeterminada → score neutro
+        return {
+            'experiencia': MatchingService._pontuar_experiencia(vaga.experiencia_minima),
+            'habilidades': MatchingService._pontuar_habilidades(vaga.requisitos),
+            'cidade_vaga': cidade_vaga,
+            'coordenadas_vaga': MatchingService._coordenadas_vaga(vaga),
+            'disponibilidade': MatchingService._pontuar_disponibilidade(None),
+        }
+
+    @staticmethod
+    def _montar_linha(vaga, cidade_freelancer, performance, confiabilidade, parcial_vaga=None,
+                      coordenadas_freelancer=None, disponibilidade=None) -> Dict[str, Any]:
+        """Calcula score e motivos a partir da mesma linha de atributos do candidato."""
+        parcial_vaga = parcial_vaga or MatchingService._pontuar_vaga(vaga)
+        if disponibilidade is None:
+            disponibilidade = parcial_vaga['disponibilidade']
+        if coordenadas_freelancer and parcial_vaga['coordenadas_vaga']:
+            localizacao = MatchingService._pontuar_distancia(
+                distancia_km(*coordenadas_freelancer, *parcial_vaga['coordenadas_vaga'])
+            )
+        elif parcial_vaga['cidade_vaga'] is None:
+            localizacao = 50.0
+        else:
+            localizacao = MatchingService._pontuar_cidades(cidade_freelancer, parcial_vaga['cidade_vaga'])
+
+        score = MatchingService._combinar_scores(
+            parcial_vaga['experiencia'],
+            parcial_vaga['habilidades'],
+            localizacao,
+            disponibilidade,
+            performance,
+            confiabilidade,
+        )
+        motivos = MatchingService._motivos(
+            parcial_vaga['experiencia'], localizacao, parcial_vaga['habilidades'], confiabilidade
+        )
+        return {'score': score, 'motivos': motivos}
+
+    @staticmethod
+    def _combinar_scores(experiencia, habilidades, localizacao, disponibilidade, performance, confiabilidade) -> float:
+        """Soma ponderada dos componentes (mesma ordem de operações do score por instância)."""
         score = 0.0
         
         # 1. Experiência (30 pontos)
-        score += MatchingService._score_experiencia(freelancer, vaga) * 0.3
+        score += experiencia * 0.3
         
         # 2. Habilidades (25 pontos)
-        score += MatchingService._score_habilidades(freelancer, vaga) * 0.25
+        score += habilidades * 0.25
         
         # 3. Localização (20 pontos)
-        score += MatchingService._score_localizacao(freelancer, vaga) * 0.2
+        score += localizacao * 0.2
         
         # 4. Disponibilidade (15 pontos)
-        score += MatchingService._score_disponibilidade(freelancer, vaga) * 0.15
+        score += disponibilidade * 0.15
         
         # 5. Histórico de performance (10 pontos)
-        score += MatchingService._score_performance(freelancer) * 0.1
+        score += performance * 0.1
 
         # 6. Confiabilidade operacional (score 0–10 no Freelance → até ~3 pts extra, peso leve)
-        sc = getattr(freelancer, 'score_confiabilidade', 5) or 0
+        sc = confiabilidade or 0
         try:
             sc = max(0, min(10, int(sc)))
         except (TypeError, ValueError):
@@ -141,131 +272,209 @@ class MatchingService:
         score += (sc / 10.0) * 3.0
 
         return min(score, 100.0)  # Máximo 100
-    
+
     @staticmethod
-    def _calcular_score_vaga_freelancer(vaga: Vaga, freelancer: Freelance) -> float:
-        """
-        Calcula score de compatibilidade entre vaga e freelancer
-        Mesma lógica, mas perspectiva da empresa
-        """
-        return MatchingService._calcular_score_freelancer_vaga(freelancer, vaga)
-    
+    def _motivos(experiencia, localizacao, habilidades, confiabilidade) -> List[str]:
+        motivos = []
+        
+        if experiencia > 80:
+            motivos.append("Experiência adequada")
+        
+        if localizacao > 80:
+            motivos.append("Localização próxima")
+        
+        if habilidades > 70:
+            motivos.append("Habilidades compatíveis")
+
+        if confiabilidade is not None and confiabilidade >= 8:
+            motivos.append("Alta confiabilidade operacional")
+
+        return motivos
+
     @staticmethod
-    def _score_experiencia(freelancer: Freelance, vaga: Vaga) -> float:
-        """Calcula score baseado na experiência"""
+    def _normalizar_cidade(cidade) -> str:
+        return cidade.lower() if cidade else ""
+
+    @staticmethod
+    def _cidade_vaga(vaga: Vaga) -> str:
+        """Cidade (minúscula) do evento/ponto de operação da vaga; pode levantar exceção com dados incompletos."""
+        # Vaga pode ser de evento (setor.evento.local) ou ponto de operação
+        if vaga.ponto_operacao:
+            return vaga.ponto_operacao.cidade.lower() if vaga.ponto_operacao.cidade else ""
+        elif vaga.setor and vaga.setor.evento and vaga.setor.evento.local:
+            return vaga.setor.evento.local.cidade.lower()
+        elif vaga.evento and vaga.evento.local:
+            return vaga.evento.local.cidade.lower() if vaga.evento.local.cidade else ""
+        return ""
+
+    @staticmethod
+    def _coordenadas_vaga(vaga: Vaga) -> Optional[Tuple[float, float]]:
+        """Coordenadas do ponto de operação ou do local do evento da vaga (mesma precedência de ``_cidade_vaga``)."""
+        try:
+            if vaga.ponto_operacao:
+                return coordenadas_de(vaga.ponto_operacao)
+            if vaga.setor and vaga.setor.evento:
+                return coordenadas_de(vaga.setor.evento.local)
+            if vaga.evento:
+                return coordenadas_de(vaga.evento.local)
+        except Exception:
+            pass
+        return None
+
+    @staticmethod
+    def _pontuar_experiencia(experiencia_minima) -> float:
         # Implementar lógica baseada em:
         # - Experiência mínima da vaga vs experiência do freelancer
         # - Nível de experiência (iniciante, intermediário, etc.)
         # - Experiência específica na área
         
-        if not vaga.experiencia_minima:
+        if not experiencia_minima:
             return 50.0  # Score neutro se não há requisito mínimo
         
         # Calcular experiência do freelancer (implementar baseado em histórico)
         experiencia_freelancer = 0  # TODO: Implementar cálculo real
         
-        if experiencia_freelancer >= vaga.experiencia_minima:
+        if experiencia_freelancer >= experiencia_minima:
             return 100.0
-        elif experiencia_freelancer >= vaga.experiencia_minima * 0.7:
+        elif experiencia_freelancer >= experiencia_minima * 0.7:
             return 70.0
-        elif experiencia_freelancer >= vaga.experiencia_minima * 0.5:
+        elif experiencia_freelancer >= experiencia_minima * 0.5:
             return 50.0
         else:
             return 20.0
-    
+
     @staticmethod
-    def _score_habilidades(freelancer: Freelance, vaga: Vaga) -> float:
-        """Calcula score baseado nas habilidades"""
+    def _pontuar_habilidades(requisitos) -> float:
         # Implementar matching de habilidades
         # - Habilidades do freelancer vs requisitos da vaga
         # - Função específica vs experiência do freelancer
         
-        if not vaga.requisitos:
+        if not requisitos:
             return 50.0  # Score neutro se não há requisitos específicos
         
         # TODO: Implementar análise de texto dos requisitos
         # e matching com habilidades do freelancer
         
         return 60.0  # Placeholder
+
+    @staticmethod
+    def _pontuar_cidades(cidade_freelancer: str, cidade_vaga: str) -> float:
+        # - Distância máxima aceitável
+        if cidade_freelancer == cidade_vaga:
+            return 100.0
+        elif cidade_freelancer and cidade_vaga:
+            # TODO: Implementar cálculo de distância real
+            return 70.0
+        else:
+            return 30.0
+
+    @staticmethod
+    def _pontuar_distancia(distancia: float) -> float:
+        """100 na mesma posição, decaindo exponencialmente com a distância (piso de 10)."""
+        escala = getattr(settings, 'MATCHING_DECAIMENTO_KM', 30.0)
+        return max(10.0, 100.0 * math.exp(-distancia / escala))
+
+    @staticmethod
+    def _pontuar_disponibilidade(situacao: Optional[str]) -> float:
+        """Situação na agenda → score: livre 100, compromisso colado 60, ocupado 0, sem horário 80."""
+        return {'livre': 100.0, 'apertado': 60.0, 'ocupado': 0.0}.get(situacao, 80.0)
+
+    @staticmethod
+    def _pontuar_performance(total_candidaturas: int, candidaturas_aprovadas: int) -> float:
+        if total_candidaturas == 0:
+            return 50.0  # Score neutro para freelancers sem histórico
+        
+        taxa_aprovacao = candidaturas_aprovadas / total_candidaturas
+        return taxa_aprovacao * 100
+
+    # ------------------------------------------------------------------
+    # Pontuação por instância (um par freelancer/vaga)
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _calcular_score_freelancer_vaga(freelancer: Freelance, vaga: Vaga) -> float:
+        """
+        Calcula score de compatibilidade entre freelancer e vaga
+        Score de 0 a 100
+        """
+        return MatchingService._combinar_scores(
+            MatchingService._score_experiencia(freelancer, vaga),
+            MatchingService._score_habilidades(freelancer, vaga),
+            MatchingService._score_localizacao(freelancer, vaga),
+            MatchingService._score_disponibilidade(freelancer, vaga),
+            MatchingService._score_performance(freelancer),
+            getattr(freelancer, 'score_confiabilidade', 5),
+        )
+    
+    @staticmethod
+    def _calcular_score_vaga_freelancer(vaga: Vaga, freelancer: Freelance) -> float:
+        """
+        Calcula score de compatibilidade entre vaga e freelancer
+        Mesma lógica, mas perspectiva da empresa
+        """
+        return MatchingService._calcular_score_freelancer_vaga(freelancer, vaga)
+    
+    @staticmethod
+    def _score_experiencia(freelancer: Freelance, vaga: Vaga) -> float:
+        """Calcula score baseado na experiência"""
+        return MatchingService._pontuar_experiencia(vaga.experiencia_minima)
+    
+    @staticmethod
+    def _score_habilidades(freelancer: Freelance, vaga: Vaga) -> float:
+        """Calcula score baseado nas habilidades"""
+        return MatchingService._pontuar_habilidades(vaga.requisitos)
     
     @staticmethod
     def _score_localizacao(freelancer: Freelance, vaga: Vaga) -> float:
         """Calcula score baseado na localização"""
-        # - Cidade do freelancer vs cidade do evento/ponto de operação
-        # - Distância máxima aceitável
-        
+        # - Distância real quando há coordenadas; senão, cidade do freelancer vs cidade da vaga
+        coordenadas_freelancer = coordenadas_de(freelancer)
+        coordenadas_vaga = MatchingService._coordenadas_vaga(vaga)
+        if coordenadas_freelancer and coordenadas_vaga:
+            return MatchingService._pontuar_distancia(distancia_km(*coordenadas_freelancer, *coordenadas_vaga))
         try:
-            cidade_freelancer = freelancer.cidade.lower() if freelancer.cidade else ""
-            # Vaga pode ser de evento (setor.evento.local) ou ponto de operação
-            if vaga.ponto_operacao:
-                cidade_vaga = vaga.ponto_operacao.cidade.lower() if vaga.ponto_operacao.cidade else ""
-            elif vaga.setor and vaga.setor.evento and vaga.setor.evento.local:
-                cidade_vaga = vaga.setor.evento.local.cidade.lower()
-            elif vaga.evento and vaga.evento.local:
-                cidade_vaga = vaga.evento.local.cidade.lower() if vaga.evento.local.cidade else ""
-            else:
-                cidade_vaga = ""
-            
-            if cidade_freelancer == cidade_vaga:
-                return 100.0
-            elif cidade_freelancer and cidade_vaga:
-                # TODO: Implementar cálculo de distância real
-                return 70.0
-            else:
-                return 30.0
+            return MatchingService._pontuar_cidades(
+                MatchingService._normalizar_cidade(freelancer.cidade),
+                MatchingService._cidade_vaga(vaga),
+            )
         except Exception:
             return 50.0
     
     @staticmethod
     def _score_disponibilidade(freelancer: Freelance, vaga: Vaga) -> float:
-        """Calcula score baseado na disponibilidade"""
-        # Implementar lógica de disponibilidade
-        # - Horários disponíveis do freelancer vs horários da vaga
-        # - Conflitos com outros eventos
-        
-        # TODO: Implementar verificação de conflitos de agenda
-        return 80.0  # Placeholder
+        """Calcula score baseado na disponibilidade (agenda do freelancer no horário da vaga)"""
+        janela = janela_vaga(vaga)
+        if freelancer is None or janela is None:
+            return MatchingService._pontuar_disponibilidade(None)
+        margem = margem_deslocamento()
+        agenda = AgendaFreelancers(
+            (freelancer.pk, c.inicio, c.fim)
+            for c in conflitos(freelancer.pk, janela[0] - margem, janela[1] + margem, ignorar=('vaga', vaga.pk))
+        )
+        return MatchingService._pontuar_disponibilidade(agenda.situacao(freelancer.pk, janela, margem))
     
     @staticmethod
     def _score_performance(freelancer: Freelance) -> float:
         """Calcula score baseado no histórico de performance"""
         try:
-            # Calcular taxa de aprovação
-            total_candidaturas = Candidatura.objects.filter(freelance=freelancer).count()
-            candidaturas_aprovadas = Candidatura.objects.filter(
-                freelance=freelancer,
-                status='aprovado'
-            ).count()
-            
-            if total_candidaturas == 0:
-                return 50.0  # Score neutro para freelancers sem histórico
-            
-            taxa_aprovacao = candidaturas_aprovadas / total_candidaturas
-            return taxa_aprovacao * 100
+            historico = Candidatura.objects.filter(freelance=freelancer).aggregate(
+                total=Count('id'),
+                aprovadas=Count('id', filter=Q(status='aprovado')),
+            )
+            return MatchingService._pontuar_performance(historico['total'], historico['aprovadas'])
             
-        except:
+        except Exception:
             return 50.0
     
     @staticmethod
     def _obter_motivos_score(freelancer: Freelance, vaga: Vaga) -> List[str]:
         """Retorna motivos do score calculado"""
-        motivos = []
-        
-        # Adicionar motivos baseados nos scores calculados
-        if MatchingService._score_experiencia(freelancer, vaga) > 80:
-            motivos.append("Experiência adequada")
-        
-        if MatchingService._score_localizacao(freelancer, vaga) > 80:
-            motivos.append("Localização próxima")
-        
-        if MatchingService._score_habilidades(freelancer, vaga) > 70:
-            motivos.append("Habilidades compatíveis")
-
-        sc = getattr(freelancer, 'score_confiabilidade', None)
-        if sc is not None and sc >= 8:
-            motivos.append("Alta confiabilidade operacional")
-
-        return motivos
+        return MatchingService._motivos(
+            MatchingService._score_experiencia(freelancer, vaga),
+            MatchingService._score_localizacao(freelancer, vaga),
+            MatchingService._score_habilidades(freelancer, vaga),
+            getattr(freelancer, 'score_confiabilidade', None),
+        )
 
 
 class VagaRecommendationService:
@@ -297,16 +506,12 @@ class VagaRecommendationService:
     @staticmethod
     def obter_vagas_por_localizacao(cidade: str, limite: int = 10) -> List[Vaga]:
         """Retorna vagas por localização (evento ou ponto de operação)"""
-        from django.db.models import Q
-        return Vaga.objects.filter(
+        vagas = Vaga.objects.filter(
             ativa=True,
             publicada=True,
             data_limite_candidatura__gte=timezone.now()
-        ).filter(
-            Q(setor__evento__local__cidade__icontains=cidade) |
-            Q(evento__local__cidade__icontains=cidade) |
-            Q(ponto_operacao__cidade__icontains=cidade)
-        ).order_by('-data_criacao')[:limite]
+        )
+        return aplicar_busca(vagas, 'vaga', cidade=cidade).order_by('-data_criacao')[:limite]
     
     @staticmethod
     def obter_vagas_por_funcao(funcao_id: int, limite: int = 10) -> List[Vaga]:
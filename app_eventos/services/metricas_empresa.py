@@ -0,0 +1,213 @@
+"""
+Métricas materializadas dos dashboards por empresa (MetricasEmpresa).
+
+Os dashboards leem uma linha por empresa em vez de contar as tabelas
+transacionais a cada acesso. A linha é mantida por deltas aplicados nos
+signals (ver signals_metricas.py) com UPDATE ... SET campo = campo + n, e o
+comando ``reconciliar_metricas_empresa`` recalcula tudo em lote para corrigir
+qualquer deriva (updates em massa, bulk_create, SQL manual etc.).
+"""
+import logging
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from app_eventos.models import (
+    Candidatura,
+    ContratoFreelance,
+    EmpresaContratante,
+    Evento,
+    MetricasEmpresa,
+    Vaga,
+)
+
+logger = logging.getLogger(__name__)
+
+# status da Candidatura -> campo em MetricasEmpresa
+CAMPO_STATUS_CANDIDATURA = {
+    'pendente': 'candidaturas_pendentes',
+    'em_analise': 'candidaturas_em_analise',
+    'aprovado': 'candidaturas_aprovadas',
+    'rejeitado': 'candidaturas_rejeitadas',
+    'cancelado': 'candidaturas_canceladas',
+    'contratado': 'candidaturas_contratadas',
+}
+
+CAMPOS_METRICAS = (
+    'total_eventos',
+    'eventos_ativos',
+    'total_vagas',
+    'vagas_ativas',
+    'vagas_quantidade',
+    'vagas_ativas_quantidade',
+    'total_candidaturas',
+    *CAMPO_STATUS_CANDIDATURA.values(),
+    'total_freelancers',
+    'total_contratos',
+    'contratos_ativos',
+)
+
+
+def calcular_metricas(empresa_ids):
+    """
+    Recalcula as métricas a partir das tabelas transacionais.
+
+    Faz uma consulta agrupada por tabela para todas as empresas informadas
+    (independe da quantidade de empresas). Retorna {empresa_id: {campo: valor}}.
+    """
+    empresa_ids = list(empresa_ids)
+    metricas = {empresa_id: dict.fromkeys(CAMPOS_METRICAS, 0) for empresa_id in empresa_ids}
+    if not empresa_ids:
+        return metricas
+
+    eventos = (
+        Evento.objects.filter(empresa_contratante_id__in=empresa_ids)
+        .order_by()
+        .values(empresa_ref=F('empresa_contratante_id'))
+        .annotate(
+            total_eventos=Count('id'),
+            eventos_ativos=Count('id', filter=Q(ativo=True)),
+        )
+    )
+    vagas = (
+        Vaga.objects.filter(empresa_contratante_id__in=empresa_ids)
+        .order_by()
+        .values(empresa_ref=F('empresa_contratante_id'))
+        .annotate(
+            total_vagas=Count('id'),
+            vagas_ativas=Count('id', filter=Q(ativa=True)),
+            vagas_quantidade=Sum('quantidade'),
+            vagas_ativas_quantidade=Sum('quantidade', filter=Q(ativa=True)),
+        )
+    )
+    candidaturas = (
+        Candidatura.objects.filter(vaga__empresa_contratante_id__in=empresa_ids)
+        .order_by()
+        .values(empresa_ref=F('vaga__empresa_contratante_id'))
+        .annotate(
+            total_candidaturas=Count('id'),
+            total_freelancers=Count('freelance_id', distinct=True),
+            **{
+                campo: Count('id', filter=Q(status=status))
+                for status, campo in CAMPO_STATUS_CANDIDATURA.items()
+            },
+        )
+    )
+    contratos = (
+        ContratoFreelance.objects.filter(vaga__empresa_contratante_id__in=empresa_ids)
+        .order_by()
+        .values(empresa_ref=F('vaga__empresa_contratante_id'))
+        .annotate(
+            total_contratos=Count('id'),
+            contratos_ativos=Count('id', filter=Q(status='ativo')),
+        )
+    )
+
+    for linhas in (eventos, vagas, candidaturas, contratos):
+        for linha in linhas:
+            empresa_id = linha.pop('empresa_ref')
+            metricas[empresa_id].update({campo: valor or 0 for campo, valor in linha.items()})
+    return metricas
+
+
+def obter_metricas(empresa):
+    """
+    Retorna a MetricasEmpresa da empresa, criando o snapshot na primeira leitura.
+
+    Sem empresa, devolve uma instância zerada (não salva).
+    """
+    empresa_id = getattr(empresa, 'pk', empresa)
+    if empresa_id is None:
+        return MetricasEmpresa()
+    metricas = MetricasEmpresa.objects.filter(pk=empresa_id).first()
+    if metricas is not None:
+        return metricas
+    valores = calcular_metricas([empresa_id])[empresa_id]
+    try:
+        with transaction.atomic():
+            return MetricasEmpresa.objects.create(
+                empresa_contratante_id=empresa_id, reconciliado_em=timezone.now(), **valores
+            )
+    except IntegrityError:
+        # Criado em paralelo por outra requisição
+        return MetricasEmpresa.objects.get(pk=empresa_id)
+
+
+def aplicar_deltas(deltas):
+    """
+    Aplica {empresa_id: {campo: delta}} com UPDATE atômico (campo = campo + delta).
+
+    Empresas sem snapshot são ignoradas: a linha é criada já consistente na
+    primeira leitura (obter_metricas).
+    """
+    for empresa_id, campos in deltas.items():
+        campos = {campo: delta for campo, delta in campos.items() if delta}
+        if empresa_id is None or not campos:
+            continue
+        MetricasEmpresa.objects.filter(pk=empresa_id).update(
+            atualizado_em=timezone.now(),
+            **{campo: F(campo) + delta for campo, delta in campos.items()},
+        )
+
+
+def diferenca_contribuicoes(anterior, atual):
+    """
+    Converte duas contribuições [(empresa_id, {campo: n})] em deltas por empresa.
+    """
+    deltas = defaultdict(Counter)
+    for empresa_id, campos in atual:
+        deltas[empresa_id].update(campos)
+    for empresa_id, campos in anterior:
+        deltas[empresa_id].subtract(campos)
+    return deltas
+
+
+def reconciliar_metricas(empresa_ids=None, tamanho_lote=500):
+    """
+    Recalcula os snapshots e corrige a deriva.
+
+    Retorna a lista de (empresa_id, {campo: (materializado, real)}) das empresas
+    que estavam divergentes.
+    """
+    if empresa_ids is None:
+        empresa_ids = EmpresaContratante.objects.order_by('pk').values_list('pk', flat=True)
+    empresa_ids = list(empresa_ids)
+    divergencias = []
+    agora = timezone.now()
+
+    for inicio in range(0, len(empresa_ids), tamanho_lote):
+        lote = empresa_ids[inicio:inicio + tamanho_lote]
+        with transaction.atomic():
+            # Trava os snapshots antes de contar: deltas concorrentes esperam e
+            # são aplicados sobre o valor reconciliado.
+            existentes = MetricasEmpresa.objects.select_for_update().in_bulk(lote)
+            reais = calcular_metricas(lote)
+            novas, alteradas = [], []
+            for empresa_id, valores in reais.items():
+                metricas = existentes.get(empresa_id)
+                if metricas is None:
+                    novas.append(MetricasEmpresa(
+                        empresa_contratante_id=empresa_id, reconciliado_em=agora, **valores
+                    ))
+                    continue
+                diff = {
+                    campo: (getattr(metricas, campo), valor)
+                    for campo, valor in valores.items()
+                    if getattr(metricas, campo) != valor
+                }
+                if diff:
+                    divergencias.append((empresa_id, diff))
+                    for campo, valor in valores.items():
+                        setattr(metricas, campo, valor)
+                metricas.reconciliado_em = agora
+                alteradas.append(metricas)
+            MetricasEmpresa.objects.bulk_create(novas, ignore_conflicts=True)
+            MetricasEmpresa.objects.bulk_update(
+                alteradas, [*CAMPOS_METRICAS, 'reconciliado_em'], batch_size=tamanho_lote
+            )
+
+    for empresa_id, diff in divergencias:
+        logger.warning('Métricas da empresa %s divergentes, corrigidas: %s', empresa_id, diff)
+    return divergencias
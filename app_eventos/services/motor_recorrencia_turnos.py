@@ -3,9 +3,14 @@ Motor de recorrência: materializa turnos e VagaTurno numa janela rolante (ex.:
 
 Não gera infinito: apenas [data_referencia, data_referencia + dias_a_frente).
 Idempotente: não duplica turno nem vaga por (unidade, data, intervalo, função).
+
+Modo em lote (padrão): calcula em memória o conjunto desejado de turnos/vagas, compara
+com uma única leitura dos turnos e vagas já existentes na janela e grava com
+``bulk_create(ignore_conflicts=True)`` + ``bulk_update`` — número de consultas constante,
+independente de dias e regras. ``em_lote=False`` mantém o caminho antigo (dia a dia).
 """
 from datetime import date, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from django.db import transaction
 
@@ -62,16 +67,125 @@ def _sincronizar_vagas_para_turno(turno, regra: RegraRecorrencia) -> int:
     return alteradas
 
 
+def _datas_da_regra(regra: RegraRecorrencia, data_ref: date, limite: date):
+    dias = regra.dias_semana or []
+    d = data_ref
+    while d < limite:
+        if d.weekday() in dias:
+            yield d
+        d += timedelta(days=1)
+
+
+def _gerar_turnos_em_lote(unidade, regras, data_ref, limite, sincronizar_existentes) -> dict:
+    """
+    Mesmo resultado (e mesmas contagens) do caminho dia a dia, com consultas em lote.
+
+    As regras são percorridas na mesma ordem: a primeira que "pega" um intervalo cria o
+    turno; as seguintes contam como existentes e sincronizam as vagas, como antes.
+    """
+    regras = [r for r in regras if r.dias_semana]
+
+    # Uma leitura do que já existe na janela
+    existentes: Dict[Tuple, TurnoOperacional] = {
+        (t.data, t.hora_inicio, t.hora_fim): t
+        for t in TurnoOperacional.objects.filter(unidade_id=unidade.pk, data__gte=data_ref, data__lt=limite)
+    }
+    vagas: Dict[Tuple, VagaTurno] = {}
+    if existentes:
+        chave_por_turno = {t.pk: chave for chave, t in existentes.items()}
+        for v in VagaTurno.objects.filter(turno_id__in=chave_por_turno):
+            vagas[(chave_por_turno[v.turno_id], v.funcao_id)] = v
+
+    novos_turnos: Dict[Tuple, TurnoOperacional] = {}
+    novas_vagas: Dict[Tuple, VagaTurno] = {}
+    vagas_alteradas = {}
+    contagem = {
+        'turnos_criados': 0,
+        'turnos_atualizados': 0,
+        'vagas_turno_criadas': 0,
+        'vagas_turno_atualizadas': 0,
+        'turnos_existentes_ignorados': 0,
+    }
+
+    for regra in regras:
+        demandas = list(regra.demandas_por_funcao.all())
+        for d in _datas_da_regra(regra, data_ref, limite):
+            chave = (d, regra.hora_inicio, regra.hora_fim)
+
+            if chave in existentes or chave in novos_turnos:
+                contagem['turnos_existentes_ignorados'] += 1
+                if not sincronizar_existentes:
+                    continue
+                contagem['turnos_atualizados'] += 1
+                for dem in demandas:
+                    chave_vaga = (chave, dem.funcao_id)
+                    vaga = vagas.get(chave_vaga)
+                    if vaga is None:
+                        vagas[chave_vaga] = novas_vagas[chave_vaga] = VagaTurno(
+                            funcao_id=dem.funcao_id, quantidade_total=dem.quantidade, quantidade_preenchida=0,
+                        )
+                        contagem['vagas_turno_atualizadas'] += 1
+                        continue
+                    alvo = max(int(dem.quantidade), int(vaga.quantidade_preenchida))
+                    if vaga.quantidade_total != alvo:
+                        vaga.quantidade_total = alvo
+                        if vaga.pk:
+                            vagas_alteradas[vaga.pk] = vaga
+                        contagem['vagas_turno_atualizadas'] += 1
+                continue
+
+            novos_turnos[chave] = TurnoOperacional(
+                unidade_id=unidade.pk,
+                data=d,
+                hora_inicio=regra.hora_inicio,
+                hora_fim=regra.hora_fim,
+                origem=TurnoOperacional.ORIGEM_RECORRENCIA,
+                regra_recorrencia=regra,
+                status=TurnoOperacional.STATUS_ABERTO,
+            )
+            contagem['turnos_criados'] += 1
+            for dem in demandas:
+                chave_vaga = (chave, dem.funcao_id)
+                vagas[chave_vaga] = novas_vagas[chave_vaga] = VagaTurno(
+                    funcao_id=dem.funcao_id, quantidade_total=dem.quantidade, quantidade_preenchida=0,
+                )
+                contagem['vagas_turno_criadas'] += 1
+
+    if novos_turnos:
+        TurnoOperacional.objects.bulk_create(novos_turnos.values(), ignore_conflicts=True)
+        # ignore_conflicts não devolve pk em todos os bancos: relê só os turnos novos
+        for t in TurnoOperacional.objects.filter(
+            unidade_id=unidade.pk, data__gte=data_ref, data__lt=limite
+        ).only('id', 'data', 'hora_inicio', 'hora_fim'):
+            chave = (t.data, t.hora_inicio, t.hora_fim)
+            if chave in novos_turnos:
+                novos_turnos[chave].pk = t.pk
+
+    if novas_vagas:
+        turnos = {**existentes, **novos_turnos}
+        for (chave, _funcao_id), vaga in novas_vagas.items():
+            vaga.turno_id = turnos[chave].pk
+        VagaTurno.objects.bulk_create(novas_vagas.values(), ignore_conflicts=True)
+
+    if vagas_alteradas:
+        VagaTurno.objects.bulk_update(vagas_alteradas.values(), ['quantidade_total'])
+
+    return contagem
+
+
 def gerar_turnos_janela(
     unidade: UnidadeOperacional,
     *,
     dias_a_frente: int = 7,
     data_referencia: Optional[date] = None,
     sincronizar_existentes: bool = True,
+    em_lote: bool = True,
 ) -> dict:
     """
     Para cada regra ativa da unidade, gera turnos nos dias que batem dias_semana.
 
+    ``em_lote=True`` (padrão) usa consultas em lote; ``False`` percorre dia a dia.
+
     Returns:
         dict com chaves:
           - turnos_criados
@@ -104,6 +218,9 @@ def gerar_turnos_janela(
     with transaction.atomic():
         unidade_locked = UnidadeOperacional.objects.select_for_update().get(pk=unidade.pk)
 
+        if em_lote:
+            return _gerar_turnos_em_lote(unidade_locked, regras, data_ref, limite, sincronizar_existentes)
+
         for regra in regras:
             dias = regra.dias_semana or []
             if not dias:
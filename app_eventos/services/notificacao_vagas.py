@@ -9,6 +9,15 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def telefone_e164_freelancer(telefone, codigo_pais=None):
+    """Formata o telefone do freelancer em E.164 usando o código do país do cadastro"""
+    telefone = telefone.strip()
+    if telefone.startswith('+'):
+        return telefone
+    digitos = ''.join(filter(str.isdigit, telefone))
+    return f"+{codigo_pais or '55'}{digitos}"
+
+
 class NotificacaoVagasService:
     """
     Serviço para enviar notificações de vagas para freelancers
@@ -182,6 +191,58 @@ class NotificacaoVagasService:
         
         return stats
     
+    def enfileirar_nova_vaga(self, vaga, criado_por=None, chave_job=None):
+        """
+        Enfileira a notificação de uma nova vaga para envio pelo worker
+        (``processar_fila_mensagens``), sem chamar o Twilio no request.
+        
+        Args:
+            vaga: Instância da Vaga
+            criado_por: Usuário que disparou a notificação (opcional)
+            chave_job: Chave de idempotência da solicitação (opcional)
+            
+        Returns:
+            BroadcastLog: job com o progresso do envio (vazio e concluído se não há destinatários)
+        """
+        freelancers = self._buscar_freelancers_por_funcao(vaga.funcao)
+        mensagem = self._criar_mensagem_vaga(vaga)
+        return self.enfileirar_notificacoes(
+            freelancers,
+            mensagem,
+            empresa_contratante=vaga.empresa_contratante,
+            campaign_name=f"Nova vaga: {vaga.titulo}"[:200],
+            evento=vaga.evento,
+            criado_por=criado_por,
+            chave_job=chave_job,
+        )
+    
+    def enfileirar_notificacoes(self, freelancers, mensagem, *, empresa_contratante, campaign_name,
+                                evento=None, criado_por=None, chave_job=None):
+        """
+        Enfileira uma mensagem (SMS) para cada freelancer com telefone
+        
+        Returns:
+            BroadcastLog: job criado
+        """
+        from app_eventos.services.fila_mensagens import enfileirar_broadcast
+        
+        destinos = [
+            (telefone_e164_freelancer(telefone, codigo_pais), mensagem)
+            for telefone, codigo_pais in freelancers.values_list('telefone', 'codigo_telefonico_pais')
+            if telefone
+        ]
+        return enfileirar_broadcast(
+            empresa_contratante=empresa_contratante,
+            campaign_name=campaign_name,
+            mensagens=destinos,
+            channel_preferred='sms',
+            evento=evento,
+            created_by=criado_por,
+            chave_job=chave_job,
+            body_template=mensagem,
+            provedor='sandbox',  # mesmo número que enviava as notificações de vagas
+        )
+    
     def notificar_vagas_por_funcao(self, funcao_nome):
         """
         Notifica freelancers sobre vagas de uma função específica
@@ -2,8 +2,14 @@
 Serviço de Notificações Push via Firebase Admin SDK (Recomendado)
 """
 from firebase_admin import messaging
+
+from app_eventos.models import Freelance
+from .despacho_push import LOTE_MAX_FCM, dividir_em_lotes
 from .firebase_config import get_firebase_app
 
+# Tokens que não voltam a funcionar: removidos do cadastro do freelancer
+ERROS_ADMIN_TOKEN_MORTO = (messaging.UnregisteredError, messaging.SenderIdMismatchError)
+
 
 class NotificacaoPushAdminService:
     """
@@ -110,46 +116,61 @@ class NotificacaoPushAdminService:
                 'tipo': 'nova_vaga',
             }
             
-            # Criar mensagem multicast
-            message = messaging.MulticastMessage(
-                tokens=device_tokens,
-                notification=messaging.Notification(
-                    title=titulo,
-                    body=corpo,
+            # Partes comuns da mensagem; cada lote ganha seu próprio MulticastMessage
+            # (o SDK recusa mais de 500 tokens por mensagem)
+            tokens = list(dict.fromkeys(t for t in device_tokens if t))
+            notificacao = messaging.Notification(
+                title=titulo,
+                body=corpo,
+            )
+            android = messaging.AndroidConfig(
+                priority='high',
+                notification=messaging.AndroidNotification(
+                    icon='ic_notification',
+                    color='#667eea',
+                    sound='default',
                 ),
-                data=data_adicional,
-                android=messaging.AndroidConfig(
-                    priority='high',
-                    notification=messaging.AndroidNotification(
-                        icon='ic_notification',
-                        color='#667eea',
+            )
+            apns = messaging.APNSConfig(
+                headers={'apns-priority': '10'},
+                payload=messaging.APNSPayload(
+                    aps=messaging.Aps(
                         sound='default',
-                    ),
-                ),
-                apns=messaging.APNSConfig(
-                    headers={'apns-priority': '10'},
-                    payload=messaging.APNSPayload(
-                        aps=messaging.Aps(
-                            sound='default',
-                            badge=1,
-                            content_available=True,
-                        ),
+                        badge=1,
+                        content_available=True,
                     ),
                 ),
             )
             
-            # Enviar para múltiplos dispositivos
-            response = messaging.send_multicast(message)
-            
-            print(f"✓ Notificações enviadas: {response.success_count}/{len(device_tokens)}")
+            # Enviar em lotes de até 500 tokens (limite do multicast)
+            enviar = getattr(messaging, 'send_each_for_multicast', None) or messaging.send_multicast
+            sucesso = 0
+            mortos = []
+            for lote in dividir_em_lotes(tokens, LOTE_MAX_FCM):
+                message = messaging.MulticastMessage(
+                    tokens=lote,
+                    notification=notificacao,
+                    data=data_adicional,
+                    android=android,
+                    apns=apns,
+                )
+                response = enviar(message)
+                sucesso += response.success_count
+                
+                # Tratar tokens inválidos
+                if response.failure_count > 0:
+                    for idx, result in enumerate(response.responses):
+                        if not result.success:
+                            print(f"✗ Falha no token {lote[idx][:20]}...: {result.exception}")
+                            if isinstance(result.exception, ERROS_ADMIN_TOKEN_MORTO):
+                                mortos.append(lote[idx])
             
-            # Tratar tokens inválidos
-            if response.failure_count > 0:
-                for idx, result in enumerate(response.responses):
-                    if not result.success:
-                        print(f"✗ Falha no token {device_tokens[idx][:20]}...: {result.exception}")
+            print(f"✓ Notificações enviadas: {sucesso}/{len(tokens)}")
+            if mortos:
+                removidos = Freelance.objects.filter(device_token__in=mortos).update(device_token=None)
+                print(f"✓ Tokens inválidos removidos: {removidos}")
             
-            return response.success_count
+            return sucesso
             
         except Exception as e:
             print(f"✗ Erro ao enviar notificações: {str(e)}")
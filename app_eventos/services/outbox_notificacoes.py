@@ -0,0 +1,384 @@
+"""
+Outbox das notificações disparadas por signals (in-app + e-mail).
+
+Fluxo:
+- Os signals de Candidatura, Vaga, ContratoFreelance e DocumentoFreelancerEmpresa
+  chamam ``registrar_evento``, que só grava uma linha ``NotificacaoOutbox``
+  (tipo + ids) depois do commit. Salvar o objeto não custa nada por destinatário.
+- O comando ``processar_notificacoes`` reserva lotes de eventos e, para o lote
+  inteiro: carrega os objetos com ``in_bulk``/``select_related``, resolve os
+  destinatários, carrega as ``ConfiguracaoNotificacao`` numa única consulta
+  (criando as que faltam com ``bulk_create``), grava as ``Notificacao`` com
+  ``bulk_create`` e envia os e-mails por uma única conexão SMTP.
+- Os eventos do lote também viram ``EntregaWebhook`` para os ``WebhookGlobal``
+  inscritos (services/webhooks.py), entregues pelo comando ``processar_webhooks``.
+
+Os textos e as regras (qual preferência libera qual notificação) são os mesmos
+que os signals usavam quando faziam tudo dentro do save.
+"""
+import logging
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from app_eventos.models import Candidatura, ContratoFreelance, User, Vaga
+from app_eventos.models_documentos import DocumentoFreelancerEmpresa
+from app_eventos.models_notificacoes import ConfiguracaoNotificacao, Notificacao, NotificacaoOutbox
+from app_eventos.services.webhooks import enfileirar_entregas
+
+logger = logging.getLogger(__name__)
+
+MAX_TENTATIVAS_PADRAO = 5
+RESERVA_SEGUNDOS = 300
+TIPOS_USUARIO_EMPRESA = ['admin_empresa', 'operador_empresa']
+
+
+def registrar_evento(evento, **payload):
+    """
+    Enfileira um evento de notificação quando a transação atual for confirmada.
+
+    ``payload`` deve conter só ids e valores simples (vai para um JSONField).
+    Se a transação for desfeita, nada é enfileirado.
+    """
+    transaction.on_commit(lambda: NotificacaoOutbox.objects.create(evento=evento, payload=payload))
+
+
+class _Envio:
+    """Uma notificação a entregar: destinatário, preferência que a libera, dados e e-mail opcional."""
+    __slots__ = ('usuario', 'preferencia', 'dados', 'assunto_email')
+
+    def __init__(self, usuario, dados, preferencia=None, assunto_email=None):
+        self.usuario = usuario
+        self.dados = dados
+        self.preferencia = preferencia
+        self.assunto_email = assunto_email
+
+
+class ProcessadorOutboxNotificacoes:
+    """
+    Drena a ``NotificacaoOutbox`` em lotes.
+
+    Eventos cujo objeto já foi apagado são marcados como processados sem gerar nada.
+    Uma falha no lote devolve os eventos à fila (até ``max_tentativas``).
+    """
+
+    def __init__(self, tamanho_lote=200, max_tentativas=None, connection=None):
+        self.tamanho_lote = tamanho_lote
+        self.max_tentativas = max_tentativas or getattr(
+            settings, 'OUTBOX_NOTIFICACOES_MAX_TENTATIVAS', MAX_TENTATIVAS_PADRAO
+        )
+        self.connection = connection
+        self.worker_id = uuid.uuid4().hex[:8]
+
+    def processar_lote(self) -> Dict[str, int]:
+        """Reserva e processa um lote. Retorna {'processados', 'notificacoes', 'emails', 'falhas'}."""
+        self._liberar_reservas_expiradas()
+        lote = self._reservar_lote()
+        stats = {'processados': len(lote), 'notificacoes': 0, 'emails': 0, 'falhas': 0}
+        if not lote:
+            return stats
+
+        try:
+            with transaction.atomic():
+                envios = self._resolver_envios(lote)
+                notificacoes, emails = self._aplicar_preferencias(envios)
+                Notificacao.objects.bulk_create(notificacoes, batch_size=500)
+                # Os mesmos eventos seguem para os webhooks globais inscritos (entregues por processar_webhooks)
+                enfileirar_entregas((item.evento, item.payload) for item in lote)
+                NotificacaoOutbox.objects.filter(id__in=[e.id for e in lote]).update(
+                    status='processado',
+                    claim_token='',
+                    reservado_ate=None,
+                    data_processamento=timezone.now(),
+                )
+        except Exception as e:
+            logger.exception("Erro ao processar lote de %s evento(s) de notificação", len(lote))
+            stats['falhas'] = self._registrar_falha(lote, e)
+            return stats
+
+        stats['notificacoes'] = len(notificacoes)
+        stats['emails'] = self._enviar_emails(emails)
+        return stats
+
+    def processar_pendentes(self, max_lotes=None) -> Dict[str, int]:
+        """Processa lotes até a fila esvaziar."""
+        total = {'processados': 0, 'notificacoes': 0, 'emails': 0, 'falhas': 0}
+        lotes = 0
+        while max_lotes is None or lotes < max_lotes:
+            stats = self.processar_lote()
+            if not stats['processados']:
+                break
+            for chave, valor in stats.items():
+                total[chave] += valor
+            lotes += 1
+        return total
+
+    # ----- reserva -----
+
+    def _reservar_lote(self) -> List[NotificacaoOutbox]:
+        agora = timezone.now()
+        token = uuid.uuid4().hex
+        ids = list(
+            NotificacaoOutbox.objects.filter(status='pendente')
+            .order_by('id')
+            .values_list('id', flat=True)[:self.tamanho_lote]
+        )
+        if not ids:
+            return []
+        # UPDATE condicional: se outro worker reservou primeiro, a linha não é reservada aqui
+        NotificacaoOutbox.objects.filter(id__in=ids, status='pendente').update(
+            status='processando',
+            claim_token=token,
+            reservado_ate=agora + timedelta(seconds=RESERVA_SEGUNDOS),
+        )
+        return list(NotificacaoOutbox.objects.filter(claim_token=token, status='processando').order_by('id'))
+
+    def _liberar_reservas_expiradas(self):
+        """Devolve à fila eventos de workers que morreram no meio do lote."""
+        liberados = NotificacaoOutbox.objects.filter(
+            status='processando', reservado_ate__lt=timezone.now()
+        ).update(status='pendente', claim_token='', reservado_ate=None)
+        if liberados:
+            logger.warning(f"⚠️ {liberados} eventos de notificação com reserva expirada devolvidos à fila")
+
+    def _registrar_falha(self, lote, erro) -> int:
+        falhas = 0
+        for item in lote:
+            tentativas = item.tentativas + 1
+            definitivo = tentativas >= self.max_tentativas
+            falhas += definitivo
+            NotificacaoOutbox.objects.filter(pk=item.pk, claim_token=item.claim_token).update(
+                status='falhou' if definitivo else 'pendente',
+                tentativas=tentativas,
+                ultimo_erro=str(erro)[:1000],
+                claim_token='',
+                reservado_ate=None,
+            )
+        return falhas
+
+    # ----- resolução dos destinatários -----
+
+    def _resolver_envios(self, lote) -> List[_Envio]:
+        por_evento = defaultdict(list)
+        for item in lote:
+            por_evento[item.evento].append(item.payload)
+
+        envios = []
+        envios += self._nova_candidatura(por_evento['nova_candidatura'])
+        envios += self._status_candidatura(por_evento['status_candidatura'])
+        envios += self._vaga_publicada(por_evento['vaga_publicada'])
+        envios += self._contrato_criado(por_evento['contrato_criado'])
+        envios += self._documento_enviado(por_evento['documento_enviado'])
+        envios += self._documento_validado(por_evento['documento_validado'])
+        return envios
+
+    def _candidaturas(self, payloads):
+        ids = {p['candidatura_id'] for p in payloads}
+        if not ids:
+            return {}
+        return Candidatura.objects.select_related(
+            'vaga__setor__evento', 'freelance__usuario'
+        ).in_bulk(ids)
+
+    def _usuarios_empresa(self, empresa_ids, somente_ativos=True):
+        """{empresa_id: [usuários admin/operador]} numa única consulta."""
+        if not empresa_ids:
+            return {}
+        usuarios = User.objects.filter(
+            empresa_contratante_id__in=empresa_ids, tipo_usuario__in=TIPOS_USUARIO_EMPRESA
+        )
+        if somente_ativos:
+            usuarios = usuarios.filter(is_active=True)
+        por_empresa = defaultdict(list)
+        for usuario in usuarios:
+            por_empresa[usuario.empresa_contratante_id].append(usuario)
+        return por_empresa
+
+    def _nova_candidatura(self, payloads):
+        candidaturas = self._candidaturas(payloads)
+        empresa_por_candidatura = {}
+        for candidatura in candidaturas.values():
+            vaga = candidatura.vaga
+            if vaga.setor_id:
+                empresa_por_candidatura[candidatura.pk] = vaga.setor.evento.empresa_contratante_id
+            else:
+                empresa_por_candidatura[candidatura.pk] = vaga.empresa_contratante_id
+        usuarios = self._usuarios_empresa({e for e in empresa_por_candidatura.values() if e})
+
+        envios = []
+        for candidatura in candidaturas.values():
+            vaga = candidatura.vaga
+            mensagem = (
+                f'Você recebeu uma nova candidatura para a vaga "{vaga.titulo}" '
+                f'de {candidatura.freelance.nome_completo}.'
+            )
+            for usuario in usuarios.get(empresa_por_candidatura[candidatura.pk], []):
+                envios.append(_Envio(
+                    usuario,
+                    dict(tipo='nova_candidatura', titulo='Nova Candidatura Recebida', mensagem=mensagem,
+                         candidatura=candidatura, vaga=vaga, prioridade='media'),
+                    preferencia='email_nova_candidatura',
+                    assunto_email=f'Nova Candidatura - {vaga.titulo}',
+                ))
+        return envios
+
+    def _status_candidatura(self, payloads):
+        candidaturas = self._candidaturas(payloads)
+        envios = []
+        for payload in payloads:
+            candidatura = candidaturas.get(payload['candidatura_id'])
+            if candidatura is None:
+                continue
+            vaga = candidatura.vaga
+            if payload['status'] == 'aprovado':
+                mensagem = f'Parabéns! Sua candidatura para a vaga "{vaga.titulo}" foi aprovada.'
+                envios.append(_Envio(
+                    candidatura.freelance.usuario,
+                    dict(tipo='candidatura_aprovada', titulo='Candidatura Aprovada!', mensagem=mensagem,
+                         candidatura=candidatura, vaga=vaga, prioridade='alta'),
+                    preferencia='email_candidatura_aprovada',
+                    assunto_email=f'Candidatura Aprovada - {vaga.titulo}',
+                ))
+            elif payload['status'] == 'rejeitado':
+                mensagem = f'Sua candidatura para a vaga "{vaga.titulo}" não foi aprovada desta vez.'
+                envios.append(_Envio(
+                    candidatura.freelance.usuario,
+                    dict(tipo='candidatura_rejeitada', titulo='Candidatura Não Aprovada', mensagem=mensagem,
+                         candidatura=candidatura, vaga=vaga, prioridade='media'),
+                    preferencia='email_candidatura_rejeitada',
+                    assunto_email=f'Candidatura Não Aprovada - {vaga.titulo}',
+                ))
+        return envios
+
+    def _vaga_publicada(self, payloads):
+        # Vários saves da mesma vaga no lote viram uma notificação só
+        ids = {p['vaga_id'] for p in payloads}
+        if not ids:
+            return []
+        vagas = Vaga.objects.select_related('setor__evento__local').filter(
+            id__in=ids, publicada=True, setor__isnull=False
+        )
+        envios = []
+        for vaga in vagas:
+            evento = vaga.setor.evento
+            mensagem = f'Uma nova vaga foi publicada: "{vaga.titulo}" em {evento.nome}.'
+            for freelancer in vaga._get_freelancers_interessados():
+                envios.append(_Envio(
+                    freelancer.usuario,
+                    dict(tipo='vaga_publicada', titulo='Nova Vaga Disponível', mensagem=mensagem,
+                         vaga=vaga, evento=evento, prioridade='media'),
+                    preferencia='email_vaga_publicada',
+                ))
+        return envios
+
+    def _contrato_criado(self, payloads):
+        ids = {p['contrato_id'] for p in payloads}
+        if not ids:
+            return []
+        contratos = ContratoFreelance.objects.select_related('freelance__usuario', 'vaga').in_bulk(ids)
+        return [
+            _Envio(
+                contrato.freelance.usuario,
+                dict(tipo='contrato_criado', titulo='Contrato Criado',
+                     mensagem=f'Seu contrato para a vaga "{contrato.vaga.titulo}" foi criado com sucesso.',
+                     vaga=contrato.vaga, prioridade='alta'),
+            )
+            for contrato in contratos.values()
+        ]
+
+    def _documentos(self, payloads):
+        ids = {p['documento_id'] for p in payloads}
+        if not ids:
+            return {}
+        return DocumentoFreelancerEmpresa.objects.select_related(
+            'freelancer__usuario', 'empresa_contratante'
+        ).in_bulk(ids)
+
+    def _documento_enviado(self, payloads):
+        documentos = self._documentos(payloads)
+        usuarios = self._usuarios_empresa(
+            {d.empresa_contratante_id for d in documentos.values()}, somente_ativos=False
+        )
+        envios = []
+        for documento in documentos.values():
+            mensagem = (
+                f'{documento.freelancer.usuario.get_full_name()} enviou {documento.get_tipo_documento_display()}'
+            )
+            for usuario in usuarios.get(documento.empresa_contratante_id, []):
+                envios.append(_Envio(
+                    usuario,
+                    dict(tipo='nova_candidatura', titulo='Novo Documento Enviado', mensagem=mensagem,
+                         prioridade='media'),
+                ))
+        return envios
+
+    def _documento_validado(self, payloads):
+        documentos = self._documentos(payloads)
+        status_display = dict(DocumentoFreelancerEmpresa.STATUS_DOCUMENTO_CHOICES)
+        envios = []
+        for payload in payloads:
+            documento = documentos.get(payload['documento_id'])
+            if documento is None:
+                continue
+            aprovado = payload['status'] == 'aprovado'
+            mensagem = (
+                f'Seu {documento.get_tipo_documento_display()} foi '
+                f'{status_display.get(payload["status"], payload["status"]).lower()} '
+                f'pela empresa {documento.empresa_contratante.nome_fantasia}'
+            )
+            if documento.observacoes:
+                mensagem += f'\n\nObservações: {documento.observacoes}'
+            envios.append(_Envio(
+                documento.freelancer.usuario,
+                dict(tipo='candidatura_aprovada' if aprovado else 'candidatura_rejeitada',
+                     titulo='Documento Aprovado!' if aprovado else 'Documento Rejeitado',
+                     mensagem=mensagem, prioridade='media' if aprovado else 'alta'),
+            ))
+        return envios
+
+    # ----- preferências, gravação e e-mail -----
+
+    def _configuracoes(self, usuario_ids):
+        """{usuario_id: ConfiguracaoNotificacao}; quem não tem recebe uma com os padrões."""
+        configs = {
+            c.usuario_id: c for c in ConfiguracaoNotificacao.objects.filter(usuario_id__in=usuario_ids)
+        }
+        faltando = [ConfiguracaoNotificacao(usuario_id=uid) for uid in usuario_ids if uid not in configs]
+        if faltando:
+            ConfiguracaoNotificacao.objects.bulk_create(faltando, ignore_conflicts=True)
+            configs.update((c.usuario_id, c) for c in faltando)
+        return configs
+
+    def _aplicar_preferencias(self, envios):
+        configs = self._configuracoes({envio.usuario.pk for envio in envios})
+        notificacoes, emails = [], []
+        remetente = settings.DEFAULT_FROM_EMAIL
+        for envio in envios:
+            if envio.preferencia and not getattr(configs[envio.usuario.pk], envio.preferencia):
+                continue
+            notificacoes.append(Notificacao(usuario=envio.usuario, **envio.dados))
+            if envio.assunto_email and envio.usuario.email:
+                emails.append(EmailMessage(
+                    subject=envio.assunto_email,
+                    body=envio.dados['mensagem'],
+                    from_email=remetente,
+                    to=[envio.usuario.email],
+                ))
+        return notificacoes, emails
+
+    def _enviar_emails(self, emails) -> int:
+        """Envia todas as mensagens do lote pela mesma conexão SMTP."""
+        if not emails:
+            return 0
+        connection = self.connection or get_connection(fail_silently=True)
+        try:
+            return connection.send_messages(emails) or 0
+        except Exception as e:
+            logger.error(f"Erro ao enviar {len(emails)} email(s) de notificação: {e}")
+            return 0
@@ -0,0 +1,209 @@
+"""
+Registro em memória de ParametroSistema, ConfiguracaoSistema e IntegracaoGlobal.
+
+``parametros()`` devolve um instantâneo imutável de todos os registros ativos,
+com os valores já convertidos pelo ``tipo`` (integer, float, boolean, json) uma
+única vez na carga:
+
+    from app_eventos.services.parametros_sistema import parametros
+
+    timeout = parametros().TIMEOUT_API            # int
+    if parametros().get('BACKUP_AUTOMATICO', False): ...
+    twilio = parametros().integracoes.get('Twilio')
+
+Parâmetros e configurações dividem o mesmo espaço de nomes (o parâmetro vence se
+repetir o nome); valor inválido para o tipo cai no ``valor_padrao`` do parâmetro
+(ou no texto cru da configuração) com aviso no log.
+
+Recarga: cada save/delete desses modelos incrementa a versão no cache
+(``PARAMETROS_SISTEMA_CACHE_ALIAS``, ver signals_parametros_sistema.py). O processo
+compara a versão no máximo a cada ``PARAMETROS_SISTEMA_VERIFICACAO`` segundos e só
+então consulta o banco; entre verificações o acesso é só leitura de atributo. A
+versão expira com ``PARAMETROS_SISTEMA_TIMEOUT`` e volta com outro valor, então
+mesmo um worker sem cache compartilhado recarrega dentro desse prazo.
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from app_eventos.models_globais import ConfiguracaoSistema, IntegracaoGlobal, ParametroSistema
+
+logger = logging.getLogger(__name__)
+
+CHAVE_VERSAO = 'parametros_sistema:versao'
+VERDADEIROS = {'true', '1', 'sim', 's', 'yes', 'y', 'on', 'verdadeiro'}
+FALSOS = {'false', '0', 'nao', 'não', 'n', 'no', 'off', 'falso', ''}
+
+
+def _cache():
+    return caches[getattr(settings, 'PARAMETROS_SISTEMA_CACHE_ALIAS', 'default')]
+
+
+def _timeout():
+    return getattr(settings, 'PARAMETROS_SISTEMA_TIMEOUT', 300)
+
+
+def converter(tipo: str, texto: Optional[str]) -> Any:
+    """Texto do banco -> valor Python conforme o ``tipo``. Levanta ValueError se não converter."""
+    texto = (texto or '').strip()
+    if tipo == 'integer':
+        return int(texto)
+    if tipo == 'float':
+        return float(texto.replace(',', '.'))
+    if tipo == 'boolean':
+        minusculo = texto.lower()
+        if minusculo in VERDADEIROS:
+            return True
+        if minusculo in FALSOS:
+            return False
+        raise ValueError(f"booleano inválido: {texto!r}")
+    if tipo == 'json':
+        return _congelar(json.loads(texto))
+    return texto
+
+
+def _congelar(valor):
+    # JSON decodificado vira estrutura só de leitura, compartilhada entre threads
+    if isinstance(valor, dict):
+        return MappingProxyType({k: _congelar(v) for k, v in valor.items()})
+    if isinstance(valor, list):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+@dataclass(frozen=True)
+class Integracao:
+    nome: str
+    tipo: str
+    url_base: Optional[str]
+    documentacao: Optional[str]
+
+
+class InstantaneoParametros:
+    """Valores tipados de uma versão; imutável, acesso por atributo ou por nome."""
+
+    __slots__ = ('versao', '_valores', 'integracoes')
+
+    def __init__(self, versao, valores: dict, integracoes: dict):
+        object.__setattr__(self, 'versao', versao)
+        object.__setattr__(self, '_valores', MappingProxyType(valores))
+        object.__setattr__(self, 'integracoes', MappingProxyType(integracoes))
+
+    def __getattr__(self, nome):
+        try:
+            return self._valores[nome]
+        except KeyError:
+            raise AttributeError(f"Parâmetro do sistema inexistente ou inativo: {nome}") from None
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("Parâmetros do sistema são somente leitura")
+
+    def __getitem__(self, nome):
+        return self._valores[nome]
+
+    def __contains__(self, nome):
+        return nome in self._valores
+
+    def get(self, nome, padrao=None):
+        return self._valores.get(nome, padrao)
+
+    @property
+    def valores(self) -> Mapping[str, Any]:
+        return self._valores
+
+
+def carregar(versao=None) -> InstantaneoParametros:
+    """Lê os três modelos (três consultas) e monta o instantâneo."""
+    valores = {}
+    for chave, valor, tipo in ConfiguracaoSistema.objects.filter(ativo=True).values_list('chave', 'valor', 'tipo'):
+        try:
+            valores[chave] = converter(tipo, valor)
+        except ValueError:
+            logger.warning("Configuração %s com valor inválido para %s: %r", chave, tipo, valor)
+            valores[chave] = valor
+
+    campos = ('nome', 'valor_atual', 'valor_padrao', 'tipo')
+    for nome, atual, padrao, tipo in ParametroSistema.objects.filter(ativo=True).values_list(*campos):
+        if nome in valores:
+            logger.warning("Parâmetro %s sobrepõe a configuração de mesmo nome", nome)
+        try:
+            valores[nome] = converter(tipo, atual)
+        except ValueError:
+            logger.warning("Parâmetro %s com valor inválido para %s: %r; usando o padrão", nome, tipo, atual)
+            try:
+                valores[nome] = converter(tipo, padrao)
+            except ValueError:
+                valores[nome] = padrao
+
+    integracoes = {
+        nome: Integracao(nome, tipo, url_base, documentacao)
+        for nome, tipo, url_base, documentacao in IntegracaoGlobal.objects.filter(ativo=True).values_list(
+            'nome', 'tipo', 'url_base', 'documentacao'
+        )
+    }
+    return InstantaneoParametros(versao, valores, integracoes)
+
+
+def _versao_compartilhada():
+    cache = _cache()
+    versao = cache.get(CHAVE_VERSAO)
+    if versao is None:
+        # Valor inicial do relógio: nunca coincide com uma versão já carregada
+        semente = time.time_ns()
+        cache.add(CHAVE_VERSAO, semente, _timeout())
+        versao = cache.get(CHAVE_VERSAO, semente)
+    return versao
+
+
+class RegistroParametros:
+    def __init__(self):
+        self._instantaneo: Optional[InstantaneoParametros] = None
+        self._verificado_em = 0.0
+        self._lock = threading.Lock()
+
+    def atual(self) -> InstantaneoParametros:
+        instantaneo = self._instantaneo
+        agora = time.monotonic()
+        if instantaneo is not None and agora - self._verificado_em < getattr(settings, 'PARAMETROS_SISTEMA_VERIFICACAO', 10):
+            return instantaneo
+
+        versao = _versao_compartilhada()
+        self._verificado_em = agora
+        if instantaneo is not None and instantaneo.versao == versao:
+            return instantaneo
+        with self._lock:
+            if self._instantaneo is None or self._instantaneo.versao != versao:
+                self._instantaneo = carregar(versao)
+                logger.debug("Parâmetros do sistema recarregados (versão %s)", versao)
+            return self._instantaneo
+
+    def invalidar(self):
+        """Nova versão no cache; este processo confere já no próximo acesso."""
+        cache = _cache()
+        try:
+            cache.incr(CHAVE_VERSAO)
+        except ValueError:
+            cache.add(CHAVE_VERSAO, time.time_ns(), _timeout())
+        self._verificado_em = 0.0
+
+
+_registro = RegistroParametros()
+
+
+def parametros() -> InstantaneoParametros:
+    return _registro.atual()
+
+
+def parametro(nome: str, padrao=None):
+    return _registro.atual().get(nome, padrao)
+
+
+def invalidar_parametros():
+    _registro.invalidar()
@@ -0,0 +1,213 @@
+"""
+Perfil de consultas por request: contagem, tempo de banco, N+1 e métricas por rota.
+
+Ativado por ``PERFIL_CONSULTAS_ATIVO`` (middleware_perfil.PerfilConsultasMiddleware;
+desligado, o middleware nem entra na cadeia):
+- uma fração ``PERFIL_CONSULTAS_AMOSTRAGEM`` dos requests (0 a 1) roda dentro de
+  ``connection.execute_wrapper``: cada consulta é contada e cronometrada, e o SQL
+  (já sem parâmetros, com listas de IN colapsadas) vira a "forma" da consulta;
+  uma forma repetida ``PERFIL_CONSULTAS_LIMIAR_REPETICAO`` vezes no mesmo request
+  é sinalizada como N+1, com a pilha do ponto de chamada no nosso código;
+- todo request (amostrado ou não) entra no histograma de latência da rota;
+- requests amostrados acima de ``PERFIL_CONSULTAS_LENTO_MS`` (ou com N+1) vão para
+  um buffer circular de ``PERFIL_CONSULTAS_BUFFER`` entradas.
+
+Os agregados ficam em memória, por processo (com vários workers, cada um expõe os
+seus; o Prometheus soma pelas séries). ``exportar_prometheus`` gera o texto servido
+em ``/metrics``.
+"""
+import logging
+import os
+import random
+import re
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LIMITES_DURACAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+PROFUNDIDADE_PILHA = 6
+
+_RE_LISTA_IN = re.compile(r'\((?:%s, )+%s\)')
+_RE_ESPACOS = re.compile(r'\s+')
+
+
+def forma_sql(sql: str) -> str:
+    """SQL sem variação entre chamadas: ``IN (%s, %s, %s)`` vira ``IN (%s...)``."""
+    return _RE_ESPACOS.sub(' ', _RE_LISTA_IN.sub('(%s...)', sql)).strip()
+
+
+def _pilha_do_projeto() -> List[str]:
+    """Frames do nosso código (fora de site-packages e deste módulo), do mais externo ao mais interno."""
+    raiz = str(settings.BASE_DIR)
+    frames = [
+        f"{os.path.relpath(f.filename, raiz)}:{f.lineno} {f.name}"
+        for f in traceback.extract_stack()[:-1]
+        if f.filename.startswith(raiz) and 'site-packages' not in f.filename and f.filename != __file__
+    ]
+    return frames[-PROFUNDIDADE_PILHA:]
+
+
+class PerfilRequest:
+    """Coletor de um request; usado como ``connection.execute_wrapper(perfil)``."""
+
+    def __init__(self, limiar_repeticao: int):
+        self.limiar_repeticao = limiar_repeticao
+        self.consultas = 0
+        self.tempo_banco = 0.0
+        self.formas: Counter = Counter()
+        self.repeticoes: Dict[str, List[str]] = {}  # forma -> pilha da chamada que atingiu o limiar
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tempo_banco += time.perf_counter() - inicio
+            self.consultas += 1
+            forma = forma_sql(sql)
+            self.formas[forma] += 1
+            if self.formas[forma] == self.limiar_repeticao:
+                self.repeticoes[forma] = _pilha_do_projeto()
+
+    def n_mais_um(self) -> List[dict]:
+        return [
+            {'sql': forma, 'vezes': self.formas[forma], 'pilha': pilha}
+            for forma, pilha in self.repeticoes.items()
+        ]
+
+
+class _Histograma:
+    __slots__ = ('limites', 'baldes', 'soma', 'total')
+
+    def __init__(self, limites):
+        self.limites = limites
+        self.baldes = [0] * len(limites)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.soma += valor
+        self.total += 1
+        for i, limite in enumerate(self.limites):
+            if valor <= limite:
+                self.baldes[i] += 1
+                break
+
+    def linhas(self, nome, rotulos):
+        acumulado = 0
+        for limite, quantidade in zip(self.limites, self.baldes):
+            acumulado += quantidade
+            yield f'{nome}_bucket{{{rotulos},le="{limite}"}} {acumulado}'
+        yield f'{nome}_bucket{{{rotulos},le="+Inf"}} {self.total}'
+        yield f'{nome}_sum{{{rotulos}}} {self.soma:.6f}'
+        yield f'{nome}_count{{{rotulos}}} {self.total}'
+
+
+class _MetricasRota:
+    __slots__ = ('duracao', 'consultas', 'tempo_banco', 'n_mais_um', 'status')
+
+    def __init__(self):
+        self.duracao = _Histograma(LIMITES_DURACAO)
+        self.consultas = _Histograma(LIMITES_CONSULTAS)
+        self.tempo_banco = 0.0
+        self.n_mais_um = 0
+        self.status: Counter = Counter()
+
+
+class RegistroPerfil:
+    """Agregados por rota e buffer de requests lentos do processo."""
+
+    def __init__(self):
+        self.amostragem = float(getattr(settings, 'PERFIL_CONSULTAS_AMOSTRAGEM', 1.0))
+        self.limiar_repeticao = int(getattr(settings, 'PERFIL_CONSULTAS_LIMIAR_REPETICAO', 5))
+        self.lento = getattr(settings, 'PERFIL_CONSULTAS_LENTO_MS', 500) / 1000
+        self.lentos = deque(maxlen=int(getattr(settings, 'PERFIL_CONSULTAS_BUFFER', 100)))
+        self._rotas: Dict[tuple, _MetricasRota] = {}
+        self._lock = threading.Lock()
+
+    def novo_perfil(self) -> Optional[PerfilRequest]:
+        """Coletor para o request, ou None se ele ficou fora da amostra."""
+        if self.amostragem <= 0 or (self.amostragem < 1 and random.random() >= self.amostragem):
+            return None
+        return PerfilRequest(self.limiar_repeticao)
+
+    def registrar(self, rota, metodo, caminho, status, duracao, perfil: Optional[PerfilRequest] = None):
+        n_mais_um = perfil.n_mais_um() if perfil else []
+        with self._lock:
+            metricas = self._rotas.get((rota, metodo))
+            if metricas is None:
+                metricas = self._rotas[(rota, metodo)] = _MetricasRota()
+            metricas.duracao.observar(duracao)
+            metricas.status[status] += 1
+            if perfil:
+                metricas.consultas.observar(perfil.consultas)
+                metricas.tempo_banco += perfil.tempo_banco
+                metricas.n_mais_um += len(n_mais_um)
+
+        if perfil and (duracao >= self.lento or n_mais_um):
+            self.lentos.append({
+                'rota': rota,
+                'metodo': metodo,
+                'caminho': caminho,
+                'status': status,
+                'duracao_ms': round(duracao * 1000, 1),
+                'consultas': perfil.consultas,
+                'tempo_banco_ms': round(perfil.tempo_banco * 1000, 1),
+                'n_mais_um': n_mais_um,
+            })
+        for item in n_mais_um:
+            logger.warning(
+                "N+1 em %s %s: %sx %s\n  %s", metodo, rota, item['vezes'], item['sql'][:200], '\n  '.join(item['pilha'])
+            )
+
+    def exportar_prometheus(self) -> str:
+        with self._lock:
+            rotas = sorted(self._rotas.items())
+            linhas = []
+
+            def bloco(nome, tipo, ajuda, gerar):
+                linhas.append(f'# HELP {nome} {ajuda}')
+                linhas.append(f'# TYPE {nome} {tipo}')
+                for (rota, metodo), metricas in rotas:
+                    linhas.extend(gerar(f'rota="{_escapar(rota)}",metodo="{metodo}"', metricas))
+
+            bloco('eventix_request_duracao_segundos', 'histogram', 'Latência dos requests por rota.',
+                  lambda r, m: m.duracao.linhas('eventix_request_duracao_segundos', r))
+            bloco('eventix_requests_total', 'counter', 'Requests por rota e status.',
+                  lambda r, m: (f'eventix_requests_total{{{r},status="{s}"}} {n}' for s, n in sorted(m.status.items())))
+            bloco('eventix_consultas_por_request', 'histogram', 'Consultas SQL por request (amostrados).',
+                  lambda r, m: m.consultas.linhas('eventix_consultas_por_request', r))
+            bloco('eventix_tempo_banco_segundos_total', 'counter', 'Tempo de banco acumulado (amostrados).',
+                  lambda r, m: [f'eventix_tempo_banco_segundos_total{{{r}}} {m.tempo_banco:.6f}'])
+            bloco('eventix_n_mais_um_total', 'counter', 'Formas de SQL repetidas acima do limiar num request.',
+                  lambda r, m: [f'eventix_n_mais_um_total{{{r}}} {m.n_mais_um}'])
+        return '\n'.join(linhas) + '\n'
+
+    def limpar(self):
+        with self._lock:
+            self._rotas.clear()
+            self.lentos.clear()
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_registro = None
+_registro_lock = threading.Lock()
+
+
+def registro() -> RegistroPerfil:
+    global _registro
+    if _registro is None:
+        with _registro_lock:
+            if _registro is None:
+                _registro = RegistroPerfil()
+    return _registro
@@ -0,0 +1,334 @@
+"""
+Renderização de PDFs endereçada por conteúdo (RenderizacaoDocumento).
+
+- Cada tipo de documento registra um renderizador com uma versão de layout
+  (``@renderizador('contrato_evento', versao=1)``); o hash SHA-256 de
+  tipo + versão + ``parametros`` identifica o PDF. Mudar o layout = subir a versão.
+- ``solicitar_renderizacoes`` resolve vários pedidos com duas consultas: os
+  hashes já conhecidos são reaproveitados (concluídos não são refeitos), os
+  novos entram com um ``bulk_create`` como ``pendente``.
+- Pendentes são renderizados fora da requisição conforme
+  ``RENDERIZACAO_PDF_MODO``: ``thread`` (padrão; pool de
+  ``RENDERIZACAO_PDF_WORKERS`` threads no próprio processo, disparado no commit),
+  ``fila`` (só o comando ``processar_renderizacoes``) ou ``sincrono`` (na hora;
+  desenvolvimento). Pedidos órfãos (em "processando" há mais de
+  ``RENDERIZACAO_PDF_TIMEOUT_PROCESSANDO``, p.ex. processo web reiniciado no
+  meio) voltam para a fila no próximo pedido do mesmo documento e a cada
+  rodada do comando; pendentes são despachados de novo a cada pedido (a
+  reserva em ``processar`` impede renderizar duas vezes).
+- O arquivo fica em ``renderizacoes/<aa>/<hash>.pdf``: a URL é conhecida antes
+  de o PDF existir e o status diz quando ele está pronto.
+
+Usado por app_contratos (contrato do evento) e por ``gerar_documentos``
+(DocumentoGerado a partir de TemplateDocumento, em lote).
+"""
+import hashlib
+import json
+import logging
+import re
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.utils import timezone
+
+from app_eventos.models import DocumentoGerado
+from app_eventos.models_renderizacao import RenderizacaoDocumento
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    REPORTLAB_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    REPORTLAB_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MODO_PADRAO = 'thread'
+WORKERS_PADRAO = 2
+LIMITE_PROCESSANDO = 600  # segundos; depois disso, "processando" é considerado órfão
+
+RENDERIZADORES: Dict[str, Tuple[int, Callable[[dict], bytes]]] = {}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def renderizador(tipo: str, versao: int):
+    """Registra a função ``parametros -> bytes`` do tipo, com a versão do layout."""
+    def registrar(funcao):
+        RENDERIZADORES[tipo] = (versao, funcao)
+        return funcao
+    return registrar
+
+
+# ---------------------------------------------------------------------------
+# Layouts
+# ---------------------------------------------------------------------------
+
+def _escrever_pdf(titulo: str, linhas: Sequence[str]) -> bytes:
+    """Título + texto corrido com quebra de linha e de página. ``invariant`` deixa a saída determinística."""
+    if not REPORTLAB_AVAILABLE:  # pragma: no cover - fallback textual
+        return '\n'.join([titulo, *linhas]).encode('utf-8')
+
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4, invariant=1)
+    pdf.setTitle(titulo)
+    topo = A4[1] - 42
+    pdf.setFont('Helvetica-Bold', 13)
+    pdf.drawString(50, topo, titulo)
+    pdf.setFont('Helvetica', 11)
+    y = topo - 28
+    for linha in linhas:
+        for parte in textwrap.wrap(linha, 95) or ['']:
+            if y < 50:
+                pdf.showPage()
+                pdf.setFont('Helvetica', 11)
+                y = topo
+            pdf.drawString(50, y, parte)
+            y -= 15
+    pdf.save()
+    return buffer.getvalue()
+
+
+@renderizador('contrato_evento', versao=1)
+def _contrato_evento(parametros: dict) -> bytes:
+    linhas = [f"Data: {parametros['data_inicio']}"]
+    if parametros.get('orcamento'):
+        linhas.append(f"Orçamento: R$ {parametros['orcamento']['total']}")
+    linhas += ['', 'Condições Gerais:', *(parametros['condicoes'].splitlines() or ['N/A'])]
+    return _escrever_pdf(f"Contrato do Evento: {parametros['evento']}", linhas)
+
+
+@renderizador('documento_gerado', versao=1)
+def _documento_gerado(parametros: dict) -> bytes:
+    return _escrever_pdf(parametros['titulo'], parametros['conteudo'].splitlines())
+
+
+def parametros_contrato(evento, orcamento, condicoes: str) -> dict:
+    """Entradas do contrato do evento (tudo que aparece no PDF, já em tipos JSON)."""
+    return {
+        'evento_id': evento.pk,
+        'evento': evento.nome,
+        'data_inicio': str(evento.data_inicio),
+        'orcamento': {'id': orcamento.pk, 'total': str(orcamento.total)} if orcamento else None,
+        'condicoes': condicoes or '',
+    }
+
+
+# ---------------------------------------------------------------------------
+# Pedidos
+# ---------------------------------------------------------------------------
+
+def calcular_hash(tipo: str, parametros: dict) -> str:
+    versao = RENDERIZADORES[tipo][0]
+    bruto = json.dumps(
+        {'tipo': tipo, 'versao': versao, 'parametros': parametros},
+        sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str,
+    )
+    return hashlib.sha256(bruto.encode('utf-8')).hexdigest()
+
+
+def solicitar_renderizacoes(tipo: str, lista_parametros: Sequence[dict], despachar_agora: bool = True) -> List[RenderizacaoDocumento]:
+    """Uma renderização por item de ``lista_parametros`` (mesma ordem); entradas iguais compartilham a linha."""
+    if tipo not in RENDERIZADORES:
+        raise ValueError(f"Tipo de documento sem renderizador: {tipo}")
+    versao = RENDERIZADORES[tipo][0]
+    hashes = [calcular_hash(tipo, parametros) for parametros in lista_parametros]
+
+    por_hash = {r.hash: r for r in RenderizacaoDocumento.objects.filter(hash__in=set(hashes))}
+    novos = {h: p for h, p in zip(hashes, lista_parametros) if h not in por_hash}
+    if novos:
+        RenderizacaoDocumento.objects.bulk_create(
+            [RenderizacaoDocumento(hash=h, tipo=tipo, versao=versao, parametros=p) for h, p in novos.items()],
+            ignore_conflicts=True,
+        )
+        por_hash.update({r.hash: r for r in RenderizacaoDocumento.objects.filter(hash__in=list(novos))})
+
+    com_erro = [r for r in por_hash.values() if r.status == 'erro']
+    if com_erro:
+        RenderizacaoDocumento.objects.filter(pk__in=[r.pk for r in com_erro], status='erro').update(status='pendente', erro='')
+        for r in com_erro:
+            r.status, r.erro = 'pendente', ''
+
+    limite = _limite_processando()
+    orfaos = [r for r in por_hash.values() if r.status == 'processando' and r.iniciado_em and r.iniciado_em < limite]
+    if orfaos:
+        _liberar_orfaos(RenderizacaoDocumento.objects.filter(pk__in=[r.pk for r in orfaos]))
+        for r in orfaos:
+            r.status = 'pendente'
+
+    pendentes = [r.pk for r in por_hash.values() if r.status == 'pendente']
+    if despachar_agora and pendentes:
+        despachar(pendentes)
+        if _modo() == 'sincrono':
+            por_hash.update({r.hash: r for r in RenderizacaoDocumento.objects.filter(pk__in=pendentes)})
+    return [por_hash[h] for h in hashes]
+
+
+def solicitar_renderizacao(tipo: str, parametros: dict) -> RenderizacaoDocumento:
+    return solicitar_renderizacoes(tipo, [parametros])[0]
+
+
+def _limite_processando():
+    return timezone.now() - timedelta(seconds=getattr(settings, 'RENDERIZACAO_PDF_TIMEOUT_PROCESSANDO', LIMITE_PROCESSANDO))
+
+
+def _liberar_orfaos(queryset) -> int:
+    """Devolve para 'pendente' os "processando" que passaram do limite (quem reservou morreu)."""
+    liberados = queryset.filter(status='processando', iniciado_em__lt=_limite_processando()).update(status='pendente')
+    if liberados:
+        logger.warning("♻️ %s renderização(ões) órfãs voltaram para a fila", liberados)
+    return liberados
+
+
+def _modo() -> str:
+    return getattr(settings, 'RENDERIZACAO_PDF_MODO', MODO_PADRAO)
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=max(1, getattr(settings, 'RENDERIZACAO_PDF_WORKERS', WORKERS_PADRAO)),
+                    thread_name_prefix='pdf',
+                )
+    return _pool
+
+
+def _processar_em_thread(pk: int) -> None:
+    try:
+        processar(pk)
+    except Exception:
+        logger.exception("Falha ao renderizar o documento %s", pk)
+    finally:
+        connection.close()
+
+
+def despachar(ids: Iterable[int]) -> None:
+    """Agenda a renderização dos pendentes conforme ``RENDERIZACAO_PDF_MODO``."""
+    ids = list(ids)
+    if not ids:
+        return
+    modo = _modo()
+    if modo == 'sincrono':
+        for pk in ids:
+            processar(pk)
+    elif modo == 'thread':
+        transaction.on_commit(lambda: [_executor().submit(_processar_em_thread, pk) for pk in ids])
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+def _renderizar(renderizacao: RenderizacaoDocumento) -> RenderizacaoDocumento:
+    try:
+        conteudo = RENDERIZADORES[renderizacao.tipo][1](renderizacao.parametros)
+        if default_storage.exists(renderizacao.caminho):  # sobra de uma tentativa interrompida
+            default_storage.delete(renderizacao.caminho)
+        renderizacao.arquivo.name = default_storage.save(renderizacao.caminho, ContentFile(conteudo))
+        renderizacao.tamanho = len(conteudo)
+        renderizacao.status = 'concluida'
+        renderizacao.erro = ''
+    except Exception as exc:
+        logger.exception("Falha ao renderizar %s %s", renderizacao.tipo, renderizacao.hash)
+        renderizacao.status = 'erro'
+        renderizacao.erro = str(exc)[:1000]
+    renderizacao.concluido_em = timezone.now()
+    renderizacao.save(update_fields=['arquivo', 'tamanho', 'status', 'erro', 'concluido_em'])
+    if renderizacao.status == 'concluida':
+        DocumentoGerado.objects.filter(renderizacao=renderizacao).update(arquivo=renderizacao.arquivo.name)
+    return renderizacao
+
+
+def processar(pk: int) -> Optional[RenderizacaoDocumento]:
+    """Reserva (pendente → processando) e renderiza. ``None`` se outro worker já pegou."""
+    if not RenderizacaoDocumento.objects.filter(pk=pk, status='pendente').update(
+        status='processando', iniciado_em=timezone.now()
+    ):
+        return None
+    return _renderizar(RenderizacaoDocumento.objects.get(pk=pk))
+
+
+def processar_pendentes(limite: Optional[int] = None, workers: int = 1) -> Dict[str, int]:
+    """Renderiza os pendentes (e os órfãos em "processando"). Retorna {'processadas', 'concluidas', 'erros'}."""
+    _liberar_orfaos(RenderizacaoDocumento.objects.all())
+    ids = RenderizacaoDocumento.objects.filter(status='pendente').order_by('criado_em').values_list('pk', flat=True)
+    ids = list(ids[:limite] if limite else ids)
+
+    def processar_isolado(pk):
+        try:
+            return processar(pk)
+        finally:
+            connection.close()
+
+    if workers > 1 and len(ids) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pdf') as pool:
+            resultados = list(pool.map(processar_isolado, ids))
+    else:
+        resultados = [processar(pk) for pk in ids]
+
+    feitas = [r for r in resultados if r is not None]
+    concluidas = sum(1 for r in feitas if r.status == 'concluida')
+    return {'processadas': len(feitas), 'concluidas': concluidas, 'erros': len(feitas) - concluidas}
+
+
+# ---------------------------------------------------------------------------
+# Documentos gerados por template
+# ---------------------------------------------------------------------------
+
+VARIAVEL_TEMPLATE = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+
+def preencher_template(conteudo: str, variaveis: dict) -> str:
+    """Substitui ``{{ nome }}``; variáveis não informadas ficam como estão."""
+    return VARIAVEL_TEMPLATE.sub(lambda m: str(variaveis.get(m.group(1), m.group(0))), conteudo)
+
+
+def gerar_documentos(template, usuario, itens: Iterable[dict], evento=None) -> List[DocumentoGerado]:
+    """
+    Cria em lote os DocumentoGerado de ``template`` (ex.: um termo por freelancer do evento).
+
+    ``itens``: [{'titulo', 'variaveis', 'evento' (opcional)}]. Documentos com o mesmo título e
+    conteúdo compartilham o PDF; os já renderizados saem com ``arquivo`` preenchido.
+    """
+    preparados = []
+    for item in itens:
+        variaveis = item.get('variaveis') or {}
+        preparados.append((item['titulo'], preencher_template(template.conteudo, variaveis), variaveis, item.get('evento', evento)))
+
+    with transaction.atomic():
+        renderizacoes = solicitar_renderizacoes(
+            'documento_gerado',
+            [{'titulo': titulo, 'conteudo': conteudo} for titulo, conteudo, _, _ in preparados],
+            despachar_agora=False,
+        )
+        documentos = DocumentoGerado.objects.bulk_create(
+            [
+                DocumentoGerado(
+                    template=template,
+                    titulo=titulo,
+                    conteudo=conteudo,
+                    variaveis_utilizadas=variaveis,
+                    gerado_por=usuario,
+                    evento_relacionado=evento_item,
+                    renderizacao=renderizacao,
+                    arquivo=renderizacao.arquivo.name if renderizacao.status == 'concluida' else None,
+                )
+                for (titulo, conteudo, variaveis, evento_item), renderizacao in zip(preparados, renderizacoes)
+            ],
+            batch_size=500,
+        )
+        despachar({r.pk for r in renderizacoes if r.status == 'pendente'})
+    return documentos
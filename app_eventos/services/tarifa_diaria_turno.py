@@ -1,9 +1,15 @@
 """
 Resolve qual valor de diária aplicar (dia / noite / noite especial) a partir da tarifa cadastrada.
 """
-from datetime import datetime, time
-from typing import Any, Dict
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
 
+from django.db import transaction
+from django.utils import timezone
+
+from app_eventos.models import ContratoFreelance
+from app_eventos.models_freelancer_empresa import FreelancerPrestacaoServico
+from app_eventos.models_pagamento_freelancers import FichamentoSemanaFreelancer, LancamentoPagoDiarioFreelancer
 from app_eventos.models_tarifa_diaria_turno import DataCalendarioTarifa, TarifaDiariaPorFuncaoPonto
 
 
@@ -30,40 +36,26 @@ def _eh_data_especial_noite(ponto_id: int, data) -> bool:
     ).exists()
 
 
-def resolver_tarifa_diaria(
-    *,
-    empresa_contratante_id: int,
-    ponto_operacao_id: int,
-    funcao_id: int,
-    data,
-    hora_inicio: time,
-) -> Dict[str, Any]:
+SEM_TARIFA = {
+    'encontrou': False,
+    'valor': None,
+    'tipo': None,
+    'motivo': 'Não há tarifa cadastrada para este estabelecimento e função.',
+}
+
+
+def _classificar(tarifa: TarifaDiariaPorFuncaoPonto, data, hora_inicio: time, eh_data_especial) -> Dict[str, Any]:
     """
-    Retorna valor sugerido e motivo.
+    Aplica as regras dia / noite / noite especial. ``eh_data_especial()`` só é chamado em turno noite.
 
     Prioridade noite especial: (sexta/sáb noite) OU (data em calendário especial) — ambos exigem turno noite.
     """
-    try:
-        tarifa = TarifaDiariaPorFuncaoPonto.objects.get(
-            empresa_contratante_id=empresa_contratante_id,
-            ponto_operacao_id=ponto_operacao_id,
-            funcao_id=funcao_id,
-            ativo=True,
-        )
-    except TarifaDiariaPorFuncaoPonto.DoesNotExist:
-        return {
-            'encontrou': False,
-            'valor': None,
-            'tipo': None,
-            'motivo': 'Não há tarifa cadastrada para este estabelecimento e função.',
-        }
-
     noite = _eh_noite(hora_inicio, tarifa)
     wd = data.weekday()
 
     if noite:
         especial_fs = _eh_sexta_sabado_noite(wd, True)
-        especial_cal = _eh_data_especial_noite(ponto_operacao_id, data)
+        especial_cal = eh_data_especial()
         if especial_fs or especial_cal:
             partes = []
             if especial_fs:
@@ -96,6 +88,86 @@ def resolver_tarifa_diaria(
     }
 
 
+def resolver_tarifa_diaria(
+    *,
+    empresa_contratante_id: int,
+    ponto_operacao_id: int,
+    funcao_id: int,
+    data,
+    hora_inicio: time,
+) -> Dict[str, Any]:
+    """
+    Retorna valor sugerido e motivo.
+
+    Uma consulta por chamada; para vários dias/funções do mesmo estabelecimento use ``ResolvedorTarifas``.
+    """
+    try:
+        tarifa = TarifaDiariaPorFuncaoPonto.objects.get(
+            empresa_contratante_id=empresa_contratante_id,
+            ponto_operacao_id=ponto_operacao_id,
+            funcao_id=funcao_id,
+            ativo=True,
+        )
+    except TarifaDiariaPorFuncaoPonto.DoesNotExist:
+        return dict(SEM_TARIFA)
+
+    return _classificar(tarifa, data, hora_inicio, lambda: _eh_data_especial_noite(ponto_operacao_id, data))
+
+
+class ResolvedorTarifas:
+    """
+    Resolve muitas diárias (função, data, hora de início) de um estabelecimento em memória.
+
+    Carrega as tarifas ativas do ponto e as datas especiais de ``data_inicio`` a ``data_fim``
+    em duas consultas; cada ``resolver`` depois é só dicionário + regras de ``_classificar``.
+    Datas fora da janela ainda funcionam, com uma consulta extra por data (cacheada).
+
+        resolvedor = ResolvedorTarifas(empresa_id, ponto_id, fichamento.data_inicio_periodo, fichamento.data_fechamento)
+        resolvedor.resolver(funcao_id, data, time(20))
+    """
+
+    def __init__(self, empresa_contratante_id: int, ponto_operacao_id: int, data_inicio, data_fim, funcao_ids=None):
+        self.empresa_contratante_id = empresa_contratante_id
+        self.ponto_operacao_id = ponto_operacao_id
+        self.data_inicio = data_inicio
+        self.data_fim = data_fim
+
+        tarifas = TarifaDiariaPorFuncaoPonto.objects.filter(
+            empresa_contratante_id=empresa_contratante_id,
+            ponto_operacao_id=ponto_operacao_id,
+            ativo=True,
+        )
+        if funcao_ids is not None:
+            tarifas = tarifas.filter(funcao_id__in=list(funcao_ids))
+        self.tarifas: Dict[int, TarifaDiariaPorFuncaoPonto] = {t.funcao_id: t for t in tarifas}
+        self._datas_especiais = set(
+            DataCalendarioTarifa.objects.filter(
+                ponto_operacao_id=ponto_operacao_id,
+                data__range=(data_inicio, data_fim),
+                ativo=True,
+            ).values_list('data', flat=True)
+        )
+        self._fora_da_janela: Dict[Any, bool] = {}
+
+    def eh_data_especial(self, data) -> bool:
+        if self.data_inicio <= data <= self.data_fim:
+            return data in self._datas_especiais
+        if data not in self._fora_da_janela:
+            self._fora_da_janela[data] = _eh_data_especial_noite(self.ponto_operacao_id, data)
+        return self._fora_da_janela[data]
+
+    def resolver(self, funcao_id: int, data, hora_inicio: time) -> Dict[str, Any]:
+        """Mesmo retorno de ``resolver_tarifa_diaria``."""
+        tarifa = self.tarifas.get(funcao_id)
+        if tarifa is None:
+            return dict(SEM_TARIFA)
+        return _classificar(tarifa, data, hora_inicio, lambda: self.eh_data_especial(data))
+
+    def resolver_lote(self, itens: Iterable[Tuple[int, Any, time]]) -> List[Dict[str, Any]]:
+        """``itens``: tuplas (funcao_id, data, hora_inicio), na mesma ordem do retorno."""
+        return [self.resolver(funcao_id, data, hora_inicio) for funcao_id, data, hora_inicio in itens]
+
+
 def parse_hora(valor: str) -> time:
     """Aceita HH:MM ou HH:MM:SS."""
     for fmt in ('%H:%M', '%H:%M:%S'):
@@ -104,3 +176,94 @@ def parse_hora(valor: str) -> time:
         except ValueError:
             continue
     raise ValueError('Hora inválida. Use HH:MM.')
+
+
+HORA_INICIO_PADRAO = time(8, 0)
+
+
+def _itens_dos_contratos(fichamento) -> List[Dict[str, Any]]:
+    """Contratos ativos no estabelecimento × dias do período em que a vaga trabalha (todos, se a vaga não tem datas)."""
+    inicio, fim = fichamento.data_inicio_periodo, fichamento.data_fechamento
+    contratos = ContratoFreelance.objects.filter(
+        status='ativo',
+        vaga__empresa_contratante_id=fichamento.empresa_contratante_id,
+        vaga__ponto_operacao_id=fichamento.ponto_operacao_id,
+        vaga__funcao__isnull=False,
+    ).values_list('pk', 'freelance_id', 'vaga__funcao_id', 'vaga__data_inicio_trabalho', 'vaga__data_fim_trabalho')
+
+    itens = []
+    for contrato_id, freelance_id, funcao_id, vaga_inicio, vaga_fim in contratos:
+        hora = HORA_INICIO_PADRAO
+        primeiro, ultimo = inicio, fim
+        if vaga_inicio:
+            vaga_inicio = timezone.localtime(vaga_inicio)
+            hora = vaga_inicio.time().replace(second=0, microsecond=0)
+            primeiro = max(inicio, vaga_inicio.date())
+            ultimo = min(fim, timezone.localtime(vaga_fim).date() if vaga_fim else vaga_inicio.date())
+        dia = primeiro
+        while dia <= ultimo:
+            itens.append({
+                'freelance': freelance_id,
+                'funcao': funcao_id,
+                'data': dia,
+                'hora_inicio': hora,
+                'contrato_freelance': contrato_id,
+            })
+            dia += timedelta(days=1)
+    return itens
+
+
+def pre_preencher_fichamento(fichamento, itens=None, salvar: bool = False) -> Dict[str, Any]:
+    """
+    Sugere a diária de cada (freelancer, função, data, hora) da semana do fichamento com um ``ResolvedorTarifas``.
+
+    Sem ``itens``, usa os contratos ativos do estabelecimento no período. Com ``salvar``, grava os
+    ``LancamentoPagoDiarioFreelancer`` ainda inexistentes com o valor sugerido (um ``bulk_create``) e
+    registra os freelancers na empresa, como o signal ``prestacao_ao_lancar_pago`` faria em cada save.
+    """
+    if itens is None:
+        itens = _itens_dos_contratos(fichamento)
+    resolvedor = ResolvedorTarifas(
+        fichamento.empresa_contratante_id,
+        fichamento.ponto_operacao_id,
+        fichamento.data_inicio_periodo,
+        fichamento.data_fechamento,
+        funcao_ids={item['funcao'] for item in itens},
+    )
+    for item in itens:
+        item.update(resolvedor.resolver(item['funcao'], item['data'], item['hora_inicio']))
+
+    criados = 0
+    if salvar:
+        with transaction.atomic():
+            # Trava o fichamento: pré-preenchimentos simultâneos da mesma semana entram em fila
+            FichamentoSemanaFreelancer.objects.select_for_update().filter(pk=fichamento.pk).exists()
+            lancamentos = LancamentoPagoDiarioFreelancer.objects.filter(fichamento=fichamento)
+            existentes = set(lancamentos.values_list('freelance_id', 'data'))
+            novos = {}
+            for item in itens:
+                chave = (item['freelance'], item['data'])
+                if item['encontrou'] and chave not in existentes and chave not in novos:
+                    novos[chave] = LancamentoPagoDiarioFreelancer(
+                        fichamento=fichamento,
+                        freelance_id=item['freelance'],
+                        data=item['data'],
+                        valor_bruto=item['valor'],
+                        contrato_freelance_id=item.get('contrato_freelance'),
+                    )
+            if novos:
+                LancamentoPagoDiarioFreelancer.objects.bulk_create(novos.values(), ignore_conflicts=True)
+                # bulk_create devolve as instâncias passadas, não as linhas inseridas
+                criados = lancamentos.count() - len(existentes)
+                # bulk_create não dispara post_save
+                FreelancerPrestacaoServico.objects.bulk_create(
+                    [
+                        FreelancerPrestacaoServico(
+                            empresa_contratante_id=fichamento.empresa_contratante_id, freelance_id=freelance_id, ativo=True
+                        )
+                        for freelance_id in {freelance_id for freelance_id, _data in novos}
+                    ],
+                    ignore_conflicts=True,
+                )
+
+    return {'itens': itens, 'criados': criados}
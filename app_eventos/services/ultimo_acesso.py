@@ -0,0 +1,118 @@
+"""
+Registro de último acesso (User.data_ultimo_acesso) com escrita agrupada.
+
+Em vez de um UPDATE na tabela de usuários a cada request autenticado:
+- ``registrar_acesso(user)`` só anota o instante num buffer do processo, e no
+  máximo uma vez por usuário a cada ``ULTIMO_ACESSO_GRANULARIDADE`` segundos
+  (padrão 300) — acessos mais próximos que isso não mudam nada;
+- o buffer é descarregado com um único UPDATE (CASE por usuário, em lotes)
+  no máximo a cada ``ULTIMO_ACESSO_INTERVALO`` segundos (padrão 60): quem
+  dispara é o fim do primeiro request depois do intervalo
+  (``EmpresaContextMiddleware.process_response``), fora de qualquer transação
+  da view. Sem thread própria, nenhuma conexão de banco vive fora do ciclo do
+  request; o que estiver no buffer quando o processo termina se perde (no
+  máximo um intervalo de acessos, que já estavam dentro da granularidade).
+
+Com ``ULTIMO_ACESSO_INTERVALO = 0`` cada registro é gravado ao fim do próprio
+request (ainda respeitando a granularidade). O valor exibido pode atrasar até
+granularidade + intervalo em relação ao acesso real.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+
+from app_eventos.models import User
+
+logger = logging.getLogger(__name__)
+
+GRANULARIDADE_PADRAO = 300
+INTERVALO_PADRAO = 60
+LOTE_UPDATE = 500
+
+
+class RastreadorUltimoAcesso:
+    def __init__(self, granularidade: Optional[float] = None, intervalo: Optional[float] = None):
+        self.granularidade = timedelta(seconds=(
+            granularidade if granularidade is not None
+            else getattr(settings, 'ULTIMO_ACESSO_GRANULARIDADE', GRANULARIDADE_PADRAO)
+        ))
+        self.intervalo = (
+            intervalo if intervalo is not None
+            else getattr(settings, 'ULTIMO_ACESSO_INTERVALO', INTERVALO_PADRAO)
+        )
+        self._pendentes: Dict[int, object] = {}
+        self._registrados: Dict[int, object] = {}  # último instante anotado por usuário neste processo
+        self._lock = threading.Lock()
+        self._ultimo_descarregamento = time.monotonic()
+
+    def registrar(self, user, agora=None) -> bool:
+        """Anota o acesso se o último conhecido for mais antigo que a granularidade. Retorna se anotou."""
+        if not getattr(user, 'pk', None):
+            return False
+        agora = agora or timezone.now()
+        limite = agora - self.granularidade
+        conhecido = user.data_ultimo_acesso
+        with self._lock:
+            anotado = self._registrados.get(user.pk)
+            if (conhecido and conhecido > limite) or (anotado and anotado > limite):
+                return False
+            self._registrados[user.pk] = agora
+            self._pendentes[user.pk] = agora
+        return True
+
+    def descarregar_se_devido(self) -> int:
+        """Descarrega se há pendências e o intervalo já passou desde o último descarregamento."""
+        if not self._pendentes or time.monotonic() - self._ultimo_descarregamento < self.intervalo:
+            return 0
+        return self.descarregar()
+
+    def descarregar(self) -> int:
+        """Grava o buffer (um UPDATE por lote de até LOTE_UPDATE usuários). Retorna quantos usuários."""
+        with self._lock:
+            self._ultimo_descarregamento = time.monotonic()
+            pendentes, self._pendentes = self._pendentes, {}
+            limite = timezone.now() - self.granularidade
+            self._registrados = {pk: t for pk, t in self._registrados.items() if t > limite}
+        if not pendentes:
+            return 0
+
+        itens = list(pendentes.items())
+        try:
+            for inicio in range(0, len(itens), LOTE_UPDATE):
+                lote = itens[inicio:inicio + LOTE_UPDATE]
+                User.objects.filter(pk__in=[pk for pk, _ in lote]).update(
+                    data_ultimo_acesso=Case(
+                        *[When(pk=pk, then=Value(instante)) for pk, instante in lote],
+                        output_field=DateTimeField(),
+                    )
+                )
+        except Exception:
+            logger.exception("Falha ao gravar último acesso de %s usuário(s)", len(itens))
+            with self._lock:
+                for pk, instante in pendentes.items():
+                    self._pendentes.setdefault(pk, instante)
+            return 0
+        return len(itens)
+
+
+_rastreador = None
+_rastreador_lock = threading.Lock()
+
+
+def rastreador() -> RastreadorUltimoAcesso:
+    global _rastreador
+    if _rastreador is None:
+        with _rastreador_lock:
+            if _rastreador is None:
+                _rastreador = RastreadorUltimoAcesso()
+    return _rastreador
+
+
+def registrar_acesso(user) -> bool:
+    return rastreador().registrar(user)
@@ -0,0 +1,140 @@
+"""
+Varredura de vencimento dos documentos (DocumentoFreelancerEmpresa).
+
+Tudo em conjunto, sem consulta por documento:
+- ``avisar_vencimentos``: uma consulta traz os documentos aprovados que vencem
+  nos próximos 30 dias com o marco de aviso da faixa (≤7, ≤15 ou ≤30 dias) e,
+  por anti-join (NOT EXISTS) em ``AvisoVencimentoDocumento``, só os que ainda
+  não foram avisados naquele marco para aquela data de vencimento. As
+  notificações e os registros de aviso entram com ``bulk_create``, em lotes.
+- ``expirar_documentos``: avisa os vencidos (mesmo anti-join, marco 0) e marca
+  todos como expirados com um único UPDATE, na mesma transação.
+
+Como a faixa é "até N dias", um dia sem varredura não perde aviso: o documento
+recebe o aviso do marco em que estiver na próxima execução. Renovar o
+documento (nova data de vencimento) abre um novo ciclo.
+
+Executada pelo comando ``agendador_documentos`` (contínuo) ou por
+``verificar_documentos_vencimento`` (uma vez, via cron).
+"""
+import logging
+from datetime import datetime, time, timedelta
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Exists, IntegerField, OuterRef, Value, When
+from django.utils import timezone
+
+from app_eventos.models_documentos import AvisoVencimentoDocumento, DocumentoFreelancerEmpresa
+from app_eventos.models_notificacoes import Notificacao
+
+logger = logging.getLogger(__name__)
+
+MARCOS = (7, 15, 30)
+AVISOS = {
+    30: ('lembrete_candidatura', 'Documento vence em 30 dias', 'vence em 30 dias.', 'media'),
+    15: ('lembrete_candidatura', '⚠️ Documento vence em 15 dias', 'vence em 15 dias.', 'media'),
+    7: ('lembrete_candidatura', '🚨 URGENTE: Documento vence em 7 dias', 'vence em 7 dias!', 'alta'),
+}
+TIPOS_DOCUMENTO = dict(DocumentoFreelancerEmpresa.TIPO_DOCUMENTO_CHOICES)
+CAMPOS_AVISO = ('pk', 'marco', 'data_vencimento', 'tipo_documento', 'freelancer__usuario_id',
+                'empresa_contratante__nome_fantasia')
+
+
+def _tamanho_lote(tamanho_lote: Optional[int]) -> int:
+    return tamanho_lote or getattr(settings, 'DOCUMENTOS_VARREDURA_LOTE', 2000)
+
+
+def _limite(hoje, dias: int) -> datetime:
+    """Início do dia seguinte a ``hoje + dias`` (horário local): vence "em até N dias"."""
+    return timezone.make_aware(datetime.combine(hoje + timedelta(days=dias + 1), time.min))
+
+
+def _nao_avisados(queryset):
+    avisado = AvisoVencimentoDocumento.objects.filter(
+        documento=OuterRef('pk'), marco=OuterRef('marco'), data_vencimento=OuterRef('data_vencimento')
+    )
+    return queryset.filter(~Exists(avisado))
+
+
+def _notificacao(marco, tipo_documento, usuario_id, empresa, documento_id) -> Notificacao:
+    documento = TIPOS_DOCUMENTO.get(tipo_documento, tipo_documento)
+    if marco == AvisoVencimentoDocumento.MARCO_EXPIRADO:
+        return Notificacao(
+            tipo='vaga_encerrada',
+            usuario_id=usuario_id,
+            titulo='Documento Expirado',
+            mensagem=f'Seu {documento} para {empresa} expirou. Por favor, envie um novo documento.',
+            prioridade='alta',
+        )
+    tipo, titulo, prazo, prioridade = AVISOS[marco]
+    return Notificacao(
+        tipo=tipo,
+        usuario_id=usuario_id,
+        titulo=titulo,
+        mensagem=f'Seu {documento} para {empresa} {prazo} Doc ID: {documento_id}',
+        prioridade=prioridade,
+    )
+
+
+def _avisar_em_lotes(candidatos, tamanho_lote: int) -> int:
+    """Percorre ``candidatos`` (já anotados com ``marco``) por chave, gravando avisos em lote."""
+    total = 0
+    ultimo = 0
+    while True:
+        lote = list(_nao_avisados(candidatos.filter(pk__gt=ultimo)).order_by('pk').values_list(*CAMPOS_AVISO)[:tamanho_lote])
+        if not lote:
+            return total
+        with transaction.atomic():
+            notificacoes = Notificacao.objects.bulk_create(
+                [_notificacao(marco, tipo, usuario_id, empresa, pk) for pk, marco, _, tipo, usuario_id, empresa in lote]
+            )
+            AvisoVencimentoDocumento.objects.bulk_create(
+                [
+                    AvisoVencimentoDocumento(documento_id=pk, marco=marco, data_vencimento=vencimento, notificacao=notificacao)
+                    for (pk, marco, vencimento, *_), notificacao in zip(lote, notificacoes)
+                ],
+                ignore_conflicts=True,
+            )
+        total += len(lote)
+        ultimo = lote[-1][0]
+
+
+def avisar_vencimentos(agora: Optional[datetime] = None, tamanho_lote: Optional[int] = None) -> int:
+    """Cria os avisos de 30/15/7 dias ainda não enviados. Retorna quantas notificações foram criadas."""
+    agora = agora or timezone.now()
+    hoje = timezone.localtime(agora).date()
+    candidatos = DocumentoFreelancerEmpresa.objects.filter(
+        status='aprovado', data_vencimento__gte=agora, data_vencimento__lt=_limite(hoje, MARCOS[-1]),
+    ).annotate(
+        marco=Case(
+            *[When(data_vencimento__lt=_limite(hoje, marco), then=Value(marco)) for marco in MARCOS[:-1]],
+            default=Value(MARCOS[-1]),
+            output_field=IntegerField(),
+        )
+    )
+    return _avisar_em_lotes(candidatos, _tamanho_lote(tamanho_lote))
+
+
+@transaction.atomic
+def expirar_documentos(agora: Optional[datetime] = None, tamanho_lote: Optional[int] = None) -> Dict[str, int]:
+    """Avisa e marca como expirados os documentos aprovados já vencidos (um UPDATE)."""
+    agora = agora or timezone.now()
+    vencidos = DocumentoFreelancerEmpresa.objects.filter(status='aprovado', data_vencimento__lt=agora)
+    notificacoes = _avisar_em_lotes(
+        vencidos.annotate(marco=Value(AvisoVencimentoDocumento.MARCO_EXPIRADO, output_field=IntegerField())),
+        _tamanho_lote(tamanho_lote),
+    )
+    return {'expirados': vencidos.update(status='expirado'), 'notificacoes': notificacoes}
+
+
+def executar_varredura(agora: Optional[datetime] = None, tamanho_lote: Optional[int] = None) -> Dict[str, int]:
+    """Avisos de vencimento + expiração. Retorna {'avisos', 'expirados', 'notificacoes_expirados'}."""
+    agora = agora or timezone.now()
+    avisos = avisar_vencimentos(agora, tamanho_lote)
+    expiracao = expirar_documentos(agora, tamanho_lote)
+    logger.info(
+        "Varredura de documentos: %s aviso(s), %s expirado(s)", avisos, expiracao['expirados']
+    )
+    return {'avisos': avisos, 'expirados': expiracao['expirados'], 'notificacoes_expirados': expiracao['notificacoes']}
@@ -0,0 +1,361 @@
+"""
+Entrega assíncrona dos eventos para os WebhookGlobal (fila EntregaWebhook).
+
+Fluxo:
+- ``disparar_webhook(evento, **payload)`` enfileira depois do commit uma
+  ``EntregaWebhook`` por webhook ativo inscrito no evento; o worker de
+  notificações faz o mesmo para cada evento da ``NotificacaoOutbox`` que processa
+  (``enfileirar_entregas``). Nenhum save espera uma chamada HTTP de terceiros.
+- O comando ``processar_webhooks`` reserva lotes, agrupa as entregas do mesmo
+  webhook em até ``max_lote`` eventos por requisição e envia com um pool de threads
+  sobre uma única sessão HTTP (conexões reaproveitadas por host), com no máximo
+  ``WEBHOOKS_CONCORRENCIA_POR_HOST`` requisições simultâneas para o mesmo host.
+- O corpo é assinado com HMAC-SHA256 (``X-Eventix-Assinatura: sha256=<hex>`` sobre
+  ``"<X-Eventix-Timestamp>.<corpo>"``) com o ``segredo`` do webhook.
+- Falhas de rede, 5xx, 408/409/425/429 são reagendadas com backoff exponencial;
+  outros 4xx, ou tentativas esgotadas, vão para ``falhou`` (fila de mortos), que
+  ``reenviar_falhas`` devolve à fila.
+
+Formato: com ``max_lote`` 1 o corpo é o evento (``{"id", "evento", "dados",
+"criado_em"}``); acima disso é sempre ``{"eventos": [...]}``, mesmo com um só.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from app_eventos.models_globais import WebhookGlobal
+from app_eventos.models_webhooks import EntregaWebhook
+
+logger = logging.getLogger(__name__)
+
+# Valores padrão; podem ser sobrescritos em settings (WEBHOOKS_*)
+MAX_TENTATIVAS_PADRAO = 8
+BACKOFF_BASE_SEGUNDOS = 30
+BACKOFF_MAX_SEGUNDOS = 6 * 3600
+RESERVA_MARGEM_SEGUNDOS = 300  # somada ao pior caso de duração do lote (ver _duracao_reserva)
+
+# 4xx que ainda valem nova tentativa; os demais não mudam repetindo a requisição
+STATUS_TEMPORARIOS = {408, 409, 425, 429}
+
+
+class ErroEntrega(Exception):
+    """Falha ao entregar; ``definitivo`` indica que não vale a pena tentar de novo."""
+
+    def __init__(self, mensagem, definitivo=False, status_http=None):
+        super().__init__(mensagem)
+        self.definitivo = definitivo
+        self.status_http = status_http
+
+
+# ========== ENFILEIRAMENTO ==========
+
+def enfileirar_entregas(eventos: Iterable[Tuple[str, dict]]) -> int:
+    """
+    Cria uma EntregaWebhook por (evento, webhook ativo inscrito). Retorna quantas.
+
+    Uma consulta aos webhooks para todos os eventos e um ``bulk_create``.
+    """
+    eventos = list(eventos)
+    nomes = {evento for evento, _ in eventos}
+    if not nomes:
+        return 0
+    inscritos = defaultdict(list)
+    for webhook_id, evento in WebhookGlobal.objects.filter(
+        evento__in=nomes, ativo=True, integracao__ativo=True
+    ).values_list('id', 'evento'):
+        inscritos[evento].append(webhook_id)
+    entregas = [
+        EntregaWebhook(webhook_id=webhook_id, evento=evento, payload=payload)
+        for evento, payload in eventos
+        for webhook_id in inscritos.get(evento, ())
+    ]
+    EntregaWebhook.objects.bulk_create(entregas, batch_size=500)
+    return len(entregas)
+
+
+def disparar_webhook(evento, **payload):
+    """
+    Enfileira o evento para os webhooks inscritos quando a transação atual for confirmada.
+
+    ``payload`` deve conter só valores serializáveis em JSON. Se a transação for
+    desfeita, nada é enfileirado.
+    """
+    transaction.on_commit(lambda: enfileirar_entregas([(evento, payload)]))
+
+
+def reenviar_falhas(ids=None) -> int:
+    """Devolve entregas da fila de mortos (todas, ou só ``ids``) à fila, com tentativas zeradas."""
+    falhas = EntregaWebhook.objects.filter(status='falhou')
+    if ids is not None:
+        falhas = falhas.filter(id__in=ids)
+    return falhas.update(status='pendente', tentativas=0, proxima_tentativa=timezone.now(), ultimo_erro='')
+
+
+# ========== ASSINATURA E CORPO ==========
+
+def assinar(segredo: str, timestamp: str, corpo: bytes) -> str:
+    """Valor de X-Eventix-Assinatura; o receptor recalcula com o mesmo segredo."""
+    mensagem = timestamp.encode() + b'.' + corpo
+    return 'sha256=' + hmac.new(segredo.encode(), mensagem, hashlib.sha256).hexdigest()
+
+
+def montar_corpo(webhook: WebhookGlobal, entregas: List[EntregaWebhook]) -> bytes:
+    itens = [
+        {'id': e.pk, 'evento': e.evento, 'dados': e.payload, 'criado_em': e.data_criacao}
+        for e in entregas
+    ]
+    corpo = itens[0] if webhook.max_lote <= 1 else {'eventos': itens}
+    return json.dumps(corpo, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+# ========== CLIENTE HTTP ==========
+
+class ClienteWebhooks:
+    """
+    Sessão HTTP compartilhada pelas threads do worker.
+
+    O pool de conexões do ``requests`` mantém conexões abertas por host; um
+    semáforo por host limita as requisições simultâneas a cada destino, para um
+    endpoint lento não ocupar todas as threads nem ser sobrecarregado.
+    """
+
+    def __init__(self, concorrencia_por_host=None, timeout=None):
+        self.concorrencia_por_host = concorrencia_por_host or getattr(
+            settings, 'WEBHOOKS_CONCORRENCIA_POR_HOST', 4
+        )
+        self.timeout = timeout or getattr(settings, 'WEBHOOKS_TIMEOUT', 10)
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=32, pool_maxsize=self.concorrencia_por_host, max_retries=0)
+        self.sessao.mount('http://', adaptador)
+        self.sessao.mount('https://', adaptador)
+        self._semaforos: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaforo(self, host):
+        with self._lock:
+            if host not in self._semaforos:
+                self._semaforos[host] = threading.BoundedSemaphore(self.concorrencia_por_host)
+            return self._semaforos[host]
+
+    def enviar(self, metodo, url, corpo: bytes, headers: dict) -> int:
+        """Faz a requisição e retorna o status 2xx; levanta ErroEntrega nos demais casos."""
+        with self._semaforo(urlsplit(url).netloc):
+            try:
+                resposta = self.sessao.request(
+                    metodo, url, data=corpo, headers=headers, timeout=self.timeout, allow_redirects=False
+                )
+            except requests.RequestException as e:
+                raise ErroEntrega(f'{type(e).__name__}: {e}')
+        if 200 <= resposta.status_code < 300:
+            return resposta.status_code
+        definitivo = 400 <= resposta.status_code < 500 and resposta.status_code not in STATUS_TEMPORARIOS
+        raise ErroEntrega(
+            f'HTTP {resposta.status_code}: {resposta.text[:200]}',
+            definitivo=definitivo,
+            status_http=resposta.status_code,
+        )
+
+    def fechar(self):
+        self.sessao.close()
+
+
+# ========== WORKER ==========
+
+class ProcessadorWebhooks:
+    """
+    Drena a fila em lotes: reserva, agrupa por webhook, envia em paralelo e grava os resultados.
+
+    As threads fazem apenas a chamada HTTP; toda escrita no banco acontece na
+    thread principal.
+    """
+
+    def __init__(self, cliente=None, max_workers=None, tamanho_lote=200, max_tentativas=None):
+        self.cliente = cliente or ClienteWebhooks()
+        self.max_workers = max_workers or getattr(settings, 'WEBHOOKS_WORKERS', 8)
+        self.tamanho_lote = tamanho_lote
+        self.max_tentativas = max_tentativas or getattr(settings, 'WEBHOOKS_MAX_TENTATIVAS', MAX_TENTATIVAS_PADRAO)
+        self.worker_id = uuid.uuid4().hex[:8]
+
+    def processar_lote(self) -> Dict[str, int]:
+        """Reserva e processa um lote. Retorna {'processadas', 'entregues', 'reagendadas', 'falhas'}."""
+        self._liberar_reservas_expiradas()
+        lote = self._reservar_lote()
+        stats = {'processadas': len(lote), 'entregues': 0, 'reagendadas': 0, 'falhas': 0}
+        if not lote:
+            return stats
+
+        inativas = [e for e in lote if not e.webhook.ativo]
+        if inativas:
+            stats['falhas'] += self._registrar_falha(inativas, ErroEntrega('Webhook desativado', definitivo=True))
+        envios = self._agrupar([e for e in lote if e.webhook.ativo])
+        if envios:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(envios))) as pool:
+                resultados = list(pool.map(self._enviar, envios))
+            for (_, entregas), (status_http, erro) in zip(envios, resultados):
+                if erro is None:
+                    self._marcar_entregues(entregas, status_http)
+                    stats['entregues'] += len(entregas)
+                else:
+                    falhas = self._registrar_falha(entregas, erro)
+                    stats['falhas'] += falhas
+                    stats['reagendadas'] += len(entregas) - falhas
+        return stats
+
+    def processar_pendentes(self, max_lotes=None) -> Dict[str, int]:
+        """Processa lotes até a fila (disponível agora) esvaziar."""
+        total = {'processadas': 0, 'entregues': 0, 'reagendadas': 0, 'falhas': 0}
+        lotes = 0
+        while max_lotes is None or lotes < max_lotes:
+            stats = self.processar_lote()
+            if not stats['processadas']:
+                break
+            for chave, valor in stats.items():
+                total[chave] += valor
+            lotes += 1
+        return total
+
+    # ----- reserva -----
+
+    def _reservar_lote(self) -> List[EntregaWebhook]:
+        agora = timezone.now()
+        token = uuid.uuid4().hex
+        ids = list(
+            EntregaWebhook.objects.filter(status='pendente', proxima_tentativa__lte=agora)
+            .order_by('proxima_tentativa', 'id')
+            .values_list('id', flat=True)[:self.tamanho_lote]
+        )
+        if not ids:
+            return []
+        # UPDATE condicional: se outro worker reservou primeiro, a linha não é reservada aqui
+        EntregaWebhook.objects.filter(id__in=ids, status='pendente').update(
+            status='enviando',
+            claim_token=token,
+            reservado_ate=agora + timedelta(seconds=self._duracao_reserva(len(ids))),
+        )
+        return list(
+            EntregaWebhook.objects.filter(claim_token=token, status='enviando')
+            .select_related('webhook')
+            .order_by('id')
+        )
+
+    def _duracao_reserva(self, quantidade) -> float:
+        """
+        Segundos de reserva para ``quantidade`` entregas.
+
+        Pior caso: todas para o mesmo host, uma por requisição, no máximo
+        ``concorrencia_por_host`` (ou ``max_workers``) de cada vez e cada uma
+        esgotando o timeout. Uma reserva menor que o lote expiraria no meio do
+        envio e outro worker reenviaria os mesmos eventos.
+        """
+        paralelo = max(1, min(self.max_workers, getattr(self.cliente, 'concorrencia_por_host', 1)))
+        timeout = getattr(self.cliente, 'timeout', None) or getattr(settings, 'WEBHOOKS_TIMEOUT', 10)
+        return math.ceil(quantidade / paralelo) * timeout + RESERVA_MARGEM_SEGUNDOS
+
+    def _liberar_reservas_expiradas(self):
+        """Devolve à fila entregas de workers que morreram no meio do envio."""
+        liberadas = EntregaWebhook.objects.filter(
+            status='enviando', reservado_ate__lt=timezone.now()
+        ).update(status='pendente', claim_token='', reservado_ate=None)
+        if liberadas:
+            logger.warning(f"⚠️ {liberadas} entregas de webhook com reserva expirada devolvidas à fila")
+
+    # ----- envio -----
+
+    def _agrupar(self, lote) -> List[Tuple[WebhookGlobal, List[EntregaWebhook]]]:
+        """Entregas do mesmo webhook em grupos de até ``max_lote``, na ordem da fila."""
+        por_webhook = defaultdict(list)
+        for entrega in lote:
+            por_webhook[entrega.webhook_id].append(entrega)
+        envios = []
+        for entregas in por_webhook.values():
+            tamanho = max(1, entregas[0].webhook.max_lote)
+            for inicio in range(0, len(entregas), tamanho):
+                envios.append((entregas[0].webhook, entregas[inicio:inicio + tamanho]))
+        return envios
+
+    def _enviar(self, envio):
+        """Executado nas threads: retorna (status_http, erro)."""
+        webhook, entregas = envio
+        corpo = montar_corpo(webhook, entregas)
+        timestamp = str(int(time.time()))
+        headers = {
+            **(webhook.headers or {}),
+            'Content-Type': 'application/json',
+            'User-Agent': 'Eventix-Webhooks/1.0',
+            'X-Eventix-Evento': webhook.evento,
+            'X-Eventix-Entregas': ','.join(str(e.pk) for e in entregas),
+            'X-Eventix-Timestamp': timestamp,
+        }
+        segredo = webhook.segredo or getattr(settings, 'WEBHOOKS_SEGREDO_PADRAO', '')
+        if segredo:
+            headers['X-Eventix-Assinatura'] = assinar(segredo, timestamp, corpo)
+        try:
+            return self.cliente.enviar(webhook.metodo, webhook.url, corpo, headers), None
+        except ErroEntrega as e:
+            return e.status_http, e
+        except Exception as e:  # falha inesperada: trata como temporária
+            return None, ErroEntrega(str(e))
+
+    def _marcar_entregues(self, entregas, status_http):
+        atualizadas = EntregaWebhook.objects.filter(
+            id__in=[e.pk for e in entregas], claim_token=entregas[0].claim_token
+        ).update(
+            status='entregue',
+            tentativas=F('tentativas') + 1,
+            status_http=status_http,
+            data_entrega=timezone.now(),
+            reservado_ate=None,
+            ultimo_erro='',
+        )
+        if atualizadas < len(entregas):
+            logger.warning(
+                f"⚠️ Webhook {entregas[0].webhook_id}: {len(entregas) - atualizadas} entregas enviadas "
+                f"após perder a reserva; outro worker pode reenviá-las"
+            )
+
+    def _registrar_falha(self, entregas, erro: ErroEntrega) -> int:
+        """Reagenda com backoff exponencial; retorna quantas foram para a fila de mortos."""
+        por_tentativas = defaultdict(list)
+        for entrega in entregas:
+            por_tentativas[entrega.tentativas + 1].append(entrega.pk)
+
+        mortas = 0
+        for tentativas, ids in por_tentativas.items():
+            fila = EntregaWebhook.objects.filter(id__in=ids, claim_token=entregas[0].claim_token)
+            if erro.definitivo or tentativas >= self.max_tentativas:
+                fila.update(
+                    status='falhou', tentativas=tentativas, status_http=erro.status_http,
+                    ultimo_erro=str(erro)[:1000], claim_token='', reservado_ate=None,
+                )
+                mortas += len(ids)
+                logger.error(f"❌ Entregas {ids} do webhook {entregas[0].webhook_id} falharam definitivamente: {erro}")
+                continue
+            espera = min(BACKOFF_BASE_SEGUNDOS * (2 ** (tentativas - 1)), BACKOFF_MAX_SEGUNDOS)
+            fila.update(
+                status='pendente',
+                tentativas=tentativas,
+                status_http=erro.status_http,
+                ultimo_erro=str(erro)[:1000],
+                proxima_tentativa=timezone.now() + timedelta(seconds=espera),
+                claim_token='',
+                reservado_ate=None,
+            )
+        return mortas
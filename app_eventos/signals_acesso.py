@@ -0,0 +1,61 @@
+"""
+Invalidação do cache de tenant/permissões (services/cache_acesso.py).
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from app_eventos.models import (
+    EmpresaContratante,
+    GrupoUsuario,
+    PermissaoSistema,
+    PlanoContratacao,
+    User,
+    UsuarioGrupo,
+)
+from app_eventos.services.cache_acesso import invalidar_empresa, invalidar_tudo, invalidar_usuario
+
+# Saves que não mudam tenant nem permissões (ex.: último acesso gravado a cada request)
+CAMPOS_SEM_IMPACTO_USUARIO = {'data_ultimo_acesso', 'last_login'}
+
+
+@receiver(post_save, sender=User, dispatch_uid='acesso_usuario_salvo')
+def invalidar_acesso_usuario_salvo(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= CAMPOS_SEM_IMPACTO_USUARIO:
+        return
+    invalidar_usuario(instance.pk, instance)
+
+
+@receiver(post_delete, sender=User, dispatch_uid='acesso_usuario_removido')
+def invalidar_acesso_usuario_removido(sender, instance, **kwargs):
+    invalidar_usuario(instance.pk)
+
+
+@receiver(post_save, sender=UsuarioGrupo, dispatch_uid='acesso_usuario_grupo_salvo')
+@receiver(post_delete, sender=UsuarioGrupo, dispatch_uid='acesso_usuario_grupo_removido')
+def invalidar_acesso_usuario_grupo(sender, instance, **kwargs):
+    # Se o usuário veio junto (ex.: user.adicionar_ao_grupo), limpa também a memória da instância
+    usuario = instance.usuario if UsuarioGrupo.usuario.is_cached(instance) else None
+    invalidar_usuario(instance.usuario_id, usuario)
+
+
+@receiver(post_save, sender=GrupoUsuario, dispatch_uid='acesso_grupo_salvo')
+@receiver(post_delete, sender=GrupoUsuario, dispatch_uid='acesso_grupo_removido')
+@receiver(post_save, sender=PermissaoSistema, dispatch_uid='acesso_permissao_salva')
+@receiver(post_delete, sender=PermissaoSistema, dispatch_uid='acesso_permissao_removida')
+@receiver(post_save, sender=PlanoContratacao, dispatch_uid='acesso_plano_salvo')
+@receiver(post_delete, sender=PlanoContratacao, dispatch_uid='acesso_plano_removido')
+def invalidar_acesso_global(sender, **kwargs):
+    # Afeta vários usuários/empresas: mais simples (e raro) invalidar tudo
+    invalidar_tudo()
+
+
+@receiver(m2m_changed, sender=GrupoUsuario.permissoes.through, dispatch_uid='acesso_grupo_permissoes')
+def invalidar_acesso_permissoes_grupo(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidar_tudo()
+
+
+@receiver(post_save, sender=EmpresaContratante, dispatch_uid='acesso_empresa_salva')
+@receiver(post_delete, sender=EmpresaContratante, dispatch_uid='acesso_empresa_removida')
+def invalidar_acesso_empresa(sender, instance, **kwargs):
+    invalidar_empresa(instance.pk)
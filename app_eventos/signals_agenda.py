@@ -0,0 +1,74 @@
+"""
+Mantém a agenda dos freelancers (CompromissoAgenda) em dia.
+
+Contrato ativo ou candidatura aprovada numa vaga com data, e alocação não
+cancelada num turno, viram compromissos; cancelamentos e exclusões os removem;
+mudanças de data da vaga ou do turno movem os compromissos existentes.
+Ver app_eventos/services/agenda_freelancer.py.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app_eventos.models import AlocacaoTurno, Candidatura, CompromissoAgenda, ContratoFreelance, TurnoOperacional, Vaga
+from app_eventos.services.agenda_freelancer import (
+    STATUS_CANDIDATURA_COMPROMETIDA,
+    atualizar_janela_turno,
+    atualizar_janela_vaga,
+    sincronizar_alocacao,
+    sincronizar_vaga_freelancer,
+)
+
+CAMPOS_VINCULO = {'status', 'vaga', 'freelance'}
+CAMPOS_JANELA_VAGA = {'data_inicio_trabalho', 'data_fim_trabalho'}
+CAMPOS_JANELA_TURNO = {'data', 'hora_inicio', 'hora_fim'}
+
+
+def _ignorar(update_fields, campos):
+    return update_fields is not None and not set(update_fields) & campos
+
+
+@receiver(post_save, sender=ContratoFreelance, dispatch_uid='agenda_contrato_salvo')
+def agenda_contrato_salvo(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or _ignorar(update_fields, CAMPOS_VINCULO):
+        return
+    sincronizar_vaga_freelancer(instance.freelance_id, instance.vaga_id)
+
+
+@receiver(post_save, sender=Candidatura, dispatch_uid='agenda_candidatura_salva')
+def agenda_candidatura_salva(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or _ignorar(update_fields, CAMPOS_VINCULO):
+        return
+    if created and instance.status not in STATUS_CANDIDATURA_COMPROMETIDA:
+        return  # Candidatura nova pendente não muda a agenda
+    sincronizar_vaga_freelancer(instance.freelance_id, instance.vaga_id)
+
+
+@receiver(post_delete, sender=ContratoFreelance, dispatch_uid='agenda_contrato_removido')
+@receiver(post_delete, sender=Candidatura, dispatch_uid='agenda_candidatura_removida')
+def agenda_vinculo_removido(sender, instance, **kwargs):
+    sincronizar_vaga_freelancer(instance.freelance_id, instance.vaga_id)
+
+
+@receiver(post_save, sender=AlocacaoTurno, dispatch_uid='agenda_alocacao_salva')
+def agenda_alocacao_salva(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sincronizar_alocacao(instance)
+
+
+@receiver(post_delete, sender=AlocacaoTurno, dispatch_uid='agenda_alocacao_removida')
+def agenda_alocacao_removida(sender, instance, **kwargs):
+    CompromissoAgenda.objects.filter(origem='alocacao', objeto_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=Vaga, dispatch_uid='agenda_vaga_salva')
+def agenda_vaga_salva(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or created or _ignorar(update_fields, CAMPOS_JANELA_VAGA):
+        return
+    atualizar_janela_vaga(instance)
+
+
+@receiver(post_save, sender=TurnoOperacional, dispatch_uid='agenda_turno_salvo')
+def agenda_turno_salvo(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or created or _ignorar(update_fields, CAMPOS_JANELA_TURNO):
+        return
+    atualizar_janela_turno(instance)
@@ -0,0 +1,101 @@
+"""
+Mantém os documentos de busca (services/busca.py) em dia.
+
+A reindexação roda depois do commit e só quando o save mexe em campos que
+entram no documento (saves com ``update_fields`` de outros campos são ignorados).
+"""
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app_eventos.models import (
+    Evento,
+    Freelance,
+    FreelancerFuncao,
+    Funcao,
+    LocalEvento,
+    PontoOperacao,
+    SetorEvento,
+    Vaga,
+)
+from app_eventos.services.busca import agendar_indexacao, remover
+
+CAMPOS_VAGA = {'titulo', 'descricao', 'requisitos', 'funcao', 'setor', 'evento', 'ponto_operacao'}
+CAMPOS_EVENTO = {'nome', 'descricao', 'local'}
+CAMPOS_FREELANCE = {'nome_completo', 'habilidades', 'bairro', 'cidade', 'uf'}
+
+
+def _afeta(update_fields, campos):
+    return update_fields is None or bool(set(update_fields) & campos)
+
+
+def _ids_vagas(filtro):
+    return list(Vaga.objects.filter(filtro).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Vaga, dispatch_uid='busca_vaga_salva')
+def indexar_vaga(sender, instance, update_fields=None, **kwargs):
+    if _afeta(update_fields, CAMPOS_VAGA):
+        agendar_indexacao('vaga', [instance.pk])
+
+
+@receiver(post_save, sender=Evento, dispatch_uid='busca_evento_salvo')
+def indexar_evento(sender, instance, created, update_fields=None, **kwargs):
+    if not _afeta(update_fields, CAMPOS_EVENTO):
+        return
+    agendar_indexacao('evento', [instance.pk])
+    if not created:
+        agendar_indexacao('vaga', _ids_vagas(Q(evento=instance) | Q(setor__evento=instance)))
+
+
+@receiver(post_save, sender=SetorEvento, dispatch_uid='busca_setor_salvo')
+def indexar_vagas_do_setor(sender, instance, created, **kwargs):
+    if not created:
+        agendar_indexacao('vaga', _ids_vagas(Q(setor=instance)))
+
+
+@receiver(post_save, sender=LocalEvento, dispatch_uid='busca_local_salvo')
+def indexar_por_local(sender, instance, created, **kwargs):
+    if created:
+        return
+    agendar_indexacao('evento', list(instance.eventos.values_list('pk', flat=True)))
+    agendar_indexacao('vaga', _ids_vagas(
+        Q(evento__local=instance) | Q(setor__evento__local=instance) | Q(ponto_operacao__local=instance)
+    ))
+
+
+@receiver(post_save, sender=PontoOperacao, dispatch_uid='busca_ponto_salvo')
+def indexar_vagas_do_ponto(sender, instance, created, **kwargs):
+    if not created:
+        agendar_indexacao('vaga', _ids_vagas(Q(ponto_operacao=instance)))
+
+
+@receiver(post_save, sender=Funcao, dispatch_uid='busca_funcao_salva')
+def indexar_por_funcao(sender, instance, created, update_fields=None, **kwargs):
+    if created or not _afeta(update_fields, {'nome'}):
+        return
+    agendar_indexacao('vaga', _ids_vagas(Q(funcao=instance)))
+    agendar_indexacao(
+        'freelance',
+        FreelancerFuncao.objects.filter(funcao=instance).values_list('freelancer_id', flat=True).distinct(),
+    )
+
+
+@receiver(post_save, sender=Freelance, dispatch_uid='busca_freelance_salvo')
+def indexar_freelance(sender, instance, update_fields=None, **kwargs):
+    if _afeta(update_fields, CAMPOS_FREELANCE):
+        agendar_indexacao('freelance', [instance.pk])
+
+
+@receiver(post_save, sender=FreelancerFuncao, dispatch_uid='busca_freelancer_funcao_salva')
+@receiver(post_delete, sender=FreelancerFuncao, dispatch_uid='busca_freelancer_funcao_removida')
+def indexar_funcoes_do_freelance(sender, instance, **kwargs):
+    agendar_indexacao('freelance', [instance.freelancer_id])
+
+
+@receiver(post_delete, sender=Vaga, dispatch_uid='busca_vaga_removida')
+@receiver(post_delete, sender=Evento, dispatch_uid='busca_evento_removido')
+@receiver(post_delete, sender=Freelance, dispatch_uid='busca_freelance_removido')
+def remover_documento(sender, instance, **kwargs):
+    tipo = {Vaga: 'vaga', Evento: 'evento', Freelance: 'freelance'}[sender]
+    remover(tipo, [instance.pk])
@@ -0,0 +1,51 @@
+"""
+Invalidação das respostas em cache (services/cache_respostas.py).
+
+Cada escrita gera versão nova na hora (a própria transação já lê o dado novo)
+e outra depois do commit: entre as duas, um request concorrente ainda lê o dado
+antigo e pode guardá-lo sob a primeira versão nova.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app_eventos.models import Evento, Funcao, SetorEvento, TipoFuncao, Vaga
+from app_eventos.services.cache_respostas import invalidar
+
+
+def _invalidar(escopo, chave=None):
+    invalidar(escopo, chave)
+    transaction.on_commit(lambda: invalidar(escopo, chave))
+
+
+@receiver(post_save, sender=Funcao, dispatch_uid='respostas_funcao_salva')
+@receiver(post_delete, sender=Funcao, dispatch_uid='respostas_funcao_removida')
+@receiver(post_save, sender=TipoFuncao, dispatch_uid='respostas_tipo_funcao_salvo')
+@receiver(post_delete, sender=TipoFuncao, dispatch_uid='respostas_tipo_funcao_removido')
+def invalidar_respostas_funcoes(sender, **kwargs):
+    # Catálogo único (funções globais + de todas as empresas ativas)
+    _invalidar('funcoes')
+
+
+@receiver(post_save, sender=Vaga, dispatch_uid='respostas_vaga_salva')
+@receiver(post_delete, sender=Vaga, dispatch_uid='respostas_vaga_removida')
+def invalidar_respostas_vaga(sender, instance, **kwargs):
+    _invalidar('vaga_publica', instance.pk)
+    evento_id = instance.evento_id
+    if evento_id is None and instance.setor_id and Vaga.setor.is_cached(instance):
+        evento_id = instance.setor.evento_id
+    if evento_id:
+        _invalidar('evento_publico', evento_id)
+    elif instance.setor_id:
+        # Evento só alcançável por uma consulta ao setor: mais barato invalidar todas
+        _invalidar('evento_publico')
+
+
+@receiver(post_save, sender=Evento, dispatch_uid='respostas_evento_salvo')
+@receiver(post_delete, sender=Evento, dispatch_uid='respostas_evento_removido')
+@receiver(post_save, sender=SetorEvento, dispatch_uid='respostas_setor_salvo')
+@receiver(post_delete, sender=SetorEvento, dispatch_uid='respostas_setor_removido')
+def invalidar_respostas_evento(sender, instance, **kwargs):
+    _invalidar('evento_publico', instance.pk if sender is Evento else instance.evento_id)
+    # A página da vaga mostra evento e setor; mudanças neles são raras, invalida todas
+    _invalidar('vaga_publica')
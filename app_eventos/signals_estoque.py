@@ -0,0 +1,35 @@
+"""
+Mantém os saldos de insumos (services/estoque_insumos.py) coerentes com saves diretos.
+
+As operações do livro-razão atualizam os saldos com UPDATE (sem signals); estes
+receivers cobrem quem grava os modelos diretamente (clonagem de evento, carga de
+dados, shell): o total por evento do insumo é recalculado e o estoque inicial de
+um insumo novo vira uma entrada no livro-razão.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app_eventos.models import Insumo, InsumoEvento, MovimentacaoInsumo
+from app_eventos.services.estoque_insumos import recalcular_totais_insumos
+
+CAMPOS_SALDO_EVENTO = {'quantidade_alocada_evento', 'quantidade_utilizada_evento', 'insumo'}
+
+
+@receiver(post_save, sender=Insumo, dispatch_uid='estoque_insumo_criado')
+def registrar_saldo_inicial(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.estoque_atual > 0:
+        MovimentacaoInsumo.objects.create(
+            insumo=instance, tipo='entrada', quantidade=instance.estoque_atual, observacao='Saldo inicial'
+        )
+
+
+@receiver(post_save, sender=InsumoEvento, dispatch_uid='estoque_insumo_evento_salvo')
+def recalcular_totais_ao_salvar(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and not set(update_fields) & CAMPOS_SALDO_EVENTO):
+        return
+    recalcular_totais_insumos([instance.insumo_id])
+
+
+@receiver(post_delete, sender=InsumoEvento, dispatch_uid='estoque_insumo_evento_removido')
+def recalcular_totais_ao_remover(sender, instance, **kwargs):
+    recalcular_totais_insumos([instance.insumo_id])
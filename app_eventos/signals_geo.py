@@ -0,0 +1,39 @@
+"""
+Mantém latitude/longitude/geohash (services/geo.py) de Freelance, LocalEvento e
+PontoOperacao em dia com o endereço.
+
+A geocodificação é local (tabela de centroides), então roda no próprio save.
+Saves com ``update_fields`` só recalculam se algum campo de endereço estiver
+na lista; nesse caso as coordenadas são gravadas com um UPDATE à parte, já que
+o ``update_fields`` do save não inclui as colunas geográficas.
+"""
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from app_eventos.models import Freelance, LocalEvento, PontoOperacao
+from app_eventos.services.geo import CAMPOS_COORDENADAS, CAMPOS_ENDERECO, atualizar_coordenadas
+
+
+def _afeta(sender, update_fields):
+    return update_fields is None or bool(set(update_fields) & set(CAMPOS_ENDERECO[sender]))
+
+
+@receiver(pre_save, sender=Freelance, dispatch_uid='geo_freelance_pre_save')
+@receiver(pre_save, sender=LocalEvento, dispatch_uid='geo_local_pre_save')
+@receiver(pre_save, sender=PontoOperacao, dispatch_uid='geo_ponto_pre_save')
+def geocodificar_endereco(sender, instance, update_fields=None, raw=False, **kwargs):
+    if not raw and _afeta(sender, update_fields):
+        atualizar_coordenadas(instance)
+
+
+@receiver(post_save, sender=Freelance, dispatch_uid='geo_freelance_post_save')
+@receiver(post_save, sender=LocalEvento, dispatch_uid='geo_local_post_save')
+@receiver(post_save, sender=PontoOperacao, dispatch_uid='geo_ponto_post_save')
+def gravar_coordenadas_parciais(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or update_fields is None or not _afeta(sender, update_fields):
+        return
+    if set(CAMPOS_COORDENADAS) <= set(update_fields):
+        return
+    sender.objects.filter(pk=instance.pk).update(
+        **{campo: getattr(instance, campo) for campo in CAMPOS_COORDENADAS}
+    )
@@ -0,0 +1,208 @@
+"""
+Mantém MetricasEmpresa atualizada por deltas.
+
+Para cada modelo rastreado, a "contribuição" de uma linha é o quanto ela soma
+em cada contador da empresa (ex.: uma Vaga ativa com quantidade 3 soma 1 em
+total_vagas, 1 em vagas_ativas e 3 nas somas de quantidade). No save o delta
+é contribuição_nova − contribuição_anterior (lida no pre_save); no delete é
+−contribuição. Operações que não disparam signals (queryset.update,
+bulk_create) ficam para o comando reconciliar_metricas_empresa.
+
+Os deltas são calculados no signal mas aplicados só depois do commit: o UPDATE
+na linha única da empresa em MetricasEmpresa não fica travado durante toda a
+transação de negócio (o que enfileiraria as escritas simultâneas da empresa).
+Transação desfeita não aplica nada.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from app_eventos.models import Candidatura, ContratoFreelance, Evento, Vaga
+from app_eventos.services.metricas_empresa import (
+    CAMPO_STATUS_CANDIDATURA,
+    aplicar_deltas,
+    diferenca_contribuicoes,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _empresa_da_vaga(instance):
+    if not instance.vaga_id:
+        return None
+    if type(instance).vaga.is_cached(instance):
+        return instance.vaga.empresa_contratante_id
+    return Vaga.objects.filter(pk=instance.vaga_id).values_list('empresa_contratante_id', flat=True).first()
+
+
+def _contribuicao_evento(estado):
+    return [(estado['empresa_contratante_id'], {
+        'total_eventos': 1,
+        'eventos_ativos': int(bool(estado['ativo'])),
+    })]
+
+
+def _contribuicao_vaga(estado):
+    ativa = bool(estado['ativa'])
+    quantidade = estado['quantidade'] or 0
+    return [(estado['empresa_contratante_id'], {
+        'total_vagas': 1,
+        'vagas_ativas': int(ativa),
+        'vagas_quantidade': quantidade,
+        'vagas_ativas_quantidade': quantidade if ativa else 0,
+    })]
+
+
+def _contribuicao_candidatura(estado):
+    campos = {'total_candidaturas': 1}
+    campo_status = CAMPO_STATUS_CANDIDATURA.get(estado['status'])
+    if campo_status:
+        campos[campo_status] = 1
+    return [(estado['empresa_contratante_id'], campos)]
+
+
+def _contribuicao_contrato(estado):
+    return [(estado['empresa_contratante_id'], {
+        'total_contratos': 1,
+        'contratos_ativos': int(estado['status'] == 'ativo'),
+    })]
+
+
+# modelo -> (campos lidos no pre_save, campos que afetam métricas, contribuição)
+RASTREADOS = {
+    Evento: (
+        ('empresa_contratante_id', 'ativo'),
+        {'empresa_contratante', 'ativo'},
+        _contribuicao_evento,
+    ),
+    Vaga: (
+        ('empresa_contratante_id', 'ativa', 'quantidade'),
+        {'empresa_contratante', 'ativa', 'quantidade'},
+        _contribuicao_vaga,
+    ),
+    Candidatura: (
+        ('vaga__empresa_contratante_id', 'freelance_id', 'status'),
+        {'vaga', 'freelance', 'status'},
+        _contribuicao_candidatura,
+    ),
+    ContratoFreelance: (
+        ('vaga__empresa_contratante_id', 'status'),
+        {'vaga', 'status'},
+        _contribuicao_contrato,
+    ),
+}
+
+
+def _estado_atual(instance):
+    if isinstance(instance, (Candidatura, ContratoFreelance)):
+        estado = {'empresa_contratante_id': _empresa_da_vaga(instance), 'status': instance.status}
+        if isinstance(instance, Candidatura):
+            estado['freelance_id'] = instance.freelance_id
+        return estado
+    campos, _, _ = RASTREADOS[type(instance)]
+    return {campo: getattr(instance, campo) for campo in campos}
+
+
+def estado_salvo(sender, pk):
+    campos, _, _ = RASTREADOS[sender]
+    linha = sender.objects.filter(pk=pk).values(*campos).first()
+    if linha and 'vaga__empresa_contratante_id' in linha:
+        linha['empresa_contratante_id'] = linha.pop('vaga__empresa_contratante_id')
+    return linha
+
+
+def lembrar_estado_anterior(instance, estado):
+    """
+    Para saves precedidos de um UPDATE condicional na mesma linha (ex.:
+    Candidatura.aprovar): o pre_save leria o valor já alterado e o delta seria
+    zero, então o próximo save usa ``estado`` (lido antes do UPDATE).
+    """
+    instance._metricas_anterior_fixo = estado
+
+
+def _delta_freelancers(instance, anterior, atual):
+    """
+    total_freelancers conta freelancers distintos: só muda quando a candidatura
+    é a primeira (ou a última) do freelancer naquela empresa.
+    """
+    par_anterior = (anterior['empresa_contratante_id'], anterior['freelance_id']) if anterior else None
+    par_atual = (atual['empresa_contratante_id'], atual['freelance_id']) if atual else None
+    if par_anterior == par_atual:
+        return []
+
+    def unico(par):
+        empresa_id, freelance_id = par
+        return not (
+            Candidatura.objects.filter(freelance_id=freelance_id, vaga__empresa_contratante_id=empresa_id)
+            .exclude(pk=instance.pk)
+            .exists()
+        )
+
+    delta = []
+    if par_anterior and unico(par_anterior):
+        delta.append((par_anterior[0], {'total_freelancers': -1}))
+    if par_atual and unico(par_atual):
+        delta.append((par_atual[0], {'total_freelancers': 1}))
+    return delta
+
+
+def _aplicar(instance, anterior, atual):
+    _, _, contribuicao = RASTREADOS[type(instance)]
+    deltas = diferenca_contribuicoes(
+        contribuicao(anterior) if anterior else [],
+        contribuicao(atual) if atual else [],
+    )
+    if isinstance(instance, Candidatura):
+        for empresa_id, campos in _delta_freelancers(instance, anterior, atual):
+            deltas[empresa_id].update(campos)
+    if not any(any(campos.values()) for campos in deltas.values()):
+        return
+    nome, pk = type(instance).__name__, instance.pk
+
+    def aplicar():
+        try:
+            with transaction.atomic():
+                aplicar_deltas(deltas)
+        except Exception:
+            # Nunca derrubar o fluxo de negócio; a reconciliação corrige depois
+            logger.exception('Falha ao atualizar métricas da empresa (%s %s)', nome, pk)
+
+    transaction.on_commit(aplicar)
+
+
+def _afeta_metricas(sender, update_fields):
+    if update_fields is None:
+        return True
+    _, relevantes, _ = RASTREADOS[sender]
+    return bool(relevantes & set(update_fields))
+
+
+def metricas_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if '_metricas_anterior_fixo' in instance.__dict__:
+        instance._metricas_anterior = instance.__dict__.pop('_metricas_anterior_fixo')
+        return
+    if _afeta_metricas(sender, update_fields):
+        instance._metricas_anterior = estado_salvo(sender, instance.pk)
+
+
+def metricas_post_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    anterior = None if created else instance.__dict__.pop('_metricas_anterior', None)
+    if not created and anterior is None:
+        return
+    _aplicar(instance, anterior, _estado_atual(instance))
+
+
+def metricas_post_delete(sender, instance, **kwargs):
+    _aplicar(instance, _estado_atual(instance), None)
+
+
+for _modelo in RASTREADOS:
+    receiver(pre_save, sender=_modelo, dispatch_uid=f'metricas_pre_save_{_modelo.__name__}')(metricas_pre_save)
+    receiver(post_save, sender=_modelo, dispatch_uid=f'metricas_post_save_{_modelo.__name__}')(metricas_post_save)
+    receiver(post_delete, sender=_modelo, dispatch_uid=f'metricas_post_delete_{_modelo.__name__}')(metricas_post_delete)
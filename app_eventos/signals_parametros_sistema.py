@@ -0,0 +1,22 @@
+"""
+Nova versão do registro de parâmetros (services/parametros_sistema.py) a cada escrita.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app_eventos.models_globais import ConfiguracaoSistema, IntegracaoGlobal, ParametroSistema
+from app_eventos.services.parametros_sistema import invalidar_parametros
+
+
+@receiver(post_save, sender=ParametroSistema, dispatch_uid='parametros_parametro_salvo')
+@receiver(post_delete, sender=ParametroSistema, dispatch_uid='parametros_parametro_removido')
+@receiver(post_save, sender=ConfiguracaoSistema, dispatch_uid='parametros_configuracao_salva')
+@receiver(post_delete, sender=ConfiguracaoSistema, dispatch_uid='parametros_configuracao_removida')
+@receiver(post_save, sender=IntegracaoGlobal, dispatch_uid='parametros_integracao_salva')
+@receiver(post_delete, sender=IntegracaoGlobal, dispatch_uid='parametros_integracao_removida')
+def invalidar_registro_parametros(sender, **kwargs):
+    # Na hora (a própria transação já lê o valor novo) e de novo após o commit,
+    # para que outro worker não fique com uma recarga feita antes do commit
+    invalidar_parametros()
+    transaction.on_commit(invalidar_parametros)
@@ -0,0 +1,194 @@
+"""Agenda dos freelancers: índice de intervalos, recusa de conflitos e disponibilidade no matching."""
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from app_eventos.models import (
+    Candidatura,
+    CompromissoAgenda,
+    ContratoFreelance,
+    EmpresaContratante,
+    Freelance,
+    Funcao,
+    PlanoContratacao,
+    PontoOperacao,
+    TipoFuncao,
+    Vaga,
+)
+from app_eventos.models_operacao_continua import AlocacaoTurno, TurnoOperacional, UnidadeOperacional, VagaTurno
+from app_eventos.services.agenda_freelancer import (
+    AgendaFreelancers,
+    ConflitoAgenda,
+    esta_livre,
+    freelancers_livres,
+    garantir_disponibilidade,
+    janela_turno,
+)
+from app_eventos.services.atribuicao_vaga_direta import atribuir_freelancer_a_vaga_direto
+from app_eventos.services.matching_service import MatchingService
+
+User = get_user_model()
+
+
+def _hora(dia, hora):
+    return timezone.make_aware(datetime(2030, 3, dia, hora))
+
+
+class AgendaEmMemoriaTest(TestCase):
+    def test_bisect_equivale_a_busca_linear(self):
+        gerador = random.Random(7)
+        base = _hora(1, 0)
+        compromissos = []
+        for freelance_id in range(5):
+            for _ in range(30):
+                inicio = base + timedelta(hours=gerador.randrange(0, 500))
+                compromissos.append((freelance_id, inicio, inicio + timedelta(hours=gerador.randrange(1, 30))))
+        agenda = AgendaFreelancers(compromissos)
+        for _ in range(500):
+            freelance_id = gerador.randrange(0, 6)
+            inicio = base + timedelta(hours=gerador.randrange(-10, 520))
+            fim = inicio + timedelta(hours=gerador.randrange(1, 12))
+            esperado = any(f == freelance_id and i < fim and t > inicio for f, i, t in compromissos)
+            self.assertEqual(agenda.ocupado(freelance_id, inicio, fim), esperado)
+
+        agenda = AgendaFreelancers([(1, _hora(1, 10), _hora(1, 14))])
+        self.assertEqual(agenda.situacao(1, (_hora(1, 14), _hora(1, 18))), 'apertado')
+        self.assertEqual(agenda.situacao(1, (_hora(1, 17), _hora(1, 20))), 'livre')
+        self.assertEqual(agenda.situacao(1, (_hora(1, 13), _hora(1, 20))), 'ocupado')
+        self.assertIsNone(agenda.situacao(1, None))
+
+
+class AgendaFreelancerTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Agenda",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Agenda",
+            nome_fantasia="Empresa Agenda",
+            razao_social="Empresa Agenda LTDA",
+            cnpj="12.345.678/0001-25",
+            email="agenda@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        self.ponto = PontoOperacao.objects.create(
+            empresa_contratante=self.empresa, nome="Restaurante", endereco="Rua A", cidade="Porto Alegre", uf="RS"
+        )
+        self.funcao = Funcao.objects.create(nome="Garçom", tipo_funcao=TipoFuncao.objects.create(nome="Salão"), ativo=True)
+        self.freelancers = []
+        for i in range(3):
+            usuario = User.objects.create_user(
+                username=f"agenda{i}@test.com", email=f"agenda{i}@test.com", password="teste12345",
+                tipo_usuario="freelancer",
+            )
+            self.freelancers.append(Freelance.objects.create(
+                usuario=usuario, nome_completo=f"Freelancer {i}", cidade="Porto Alegre", cadastro_completo=True,
+            ))
+
+    def _vaga(self, titulo, inicio, fim=None):
+        return Vaga.objects.create(
+            ponto_operacao=self.ponto, empresa_contratante=self.empresa, titulo=titulo, funcao=self.funcao,
+            quantidade=5, remuneracao=Decimal("100.00"), descricao="", ativa=True, publicada=True,
+            data_limite_candidatura=timezone.now() + timedelta(days=5),
+            data_inicio_trabalho=inicio, data_fim_trabalho=fim,
+        )
+
+    def test_aprovacao_recusa_horario_sobreposto(self):
+        freelancer = self.freelancers[0]
+        sabado = self._vaga("Sábado", _hora(9, 18), _hora(9, 23))
+        sobreposta = self._vaga("Sábado tarde", _hora(9, 14))  # 8h de duração padrão → até 22h
+        domingo = self._vaga("Domingo", _hora(10, 18), _hora(10, 23))
+
+        self.assertTrue(Candidatura.objects.create(freelance=freelancer, vaga=sabado).aprovar())
+        compromisso = CompromissoAgenda.objects.get(freelance=freelancer)
+        self.assertEqual((compromisso.origem, compromisso.objeto_id), ('vaga', sabado.pk))
+        self.assertEqual((compromisso.inicio, compromisso.fim), (_hora(9, 18), _hora(9, 23)))
+
+        conflitante = Candidatura.objects.create(freelance=freelancer, vaga=sobreposta)
+        self.assertFalse(conflitante.aprovar())
+        conflitante.refresh_from_db()
+        sobreposta.refresh_from_db()
+        self.assertEqual((conflitante.status, sobreposta.quantidade_preenchida), ('pendente', 0))
+        self.assertTrue(Candidatura.objects.create(freelance=freelancer, vaga=domingo).aprovar())
+        self.assertEqual(CompromissoAgenda.objects.filter(freelance=freelancer).count(), 2)
+
+        with self.assertRaises(ConflitoAgenda):
+            atribuir_freelancer_a_vaga_direto(freelancer, sobreposta)
+
+        # Mudar a data da vaga move o compromisso; liberar a agenda permite a aprovação
+        sabado.data_inicio_trabalho, sabado.data_fim_trabalho = _hora(8, 18), _hora(8, 23)
+        sabado.save()
+        self.assertTrue(esta_livre(freelancer.pk, _hora(9, 14), _hora(9, 22)))
+        self.assertTrue(conflitante.aprovar())
+
+        ContratoFreelance.objects.filter(freelance=freelancer, vaga=domingo).update(status='cancelado')
+        Candidatura.objects.get(freelance=freelancer, vaga=domingo).delete()
+        self.assertFalse(CompromissoAgenda.objects.filter(freelance=freelancer, objeto_id=domingo.pk).exists())
+
+    def test_alocacao_em_turno_entra_na_agenda(self):
+        freelancer, outro, _ = self.freelancers
+        unidade = UnidadeOperacional.objects.create(
+            empresa_contratante=self.empresa, nome="Salão", tipo='operacao', ponto_operacao=self.ponto
+        )
+        turno = TurnoOperacional.objects.create(unidade=unidade, data=date(2030, 3, 9), hora_inicio=time(20), hora_fim=time(2))
+        vaga_turno = VagaTurno.objects.create(turno=turno, funcao=self.funcao, quantidade_total=3)
+        alocacao = AlocacaoTurno.objects.create(vaga_turno=vaga_turno, freelance=freelancer)
+        self.assertEqual(janela_turno(turno), (_hora(9, 20), _hora(10, 2)))
+
+        vaga = self._vaga("Madrugada", _hora(10, 1), _hora(10, 6))
+        with self.assertRaises(ConflitoAgenda):
+            garantir_disponibilidade(freelancer.pk, (vaga.data_inicio_trabalho, vaga.data_fim_trabalho))
+        livres = freelancers_livres(vaga.data_inicio_trabalho, vaga.data_fim_trabalho)
+        self.assertEqual(set(livres.values_list('pk', flat=True)), {f.pk for f in self.freelancers[1:]})
+
+        turno.hora_fim = time(23)
+        turno.save()
+        self.assertTrue(esta_livre(freelancer.pk, _hora(10, 1), _hora(10, 6)))
+        alocacao.status = AlocacaoTurno.STATUS_CANCELADO
+        alocacao.save()
+        self.assertFalse(CompromissoAgenda.objects.exists())
+
+        AlocacaoTurno.objects.create(vaga_turno=vaga_turno, freelance=outro)
+        CompromissoAgenda.objects.all().delete()
+        saida = StringIO()
+        call_command('reconstruir_agenda_freelancers', stdout=saida)
+        self.assertIn('✅ Concluído: 1 compromisso(s)', saida.getvalue())
+        self.assertEqual(CompromissoAgenda.objects.get().freelance_id, outro.pk)
+
+    def test_matching_pontua_disponibilidade_pela_agenda(self):
+        ocupado, apertado, livre = self.freelancers
+        self.assertTrue(Candidatura.objects.create(freelance=ocupado, vaga=self._vaga("A", _hora(9, 12), _hora(9, 20))).aprovar())
+        self.assertTrue(Candidatura.objects.create(freelance=apertado, vaga=self._vaga("B", _hora(9, 10), _hora(9, 17))).aprovar())
+        vaga = self._vaga("Noite", _hora(9, 18), _hora(9, 23))
+
+        resultado = MatchingService.encontrar_freelancers_para_vaga(vaga, limite=10)
+        por_id = {item['freelancer'].pk: item['score'] for item in resultado}
+        self.assertNotIn(ocupado.pk, por_id)
+        self.assertGreater(por_id[livre.pk], por_id[apertado.pk])
+        for freelancer in (apertado, livre):
+            self.assertEqual(por_id[freelancer.pk], MatchingService._calcular_score_vaga_freelancer(vaga, freelancer))
+        self.assertEqual(MatchingService._score_disponibilidade(ocupado, vaga), 0.0)
+        self.assertEqual(MatchingService._score_disponibilidade(livre, vaga), 100.0)
+
+        recomendadas = {item['vaga'].pk for item in MatchingService.encontrar_vagas_para_freelancer(ocupado)}
+        self.assertNotIn(vaga.pk, recomendadas)
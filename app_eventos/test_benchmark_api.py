@@ -0,0 +1,38 @@
+"""Suíte de benchmark: cenário mínimo, medição e comparação com os limiares."""
+from django.test import TestCase
+
+from app_eventos.services.benchmark_api import (
+    carregar_limiares,
+    comparar_limiares,
+    executar_benchmarks,
+    semear_cenario,
+)
+
+
+class BenchmarkApiTest(TestCase):
+    def test_cenario_mini_mede_todos_os_endpoints(self):
+        cenario = semear_cenario('mini')
+        self.assertEqual(cenario.volumes['candidaturas'], 150)
+        # Recarrega em vez de semear de novo (reuso com --manter-banco)
+        self.assertEqual(semear_cenario('mini').empresa, cenario.empresa)
+
+        resultados = executar_benchmarks(cenario, repeticoes=2)
+        limiares = carregar_limiares()
+        self.assertEqual(set(resultados), set(limiares['mini']))
+        for nome, r in resultados.items():
+            self.assertEqual(r['status'], 200, nome)
+            self.assertGreater(r['consultas'], 0, nome)
+            self.assertLessEqual(r['p50_ms'], r['p95_ms'])
+        violacoes = comparar_limiares(resultados, limiares['mini'])
+        self.assertEqual([v for v in violacoes if v['metrica'] == 'consultas'], [])
+
+    def test_comparar_limiares(self):
+        resultados = {
+            'feed': {'status': 200, 'consultas': 5, 'p95_ms': 80.0, 'memoria_pico_kb': 100.0},
+            'dashboard': {'status': 500, 'consultas': 2, 'p95_ms': 10.0, 'memoria_pico_kb': 10.0},
+        }
+        violacoes = comparar_limiares(resultados, {'feed': {'consultas': 4, 'p95_ms': 100}})
+        self.assertEqual(
+            [(v['endpoint'], v['metrica']) for v in violacoes],
+            [('feed', 'consultas'), ('dashboard', 'status')],
+        )
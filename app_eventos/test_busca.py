@@ -0,0 +1,194 @@
+"""Busca indexada (DocumentoBusca): acentos, relevância, cidade, signals e feed do app."""
+from datetime import timedelta
+from importlib import import_module
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from app_eventos.models import (
+    Empresa,
+    EmpresaContratante,
+    Evento,
+    Freelance,
+    FreelancerFuncao,
+    Funcao,
+    LocalEvento,
+    PlanoContratacao,
+    PontoOperacao,
+    SetorEvento,
+    TipoEmpresa,
+    TipoFuncao,
+    Vaga,
+)
+from app_eventos.models_busca import DocumentoBusca
+from app_eventos.services.busca import CAMPO_RELEVANCIA, aplicar_busca, normalizar
+from app_eventos.services.matching_service import VagaRecommendationService
+
+User = get_user_model()
+
+
+class BuscaIndexadaTest(APITestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Busca",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Busca",
+            nome_fantasia="Empresa Busca",
+            razao_social="Empresa Busca LTDA",
+            cnpj="12.345.678/0001-60",
+            email="busca@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        tipo = TipoFuncao.objects.create(nome="Salão")
+        self.garcom = Funcao.objects.create(nome="Garçom", tipo_funcao=tipo, ativo=True)
+        self.seguranca = Funcao.objects.create(nome="Segurança", tipo_funcao=tipo, ativo=True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.evento = Evento.objects.create(
+                nome="Festival de Inverno",
+                data_inicio="2030-06-10",
+                data_fim="2030-06-12",
+                local=LocalEvento.objects.create(
+                    nome="Arena Sul",
+                    endereco="Av. Principal, 100 - Canoas/RS",
+                    capacidade=500,
+                    empresa_proprietaria=Empresa.objects.create(
+                        nome="Produtora",
+                        cnpj="98.765.432/0001-60",
+                        tipo_empresa=TipoEmpresa.objects.create(nome="Buffet", descricao=""),
+                        email="produtora@x.com",
+                    ),
+                ),
+                empresa_contratante=self.empresa,
+            )
+            setor = SetorEvento.objects.create(nome="Bar Central", evento=self.evento)
+            ponto = PontoOperacao.objects.create(
+                empresa_contratante=self.empresa, nome="Restaurante Orla", endereco="Rua A",
+                cidade="Porto Alegre", uf="RS",
+            )
+            agora = timezone.now()
+            comum = dict(
+                empresa_contratante=self.empresa, quantidade=1, remuneracao=Decimal("120.00"),
+                data_limite_candidatura=agora + timedelta(days=2), data_inicio_trabalho=agora + timedelta(days=3),
+                publicada=True,
+            )
+            self.vaga_evento = Vaga.objects.create(
+                setor=setor, evento=self.evento, titulo="Garçom para o festival",
+                descricao="Atendimento de mesas", funcao=self.garcom, **comum
+            )
+            self.vaga_ponto = Vaga.objects.create(
+                ponto_operacao=ponto, titulo="Garçom de salão",
+                descricao="Garçom experiente, salão e eventos de garçom", funcao=self.garcom, **comum
+            )
+            self.vaga_seguranca = Vaga.objects.create(
+                setor=setor, evento=self.evento, titulo="Controle de acesso",
+                descricao="Portaria", funcao=self.seguranca, **comum
+            )
+
+            self.user = User.objects.create_user(
+                username="freela@busca.com", password="teste12345", tipo_usuario="freelancer"
+            )
+            self.freelancer = Freelance.objects.create(
+                usuario=self.user, nome_completo="João Ávila", cidade="São Leopoldo", uf="RS"
+            )
+            FreelancerFuncao.objects.create(freelancer=self.freelancer, funcao=self.garcom, nivel="iniciante", ativo=True)
+
+    def _vagas(self, **kwargs):
+        return list(aplicar_busca(Vaga.objects.all(), 'vaga', **kwargs).values_list('pk', flat=True))
+
+    def test_documentos_normalizados(self):
+        self.assertEqual(normalizar("  São  José DO Rio "), "sao jose do rio")
+        doc = DocumentoBusca.objects.get(tipo='vaga', objeto_id=self.vaga_evento.pk)
+        self.assertIn('garcom para o festival', doc.texto)
+        self.assertIn('festival de inverno', doc.texto)
+        self.assertIn('canoas', doc.cidade)
+        self.assertEqual(DocumentoBusca.objects.get(tipo='vaga', objeto_id=self.vaga_ponto.pk).cidade, 'porto alegre rs')
+
+    def test_busca_sem_acento_prefixo_e_relevancia(self):
+        encontrados = aplicar_busca(Vaga.objects.all(), 'vaga', busca='GARÇ').order_by(f'-{CAMPO_RELEVANCIA}')
+        self.assertEqual(list(encontrados.values_list('pk', flat=True)), [self.vaga_ponto.pk, self.vaga_evento.pk])
+        self.assertEqual(self._vagas(busca='garcom festival'), [self.vaga_evento.pk])
+        self.assertEqual(self._vagas(busca='portaria'), [self.vaga_seguranca.pk])
+        self.assertEqual(self._vagas(busca='inexistente'), [])
+
+    def test_filtro_por_cidade(self):
+        self.assertEqual(self._vagas(cidade='porto alegre'), [self.vaga_ponto.pk])
+        self.assertEqual(sorted(self._vagas(cidade='Canoas')), sorted([self.vaga_evento.pk, self.vaga_seguranca.pk]))
+        self.assertEqual(self._vagas(busca='garcom', cidade='canoas'), [self.vaga_evento.pk])
+        self.assertEqual(
+            [v.pk for v in VagaRecommendationService.obter_vagas_por_localizacao('Porto Alegre')], [self.vaga_ponto.pk]
+        )
+
+    def test_signals_mantem_documentos(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vaga_seguranca.titulo = "Vigilante noturno"
+            self.vaga_seguranca.save()
+        self.assertEqual(self._vagas(busca='vigilante'), [self.vaga_seguranca.pk])
+
+        # Renomear o evento reindexa as vagas dele
+        with self.captureOnCommitCallbacks(execute=True):
+            self.evento.nome = "Feira Gastronômica"
+            self.evento.save()
+        self.assertEqual(sorted(self._vagas(busca='gastronomica')), sorted([self.vaga_evento.pk, self.vaga_seguranca.pk]))
+
+        # Freelancer: nome, funções e cidade
+        freelancers = aplicar_busca(Freelance.objects.all(), 'freelance', busca='avila garcom', cidade='sao leopoldo')
+        self.assertEqual(list(freelancers), [self.freelancer])
+        with self.captureOnCommitCallbacks(execute=True):
+            FreelancerFuncao.objects.create(freelancer=self.freelancer, funcao=self.seguranca, nivel="iniciante", ativo=True)
+        self.assertEqual(list(aplicar_busca(Freelance.objects.all(), 'freelance', busca='seguranca')), [self.freelancer])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vaga_seguranca.delete()
+        self.assertFalse(DocumentoBusca.objects.filter(tipo='vaga', objeto_id=self.vaga_seguranca.pk).exists())
+
+    def test_feed_do_app_usa_busca_e_cidade(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('vaga-list')
+        resposta = self.client.get(url, {'search': 'garcom'})
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual([v['id'] for v in resposta.data['results']], [self.vaga_ponto.pk, self.vaga_evento.pk])
+
+        resposta = self.client.get(url, {'cidade': 'canoas', 'cursor': ''})
+        self.assertEqual([v['id'] for v in resposta.data['results']], [self.vaga_evento.pk])
+
+    def test_reindexar_reconstroi_tudo(self):
+        DocumentoBusca.objects.all().delete()
+        saida = StringIO()
+        call_command('reindexar_busca', stdout=saida)
+        self.assertEqual(DocumentoBusca.objects.filter(tipo='vaga').count(), 3)
+        self.assertEqual(DocumentoBusca.objects.filter(tipo='evento').count(), 1)
+        self.assertEqual(DocumentoBusca.objects.filter(tipo='freelance').count(), 1)
+        self.assertEqual(self._vagas(busca='portaria'), [self.vaga_seguranca.pk])
+        self.assertIn('✅ Concluído: 5 documento(s)', saida.getvalue())
+
+    def test_migracao_faz_a_carga_inicial(self):
+        DocumentoBusca.objects.all().delete()
+        migracao = ('app_eventos', '0053_popular_documentos_busca')
+        apps = MigrationLoader(connection).project_state(migracao).apps
+        import_module('app_eventos.migrations.0053_popular_documentos_busca').popular_documentos_busca(apps, None)
+
+        self.assertEqual(DocumentoBusca.objects.count(), 5)
+        self.assertEqual(self._vagas(busca='garcom', cidade='canoas'), [self.vaga_evento.pk])
@@ -0,0 +1,150 @@
+"""Cache de tenant/permissões: hits sem consulta e invalidação por signals."""
+import tempfile
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from app_eventos.models import (
+    EmpresaContratante,
+    GrupoUsuario,
+    PermissaoSistema,
+    PlanoContratacao,
+    UsuarioGrupo,
+)
+from app_eventos.services import cache_acesso
+from app_eventos.utils_empresa_ativa import empresa_ativa
+
+User = get_user_model()
+
+
+class CacheAcessoTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Acesso",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Acesso",
+            nome_fantasia="Empresa Acesso",
+            razao_social="Empresa Acesso LTDA",
+            cnpj="12.345.678/0001-10",
+            email="acesso@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        self.user = User.objects.create_user(
+            username="operador@acesso.com",
+            password="teste12345",
+            tipo_usuario="operador_empresa",
+            empresa_contratante=self.empresa,
+        )
+        self.perm_eventos = PermissaoSistema.objects.create(
+            codigo="gerenciar_eventos", nome="Eventos", modulo="eventos"
+        )
+        self.perm_financeiro = PermissaoSistema.objects.create(
+            codigo="gerenciar_financeiro", nome="Financeiro", modulo="financeiro"
+        )
+        self.grupo = GrupoUsuario.objects.create(nome="Operadores", empresa_contratante=self.empresa)
+        self.grupo.permissoes.add(self.perm_eventos, self.perm_financeiro)
+        self.vinculo = UsuarioGrupo.objects.create(usuario=self.user, grupo=self.grupo)
+
+    def _usuario(self):
+        # Nova instância a cada "request", como o AuthenticationMiddleware faz
+        return User.objects.get(pk=self.user.pk)
+
+    def test_permissoes_sem_consulta_no_cache_hit(self):
+        self.assertTrue(self._usuario().tem_permissao("gerenciar_eventos"))
+        user = self._usuario()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.tem_permissao("gerenciar_financeiro"))
+            self.assertFalse(user.tem_permissao("gerenciar_usuarios"))
+            self.assertCountEqual(user.get_permissoes(), ["gerenciar_eventos", "gerenciar_financeiro"])
+
+    def test_invalidacao_por_grupo_permissao_e_vinculo(self):
+        self.assertTrue(self._usuario().tem_permissao("gerenciar_financeiro"))
+
+        self.grupo.permissoes.remove(self.perm_financeiro)
+        self.assertFalse(self._usuario().tem_permissao("gerenciar_financeiro"))
+
+        self.perm_eventos.ativo = False
+        self.perm_eventos.save()
+        self.assertFalse(self._usuario().tem_permissao("gerenciar_eventos"))
+
+        self.perm_eventos.ativo = True
+        self.perm_eventos.save()
+        self.vinculo.ativo = False
+        self.vinculo.save()
+        self.assertEqual(self._usuario().get_permissoes(), [])
+
+    def test_adicionar_ao_grupo_limpa_memoria_da_instancia(self):
+        outro = GrupoUsuario.objects.create(nome="Admins", empresa_contratante=self.empresa)
+        outro.permissoes.add(PermissaoSistema.objects.create(
+            codigo="gerenciar_usuarios", nome="Usuários", modulo="usuarios"
+        ))
+        user = self._usuario()
+        self.assertFalse(user.tem_permissao("gerenciar_usuarios"))
+        user.adicionar_ao_grupo(outro)
+        self.assertTrue(user.tem_permissao("gerenciar_usuarios"))
+
+    def test_empresa_ativa_sem_consulta_no_cache_hit(self):
+        request = RequestFactory().get("/empresa/dashboard/")
+        request.user = self._usuario()
+        self.assertEqual(empresa_ativa(request), self.empresa)
+
+        request.user = self._usuario()
+        with self.assertNumQueries(0):
+            empresa = empresa_ativa(request)
+            self.assertEqual(empresa.plano_contratado.nome, "Plano Acesso")
+            self.assertIs(request.user.empresa_contratante, empresa)
+
+        self.empresa.ativo = False
+        self.empresa.save()
+        request.user = self._usuario()
+        self.assertIsNone(empresa_ativa(request))
+
+    def test_empresa_owner_freelancer_cacheado(self):
+        eventix = EmpresaContratante.objects.create(
+            nome="Eventix",
+            nome_fantasia="Eventix",
+            razao_social="Eventix LTDA",
+            cnpj="12.345.678/0001-20",
+            email="eventix@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=self.empresa.plano_contratado,
+            valor_mensal=Decimal("0.00"),
+        )
+        freelancer = User.objects.create_user(
+            username="freela@acesso.com", password="teste12345", tipo_usuario="freelancer"
+        )
+        self.assertEqual(freelancer.empresa_owner, eventix)
+        with self.assertNumQueries(0):
+            self.assertEqual(freelancer.empresa_owner, eventix)
+
+    @override_settings(ACESSO_CACHE_ALIAS='default', ACESSO_CACHE_TIMEOUT=120, ACESSO_CACHE_TIMEOUT_LOCAL=5)
+    def test_ttl_curto_sem_cache_compartilhado(self):
+        # LocMem é por processo: a invalidação não chega aos outros workers
+        self.assertEqual(cache_acesso._timeout(), 5)
+
+        with tempfile.TemporaryDirectory() as diretorio:
+            compartilhado = {
+                **settings.CACHES,
+                'acesso': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': diretorio},
+            }
+            with self.settings(CACHES=compartilhado, ACESSO_CACHE_ALIAS='acesso'):
+                self.assertEqual(cache_acesso._timeout(), 120)
@@ -0,0 +1,91 @@
+"""Cache de respostas: 304 por ETag sem consultas, corpo reaproveitado e invalidação por signals."""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app_eventos.models import EmpresaContratante, Funcao, PlanoContratacao, PontoOperacao, TipoFuncao, Vaga
+
+User = get_user_model()
+
+
+class CacheRespostasTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Respostas",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Respostas",
+            nome_fantasia="Empresa Respostas",
+            razao_social="Empresa Respostas LTDA",
+            cnpj="12.345.678/0001-75",
+            email="respostas@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        self.tipo = TipoFuncao.objects.create(nome="Salão")
+        self.funcao = Funcao.objects.create(nome="Garçom", tipo_funcao=self.tipo, ativo=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(
+            User.objects.create_user(username="respostas", password="teste12345", tipo_usuario="freelancer")
+        )
+
+    def test_catalogo_de_funcoes(self):
+        url = reverse("funcao-list")
+        primeira = self.cliente.get(url)
+        etag = primeira["ETag"]
+        self.assertIn("no-cache", primeira["Cache-Control"])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.cliente.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            repetida = self.cliente.get(url)
+        self.assertEqual(repetida.json(), primeira.json())
+
+        Funcao.objects.create(nome="Copeiro", tipo_funcao=self.tipo, ativo=True)
+        nova = self.cliente.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(nova.status_code, 200)
+        self.assertNotEqual(nova["ETag"], etag)
+        self.assertIn("Copeiro", [item["nome"] for item in nova.json()["results"]])
+
+    def test_pagina_publica_da_vaga(self):
+        ponto = PontoOperacao.objects.create(
+            empresa_contratante=self.empresa, nome="Salão de festas", endereco="Rua A", cidade="Porto Alegre", uf="RS"
+        )
+        vaga = Vaga.objects.create(
+            empresa_contratante=self.empresa,
+            ponto_operacao=ponto,
+            titulo="Garçom para casamento",
+            funcao=self.funcao,
+            quantidade=2,
+            remuneracao=Decimal("150.00"),
+            descricao="Serviço de salão",
+        )
+        url = reverse("freelancer_publico:vaga_publica", args=[vaga.pk])
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            self.assertContains(self.client.get(url), "Garçom para casamento")
+
+        vaga.titulo = "Garçom para formatura"
+        vaga.save()
+        self.assertContains(self.client.get(url, HTTP_IF_NONE_MATCH=etag), "Garçom para formatura")
+
+        # Logado a página muda com o usuário: sem cache nem ETag
+        self.client.force_login(User.objects.create_user(username="logado", password="teste12345"))
+        self.assertFalse(self.client.get(url).has_header("ETag"))
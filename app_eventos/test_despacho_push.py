@@ -0,0 +1,152 @@
+"""Despacho de push em lotes contra um servidor FCM local (stub)."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from app_eventos.models import Freelance
+from app_eventos.services.despacho_push import DespachantePush
+from app_eventos.services.notificacoes_push_admin import NotificacaoPushAdminService, messaging
+
+User = get_user_model()
+
+
+class _FCMStub(BaseHTTPRequestHandler):
+    """Responde como a API legada: tokens 'morto-*' → NotRegistered, 'antigo-*' → canônico."""
+    protocol_version = 'HTTP/1.1'  # keep-alive, para medir reuso de conexão
+
+    def do_POST(self):
+        corpo = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if self.path != '/fcm/send':
+            self.send_response(500)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        servidor = self.server
+        with servidor.lock:
+            servidor.lotes.append(len(corpo['registration_ids']))
+            servidor.conexoes.add(self.client_address)
+            servidor.autorizacoes.add(self.headers.get('Authorization'))
+        resultados = []
+        for token in corpo['registration_ids']:
+            if token.startswith('morto-'):
+                resultados.append({'error': 'NotRegistered'})
+            elif token.startswith('antigo-'):
+                resultados.append({'message_id': '1', 'registration_id': token.replace('antigo-', 'novo-')})
+            else:
+                resultados.append({'message_id': '1'})
+        resposta = json.dumps({'results': resultados}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(resposta)))
+        self.end_headers()
+        self.wfile.write(resposta)
+
+    def log_message(self, *args):
+        pass
+
+
+class DespachoPushTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.servidor = ThreadingHTTPServer(('127.0.0.1', 0), _FCMStub)
+        cls.servidor.lock = threading.Lock()
+        threading.Thread(target=cls.servidor.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.servidor.server_address[1]}/fcm/send"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servidor.shutdown()
+        cls.servidor.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.servidor.lotes = []
+        self.servidor.conexoes = set()
+        self.servidor.autorizacoes = set()
+
+    def _freelancer(self, token):
+        user = User.objects.create_user(username=f"{token}@push.com", password="teste12345", tipo_usuario="freelancer")
+        return Freelance.objects.create(usuario=user, nome_completo=token, device_token=token)
+
+    @override_settings(FCM_CONCORRENCIA=3)
+    def test_lotes_de_500_em_paralelo_com_estatisticas(self):
+        tokens = [f"ok-{i}" for i in range(1200)] + [f"morto-{i}" for i in range(3)]
+        stats = DespachantePush(server_key='chave', url=self.url).despachar(tokens + tokens[:10], {'title': 'Oi'})
+
+        self.assertEqual(sorted(self.servidor.lotes), [203, 500, 500])
+        self.assertEqual(self.servidor.autorizacoes, {'key=chave'})
+        self.assertEqual(stats['total'], 1203)
+        self.assertEqual(stats['lotes'], 3)
+        self.assertEqual(stats['enviados'], 1200)
+        self.assertEqual(stats['falhas'], 3)
+        self.assertEqual(stats['lotes_com_erro'], 0)
+        self.assertEqual([d['tokens'] for d in stats['detalhes_lotes']], [500, 500, 203])
+
+    def test_remove_tokens_mortos_e_atualiza_canonicos(self):
+        vivo = self._freelancer('ok-1')
+        morto = self._freelancer('morto-1')
+        antigo = self._freelancer('antigo-1')
+
+        stats = DespachantePush(server_key='chave', url=self.url).despachar(
+            ['ok-1', 'morto-1', 'antigo-1'], {'title': 'Oi'}
+        )
+
+        self.assertEqual((stats['tokens_removidos'], stats['tokens_atualizados']), (1, 1))
+        for freelancer in (vivo, morto, antigo):
+            freelancer.refresh_from_db()
+        self.assertEqual(vivo.device_token, 'ok-1')
+        self.assertIsNone(morto.device_token)
+        self.assertEqual(antigo.device_token, 'novo-1')
+
+    @override_settings(FCM_CONCORRENCIA=1)
+    def test_session_reaproveita_conexao(self):
+        despachante = DespachantePush(server_key='chave', url=self.url, remover_tokens_mortos=False)
+        for _ in range(3):
+            despachante.despachar(['ok-1', 'ok-2'], {'title': 'Oi'})
+        self.assertEqual(len(self.servidor.lotes), 3)
+        self.assertEqual(len(self.servidor.conexoes), 1)
+
+    def test_falha_http_conta_lote_inteiro(self):
+        despachante = DespachantePush(server_key='chave', url=self.url.replace('/fcm/send', '/erro'),
+                                      remover_tokens_mortos=False)
+        stats = despachante.despachar(['ok-1', 'ok-2'], {'title': 'Oi'})
+        self.assertEqual((stats['enviados'], stats['falhas'], stats['lotes_com_erro']), (0, 2, 1))
+
+
+class NotificacaoPushAdminMulticastTest(TestCase):
+    """Caminho do Firebase Admin SDK: um MulticastMessage de até 500 tokens por lote."""
+
+    def _enviar(self, message):
+        # O SDK já recusaria a mensagem no construtor; o stub só confere e responde
+        self.lotes.append(list(message.tokens))
+        return SimpleNamespace(
+            success_count=sum(not t.startswith('morto-') for t in message.tokens),
+            failure_count=sum(t.startswith('morto-') for t in message.tokens),
+            responses=[
+                SimpleNamespace(success=False, exception=messaging.UnregisteredError('morto'))
+                if t.startswith('morto-') else SimpleNamespace(success=True, exception=None)
+                for t in message.tokens
+            ],
+        )
+
+    def test_mais_de_500_tokens(self):
+        self.lotes = []
+        user = User.objects.create_user(username="morto@push.com", password="teste12345", tipo_usuario="freelancer")
+        morto = Freelance.objects.create(usuario=user, nome_completo="Morto", device_token="morto-1")
+        vaga = SimpleNamespace(id=1, titulo="Garçom", remuneracao="150.00", tipo_remuneracao="por_evento", setor=None)
+        tokens = [f"ok-{i}" for i in range(1000)] + ["morto-1", "ok-0"]
+
+        with mock.patch('app_eventos.services.notificacoes_push_admin.get_firebase_app', return_value=object()), \
+                mock.patch.object(messaging, 'send_each_for_multicast', side_effect=self._enviar):
+            enviados = NotificacaoPushAdminService().enviar_notificacao_multipla(tokens, vaga)
+
+        self.assertEqual(enviados, 1000)
+        self.assertEqual([len(lote) for lote in self.lotes], [500, 500, 1])
+        morto.refresh_from_db()
+        self.assertIsNone(morto.device_token)
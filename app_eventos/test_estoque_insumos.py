@@ -0,0 +1,178 @@
+"""Livro-razão de estoque dos insumos: saldos atômicos por insumo/evento/setor, leitura O(1) e reconciliação."""
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from app_eventos.models import (
+    CategoriaInsumo,
+    DashboardEstoque,
+    Empresa,
+    EmpresaContratante,
+    Evento,
+    Insumo,
+    InsumoEvento,
+    InsumoSetor,
+    LocalEvento,
+    MovimentacaoInsumo,
+    PlanoContratacao,
+    SetorEvento,
+    TipoEmpresa,
+)
+from app_eventos.services.estoque_insumos import (
+    EstoqueInsuficiente,
+    ajustar_estoque,
+    devolver_ao_estoque,
+    devolver_ao_evento,
+    gerar_relatorio_estoque,
+    insumos_com_disponibilidade,
+    registrar_entrada,
+)
+
+User = get_user_model()
+
+
+class EstoqueInsumosTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Estoque",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Estoque",
+            nome_fantasia="Empresa Estoque",
+            razao_social="Empresa Estoque LTDA",
+            cnpj="12.345.678/0001-80",
+            email="estoque@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        self.usuario = User.objects.create_user(username="estoquista", password="teste12345")
+        fornecedor = Empresa.objects.create(
+            nome="Fornecedor",
+            cnpj="98.765.432/0001-80",
+            tipo_empresa=TipoEmpresa.objects.create(nome="Buffet", descricao=""),
+            email="fornecedor@x.com",
+        )
+        local = LocalEvento.objects.create(
+            nome="Arena", endereco="Rua B", capacidade=500, empresa_proprietaria=fornecedor
+        )
+        self.eventos = [
+            Evento.objects.create(
+                nome=f"Evento {i}", data_inicio="2030-06-10", data_fim="2030-06-12",
+                local=local, empresa_contratante=self.empresa,
+            )
+            for i in range(2)
+        ]
+        self.setor = SetorEvento.objects.create(nome="Bar", evento=self.eventos[0])
+        categoria = CategoriaInsumo.objects.create(empresa_contratante=self.empresa, nome="Bebidas")
+        self.insumo = Insumo.objects.create(
+            empresa_contratante=self.empresa, empresa_fornecedora=fornecedor, categoria=categoria,
+            codigo="AGUA", nome="Água", estoque_minimo=10, estoque_atual=100,
+        )
+
+    def test_fluxo_completo_atualiza_saldos_e_registra_movimentos(self):
+        ok, insumo_evento = self.insumo.alocar_para_evento(self.eventos[0], 60, responsavel=self.usuario)
+        self.assertTrue(ok)
+        self.assertEqual(insumo_evento.quantidade_alocada_evento, 60)
+        self.assertEqual(self.insumo.quantidade_alocada_eventos, 60)
+        self.assertEqual(self.insumo.estoque_real_disponivel, 30)
+
+        # Só há 30 realmente disponíveis: nada é criado nem reservado
+        ok, mensagem = self.insumo.alocar_para_evento(self.eventos[1], 31)
+        self.assertEqual((ok, mensagem), (False, "Estoque insuficiente"))
+        self.assertFalse(InsumoEvento.objects.filter(evento=self.eventos[1]).exists())
+
+        insumo_setor = InsumoSetor.objects.create(setor=self.setor, insumo_evento=insumo_evento, quantidade_necessaria=50)
+        self.assertTrue(insumo_setor.alocar_quantidade(50))
+        self.assertFalse(insumo_setor.alocar_quantidade(11))
+        self.assertTrue(insumo_setor.registrar_utilizacao(35))
+        self.assertFalse(insumo_setor.registrar_utilizacao(16))
+        self.assertEqual((insumo_setor.quantidade_alocada, insumo_setor.quantidade_utilizada), (50, 35))
+
+        devolver_ao_evento(insumo_setor, 15)
+        devolver_ao_estoque(insumo_evento, 20)
+        with self.assertRaises(EstoqueInsuficiente):
+            devolver_ao_estoque(insumo_evento, 6)  # 40 alocados, 35 distribuídos
+
+        insumo_evento.refresh_from_db()
+        self.insumo.refresh_from_db()
+        self.assertEqual(
+            (insumo_evento.quantidade_alocada_evento, insumo_evento.quantidade_distribuida_setores,
+             insumo_evento.quantidade_utilizada_evento),
+            (40, 35, 35),
+        )
+        self.assertEqual((self.insumo.quantidade_alocada_eventos, self.insumo.quantidade_utilizada_eventos), (40, 35))
+
+        registrar_entrada(self.insumo, 25)
+        ajustar_estoque(self.insumo, -5, observacao="Quebra")
+        with self.assertRaises(EstoqueInsuficiente):
+            ajustar_estoque(self.insumo, -1000)
+        self.assertEqual(self.insumo.estoque_atual, 120)
+
+        self.assertEqual(
+            list(MovimentacaoInsumo.objects.order_by('id').values_list('tipo', 'quantidade')),
+            [('entrada', 100), ('alocacao', 60), ('alocacao', 50), ('utilizacao', 35), ('devolucao', 15),
+             ('devolucao', 20), ('entrada', 25), ('ajuste', -5)],
+        )
+        with self.assertRaises(ValueError):
+            MovimentacaoInsumo.objects.first().save()
+
+    def test_disponibilidade_sem_somar_eventos(self):
+        # Save direto (ex.: clonagem/carga) também mantém os totais
+        InsumoEvento.objects.create(evento=self.eventos[0], insumo=self.insumo, quantidade_alocada_evento=20)
+        InsumoEvento.objects.create(evento=self.eventos[1], insumo=self.insumo, quantidade_alocada_evento=30)
+        insumo = Insumo.objects.get(pk=self.insumo.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(insumo.estoque_real_disponivel, 40)
+
+        with CaptureQueriesContext(connection) as consultas:
+            linhas = list(insumos_com_disponibilidade().values_list('codigo', 'disponivel_real'))
+        self.assertEqual(len(consultas), 1)
+        self.assertEqual(linhas, [("AGUA", 40)])
+
+        InsumoEvento.objects.filter(evento=self.eventos[1]).delete()
+        self.insumo.refresh_from_db()
+        self.assertEqual(self.insumo.quantidade_alocada_eventos, 20)
+
+    def test_reconciliacao_corrige_deriva(self):
+        ok, insumo_evento = self.insumo.alocar_para_evento(self.eventos[0], 30)
+        insumo_setor = InsumoSetor.objects.create(setor=self.setor, insumo_evento=insumo_evento)
+        insumo_setor.alocar_quantidade(10)
+        # Updates em massa não passam pelo livro-razão nem pelos signals
+        Insumo.objects.update(quantidade_alocada_eventos=999)
+        InsumoSetor.objects.update(quantidade_alocada=12)
+
+        saida = StringIO()
+        call_command('reconciliar_estoque_insumos', '--setores', stdout=saida)
+        self.insumo.refresh_from_db()
+        insumo_evento.refresh_from_db()
+        self.assertEqual(self.insumo.quantidade_alocada_eventos, 30)
+        self.assertEqual(insumo_evento.quantidade_distribuida_setores, 12)
+        self.assertIn('✅ Concluído: 2 saldo(s)', saida.getvalue())
+        dashboard = DashboardEstoque.objects.get(empresa_contratante=self.empresa)
+        self.assertEqual((dashboard.total_insumos, dashboard.insumos_estoque_baixo), (1, 0))
+
+    def test_relatorio_estoque(self):
+        self.insumo.alocar_para_evento(self.eventos[0], 15)
+        relatorio = gerar_relatorio_estoque(self.empresa, self.usuario)
+        self.assertEqual(relatorio.dados_relatorio['total_itens'], 1)
+        item = relatorio.dados_relatorio['itens'][0]
+        self.assertEqual((item['quantidade_alocada_eventos'], item['disponivel_real']), (15, 75))
+        self.assertEqual(gerar_relatorio_estoque(self.empresa, self.usuario, 'estoque_baixo').dados_relatorio['itens'], [])
@@ -0,0 +1,206 @@
+"""Clonagem de eventos em lote: consultas fixas, mapas id antigo → novo e modo multi-data."""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app_eventos.models import (
+    CategoriaFinanceira,
+    CategoriaInsumo,
+    ChecklistEvento,
+    DespesaEvento,
+    Empresa,
+    EmpresaContratante,
+    Evento,
+    Insumo,
+    InsumoEvento,
+    InsumoSetor,
+    ItemChecklist,
+    LocalEvento,
+    MetricasEmpresa,
+    PlanoContratacao,
+    ReceitaEvento,
+    SetorEvento,
+    Tarefa,
+    TipoEmpresa,
+    Vaga,
+)
+from app_eventos.models_busca import DocumentoBusca
+from app_eventos.services.event_clone_service import EventCloneOptions, EventCloneService, EventCloneTarget
+from app_eventos.services.metricas_empresa import obter_metricas
+
+User = get_user_model()
+
+
+class EventCloneLoteTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Clone",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Clone",
+            nome_fantasia="Empresa Clone",
+            razao_social="Empresa Clone LTDA",
+            cnpj="12.345.678/0001-90",
+            email="clone@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        self.usuario = User.objects.create_user(username="coordenador-clone", password="teste12345")
+        self.produtora = Empresa.objects.create(
+            nome="Produtora",
+            cnpj="98.765.432/0001-90",
+            tipo_empresa=TipoEmpresa.objects.create(nome="Buffet", descricao=""),
+            email="produtora@x.com",
+        )
+        self.local = LocalEvento.objects.create(
+            nome="Arena", endereco="Rua B", capacidade=500, empresa_proprietaria=self.produtora
+        )
+        self.categoria_financeira = CategoriaFinanceira.objects.create(
+            empresa_contratante=self.empresa, nome="Operação", descricao="", tipo='despesa'
+        )
+        self.insumo = Insumo.objects.create(
+            empresa_contratante=self.empresa, empresa_fornecedora=self.produtora,
+            categoria=CategoriaInsumo.objects.create(empresa_contratante=self.empresa, nome="Bebidas"),
+            nome="Água", estoque_atual=1000,
+        )
+
+    def _modelo(self, n, sufixo=""):
+        """Evento de origem com ``n`` linhas em cada nível."""
+        evento = Evento.objects.create(
+            empresa_contratante=self.empresa, nome=f"Festival{sufixo}", data_inicio=date(2030, 5, 10),
+            data_fim=date(2030, 5, 12), descricao="Modelo", local=self.local, empresa_produtora=self.produtora,
+        )
+        setores = [SetorEvento.objects.create(evento=evento, nome=f"Setor {i}", capacidade=10) for i in range(n)]
+        insumo_evento = InsumoEvento.objects.create(
+            evento=evento, insumo=self.insumo, quantidade_total_necessaria=5 * n, quantidade_alocada_evento=3
+        )
+        inicio = timezone.make_aware(datetime(2030, 5, 10, 18, 0))
+        for i, setor in enumerate(setores):
+            Vaga.objects.create(
+                evento=evento, setor=setor, empresa_contratante=self.empresa, titulo=f"Garçom {i}",
+                quantidade=2, quantidade_preenchida=1, remuneracao=Decimal("150.00"), descricao="",
+                data_limite_candidatura=inicio - timedelta(days=2), data_inicio_trabalho=inicio,
+                ativa=True, publicada=True,
+            )
+            InsumoSetor.objects.create(
+                setor=setor, insumo_evento=insumo_evento, quantidade_necessaria=5, quantidade_alocada=3
+            )
+            checklist = ChecklistEvento.objects.create(
+                empresa_contratante=self.empresa, evento=evento, titulo=f"Checklist {i}",
+                responsavel=self.usuario, data_limite=inicio - timedelta(days=1), concluido=True,
+            )
+            for ordem in range(2):
+                ItemChecklist.objects.create(checklist=checklist, descricao="Item", ordem=ordem, concluido=True)
+            Tarefa.objects.create(
+                empresa_contratante=self.empresa, titulo=f"Tarefa {i}", descricao="", criado_por=self.usuario,
+                responsavel=self.usuario, status='concluida', evento_relacionado=evento,
+            )
+            DespesaEvento.objects.create(
+                evento=evento, categoria=self.categoria_financeira, descricao="Compra", valor=Decimal("10.00"),
+                data_vencimento=date(2030, 5, 1), status='pago', data_pagamento=date(2030, 5, 1),
+            )
+            ReceitaEvento.objects.create(
+                evento=evento, categoria=self.categoria_financeira, descricao="Ingresso", valor=Decimal("20.00"),
+                data_vencimento=date(2030, 5, 2),
+            )
+        return evento
+
+    def _consultas_para_clonar(self, origem):
+        service = EventCloneService(usuario=self.usuario, evento_origem=origem)
+        with CaptureQueriesContext(connection) as consultas, self.captureOnCommitCallbacks(execute=True):
+            service.clone_event(nome="Clone", data_inicio=date(2030, 8, 1), data_fim=date(2030, 8, 3))
+        return len(consultas)
+
+    def test_numero_de_consultas_independe_do_tamanho(self):
+        pequeno = self._consultas_para_clonar(self._modelo(2, " P"))
+        grande = self._consultas_para_clonar(self._modelo(15, " G"))
+        self.assertEqual(pequeno, grande)
+
+    def test_clone_religa_relacoes_e_zera_andamento(self):
+        origem = self._modelo(3)
+        obter_metricas(self.empresa)  # snapshot existente: recebe os deltas das vagas clonadas
+        service = EventCloneService(usuario=self.usuario, evento_origem=origem)
+        with self.captureOnCommitCallbacks(execute=True):
+            result = service.clone_event(nome="Clone", data_inicio=date(2030, 8, 1), data_fim=date(2030, 8, 3))
+
+        clone = result.event
+        self.assertEqual(
+            dict(result.counts),
+            {'setores': 3, 'insumos_evento': 1, 'insumos_setor': 3, 'vagas': 3, 'checklists': 3,
+             'itens_checklist': 6, 'tarefas': 3, 'despesas': 3, 'receitas': 3},
+        )
+        self.assertEqual(set(result.setor_map), set(origem.setores.values_list('pk', flat=True)))
+        for vaga in clone.vagas_diretas.select_related('setor'):
+            self.assertEqual(vaga.setor.evento_id, clone.pk)
+            self.assertEqual((vaga.quantidade_preenchida, vaga.ativa, vaga.publicada), (0, False, False))
+        self.assertEqual(
+            InsumoSetor.objects.filter(setor__evento=clone, insumo_evento__evento=clone, quantidade_alocada=0).count(), 3
+        )
+        self.assertFalse(ItemChecklist.objects.filter(checklist__evento=clone, concluido=True).exists())
+        self.assertEqual(ItemChecklist.objects.filter(checklist__evento=clone).count(), 6)
+        self.assertEqual(set(clone.despesas.values_list('status', flat=True)), {'pendente'})
+        self.assertEqual(set(clone.tarefas.values_list('status', flat=True)), {'pendente'})
+        # Datas mantidas sem shift_dates
+        self.assertEqual(
+            set(clone.vagas_diretas.values_list('data_inicio_trabalho', flat=True)),
+            set(origem.vagas_diretas.values_list('data_inicio_trabalho', flat=True)),
+        )
+
+        # Efeitos que os signals fariam em saves individuais
+        self.assertEqual(MetricasEmpresa.objects.get(pk=self.empresa.pk).total_vagas, 6)
+        self.assertEqual(
+            DocumentoBusca.objects.filter(tipo='vaga', objeto_id__in=[v.pk for v in result.vaga_map.values()]).count(), 3
+        )
+        self.insumo.refresh_from_db()
+        self.assertEqual(self.insumo.quantidade_alocada_eventos, 3)
+
+    def test_varias_datas_numa_chamada(self):
+        origem = self._modelo(2)
+        service = EventCloneService(usuario=self.usuario, evento_origem=origem)
+        destinos = [
+            EventCloneTarget(nome=f"Festival {d:%d/%m}", data_inicio=d, data_fim=d + timedelta(days=2))
+            for d in (date(2030, 6, 10), date(2030, 7, 10), date(2030, 8, 10))
+        ]
+        resultados = service.clone_events(destinos, options=EventCloneOptions(shift_dates=True, copy_financeiro=False))
+
+        self.assertEqual(len(resultados), 3)
+        self.assertEqual(Evento.objects.count(), 4)
+        for destino, resultado in zip(destinos, resultados):
+            evento = resultado.event
+            self.assertEqual((evento.nome, evento.data_inicio), (destino.nome, destino.data_inicio))
+            self.assertEqual(evento.setores.count(), 2)
+            self.assertEqual(evento.despesas.count(), 0)
+            deslocamento = destino.data_inicio - origem.data_inicio
+            for antiga_id, nova in resultado.vaga_map.items():
+                antiga = Vaga.objects.get(pk=antiga_id)
+                self.assertEqual(nova.data_inicio_trabalho, antiga.data_inicio_trabalho + deslocamento)
+                self.assertEqual(nova.setor_id, resultado.setor_map[antiga.setor_id].pk)
+
+    def test_sem_setores_nao_copia_insumos_de_setor(self):
+        origem = self._modelo(2)
+        service = EventCloneService(usuario=self.usuario, evento_origem=origem)
+        result = service.clone_event(
+            nome="Sem setores", data_inicio=date(2030, 9, 1), data_fim=date(2030, 9, 2),
+            options=EventCloneOptions(copy_setores=False),
+        )
+        self.assertEqual(result.event.insumos_evento.count(), 1)
+        self.assertEqual(result.counts['insumos_setor'], 0)
+        self.assertEqual(result.event.vagas_diretas.filter(setor__isnull=True).count(), 2)
@@ -0,0 +1,189 @@
+"""Exportação em fluxo (CSV/NDJSON/JSON/XLSX), escopo por empresa e modo assíncrono."""
+import csv
+import io
+import json
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from xml.etree import ElementTree
+
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app_eventos.models import (
+    Empresa,
+    EmpresaContratante,
+    Evento,
+    ExportacaoDados,
+    LocalEvento,
+    PlanoContratacao,
+    TipoEmpresa,
+    User,
+)
+from app_eventos.services.exportacao import ExportacaoInvalida, gerar_conteudo
+
+MEDIA_TEMPORARIA = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TEMPORARIA)
+class ExportacaoDadosTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_TEMPORARIA, ignore_errors=True)
+
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Exportação",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresas = [
+            EmpresaContratante.objects.create(
+                nome=f"Empresa {i}",
+                nome_fantasia=f"Empresa {i}",
+                razao_social=f"Empresa {i} LTDA",
+                cnpj=f"12.345.678/0001-{i}5",
+                email=f"exportacao{i}@empresa.com",
+                data_vencimento="2030-12-31",
+                plano_contratado=plano,
+                valor_mensal=Decimal("500.00"),
+            )
+            for i in range(2)
+        ]
+        dona = Empresa.objects.create(
+            nome="Dona do Local",
+            cnpj="98.765.432/0001-95",
+            tipo_empresa=TipoEmpresa.objects.create(nome="Buffet", descricao=""),
+            email="local@x.com",
+        )
+        local = LocalEvento.objects.create(nome="Arena", endereco="Rua B", capacidade=500, empresa_proprietaria=dona)
+        for indice, empresa in enumerate(self.empresas):
+            for n in range(3 + indice):
+                Evento.objects.create(
+                    nome=f"Show {indice}.{n}, \"especial\" <&>", data_inicio="2030-06-10", data_fim="2030-06-12",
+                    local=local, empresa_contratante=empresa,
+                )
+        self.admin = User.objects.create_superuser(username="admin-exportacao", password="teste12345", email="a@x.com")
+        self.usuario_empresa = User.objects.create_user(
+            username="gestor-exportacao", password="teste12345",
+            tipo_usuario='admin_empresa', empresa_contratante=self.empresas[0],
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def _baixar(self, resposta):
+        self.assertIsInstance(resposta, StreamingHttpResponse)
+        return b''.join(resposta.streaming_content)
+
+    def test_csv_em_fluxo_com_colunas_escolhidas(self):
+        resposta = self.client.post(
+            '/api/desktop/exportar-dados/', {'tipo': 'eventos', 'formato': 'csv', 'colunas': 'nome,local'}, format='json'
+        )
+        self.assertEqual(resposta.status_code, 200)
+        self.assertIn('attachment; filename="eventos_', resposta['Content-Disposition'])
+        linhas = list(csv.reader(io.StringIO(self._baixar(resposta).decode('utf-8'))))
+        self.assertEqual(linhas[0], ['nome', 'local'])
+        self.assertEqual(len(linhas), 8)
+        self.assertEqual(linhas[1], ['Show 0.0, "especial" <&>', 'Arena'])
+
+        invalida = self.client.post(
+            '/api/desktop/exportar-dados/', {'tipo': 'eventos', 'formato': 'csv', 'colunas': ['senha']}, format='json'
+        )
+        self.assertEqual(invalida.status_code, 400)
+
+    def test_json_mantem_formato_e_ndjson_respeita_escopo_da_empresa(self):
+        resposta = self.client.post('/api/desktop/exportar-dados/', {'tipo': 'eventos'}, format='json')
+        corpo = json.loads(self._baixar(resposta))
+        self.assertEqual(corpo['formato'], 'json')
+        self.assertEqual(len(corpo['dados']), 7)
+        self.assertEqual(set(corpo['dados'][0]), {'nome', 'data_inicio', 'data_fim', 'ativo'})
+
+        ndjson = b''.join(gerar_conteudo('eventos', self.usuario_empresa, 'ndjson', ['nome'])).decode('utf-8')
+        nomes = [json.loads(linha)['nome'] for linha in ndjson.splitlines()]
+        self.assertEqual(len(nomes), 3)
+        self.assertTrue(all(nome.startswith('Show 0.') for nome in nomes))
+
+        with self.assertRaises(ExportacaoInvalida):
+            gerar_conteudo('eventos', self.usuario_empresa, 'pdf')
+
+    def test_xlsx_valido(self):
+        conteudo = b''.join(gerar_conteudo('eventos', self.admin, 'xlsx', ['id', 'nome', 'ativo', 'data_inicio']))
+        with zipfile.ZipFile(io.BytesIO(conteudo)) as pacote:
+            self.assertIn('xl/workbook.xml', pacote.namelist())
+            planilha = ElementTree.fromstring(pacote.read('xl/worksheets/sheet1.xml'))
+        ns = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+        linhas = planilha.findall('.//s:row', ns)
+        self.assertEqual(len(linhas), 8)
+        primeira = linhas[1].findall('s:c', ns)
+        self.assertEqual(primeira[1].find('.//s:t', ns).text, 'Show 0.0, "especial" <&>')
+        self.assertEqual((primeira[2].get('t'), primeira[2].find('s:v', ns).text), ('b', '1'))
+        self.assertEqual(primeira[3].find('.//s:t', ns).text, '2030-06-10')
+
+    def test_modo_assincrono_gera_arquivo_e_libera_download(self):
+        resposta = self.client.post(
+            '/api/desktop/exportar-dados/', {'tipo': 'eventos', 'formato': 'csv', 'assincrono': True}, format='json'
+        )
+        self.assertEqual(resposta.status_code, 202)
+        token = resposta.data['token']
+        self.assertEqual(resposta.data['status'], 'pendente')
+        self.assertEqual(self.client.get(f'/api/desktop/exportacoes/{token}/download/').status_code, 409)
+
+        saida = StringIO()
+        call_command('processar_exportacoes', '--uma-vez', stdout=saida)
+        self.assertIn('concluidas=1', saida.getvalue())
+
+        situacao = self.client.get(f'/api/desktop/exportacoes/{token}/')
+        self.assertEqual((situacao.data['status'], situacao.data['total_linhas']), ('concluida', 7))
+        self.assertTrue(ExportacaoDados.objects.get(token=token).arquivo.name.startswith('exportacoes/'))
+
+        download = self.client.get(f'/api/desktop/exportacoes/{token}/download/')
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(b''.join(download.streaming_content).decode('utf-8').count('\n'), 8)
+        download.close()
+
+        # Outro usuário não enxerga a exportação
+        self.client.force_authenticate(self.usuario_empresa)
+        self.assertIn(self.client.get(f'/api/desktop/exportacoes/{token}/').status_code, (403, 404))
+
+    def test_exportacao_presa_em_processando_volta_para_a_fila(self):
+        resposta = self.client.post(
+            '/api/desktop/exportar-dados/', {'tipo': 'eventos', 'formato': 'csv', 'assincrono': True}, format='json'
+        )
+        token = resposta.data['token']
+        # Worker caiu depois de reservar: a linha ficou em 'processando'
+        ExportacaoDados.objects.filter(token=token).update(
+            status='processando', iniciado_em=timezone.now() - timedelta(hours=2)
+        )
+
+        with self.assertLogs('app_eventos.services.exportacao', 'WARNING'):
+            call_command('processar_exportacoes', '--uma-vez', stdout=StringIO())
+        self.assertEqual(ExportacaoDados.objects.get(token=token).status, 'concluida')
+
+    def test_exportacao_em_processando_recente_nao_e_reservada(self):
+        resposta = self.client.post(
+            '/api/desktop/exportar-dados/', {'tipo': 'eventos', 'formato': 'csv', 'assincrono': True}, format='json'
+        )
+        token = resposta.data['token']
+        ExportacaoDados.objects.filter(token=token).update(status='processando', iniciado_em=timezone.now())
+
+        saida = StringIO()
+        call_command('processar_exportacoes', '--uma-vez', stdout=saida)
+        self.assertIn('processadas=0', saida.getvalue())
+        self.assertEqual(ExportacaoDados.objects.get(token=token).status, 'processando')
@@ -0,0 +1,191 @@
+"""Fila de mensagens WhatsApp/SMS: enfileiramento, worker com cliente fake, retry e polling."""
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app_eventos.models import EmpresaContratante, PlanoContratacao
+from app_eventos.models_twilio import BroadcastMessage, BroadcastOutbox
+from app_eventos.services import fila_mensagens
+from app_eventos.services.fila_mensagens import (
+    ClienteTwilio,
+    ClienteTwilioFake,
+    ProcessadorFilaMensagens,
+    enfileirar_broadcast,
+    progresso_broadcast,
+)
+
+User = get_user_model()
+
+
+class FilaMensagensTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Fila",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=10,
+            max_usuarios=10,
+            max_freelancers=100,
+            max_equipamentos=10,
+            max_locais=10,
+            valor_mensal=Decimal("100.00"),
+            valor_anual=Decimal("1000.00"),
+            desconto_anual=Decimal("0.00"),
+            percentual_comissao=Decimal("5.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Fila",
+            nome_fantasia="Empresa Fila",
+            razao_social="Empresa Fila LTDA",
+            cnpj="11.222.333/0001-44",
+            email="fila@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("100.00"),
+        )
+        self.numeros = [f"+55519999000{i:02d}" for i in range(10)]
+
+    def _enfileirar(self, **kwargs):
+        return enfileirar_broadcast(
+            empresa_contratante=self.empresa,
+            campaign_name="Teste",
+            mensagens=[(n, "Nova vaga!") for n in self.numeros],
+            **kwargs,
+        )
+
+    def _processador(self, cliente):
+        return ProcessadorFilaMensagens(cliente=cliente, max_workers=4, tamanho_lote=4, rate_limits={})
+
+    def test_enfileirar_nao_envia_e_worker_drena_a_fila(self):
+        job = self._enfileirar()
+        self.assertEqual(job.total_targets, 10)
+        self.assertFalse(progresso_broadcast(job)['concluido'])
+
+        cliente = ClienteTwilioFake()
+        stats = self._processador(cliente).processar_pendentes()
+
+        self.assertEqual(stats['enviadas'], 10)
+        self.assertEqual(sorted(n for n, _b, _c in cliente.enviadas), sorted(self.numeros))
+        progresso = progresso_broadcast(job)
+        self.assertTrue(progresso['concluido'])
+        self.assertEqual(progresso['enviados'], 10)
+        self.assertEqual(BroadcastMessage.objects.filter(broadcast=job).count(), 10)
+        job.refresh_from_db()
+        self.assertEqual(job.sent, 10)
+        self.assertIsNotNone(job.completed_at)
+
+    def test_mesma_chave_de_idempotencia_nao_duplica(self):
+        primeiro = self._enfileirar(chave_job="pedido-1")
+        repetido = self._enfileirar(chave_job="pedido-1")
+        self.assertEqual(primeiro.id, repetido.id)
+        self.assertEqual(BroadcastOutbox.objects.count(), 10)
+
+    def test_falha_temporaria_reagenda_com_backoff(self):
+        self._enfileirar()
+        cliente = ClienteTwilioFake(falhas={self.numeros[0]: 1}, invalidos={self.numeros[1]})
+        stats = self._processador(cliente).processar_pendentes()
+
+        self.assertEqual(stats['enviadas'], 8)
+        self.assertEqual(stats['reagendadas'], 1)
+        self.assertEqual(stats['falhas'], 1)
+        reagendada = BroadcastOutbox.objects.get(to_address=self.numeros[0])
+        self.assertEqual((reagendada.status, reagendada.attempts), ('queued', 1))
+        self.assertGreater(reagendada.next_attempt_at, timezone.now())
+        self.assertEqual(BroadcastOutbox.objects.get(to_address=self.numeros[1]).status, 'failed')
+
+        # Após o backoff a mensagem volta a ser elegível e é enviada
+        BroadcastOutbox.objects.filter(pk=reagendada.pk).update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        self._processador(cliente).processar_pendentes()
+        self.assertEqual(BroadcastOutbox.objects.get(pk=reagendada.pk).status, 'sent')
+
+    def test_reserva_expirada_volta_para_a_fila(self):
+        self._enfileirar()
+        BroadcastOutbox.objects.update(
+            status='sending', claim_token='morto', locked_until=timezone.now() - timedelta(minutes=1)
+        )
+        stats = self._processador(ClienteTwilioFake()).processar_pendentes()
+        self.assertEqual(stats['enviadas'], 10)
+
+    @override_settings(FILA_MENSAGENS_CLIENTE='twilio')
+    def test_cliente_pelo_provedor_do_job(self):
+        producao, sandbox = ClienteTwilioFake(), ClienteTwilioFake()
+        self._enfileirar()
+        enfileirar_broadcast(
+            empresa_contratante=self.empresa, campaign_name="Vagas", mensagens=[("+5551988887777", "Vaga")],
+            provedor='sandbox',
+        )
+        with mock.patch.dict(fila_mensagens.PROVEDORES, {'twilio': lambda: producao, 'sandbox': lambda: sandbox}):
+            ProcessadorFilaMensagens(max_workers=4, rate_limits={}).processar_pendentes()
+
+        self.assertEqual(sorted(n for n, _b, _c in producao.enviadas), sorted(self.numeros))
+        self.assertEqual([n for n, _b, _c in sandbox.enviadas], ["+5551988887777"])
+
+    def test_reserva_perdida_nao_registra_envio(self):
+        self._enfileirar()
+        processador = self._processador(ClienteTwilioFake())
+        item = processador._reservar_lote()[0]
+        # Reserva expirou e outro worker reassumiu a linha
+        BroadcastOutbox.objects.filter(pk=item.pk).update(claim_token='outro-worker')
+
+        with self.assertLogs(fila_mensagens.logger, 'WARNING'):
+            self.assertFalse(processador._marcar_enviada(item, 'SM1', 'sms'))
+        self.assertFalse(BroadcastMessage.objects.exists())
+        self.assertEqual(BroadcastOutbox.objects.get(pk=item.pk).status, 'sending')
+
+    @override_settings(TWILIO_ACCOUNT_SID='', TWILIO_AUTH_TOKEN='')
+    def test_twilio_nao_configurado_falha_definitivamente(self):
+        self._enfileirar()
+        with self.assertLogs(fila_mensagens.logger, 'ERROR'):
+            stats = self._processador(ClienteTwilio()).processar_pendentes()
+        self.assertEqual((stats['falhas'], stats['reagendadas']), (10, 0))
+
+    def test_endpoint_de_progresso_restrito_a_empresa(self):
+        job = self._enfileirar()
+        usuario = User.objects.create_user(
+            username="admin@fila.com",
+            email="admin@fila.com",
+            password="teste12345",
+            tipo_usuario="admin_empresa",
+            empresa_contratante=self.empresa,
+        )
+        outro = User.objects.create_user(
+            username="outro@fila.com", email="outro@fila.com", password="teste12345",
+        )
+        url = reverse('dashboard_empresa:status_notificacao_job', args=[job.id])
+
+        self.client.force_login(outro)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(usuario)
+        resposta = self.client.get(url)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.json()['pendentes'], 10)
+
+    def test_broadcast_mantem_contadores_do_envio_sincrono(self):
+        usuario = User.objects.create_user(
+            username="admin@fila.com",
+            email="admin@fila.com",
+            password="teste12345",
+            tipo_usuario="admin_empresa",
+            empresa_contratante=self.empresa,
+        )
+        cliente = APIClient()
+        cliente.force_authenticate(usuario)
+        resposta = cliente.post(
+            reverse('twilio:broadcast'),
+            {'campaign_name': 'Teste', 'body': 'Nova vaga!', 'targets': self.numeros},
+            format='json',
+        )
+        self.assertEqual(resposta.status_code, 202)
+        stats = resposta.json()['stats']
+        self.assertEqual((stats['total'], stats['sent'], stats['failed']), (10, 0, 0))
+        self.assertEqual((stats['pendentes'], stats['concluido']), (10, False))
@@ -0,0 +1,211 @@
+"""Coordenadas por CEP/cidade, índice geohash (raio e K mais próximos), feed com raio_km e matching por distância."""
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from app_eventos.models import (
+    Empresa,
+    EmpresaContratante,
+    Evento,
+    Freelance,
+    FreelancerFuncao,
+    Funcao,
+    LocalEvento,
+    PlanoContratacao,
+    PontoOperacao,
+    SetorEvento,
+    TipoEmpresa,
+    TipoFuncao,
+    Vaga,
+)
+from app_eventos.services.geo import (
+    _proximo_prefixo,
+    codificar_geohash,
+    distancia_km,
+    filtrar_vagas_no_raio,
+    freelancers_mais_proximos,
+    lado_celula_km,
+    precisao_para_raio,
+)
+from app_eventos.services.matching_service import MatchingService
+
+User = get_user_model()
+
+PORTO_ALEGRE = (-30.0346, -51.2177)
+
+
+class GeoTest(APITestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Geo",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Geo",
+            nome_fantasia="Empresa Geo",
+            razao_social="Empresa Geo LTDA",
+            cnpj="12.345.678/0001-70",
+            email="geo@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        self.garcom = Funcao.objects.create(
+            nome="Garçom", tipo_funcao=TipoFuncao.objects.create(nome="Salão"), ativo=True
+        )
+        self.local = LocalEvento.objects.create(
+            nome="Arena Sul",
+            endereco="Av. Principal, 100 - Canoas/RS",
+            capacidade=500,
+            empresa_proprietaria=Empresa.objects.create(
+                nome="Produtora",
+                cnpj="98.765.432/0001-70",
+                tipo_empresa=TipoEmpresa.objects.create(nome="Buffet", descricao=""),
+                email="produtora@x.com",
+            ),
+        )
+        evento = Evento.objects.create(
+            nome="Festival", data_inicio="2030-06-10", data_fim="2030-06-12",
+            local=self.local, empresa_contratante=self.empresa,
+        )
+        self.ponto = PontoOperacao.objects.create(
+            empresa_contratante=self.empresa, nome="Restaurante Centro", endereco="Rua A",
+            cep="90010-000", cidade="Porto Alegre", uf="RS",
+        )
+        agora = timezone.now()
+        comum = dict(
+            empresa_contratante=self.empresa, funcao=self.garcom, quantidade=1, remuneracao=Decimal("120.00"),
+            descricao="Atendimento", data_limite_candidatura=agora + timedelta(days=2),
+            data_inicio_trabalho=agora + timedelta(days=3), publicada=True,
+        )
+        self.vaga_canoas = Vaga.objects.create(
+            setor=SetorEvento.objects.create(nome="Bar", evento=evento), evento=evento,
+            titulo="Garçom festival", **comum
+        )
+        self.vaga_poa = Vaga.objects.create(ponto_operacao=self.ponto, titulo="Garçom salão", **comum)
+
+        self.freelancers = {}
+        for cidade in ["São Leopoldo", "Canoas", "Novo Hamburgo", "Caxias do Sul", "Pelotas"]:
+            usuario = User.objects.create_user(
+                username=f"{cidade}@geo.com", password="teste12345", tipo_usuario="freelancer"
+            )
+            self.freelancers[cidade] = Freelance.objects.create(
+                usuario=usuario, nome_completo=f"Freela {cidade}", cidade=cidade, uf="RS", cadastro_completo=True,
+            )
+        self.user = self.freelancers["São Leopoldo"].usuario
+        FreelancerFuncao.objects.create(
+            freelancer=self.freelancers["São Leopoldo"], funcao=self.garcom, nivel="iniciante", ativo=True
+        )
+
+    def test_geohash_e_distancia(self):
+        self.assertEqual(codificar_geohash(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertAlmostEqual(distancia_km(*PORTO_ALEGRE, -29.9177, -51.1839), 13.4, delta=0.5)
+        self.assertEqual(_proximo_prefixo("6gz"), "6h")
+        self.assertIsNone(_proximo_prefixo("zz"))
+        # A célula escolhida é a menor que ainda cobre o raio
+        precisao = precisao_para_raio(20, PORTO_ALEGRE[0])
+        self.assertGreaterEqual(lado_celula_km(precisao, PORTO_ALEGRE[0]), 20)
+        self.assertLess(lado_celula_km(precisao + 1, PORTO_ALEGRE[0]), 20)
+
+    def test_coordenadas_preenchidas_no_save(self):
+        self.ponto.refresh_from_db()
+        self.assertEqual(self.ponto.coordenadas_origem, "cep")
+        self.assertEqual(self.ponto.geohash, codificar_geohash(self.ponto.latitude, self.ponto.longitude))
+        self.local.refresh_from_db()
+        self.assertEqual(self.local.coordenadas_origem, "cidade")
+        self.assertAlmostEqual(float(self.local.latitude), -29.9177, places=3)
+
+        freelancer = self.freelancers["Pelotas"]
+        freelancer.cidade = "Canoas"
+        freelancer.save(update_fields=["cidade"])
+        freelancer.refresh_from_db()
+        self.assertEqual(freelancer.geohash, self.freelancers["Canoas"].geohash)
+
+        # Coordenadas informadas não são sobrescritas pela tabela
+        freelancer.latitude, freelancer.longitude, freelancer.coordenadas_origem = (
+            Decimal("-30.1"), Decimal("-51.3"), "manual"
+        )
+        freelancer.save()
+        freelancer.cidade = "Pelotas"
+        freelancer.save()
+        freelancer.refresh_from_db()
+        self.assertEqual(freelancer.latitude, Decimal("-30.1"))
+
+        freelancer.cidade = "Cidade Desconhecida"
+        freelancer.coordenadas_origem = ""
+        freelancer.latitude = None
+        freelancer.save()
+        freelancer.refresh_from_db()
+        self.assertEqual((freelancer.latitude, freelancer.geohash), (None, ""))
+
+    def test_vagas_no_raio(self):
+        vagas = Vaga.objects.all()
+        self.assertEqual(list(filtrar_vagas_no_raio(vagas, *PORTO_ALEGRE, 5)), [self.vaga_poa])
+        self.assertEqual(set(filtrar_vagas_no_raio(vagas, *PORTO_ALEGRE, 20)), {self.vaga_poa, self.vaga_canoas})
+        self.assertEqual(list(filtrar_vagas_no_raio(vagas, -31.7654, -52.3376, 50)), [])
+
+    def test_freelancers_mais_proximos(self):
+        todos = sorted(
+            (distancia_km(*PORTO_ALEGRE, f.latitude, f.longitude), f) for f in Freelance.objects.all()
+        )
+        for k in (1, 3, 5):
+            resultado = freelancers_mais_proximos(*PORTO_ALEGRE, k=k)
+            self.assertEqual([f for f, _ in resultado], [f for _, f in todos[:k]])
+        self.assertEqual(
+            [f.cidade for f, _ in freelancers_mais_proximos(*PORTO_ALEGRE, k=5, raio_max_km=45)],
+            ["Canoas", "São Leopoldo", "Novo Hamburgo"],
+        )
+
+    def test_feed_filtra_por_raio(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('vaga-list')
+
+        def ids(**params):
+            resposta = self.client.get(url, params)
+            self.assertEqual(resposta.status_code, 200)
+            return {v['id'] for v in resposta.data['results']}
+
+        # Origem padrão: coordenadas do freelancer (São Leopoldo)
+        self.assertEqual(ids(raio_km=20), {self.vaga_canoas.pk})
+        self.assertEqual(ids(raio_km=40), {self.vaga_canoas.pk, self.vaga_poa.pk})
+        self.assertEqual(ids(raio_km=5, latitude=PORTO_ALEGRE[0], longitude=PORTO_ALEGRE[1]), {self.vaga_poa.pk})
+        self.assertEqual(ids(raio_km="abc"), {self.vaga_canoas.pk, self.vaga_poa.pk})
+
+    def test_matching_decai_com_distancia(self):
+        perto, longe = self.freelancers["Canoas"], self.freelancers["Pelotas"]
+        self.assertGreater(
+            MatchingService._score_localizacao(perto, self.vaga_poa),
+            MatchingService._score_localizacao(self.freelancers["Caxias do Sul"], self.vaga_poa),
+        )
+        self.assertEqual(MatchingService._score_localizacao(longe, self.vaga_poa), 10.0)
+
+        ranking = MatchingService.encontrar_freelancers_para_vaga(self.vaga_poa, limite=5)
+        self.assertEqual(ranking[0]['freelancer'], perto)
+        for item in ranking:
+            self.assertAlmostEqual(
+                item['score'], MatchingService._calcular_score_vaga_freelancer(self.vaga_poa, item['freelancer'])
+            )
+
+    def test_comando_geocodifica_existentes(self):
+        Freelance.objects.update(latitude=None, longitude=None, geohash='', coordenadas_origem='')
+        saida = StringIO()
+        call_command('geocodificar_enderecos', '--modelo', 'Freelance', stdout=saida)
+        self.assertFalse(Freelance.objects.filter(geohash='').exists())
+        self.assertIn('✅ Concluído: 5 registro(s)', saida.getvalue())
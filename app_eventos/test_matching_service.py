@@ -0,0 +1,177 @@
+"""Paridade do matching em lote com a pontuação por instância (freelancer × vaga)."""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from app_eventos.models import (
+    Candidatura,
+    Empresa,
+    EmpresaContratante,
+    Evento,
+    Freelance,
+    Funcao,
+    LocalEvento,
+    PlanoContratacao,
+    PontoOperacao,
+    SetorEvento,
+    TipoEmpresa,
+    TipoFuncao,
+    Vaga,
+)
+from app_eventos.services.matching_service import MatchingService
+
+User = get_user_model()
+
+
+class MatchingServiceLoteTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Matching",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Matching",
+            nome_fantasia="Empresa Matching",
+            razao_social="Empresa Matching LTDA",
+            cnpj="12.345.678/0001-55",
+            email="matching@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        self.ponto = PontoOperacao.objects.create(
+            empresa_contratante=self.empresa,
+            nome="Restaurante Centro",
+            endereco="Rua A, 1",
+            cidade="Porto Alegre",
+            uf="RS",
+        )
+        funcao = Funcao.objects.create(
+            nome="Garçom", tipo_funcao=TipoFuncao.objects.create(nome="Salão"), ativo=True
+        )
+        produtora = Empresa.objects.create(
+            nome="Produtora",
+            cnpj="98.765.432/0001-10",
+            tipo_empresa=TipoEmpresa.objects.create(nome="Buffet", descricao=""),
+            email="produtora@x.com",
+        )
+        evento = Evento.objects.create(
+            nome="Festival",
+            data_inicio="2030-01-10",
+            data_fim="2030-01-11",
+            local=LocalEvento.objects.create(
+                nome="Arena", endereco="Rua B", capacidade=500, empresa_proprietaria=produtora
+            ),
+            empresa_contratante=self.empresa,
+        )
+        setor = SetorEvento.objects.create(nome="Palco", evento=evento)
+        limite = timezone.now() + timedelta(days=5)
+        # Vagas pares no ponto de operação, ímpares em setor de evento
+        self.vagas = [
+            Vaga.objects.create(
+                ponto_operacao=self.ponto if i % 2 == 0 else None,
+                evento=evento if i % 2 else None,
+                setor=setor if i % 2 else None,
+                empresa_contratante=self.empresa,
+                titulo=f"Vaga {i}",
+                funcao=funcao,
+                quantidade=5,
+                remuneracao=Decimal("100.00"),
+                descricao="Descrição",
+                requisitos="Experiência em salão" if i % 2 else "",
+                experiencia_minima=6 if i == 2 else 0,
+                data_limite_candidatura=limite,
+                ativa=True,
+                publicada=True,
+            )
+            for i in range(4)
+        ]
+
+        cidades = ["Porto Alegre", "porto alegre", "Canoas", None, ""]
+        self.freelancers = []
+        for i in range(12):
+            usuario = User.objects.create_user(
+                username=f"freela{i}@test.com",
+                email=f"freela{i}@test.com",
+                password="teste12345",
+                tipo_usuario="freelancer",
+            )
+            self.freelancers.append(
+                Freelance.objects.create(
+                    usuario=usuario,
+                    nome_completo=f"Freelancer {i}",
+                    cidade=cidades[i % len(cidades)],
+                    cadastro_completo=True,
+                    score_confiabilidade=[5, 9, 2, 10][i % 4],
+                )
+            )
+
+        # Histórico variado: taxas de aprovação distintas entre os candidatos
+        for i, freelancer in enumerate(self.freelancers[:8]):
+            for j, vaga in enumerate(self.vagas[1::2]):
+                if (i + j) % 3 == 2:
+                    continue
+                Candidatura.objects.create(
+                    freelance=freelancer,
+                    vaga=vaga,
+                    status='aprovado' if (i * j) % 2 else 'rejeitado',
+                )
+
+    def _ranking_por_instancia(self, vaga, limite):
+        ja_candidatos = set(vaga.candidaturas.values_list('freelance_id', flat=True))
+        itens = [
+            {
+                'freelancer': f,
+                'score': MatchingService._calcular_score_vaga_freelancer(vaga, f),
+                'motivos': MatchingService._obter_motivos_score(f, vaga),
+            }
+            for f in Freelance.objects.order_by('id')
+            if f.id not in ja_candidatos
+        ]
+        itens.sort(key=lambda x: (x['score'], x['freelancer'].score_confiabilidade), reverse=True)
+        return itens[:limite]
+
+    def test_freelancers_para_vaga_mesmo_ranking_que_score_por_instancia(self):
+        for vaga in self.vagas:
+            esperado = self._ranking_por_instancia(vaga, limite=5)
+            obtido = MatchingService.encontrar_freelancers_para_vaga(vaga, limite=5)
+            self.assertEqual(
+                [(x['freelancer'].id, x['score'], x['motivos']) for x in obtido],
+                [(x['freelancer'].id, x['score'], x['motivos']) for x in esperado],
+            )
+
+    def test_freelancers_para_vaga_numero_fixo_de_consultas(self):
+        with self.assertNumQueries(2):
+            resultado = MatchingService.encontrar_freelancers_para_vaga(self.vagas[0], limite=3)
+        self.assertEqual(len(resultado), 3)
+
+    def test_vagas_para_freelancer_mesmo_ranking_que_score_por_instancia(self):
+        freelancer = self.freelancers[1]
+        ja_candidatadas = set(freelancer.candidaturas.values_list('vaga_id', flat=True))
+        esperado = sorted(
+            (
+                (v.id, MatchingService._calcular_score_freelancer_vaga(freelancer, v),
+                 MatchingService._obter_motivos_score(freelancer, v))
+                for v in Vaga.objects.all()
+                if v.id not in ja_candidatadas
+            ),
+            key=lambda x: x[1],
+            reverse=True,
+        )
+        with self.assertNumQueries(2):
+            obtido = MatchingService.encontrar_vagas_para_freelancer(freelancer)
+        self.assertEqual([(x['vaga'].id, x['score'], x['motivos']) for x in obtido], esperado)
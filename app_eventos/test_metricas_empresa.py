@@ -0,0 +1,197 @@
+"""Métricas materializadas por empresa: deltas dos signals e reconciliação."""
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from app_eventos.models import (
+    Candidatura,
+    ContratoFreelance,
+    Empresa,
+    EmpresaContratante,
+    Evento,
+    Freelance,
+    LocalEvento,
+    MetricasEmpresa,
+    PlanoContratacao,
+    SetorEvento,
+    TipoEmpresa,
+    Vaga,
+)
+from app_eventos.services.metricas_empresa import (
+    CAMPOS_METRICAS,
+    calcular_metricas,
+    obter_metricas,
+    reconciliar_metricas,
+)
+
+User = get_user_model()
+
+
+class MetricasEmpresaTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Métricas",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Métricas",
+            nome_fantasia="Empresa Métricas",
+            razao_social="Empresa Métricas LTDA",
+            cnpj="12.345.678/0001-88",
+            email="metricas@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        self.local = LocalEvento.objects.create(
+            nome="Arena",
+            endereco="Rua B",
+            capacidade=500,
+            empresa_proprietaria=Empresa.objects.create(
+                nome="Produtora",
+                cnpj="98.765.432/0001-12",
+                tipo_empresa=TipoEmpresa.objects.create(nome="Buffet", descricao=""),
+                email="produtora@x.com",
+            ),
+        )
+        self.evento = self._criar_evento("Festival")
+        self.setor = SetorEvento.objects.create(nome="Palco", evento=self.evento)
+        self.vaga = self._criar_vaga(quantidade=3)
+        self.freelancers = [
+            Freelance.objects.create(
+                usuario=User.objects.create_user(
+                    username=f"metricas{i}@test.com",
+                    email=f"metricas{i}@test.com",
+                    password="teste12345",
+                    tipo_usuario="freelancer",
+                ),
+                nome_completo=f"Freelancer {i}",
+                cadastro_completo=True,
+            )
+            for i in range(3)
+        ]
+        Candidatura.objects.create(freelance=self.freelancers[0], vaga=self.vaga)
+
+    def _criar_evento(self, nome, ativo=True):
+        return Evento.objects.create(
+            nome=nome,
+            data_inicio="2030-01-10",
+            data_fim="2030-01-11",
+            local=self.local,
+            empresa_contratante=self.empresa,
+            ativo=ativo,
+        )
+
+    def _criar_vaga(self, quantidade, evento=None, setor=None, ativa=True):
+        return Vaga.objects.create(
+            evento=evento or self.evento,
+            setor=setor or self.setor,
+            empresa_contratante=self.empresa,
+            titulo="Garçom",
+            quantidade=quantidade,
+            remuneracao=Decimal("100.00"),
+            descricao="Descrição",
+            ativa=ativa,
+        )
+
+    def assertMetricasConsistentes(self):
+        materializado = MetricasEmpresa.objects.get(pk=self.empresa.pk)
+        real = calcular_metricas([self.empresa.pk])[self.empresa.pk]
+        self.assertEqual({campo: getattr(materializado, campo) for campo in CAMPOS_METRICAS}, real)
+
+    def test_snapshot_criado_na_primeira_leitura(self):
+        metricas = obter_metricas(self.empresa)
+        self.assertEqual(metricas.total_eventos, 1)
+        self.assertEqual(metricas.vagas_quantidade, 3)
+        self.assertEqual(metricas.total_candidaturas, 1)
+        self.assertEqual(metricas.total_freelancers, 1)
+        with self.assertNumQueries(1):
+            obter_metricas(self.empresa)
+
+    def test_deltas_acompanham_saves_e_deletes(self):
+        obter_metricas(self.empresa)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            outro_evento = self._criar_evento("Feira", ativo=False)
+            outra_vaga = self._criar_vaga(quantidade=2, evento=outro_evento, setor=SetorEvento.objects.create(
+                nome="Bar", evento=outro_evento
+            ))
+        self.assertMetricasConsistentes()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            candidaturas = [
+                Candidatura.objects.create(freelance=self.freelancers[0], vaga=outra_vaga),
+                Candidatura.objects.create(freelance=self.freelancers[1], vaga=self.vaga),
+            ]
+        self.assertMetricasConsistentes()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            candidaturas[1].status = 'aprovado'
+            candidaturas[1].save()
+            self.vaga.ativa = False
+            self.vaga.save(update_fields=['ativa'])
+            outro_evento.ativo = True
+            outro_evento.save()
+            ContratoFreelance.objects.create(freelance=self.freelancers[1], vaga=self.vaga)
+        self.assertMetricasConsistentes()
+
+        # Delete em cascata: vaga, candidaturas e contratos do evento somem juntos
+        with self.captureOnCommitCallbacks(execute=True):
+            candidaturas[0].delete()
+            self.evento.delete()
+        self.assertMetricasConsistentes()
+        metricas = MetricasEmpresa.objects.get(pk=self.empresa.pk)
+        self.assertEqual((metricas.total_eventos, metricas.total_vagas, metricas.total_candidaturas), (1, 1, 0))
+
+    def test_aprovar_candidatura_move_contadores(self):
+        antes = obter_metricas(self.empresa)
+        candidatura = Candidatura.objects.get(vaga=self.vaga)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(candidatura.aprovar())
+
+        depois = MetricasEmpresa.objects.get(pk=self.empresa.pk)
+        self.assertEqual(depois.candidaturas_pendentes, antes.candidaturas_pendentes - 1)
+        self.assertEqual(depois.candidaturas_aprovadas, antes.candidaturas_aprovadas + 1)
+        self.assertMetricasConsistentes()
+
+    def test_deltas_so_depois_do_commit(self):
+        antes = obter_metricas(self.empresa).total_candidaturas
+        with self.captureOnCommitCallbacks() as callbacks:
+            Candidatura.objects.create(freelance=self.freelancers[1], vaga=self.vaga)
+            # Dentro da transação a linha da empresa não é tocada
+            self.assertEqual(MetricasEmpresa.objects.get(pk=self.empresa.pk).total_candidaturas, antes)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(MetricasEmpresa.objects.get(pk=self.empresa.pk).total_candidaturas, antes + 1)
+
+    def test_reconciliacao_corrige_deriva_de_update_em_massa(self):
+        obter_metricas(self.empresa)
+        # queryset.update não dispara signals
+        Candidatura.objects.filter(vaga=self.vaga).update(status='rejeitado')
+        self.assertEqual(MetricasEmpresa.objects.get(pk=self.empresa.pk).candidaturas_pendentes, 1)
+
+        divergencias = reconciliar_metricas([self.empresa.pk])
+        self.assertEqual(
+            divergencias,
+            [(self.empresa.pk, {'candidaturas_pendentes': (1, 0), 'candidaturas_rejeitadas': (0, 1)})],
+        )
+        self.assertMetricasConsistentes()
+        self.assertEqual(reconciliar_metricas([self.empresa.pk]), [])
+
+    def test_comando_cria_snapshots_ausentes(self):
+        call_command('reconciliar_metricas_empresa', stdout=StringIO())
+        self.assertMetricasConsistentes()
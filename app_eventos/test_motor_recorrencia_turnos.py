@@ -0,0 +1,122 @@
+"""Motor de recorrência: modo em lote equivalente ao dia a dia, com consultas constantes."""
+from datetime import date, time
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from app_eventos.models import EmpresaContratante, Funcao, PlanoContratacao, PontoOperacao, TipoFuncao
+from app_eventos.models_operacao_continua import (
+    RegraRecorrencia,
+    RegraRecorrenciaFuncao,
+    TurnoOperacional,
+    UnidadeOperacional,
+    VagaTurno,
+)
+from app_eventos.services.motor_recorrencia_turnos import gerar_turnos_janela
+
+INICIO = date(2030, 1, 7)  # segunda-feira
+
+
+class MotorRecorrenciaLoteTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Turnos",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Turnos",
+            nome_fantasia="Empresa Turnos",
+            razao_social="Empresa Turnos LTDA",
+            cnpj="12.345.678/0001-40",
+            email="turnos@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        tipo = TipoFuncao.objects.create(nome="Salão")
+        self.garcom = Funcao.objects.create(nome="Garçom", tipo_funcao=tipo, ativo=True)
+        self.cozinha = Funcao.objects.create(nome="Cozinha", tipo_funcao=tipo, ativo=True)
+        self.ponto = PontoOperacao.objects.create(
+            empresa_contratante=self.empresa, nome="Restaurante", endereco="Rua A", cidade="Porto Alegre", uf="RS"
+        )
+
+    def _unidade(self, nome):
+        unidade = UnidadeOperacional.objects.create(
+            empresa_contratante=self.empresa, nome=nome, tipo='operacao', ponto_operacao=self.ponto
+        )
+        almoco = RegraRecorrencia.objects.create(
+            unidade=unidade, dias_semana=[0, 1, 2, 3, 4], hora_inicio=time(11), hora_fim=time(15)
+        )
+        RegraRecorrenciaFuncao.objects.create(regra=almoco, funcao=self.garcom, quantidade=3)
+        # Mesmo intervalo em parte dos dias, com outra demanda: cai no caminho de sincronização
+        reforco = RegraRecorrencia.objects.create(
+            unidade=unidade, dias_semana=[4, 5], hora_inicio=time(11), hora_fim=time(15)
+        )
+        RegraRecorrenciaFuncao.objects.create(regra=reforco, funcao=self.garcom, quantidade=5)
+        RegraRecorrenciaFuncao.objects.create(regra=reforco, funcao=self.cozinha, quantidade=2)
+        jantar = RegraRecorrencia.objects.create(
+            unidade=unidade, dias_semana=[4, 5, 6], hora_inicio=time(18), hora_fim=time(23)
+        )
+        RegraRecorrenciaFuncao.objects.create(regra=jantar, funcao=self.cozinha, quantidade=4)
+        return unidade
+
+    def _estado(self, unidade):
+        return sorted(
+            VagaTurno.objects.filter(turno__unidade=unidade).values_list(
+                'turno__data', 'turno__hora_inicio', 'funcao_id', 'quantidade_total', 'quantidade_preenchida'
+            )
+        )
+
+    def test_lote_equivale_ao_dia_a_dia(self):
+        antiga = self._unidade("Antiga")
+        lote = self._unidade("Lote")
+
+        # Turno pré-existente com vaga parcialmente preenchida acima da nova demanda
+        for unidade in (antiga, lote):
+            turno = TurnoOperacional.objects.create(
+                unidade=unidade, data=INICIO, hora_inicio=time(11), hora_fim=time(15),
+                origem=TurnoOperacional.ORIGEM_MANUAL,
+            )
+            VagaTurno.objects.create(turno=turno, funcao=self.garcom, quantidade_total=6, quantidade_preenchida=4)
+
+        for _ in range(2):  # segunda rodada: tudo existe, só sincroniza
+            r_antiga = gerar_turnos_janela(antiga, dias_a_frente=21, data_referencia=INICIO, em_lote=False)
+            r_lote = gerar_turnos_janela(lote, dias_a_frente=21, data_referencia=INICIO)
+            self.assertEqual(r_lote, r_antiga)
+
+        self.assertEqual(self._estado(lote), self._estado(antiga))
+        self.assertEqual(
+            VagaTurno.objects.get(turno__unidade=lote, turno__data=INICIO, funcao=self.garcom).quantidade_total, 4
+        )
+
+    def test_consultas_constantes_na_janela(self):
+        unidade = self._unidade("Grande")
+        with CaptureQueriesContext(connection) as consultas:
+            r = gerar_turnos_janela(unidade, dias_a_frente=90, data_referencia=INICIO)
+        self.assertEqual(r['turnos_criados'], TurnoOperacional.objects.filter(unidade=unidade).count())
+        self.assertGreater(r['turnos_criados'], 100)
+        self.assertLess(len(consultas.captured_queries), 20)
+
+    def test_comando_todas_unidades(self):
+        unidades = [self._unidade(f"Unidade {i}") for i in range(2)]
+        saida = StringIO()
+        call_command('gerar_turnos_operacao', '--todas-unidades', '--dias', '7',
+                     '--data-inicio', INICIO.isoformat(), stdout=saida)
+        for unidade in unidades:
+            self.assertTrue(TurnoOperacional.objects.filter(unidade=unidade).exists())
+        self.assertIn('Total: turnos criados=', saida.getvalue())
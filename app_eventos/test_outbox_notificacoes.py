@@ -0,0 +1,170 @@
+"""Outbox de notificações: signals só enfileiram; o worker grava e envia em lote."""
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from app_eventos.models import (
+    Candidatura,
+    ContratoFreelance,
+    Empresa,
+    EmpresaContratante,
+    Evento,
+    Freelance,
+    LocalEvento,
+    PlanoContratacao,
+    SetorEvento,
+    TipoEmpresa,
+    Vaga,
+)
+from app_eventos.models_notificacoes import ConfiguracaoNotificacao, Notificacao, NotificacaoOutbox
+from app_eventos.services.outbox_notificacoes import ProcessadorOutboxNotificacoes
+
+User = get_user_model()
+
+
+class BackendContador(EmailBackend):
+    """locmem que conta quantas conexões foram abertas."""
+    instancias = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        BackendContador.instancias += 1
+
+
+@override_settings(EMAIL_BACKEND='app_eventos.test_outbox_notificacoes.BackendContador')
+class OutboxNotificacoesTest(TestCase):
+    def setUp(self):
+        BackendContador.instancias = 0
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Outbox",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Outbox",
+            nome_fantasia="Empresa Outbox",
+            razao_social="Empresa Outbox LTDA",
+            cnpj="12.345.678/0001-50",
+            email="outbox@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        evento = Evento.objects.create(
+            nome="Congresso",
+            data_inicio="2030-03-10",
+            data_fim="2030-03-11",
+            local=LocalEvento.objects.create(
+                nome="Centro de Eventos",
+                endereco="Rua C",
+                capacidade=300,
+                empresa_proprietaria=Empresa.objects.create(
+                    nome="Locadora",
+                    cnpj="98.765.432/0001-50",
+                    tipo_empresa=TipoEmpresa.objects.create(nome="Espaço", descricao=""),
+                    email="locadora@x.com",
+                ),
+            ),
+            empresa_contratante=self.empresa,
+        )
+        self.vaga = Vaga.objects.create(
+            setor=SetorEvento.objects.create(nome="Recepção", evento=evento),
+            evento=evento,
+            empresa_contratante=self.empresa,
+            titulo="Recepcionista",
+            quantidade=2,
+            remuneracao=Decimal("150.00"),
+            descricao="Descrição",
+        )
+        self.gestores = [
+            User.objects.create_user(
+                username=f"gestor{i}@outbox.com", email=f"gestor{i}@outbox.com", password="teste12345",
+                tipo_usuario="admin_empresa", empresa_contratante=self.empresa,
+            )
+            for i in range(4)
+        ]
+        # Um gestor desligou a notificação de nova candidatura
+        ConfiguracaoNotificacao.objects.create(usuario=self.gestores[0], email_nova_candidatura=False)
+        usuario = User.objects.create_user(
+            username="freela@outbox.com", email="freela@outbox.com", password="teste12345", tipo_usuario="freelancer"
+        )
+        self.freelancer = Freelance.objects.create(usuario=usuario, nome_completo="Freela Outbox")
+
+    def _candidatar(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Candidatura.objects.create(vaga=self.vaga, freelance=self.freelancer)
+
+    def test_save_so_enfileira_sem_custo_por_destinatario(self):
+        with CaptureQueriesContext(connection) as consultas:
+            self._candidatar()
+        sql = ' '.join(q['sql'] for q in consultas.captured_queries)
+        for tabela in ('"app_eventos_notificacao"', '"app_eventos_configuracaonotificacao"', '"app_eventos_user"'):
+            self.assertNotIn(tabela, sql)
+        self.assertEqual(list(NotificacaoOutbox.objects.values_list('evento', 'status')),
+                         [('nova_candidatura', 'pendente')])
+        self.assertFalse(Notificacao.objects.exists())
+        self.assertEqual(mail.outbox, [])
+
+    def test_worker_grava_em_lote_e_reusa_conexao_smtp(self):
+        candidatura = self._candidatar()
+        candidatura.status = 'aprovado'
+        with self.captureOnCommitCallbacks(execute=True):
+            candidatura.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            ContratoFreelance.objects.create(freelance=self.freelancer, vaga=self.vaga)
+
+        stats = ProcessadorOutboxNotificacoes().processar_pendentes()
+
+        self.assertEqual(stats, {'processados': 3, 'notificacoes': 5, 'emails': 4, 'falhas': 0})
+        self.assertEqual(Notificacao.objects.filter(tipo='nova_candidatura').count(), 3)
+        self.assertFalse(Notificacao.objects.filter(usuario=self.gestores[0]).exists())
+        self.assertEqual(
+            set(Notificacao.objects.filter(usuario=self.freelancer.usuario).values_list('tipo', flat=True)),
+            {'candidatura_aprovada', 'contrato_criado'},
+        )
+        self.assertEqual(len(mail.outbox), 4)
+        self.assertEqual(BackendContador.instancias, 1)
+        # Configurações que faltavam foram criadas com os padrões
+        self.assertEqual(ConfiguracaoNotificacao.objects.count(), 5)
+        self.assertFalse(NotificacaoOutbox.objects.exclude(status='processado').exists())
+
+    def test_consultas_do_worker_nao_crescem_com_destinatarios(self):
+        self._candidatar()
+        with CaptureQueriesContext(connection) as poucos:
+            ProcessadorOutboxNotificacoes().processar_lote()
+
+        for i in range(20):
+            User.objects.create_user(
+                username=f"extra{i}@outbox.com", password="teste12345",
+                tipo_usuario="operador_empresa", empresa_contratante=self.empresa,
+            )
+        Candidatura.objects.all().delete()  # leva junto as notificações da primeira rodada
+        self._candidatar()
+        with CaptureQueriesContext(connection) as muitos:
+            ProcessadorOutboxNotificacoes().processar_lote()
+
+        self.assertEqual(Notificacao.objects.filter(tipo='nova_candidatura').count(), 23)
+        self.assertLessEqual(len(muitos.captured_queries), len(poucos.captured_queries) + 1)
+
+    def test_comando_drena_a_fila(self):
+        self._candidatar()
+        saida = StringIO()
+        call_command('processar_notificacoes', '--uma-vez', stdout=saida)
+        self.assertIn('processados=1 notificacoes=3 emails=3 falhas=0', saida.getvalue())
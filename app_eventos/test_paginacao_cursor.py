@@ -0,0 +1,132 @@
+"""Paginação por cursor (keyset) no feed de vagas do app."""
+from datetime import timedelta
+from decimal import Decimal
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from app_eventos.models import (
+    Empresa,
+    EmpresaContratante,
+    Evento,
+    Freelance,
+    FreelancerFuncao,
+    Funcao,
+    LocalEvento,
+    PlanoContratacao,
+    SetorEvento,
+    TipoEmpresa,
+    TipoFuncao,
+    Vaga,
+)
+
+User = get_user_model()
+
+
+class PaginacaoCursorVagasTest(APITestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Cursor",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        empresa = EmpresaContratante.objects.create(
+            nome="Empresa Cursor",
+            nome_fantasia="Empresa Cursor",
+            razao_social="Empresa Cursor LTDA",
+            cnpj="12.345.678/0001-30",
+            email="cursor@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        evento = Evento.objects.create(
+            nome="Festival",
+            data_inicio="2030-01-10",
+            data_fim="2030-01-11",
+            local=LocalEvento.objects.create(
+                nome="Arena",
+                endereco="Rua B",
+                capacidade=500,
+                empresa_proprietaria=Empresa.objects.create(
+                    nome="Produtora",
+                    cnpj="98.765.432/0001-30",
+                    tipo_empresa=TipoEmpresa.objects.create(nome="Buffet", descricao=""),
+                    email="produtora@x.com",
+                ),
+            ),
+            empresa_contratante=empresa,
+        )
+        setor = SetorEvento.objects.create(nome="Palco", evento=evento)
+        funcao = Funcao.objects.create(
+            nome="Segurança", tipo_funcao=TipoFuncao.objects.create(nome="Operação"), ativo=True
+        )
+        self.user = User.objects.create_user(
+            username="freela@cursor.com", password="teste12345", tipo_usuario="freelancer"
+        )
+        FreelancerFuncao.objects.create(
+            freelancer=Freelance.objects.create(usuario=self.user, nome_completo="Freelancer Cursor"),
+            funcao=funcao,
+            nivel="iniciante",
+            ativo=True,
+        )
+        agora = timezone.now()
+        for i in range(7):
+            Vaga.objects.create(
+                setor=setor,
+                evento=evento,
+                empresa_contratante=empresa,
+                titulo=f"Vaga {i}",
+                funcao=funcao,
+                quantidade=1,
+                remuneracao=Decimal("100.00"),
+                descricao="Descrição",
+                data_limite_candidatura=agora + timedelta(hours=6),
+                data_inicio_trabalho=agora + timedelta(hours=12),
+            )
+        # Empate em data_criacao: o desempate por id é o que evita duplicar/pular itens
+        Vaga.objects.update(data_criacao=agora)
+        self.client.force_authenticate(user=self.user)
+
+    def test_percorre_todas_as_paginas_sem_duplicar_nem_pular(self):
+        url = f"{reverse('vaga-list')}?cursor=&page_size=3"
+        vistos, paginas = [], 0
+        while url:
+            with CaptureQueriesContext(connection) as consultas:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            self.assertFalse(any("COUNT(*)" in q["sql"].upper() for q in consultas.captured_queries))
+            vistos += [v["id"] for v in response.data["results"]]
+            paginas += 1
+            proxima = response.data["next"]
+            url = f"{urlsplit(proxima).path}?{urlsplit(proxima).query}" if proxima else None
+
+        self.assertEqual(paginas, 3)
+        esperado = list(Vaga.objects.order_by("-id").values_list("id", flat=True))
+        self.assertEqual(vistos, esperado)
+
+    def test_sem_cursor_mantem_paginacao_por_numero(self):
+        response = self.client.get(reverse("vaga-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 7)
+
+    def test_cursor_invalido(self):
+        response = self.client.get(f"{reverse('vaga-list')}?cursor=lixo")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,56 @@
+"""Registro de parâmetros do sistema: valores tipados, leitura sem consultas e recarga por versão."""
+from django.test import TestCase, override_settings
+
+from app_eventos.models_globais import ConfiguracaoSistema, IntegracaoGlobal, ParametroSistema
+from app_eventos.services import parametros_sistema
+from app_eventos.services.parametros_sistema import RegistroParametros, parametros
+
+
+@override_settings(PARAMETROS_SISTEMA_VERIFICACAO=3600)
+class ParametrosSistemaTest(TestCase):
+    def setUp(self):
+        parametros_sistema._registro = RegistroParametros()
+        self.addCleanup(setattr, parametros_sistema, '_registro', RegistroParametros())
+
+        self.timeout = ParametroSistema.objects.create(
+            nome='TIMEOUT_API', valor_padrao='30', valor_atual='45', tipo='integer', descricao='', categoria='API'
+        )
+        ParametroSistema.objects.create(
+            nome='TAXA_SERVICO', valor_padrao='0.1', valor_atual='abc', tipo='float', descricao='', categoria='Financeiro'
+        )
+        ConfiguracaoSistema.objects.create(chave='BACKUP_AUTOMATICO', valor='true', tipo='boolean', categoria='Backup')
+        ConfiguracaoSistema.objects.create(
+            chave='CANAIS', valor='{"sms": [1, 2], "push": true}', tipo='json', categoria='Notificações'
+        )
+        ConfiguracaoSistema.objects.create(chave='DESATIVADA', valor='x', categoria='Sistema', ativo=False)
+        IntegracaoGlobal.objects.create(nome='Twilio', descricao='', tipo='sms', url_base='https://api.twilio.com')
+
+    def test_valores_tipados_e_imutaveis(self):
+        with self.assertLogs(parametros_sistema.logger, 'WARNING'):
+            valores = parametros()
+        self.assertEqual(valores.TIMEOUT_API, 45)
+        self.assertEqual(valores.TAXA_SERVICO, 0.1)  # valor atual inválido: usa o padrão
+        self.assertIs(valores.BACKUP_AUTOMATICO, True)
+        self.assertEqual(valores.CANAIS['sms'], (1, 2))
+        self.assertNotIn('DESATIVADA', valores)
+        self.assertEqual(valores.integracoes['Twilio'].url_base, 'https://api.twilio.com')
+
+        with self.assertRaises(AttributeError):
+            valores.INEXISTENTE
+        with self.assertRaises(AttributeError):
+            valores.TIMEOUT_API = 1
+        with self.assertRaises(TypeError):
+            valores.CANAIS['push'] = False
+
+    def test_recarrega_so_quando_a_versao_muda(self):
+        with self.assertLogs(parametros_sistema.logger, 'WARNING'):
+            primeira = parametros()
+        with self.assertNumQueries(0):
+            for _ in range(100):
+                self.assertEqual(parametros().TIMEOUT_API, 45)
+        self.assertIs(parametros(), primeira)
+
+        self.timeout.valor_atual = '60'
+        self.timeout.save()
+        with self.assertLogs(parametros_sistema.logger, 'WARNING'), self.assertNumQueries(3):
+            self.assertEqual(parametros().TIMEOUT_API, 60)
@@ -0,0 +1,74 @@
+"""Perfil de consultas: N+1 com ponto de chamada, buffer de lentos e /metrics."""
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import Client, TestCase, override_settings
+from django.urls import path
+
+from app_eventos.services import perfil_consultas
+from app_eventos.services.perfil_consultas import forma_sql
+from app_eventos.views_perfil import metricas, requests_lentos
+
+User = get_user_model()
+
+
+def _lista_com_n_mais_um(request, limite):
+    nomes = [User.objects.get(pk=pk).username for pk in User.objects.values_list('pk', flat=True)[:limite]]
+    return HttpResponse(','.join(nomes))
+
+
+urlpatterns = [
+    path('usuarios/<int:limite>/', _lista_com_n_mais_um),
+    path('metrics', metricas),
+    path('metrics/lentos', requests_lentos),
+]
+
+
+@override_settings(
+    ROOT_URLCONF=__name__,
+    PERFIL_CONSULTAS_ATIVO=True,
+    PERFIL_CONSULTAS_AMOSTRAGEM=1.0,
+    PERFIL_CONSULTAS_LIMIAR_REPETICAO=3,
+    PERFIL_CONSULTAS_LENTO_MS=60000,
+    PERFIL_CONSULTAS_TOKEN='segredo',
+)
+class PerfilConsultasTest(TestCase):
+    def setUp(self):
+        perfil_consultas._registro = None
+        self.addCleanup(setattr, perfil_consultas, '_registro', None)
+        for i in range(4):
+            User.objects.create_user(username=f"perfil{i}", password="teste12345")
+
+    def test_forma_sql_colapsa_listas_in(self):
+        self.assertEqual(
+            forma_sql('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            forma_sql('SELECT *  FROM t WHERE id IN (%s, %s)'),
+        )
+
+    def test_n_mais_um_e_metricas(self):
+        with self.assertLogs(perfil_consultas.logger, 'WARNING') as logs:
+            self.assertEqual(Client().get('/usuarios/4/').status_code, 200)
+        self.assertIn('test_perfil_consultas.py', logs.output[0])  # ponto de chamada na pilha
+
+        lentos = perfil_consultas.registro().lentos
+        self.assertEqual(len(lentos), 1)
+        self.assertEqual(lentos[0]['rota'], '/usuarios/<int:limite>/')
+        self.assertEqual(lentos[0]['consultas'], 5)
+        self.assertEqual(lentos[0]['n_mais_um'][0]['vezes'], 4)
+
+        self.assertEqual(Client().get('/metrics').status_code, 403)
+        texto = Client().get('/metrics', HTTP_AUTHORIZATION='Bearer segredo').content.decode()
+        rotulos = 'rota="/usuarios/<int:limite>/",metodo="GET"'
+        self.assertIn(f'eventix_requests_total{{{rotulos},status="200"}} 1', texto)
+        self.assertIn(f'eventix_consultas_por_request_bucket{{{rotulos},le="5"}} 1', texto)
+        self.assertIn(f'eventix_n_mais_um_total{{{rotulos}}} 1', texto)
+
+        resposta = Client().get('/metrics/lentos', HTTP_AUTHORIZATION='Bearer segredo')
+        self.assertEqual(resposta.json()['lentos'][0]['caminho'], '/usuarios/4/')
+
+    @override_settings(PERFIL_CONSULTAS_AMOSTRAGEM=0)
+    def test_fora_da_amostra_so_mede_latencia(self):
+        Client().get('/usuarios/4/')
+        texto = perfil_consultas.registro().exportar_prometheus()
+        self.assertIn('eventix_request_duracao_segundos_count{rota="/usuarios/<int:limite>/",metodo="GET"} 1', texto)
+        self.assertIn('eventix_consultas_por_request_count{rota="/usuarios/<int:limite>/",metodo="GET"} 0', texto)
+        self.assertEqual(len(perfil_consultas.registro().lentos), 0)
@@ -0,0 +1,118 @@
+"""Renderização de PDFs endereçada por conteúdo: reaproveitamento por hash, fila e documentos em lote."""
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from app_eventos.models import DocumentoGerado, RenderizacaoDocumento, TemplateDocumento
+from app_eventos.services import renderizacao_pdf
+from app_eventos.services.renderizacao_pdf import (
+    calcular_hash,
+    gerar_documentos,
+    preencher_template,
+    processar_pendentes,
+    solicitar_renderizacoes,
+)
+
+User = get_user_model()
+MEDIA_TESTE = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_TESTE, RENDERIZACAO_PDF_MODO='fila')
+class RenderizacaoPdfTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_TESTE, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.usuario = User.objects.create_user(username="renderizacao", password="teste12345")
+        self.template = TemplateDocumento.objects.create(
+            nome="Termo de compromisso",
+            tipo_documento='termo_compromisso',
+            conteudo="Eu, {{ nome }}, me comprometo a trabalhar como {{funcao}} em {{ evento }}.",
+            criado_por=self.usuario,
+        )
+
+    def test_mesmas_entradas_mesmo_pdf(self):
+        parametros = {'titulo': 'Termo', 'conteudo': 'Linha 1\nLinha 2'}
+        self.assertEqual(calcular_hash('documento_gerado', parametros), calcular_hash('documento_gerado', dict(parametros)))
+        self.assertNotEqual(
+            calcular_hash('documento_gerado', parametros),
+            calcular_hash('documento_gerado', {**parametros, 'conteudo': 'Linha 1'}),
+        )
+
+        with self.assertNumQueries(3):
+            primeira, repetida, outra = solicitar_renderizacoes(
+                'documento_gerado', [parametros, dict(parametros), {**parametros, 'titulo': 'Outro'}]
+            )
+        self.assertEqual(primeira.pk, repetida.pk)
+        self.assertEqual((primeira.status, RenderizacaoDocumento.objects.count()), ('pendente', 2))
+
+        self.assertEqual(processar_pendentes(), {'processadas': 2, 'concluidas': 2, 'erros': 0})
+        primeira.refresh_from_db()
+        with default_storage.open(primeira.caminho) as arquivo:
+            conteudo = arquivo.read()
+        self.assertTrue(conteudo.startswith(b'%PDF'))
+        self.assertEqual(primeira.tamanho, len(conteudo))
+
+        # Já renderizado: reaproveita sem reprocessar
+        with mock.patch.object(renderizacao_pdf, '_renderizar') as renderizar:
+            self.assertEqual(solicitar_renderizacoes('documento_gerado', [parametros])[0].status, 'concluida')
+            self.assertEqual(processar_pendentes()['processadas'], 0)
+        renderizar.assert_not_called()
+
+    def test_erro_volta_para_fila_no_proximo_pedido(self):
+        parametros = {'titulo': 'Termo', 'conteudo': 'x'}
+        with mock.patch.dict(renderizacao_pdf.RENDERIZADORES, {'documento_gerado': (1, mock.Mock(side_effect=RuntimeError('sem fonte')))}):
+            solicitar_renderizacoes('documento_gerado', [parametros])
+            self.assertEqual(processar_pendentes()['erros'], 1)
+        self.assertEqual(RenderizacaoDocumento.objects.get().erro, 'sem fonte')
+
+        self.assertEqual(solicitar_renderizacoes('documento_gerado', [parametros])[0].status, 'pendente')
+        saida = StringIO()
+        call_command('processar_renderizacoes', '--uma-vez', '--workers', '1', stdout=saida)
+        self.assertIn('concluidas=1', saida.getvalue())
+
+    def test_processando_orfao_volta_para_fila_no_proximo_pedido(self):
+        parametros = {'titulo': 'Termo', 'conteudo': 'x'}
+        renderizacao = solicitar_renderizacoes('documento_gerado', [parametros])[0]
+        # Processo que reservou caiu antes de terminar
+        RenderizacaoDocumento.objects.filter(pk=renderizacao.pk).update(status='processando', iniciado_em=timezone.now())
+        with self.settings(RENDERIZACAO_PDF_MODO='sincrono'):
+            self.assertEqual(solicitar_renderizacoes('documento_gerado', [parametros])[0].status, 'processando')
+
+            RenderizacaoDocumento.objects.filter(pk=renderizacao.pk).update(iniciado_em=timezone.now() - timedelta(hours=1))
+            with self.assertLogs('app_eventos.services.renderizacao_pdf', 'WARNING'):
+                self.assertEqual(solicitar_renderizacoes('documento_gerado', [parametros])[0].status, 'concluida')
+
+    def test_documentos_em_lote_compartilham_pdf(self):
+        self.assertEqual(
+            preencher_template(self.template.conteudo, {'nome': 'Ana', 'funcao': 'Garçom'}),
+            "Eu, Ana, me comprometo a trabalhar como Garçom em {{ evento }}.",
+        )
+        itens = [
+            {'titulo': f'Termo - {nome}', 'variaveis': {'nome': nome, 'funcao': 'Garçom', 'evento': 'Festa'}}
+            for nome in ('Ana', 'Bia', 'Caio', 'Ana')
+        ]
+        with self.assertNumQueries(6):  # savepoint, busca e insert das renderizações, releitura, documentos, release
+            documentos = gerar_documentos(self.template, self.usuario, itens)
+        self.assertEqual(len(documentos), 4)
+        self.assertEqual(RenderizacaoDocumento.objects.count(), 3)
+        self.assertFalse(DocumentoGerado.objects.exclude(arquivo__isnull=True).exclude(arquivo='').exists())
+
+        processar_pendentes()
+        arquivos = list(DocumentoGerado.objects.order_by('pk').values_list('arquivo', flat=True))
+        self.assertTrue(all(nome.startswith('renderizacoes/') for nome in arquivos))
+        self.assertEqual(arquivos[0], arquivos[3])
+
+        # Novo lote com um termo já renderizado sai com o arquivo preenchido
+        documento = gerar_documentos(self.template, self.usuario, itens[:1])[0]
+        self.assertEqual(documento.arquivo.name, arquivos[0])
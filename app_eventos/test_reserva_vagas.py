@@ -0,0 +1,221 @@
+"""Reserva atômica de posições (Vaga / VagaTurno) sem read-modify-write em Python."""
+from datetime import date, time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app_eventos.models import (
+    Candidatura,
+    ContratoFreelance,
+    Empresa,
+    EmpresaContratante,
+    Evento,
+    Freelance,
+    Funcao,
+    LocalEvento,
+    PlanoContratacao,
+    PontoOperacao,
+    SetorEvento,
+    TipoEmpresa,
+    TipoFuncao,
+    Vaga,
+)
+from app_eventos.models_notificacoes import NotificacaoOutbox
+from app_eventos.models_operacao_continua import TurnoOperacional, UnidadeOperacional, VagaTurno
+from app_eventos.services.atribuicao_vaga_direta import atribuir_freelancer_a_vaga_direto
+
+User = get_user_model()
+
+
+class ReservaVagasTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Reserva",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Reserva",
+            nome_fantasia="Empresa Reserva",
+            razao_social="Empresa Reserva LTDA",
+            cnpj="12.345.678/0001-99",
+            email="reserva@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        self.funcao = Funcao.objects.create(
+            nome="Garçom", tipo_funcao=TipoFuncao.objects.create(nome="Salão"), ativo=True
+        )
+        evento = Evento.objects.create(
+            nome="Festival",
+            data_inicio="2030-01-10",
+            data_fim="2030-01-11",
+            local=LocalEvento.objects.create(
+                nome="Arena",
+                endereco="Rua B",
+                capacidade=500,
+                empresa_proprietaria=Empresa.objects.create(
+                    nome="Produtora",
+                    cnpj="98.765.432/0001-13",
+                    tipo_empresa=TipoEmpresa.objects.create(nome="Buffet", descricao=""),
+                    email="produtora@x.com",
+                ),
+            ),
+            empresa_contratante=self.empresa,
+        )
+        self.vaga = Vaga.objects.create(
+            evento=evento,
+            setor=SetorEvento.objects.create(nome="Palco", evento=evento),
+            empresa_contratante=self.empresa,
+            titulo="Garçom",
+            funcao=self.funcao,
+            quantidade=1,
+            remuneracao=Decimal("100.00"),
+            descricao="Descrição",
+        )
+        self.freelancers = [
+            Freelance.objects.create(
+                usuario=User.objects.create_user(
+                    username=f"reserva{i}@test.com",
+                    email=f"reserva{i}@test.com",
+                    password="teste12345",
+                    tipo_usuario="freelancer",
+                ),
+                nome_completo=f"Freelancer {i}",
+                cadastro_completo=True,
+            )
+            for i in range(2)
+        ]
+
+    def test_reserva_com_instancia_desatualizada_nao_ultrapassa_limite(self):
+        # Duas "requisições" leram a vaga com 0/1 preenchida
+        a = Vaga.objects.get(pk=self.vaga.pk)
+        b = Vaga.objects.get(pk=self.vaga.pk)
+        self.assertTrue(a.reservar_preenchida())
+        self.assertFalse(b.reservar_preenchida())
+        self.vaga.refresh_from_db()
+        self.assertEqual(self.vaga.quantidade_preenchida, 1)
+
+        self.assertTrue(b.liberar_preenchida())
+        self.assertFalse(a.liberar_preenchida())
+        self.vaga.refresh_from_db()
+        self.assertEqual(self.vaga.quantidade_preenchida, 0)
+
+    def test_aprovacoes_concorrentes_so_uma_preenche(self):
+        candidaturas = [
+            Candidatura.objects.create(freelance=f, vaga=self.vaga) for f in self.freelancers
+        ]
+        # As duas candidaturas carregam a vaga antes de qualquer aprovação
+        for c in candidaturas:
+            self.assertTrue(c.pode_ser_aprovada)
+        self.assertTrue(candidaturas[0].aprovar())
+        self.assertFalse(candidaturas[1].aprovar())
+
+        candidaturas[1].refresh_from_db()
+        self.assertEqual(candidaturas[1].status, 'pendente')
+        self.assertEqual(ContratoFreelance.objects.filter(vaga=self.vaga).count(), 1)
+        self.vaga.refresh_from_db()
+        self.assertEqual(self.vaga.quantidade_preenchida, 1)
+
+    def test_aprovacao_simultanea_da_mesma_candidatura_reserva_uma_posicao(self):
+        self.vaga.quantidade = 2
+        self.vaga.save()
+        candidatura = Candidatura.objects.create(freelance=self.freelancers[0], vaga=self.vaga)
+        # Duas requisições carregaram a mesma candidatura ainda pendente
+        a = Candidatura.objects.get(pk=candidatura.pk)
+        b = Candidatura.objects.get(pk=candidatura.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(a.aprovar())
+            self.assertFalse(b.aprovar())
+
+        self.vaga.refresh_from_db()
+        self.assertEqual(self.vaga.quantidade_preenchida, 1)
+        self.assertEqual(ContratoFreelance.objects.filter(vaga=self.vaga).count(), 1)
+        self.assertEqual(NotificacaoOutbox.objects.filter(evento='status_candidatura').count(), 1)
+
+    def test_views_de_aprovacao_usam_a_reserva(self):
+        gestor = User.objects.create_user(
+            username="gestor-reserva@test.com",
+            password="teste12345",
+            tipo_usuario="admin_empresa",
+            empresa_contratante=self.empresa,
+        )
+        primeira, segunda = [Candidatura.objects.create(freelance=f, vaga=self.vaga) for f in self.freelancers]
+
+        api = APIClient()
+        api.force_authenticate(gestor)
+        url = reverse('candidatura-aprovar', args=[primeira.pk])
+        self.assertEqual(api.post(url).status_code, 200)
+        self.assertEqual(api.post(url).status_code, 409)  # já aprovada: não reserva de novo
+        self.assertTrue(ContratoFreelance.objects.filter(vaga=self.vaga, freelance=primeira.freelance).exists())
+
+        # Painel da empresa: vaga (quantidade 1) já lotada
+        self.client.force_login(gestor)
+        self.client.post(reverse('dashboard_empresa:aprovar_candidatura', args=[segunda.pk]))
+        segunda.refresh_from_db()
+        self.assertEqual(segunda.status, 'pendente')
+        self.vaga.refresh_from_db()
+        self.assertEqual(self.vaga.quantidade_preenchida, 1)
+
+    def test_vaga_completa_mantem_candidatura_pendente(self):
+        candidatura = Candidatura.objects.create(freelance=self.freelancers[0], vaga=self.vaga)
+        # A vaga lotou depois que a candidatura foi carregada
+        Vaga.objects.filter(pk=self.vaga.pk).update(quantidade_preenchida=1)
+        self.assertFalse(candidatura.aprovar())
+        candidatura.refresh_from_db()
+        self.assertEqual(candidatura.status, 'pendente')
+
+    def test_atribuicao_direta_usa_reserva(self):
+        ponto = PontoOperacao.objects.create(
+            empresa_contratante=self.empresa, nome="Restaurante", endereco="Rua A", cidade="Porto Alegre", uf="RS"
+        )
+        vaga = Vaga.objects.create(
+            ponto_operacao=ponto,
+            empresa_contratante=self.empresa,
+            titulo="Cozinha",
+            funcao=self.funcao,
+            quantidade=1,
+            remuneracao=Decimal("100.00"),
+            descricao="Descrição",
+        )
+        desatualizada = Vaga.objects.get(pk=vaga.pk)
+        atribuir_freelancer_a_vaga_direto(self.freelancers[0], vaga)
+        with self.assertRaisesMessage(ValidationError, 'limite preenchido'):
+            atribuir_freelancer_a_vaga_direto(self.freelancers[1], desatualizada)
+        self.assertEqual(ContratoFreelance.objects.filter(vaga=vaga).count(), 1)
+
+    def test_vaga_turno_reserva_e_libera(self):
+        ponto = PontoOperacao.objects.create(
+            empresa_contratante=self.empresa, nome="Bar", endereco="Rua C", cidade="Canoas", uf="RS"
+        )
+        unidade = UnidadeOperacional.objects.create(
+            empresa_contratante=self.empresa, nome="Bar", tipo='operacao', ponto_operacao=ponto
+        )
+        turno = TurnoOperacional.objects.create(
+            unidade=unidade, data=date(2030, 1, 10), hora_inicio=time(8), hora_fim=time(16)
+        )
+        vaga = VagaTurno.objects.create(turno=turno, funcao=self.funcao, quantidade_total=2)
+        outra = VagaTurno.objects.get(pk=vaga.pk)
+
+        self.assertTrue(vaga.reservar_preenchida())
+        self.assertTrue(outra.reservar_preenchida())
+        self.assertFalse(vaga.reservar_preenchida())
+        vaga.refresh_from_db()
+        self.assertEqual(vaga.quantidade_preenchida, 2)
+        self.assertTrue(vaga.liberar_preenchida())
+        self.assertEqual(VagaTurno.objects.get(pk=vaga.pk).quantidade_preenchida, 1)
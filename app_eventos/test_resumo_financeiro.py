@@ -0,0 +1,139 @@
+"""Resumo financeiro anotado (com_resumo_financeiro) × properties de Evento."""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+
+from app_eventos.models import (
+    CategoriaFinanceira,
+    DespesaEvento,
+    Empresa,
+    EmpresaContratante,
+    Evento,
+    LocalEvento,
+    PlanoContratacao,
+    ReceitaEvento,
+    TipoEmpresa,
+)
+
+CAMPOS = (
+    'total_despesas',
+    'total_receitas',
+    'saldo_financeiro',
+    'despesas_pagas',
+    'receitas_recebidas',
+    'saldo_realizado',
+    'despesas_pendentes',
+    'receitas_pendentes',
+    'despesas_atrasadas_count',
+    'receitas_atrasadas_count',
+)
+
+
+class ResumoFinanceiroEventoTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Financeiro",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Financeiro",
+            nome_fantasia="Empresa Financeiro",
+            razao_social="Empresa Financeiro LTDA",
+            cnpj="12.345.678/0001-77",
+            email="financeiro@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        local = LocalEvento.objects.create(
+            nome="Arena",
+            endereco="Rua B",
+            capacidade=500,
+            empresa_proprietaria=Empresa.objects.create(
+                nome="Produtora",
+                cnpj="98.765.432/0001-11",
+                tipo_empresa=TipoEmpresa.objects.create(nome="Buffet", descricao=""),
+                email="produtora@x.com",
+            ),
+        )
+        categoria = CategoriaFinanceira.objects.create(empresa_contratante=self.empresa, nome="Geral")
+        hoje = date.today()
+        ontem, amanha = hoje - timedelta(days=1), hoje + timedelta(days=1)
+
+        self.eventos = [
+            Evento.objects.create(
+                nome=f"Evento {i}",
+                data_inicio="2030-01-10",
+                data_fim="2030-01-11",
+                local=local,
+                empresa_contratante=self.empresa,
+            )
+            for i in range(3)
+        ]
+        # Evento 0: mais despesas que receitas; evento 1: só receitas; evento 2: vazio
+        for valor, status, vencimento in (
+            ("100.00", 'pago', ontem),
+            ("50.50", 'pendente', ontem),
+            ("20.00", 'pendente', amanha),
+            ("999.00", 'cancelado', ontem),
+        ):
+            DespesaEvento.objects.create(
+                evento=self.eventos[0],
+                categoria=categoria,
+                descricao="Despesa",
+                valor=Decimal(valor),
+                data_vencimento=vencimento,
+                data_pagamento=hoje if status == 'pago' else None,
+                status=status,
+            )
+        for evento, valor, status, vencimento in (
+            (self.eventos[0], "80.00", 'recebido', ontem),
+            (self.eventos[1], "300.00", 'recebido', ontem),
+            (self.eventos[1], "45.25", 'pendente', ontem),
+            (self.eventos[1], "10.00", 'pendente', amanha),
+        ):
+            ReceitaEvento.objects.create(
+                evento=evento,
+                categoria=categoria,
+                descricao="Receita",
+                valor=Decimal(valor),
+                data_vencimento=vencimento,
+                data_recebimento=hoje if status == 'recebido' else None,
+                status=status,
+            )
+
+    def test_anotacao_igual_as_properties(self):
+        esperado = {
+            e.id: [getattr(Evento.objects.get(pk=e.pk), campo) for campo in CAMPOS]
+            for e in self.eventos
+        }
+        with self.assertNumQueries(1):
+            obtido = {
+                e.id: [getattr(e, campo) for campo in CAMPOS]
+                for e in Evento.objects.filter(empresa_contratante=self.empresa).com_resumo_financeiro()
+            }
+        self.assertEqual(obtido, esperado)
+        self.assertEqual(obtido[self.eventos[0].id][0], Decimal("1169.50"))
+        self.assertEqual(obtido[self.eventos[0].id][8], 1)
+        self.assertEqual(obtido[self.eventos[1].id][9], 1)
+
+    def test_totais_da_empresa_calculados_no_banco(self):
+        eventos = Evento.objects.filter(empresa_contratante=self.empresa)
+        with self.assertNumQueries(1):
+            totais = eventos.totais_financeiros()
+        self.assertEqual(totais['total_despesas'], Decimal("1169.50"))
+        self.assertEqual(totais['total_receitas'], Decimal("435.25"))
+        self.assertEqual(totais['saldo_financeiro'], Decimal("-734.25"))
+        self.assertEqual(totais['saldo_realizado'], Decimal("280.00"))
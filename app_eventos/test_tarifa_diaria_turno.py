@@ -0,0 +1,161 @@
+"""Diárias por turno: ResolvedorTarifas equivale ao resolver unitário e pré-preenche a semana do fichamento."""
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app_eventos.models import (
+    ContratoFreelance,
+    DataCalendarioTarifa,
+    EmpresaContratante,
+    Freelance,
+    Funcao,
+    PlanoContratacao,
+    PontoOperacao,
+    TarifaDiariaPorFuncaoPonto,
+    TipoFuncao,
+    Vaga,
+)
+from app_eventos.models_freelancer_empresa import FreelancerPrestacaoServico
+from app_eventos.models_pagamento_freelancers import FichamentoSemanaFreelancer, LancamentoPagoDiarioFreelancer
+from app_eventos.services.tarifa_diaria_turno import ResolvedorTarifas, resolver_tarifa_diaria
+
+User = get_user_model()
+
+
+class ResolvedorTarifasTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Tarifas",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Tarifas",
+            nome_fantasia="Empresa Tarifas",
+            razao_social="Empresa Tarifas LTDA",
+            cnpj="12.345.678/0001-45",
+            email="tarifas@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        self.ponto = PontoOperacao.objects.create(
+            empresa_contratante=self.empresa, nome="Bar", endereco="Rua B", cidade="Porto Alegre", uf="RS"
+        )
+        tipo = TipoFuncao.objects.create(nome="Salão")
+        self.garcom = Funcao.objects.create(nome="Garçom", tipo_funcao=tipo, ativo=True)
+        self.barman = Funcao.objects.create(nome="Barman", tipo_funcao=tipo, ativo=True)
+        self.sem_tarifa = Funcao.objects.create(nome="Recepção", tipo_funcao=tipo, ativo=True)
+        for funcao, base in ((self.garcom, 100), (self.barman, 150)):
+            TarifaDiariaPorFuncaoPonto.objects.create(
+                empresa_contratante=self.empresa, ponto_operacao=self.ponto, funcao=funcao,
+                valor_turno_dia=Decimal(base), valor_turno_noite=Decimal(base + 20),
+                valor_noite_especial=Decimal(base + 50),
+            )
+        # Semana de 2030-03-04 (segunda) a 2030-03-10 (domingo); quarta 06/03 é véspera cadastrada
+        self.inicio, self.fim = date(2030, 3, 4), date(2030, 3, 10)
+        DataCalendarioTarifa.objects.create(empresa_contratante=self.empresa, ponto_operacao=self.ponto, data=date(2030, 3, 6))
+        DataCalendarioTarifa.objects.create(
+            empresa_contratante=self.empresa, ponto_operacao=self.ponto, data=date(2030, 3, 20), ativo=False
+        )
+
+    def test_lote_equivale_ao_resolver_unitario(self):
+        with self.assertNumQueries(2):
+            resolvedor = ResolvedorTarifas(self.empresa.pk, self.ponto.pk, self.inicio, self.fim)
+        gerador = random.Random(3)
+        funcoes = [self.garcom.pk, self.barman.pk, self.sem_tarifa.pk]
+        itens = [
+            (gerador.choice(funcoes), self.inicio + timedelta(days=gerador.randrange(7)), time(gerador.randrange(24), 30))
+            for _ in range(300)
+        ]
+        with self.assertNumQueries(0):
+            resultados = resolvedor.resolver_lote(itens)
+        for (funcao_id, data, hora), resultado in zip(itens, resultados):
+            self.assertEqual(resultado, resolver_tarifa_diaria(
+                empresa_contratante_id=self.empresa.pk, ponto_operacao_id=self.ponto.pk,
+                funcao_id=funcao_id, data=data, hora_inicio=hora,
+            ))
+
+        tipos = {dia: resolvedor.resolver(self.garcom.pk, date(2030, 3, dia), time(20))['tipo'] for dia in (4, 6, 8, 9)}
+        self.assertEqual(tipos, {4: 'noite', 6: 'noite_especial', 8: 'noite_especial', 9: 'noite_especial'})
+        self.assertEqual(resolvedor.resolver(self.garcom.pk, date(2030, 3, 6), time(10))['tipo'], 'dia')
+        # Fora da janela: consulta a data uma vez e reaproveita
+        with self.assertNumQueries(1):
+            resolvedor.resolver(self.garcom.pk, date(2030, 3, 20), time(22))
+            resolvedor.resolver(self.barman.pk, date(2030, 3, 20), time(23))
+
+    def test_endpoint_pre_preenche_semana_do_fichamento(self):
+        usuario = User.objects.create_user(username="freela-tarifa", password="teste12345", tipo_usuario="freelancer")
+        freelance = Freelance.objects.create(usuario=usuario, nome_completo="Freela Tarifa", cidade="Porto Alegre")
+        vaga = Vaga.objects.create(
+            ponto_operacao=self.ponto, empresa_contratante=self.empresa, titulo="Noites", funcao=self.garcom,
+            quantidade=2, remuneracao=Decimal("100.00"), descricao="", ativa=True, publicada=True,
+            data_limite_candidatura=timezone.make_aware(datetime(2030, 3, 1)),
+            data_inicio_trabalho=timezone.make_aware(datetime(2030, 3, 5, 19)),
+            data_fim_trabalho=timezone.make_aware(datetime(2030, 3, 7, 23)),
+        )
+        contrato = ContratoFreelance.objects.create(freelance=freelance, vaga=vaga, status='ativo')
+        # Histórico ainda não registrado: o pré-preenchimento (bulk_create, sem post_save) é quem registra
+        FreelancerPrestacaoServico.objects.all().delete()
+        fichamento = FichamentoSemanaFreelancer.objects.create(
+            empresa_contratante=self.empresa, ponto_operacao=self.ponto, data_fechamento=self.fim, dia_semana_fechamento=6
+        )
+        gestor = User.objects.create_user(
+            username="gestor-tarifas", password="teste12345", tipo_usuario='admin_empresa', empresa_contratante=self.empresa
+        )
+        client = APIClient()
+        client.force_authenticate(gestor)
+        url = f'/api/v1/pagamento-freelancer/fichamentos/{fichamento.pk}/sugerir-tarifas/'
+
+        resposta = client.post(url, {'salvar': True}, format='json')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(
+            [(item['data'], item['tipo']) for item in resposta.data['itens']],
+            [(date(2030, 3, 5), 'noite'), (date(2030, 3, 6), 'noite_especial'), (date(2030, 3, 7), 'noite')],
+        )
+        self.assertEqual(resposta.data['criados'], 3)
+        lancamentos = LancamentoPagoDiarioFreelancer.objects.filter(fichamento=fichamento).order_by('data')
+        self.assertEqual([l.valor_bruto for l in lancamentos], [Decimal('120'), Decimal('150'), Decimal('120')])
+        self.assertTrue(all(l.contrato_freelance_id == contrato.pk for l in lancamentos))
+        self.assertTrue(
+            FreelancerPrestacaoServico.objects.filter(empresa_contratante=self.empresa, freelance=freelance).exists()
+        )
+
+        # Itens explícitos; lançamento existente não é sobrescrito
+        resposta = client.post(url, {'salvar': True, 'itens': [
+            {'freelance': freelance.pk, 'funcao': self.barman.pk, 'data': '2030-03-05', 'hora_inicio': '10:00'},
+            {'freelance': freelance.pk, 'funcao': self.barman.pk, 'data': '2030-03-09', 'hora_inicio': '21:00'},
+        ]}, format='json')
+        self.assertEqual([item['valor'] for item in resposta.data['itens']], [Decimal('150'), Decimal('200')])
+        self.assertEqual(resposta.data['criados'], 1)
+
+        resposta = client.post(url, {'itens': [
+            {'freelance': freelance.pk, 'funcao': self.garcom.pk, 'data': '2030-03-12'},
+        ]}, format='json')
+        self.assertEqual(resposta.status_code, 400)
+
+        # Freelancer sem vínculo com a empresa do fichamento
+        de_fora = Freelance.objects.create(
+            usuario=User.objects.create_user(username="de-fora", password="teste12345", tipo_usuario="freelancer"),
+            nome_completo="De Fora",
+        )
+        resposta = client.post(url, {'salvar': True, 'itens': [
+            {'freelance': de_fora.pk, 'funcao': self.garcom.pk, 'data': '2030-03-05'},
+        ]}, format='json')
+        self.assertEqual(resposta.status_code, 400)
+        self.assertFalse(LancamentoPagoDiarioFreelancer.objects.filter(freelance=de_fora).exists())
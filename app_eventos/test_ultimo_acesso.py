@@ -0,0 +1,106 @@
+"""Último acesso com escrita agrupada e contexto de empresa resolvido sob demanda."""
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app_eventos.middleware import EmpresaContextMiddleware
+from app_eventos.models import EmpresaContratante, PlanoContratacao
+from app_eventos.services import ultimo_acesso
+from app_eventos.services.ultimo_acesso import RastreadorUltimoAcesso
+
+User = get_user_model()
+
+
+class UltimoAcessoTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Acesso",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Acesso",
+            nome_fantasia="Empresa Acesso",
+            razao_social="Empresa Acesso LTDA",
+            cnpj="12.345.678/0001-65",
+            email="acesso@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        self.usuarios = [
+            User.objects.create_user(
+                username=f"acesso{i}", password="teste12345", tipo_usuario="empresa", empresa_contratante=self.empresa
+            )
+            for i in range(3)
+        ]
+
+    def _updates_de_usuario(self, queries):
+        tabela = User._meta.db_table
+        return [q['sql'] for q in queries if q['sql'].startswith('UPDATE') and tabela in q['sql']]
+
+    def test_um_update_para_varios_usuarios(self):
+        rastreador = RastreadorUltimoAcesso(granularidade=300, intervalo=60)
+        agora = timezone.now()
+
+        for usuario in self.usuarios:
+            self.assertTrue(rastreador.registrar(usuario, agora))
+            # Dentro da granularidade: não anota de novo
+            self.assertFalse(rastreador.registrar(usuario, agora + timedelta(seconds=30)))
+        self.assertEqual(rastreador.descarregar_se_devido(), 0)  # intervalo ainda não passou
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(rastreador.descarregar(), 3)
+        self.assertEqual(len(self._updates_de_usuario(queries.captured_queries)), 1)
+        self.assertEqual(
+            set(User.objects.filter(pk__in=[u.pk for u in self.usuarios]).values_list('data_ultimo_acesso', flat=True)),
+            {agora},
+        )
+
+        # Passada a granularidade, volta a anotar
+        self.assertTrue(rastreador.registrar(self.usuarios[0], agora + timedelta(seconds=301)))
+
+    def test_falha_na_gravacao_mantem_pendencias(self):
+        rastreador = RastreadorUltimoAcesso(granularidade=300, intervalo=0)
+        rastreador.registrar(self.usuarios[0])
+        with mock.patch.object(ultimo_acesso.User.objects, 'filter', side_effect=RuntimeError('banco fora')), \
+                self.assertLogs(ultimo_acesso.logger, 'ERROR'):
+            self.assertEqual(rastreador.descarregar(), 0)
+        self.assertEqual(rastreador.descarregar_se_devido(), 1)
+
+    def test_middleware_nao_grava_por_request(self):
+        rastreador = RastreadorUltimoAcesso(granularidade=300, intervalo=3600)
+        middleware = EmpresaContextMiddleware(lambda request: HttpResponse())
+        usuario = self.usuarios[0]
+
+        with mock.patch.object(ultimo_acesso, '_rastreador', rastreador):
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(5):
+                    request = RequestFactory().get('/')
+                    request.user = usuario
+                    request.session = {}
+                    middleware(request)
+        self.assertEqual(len(queries.captured_queries), 0)
+        self.assertIn(usuario.pk, rastreador._pendentes)
+
+        # Contexto resolvido só quando lido
+        self.assertNotIn('empresa', vars(request.contexto_empresa))
+        self.assertEqual(request.contexto_empresa.empresa, self.empresa)
+        self.assertEqual(request.contexto_empresa.plano_limites['max_usuarios'], 100)
@@ -0,0 +1,138 @@
+"""Varredura de vencimento de documentos: avisos por marco sem repetição, expiração em lote."""
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app_eventos.models import (
+    AvisoVencimentoDocumento,
+    DocumentoFreelancerEmpresa,
+    EmpresaContratante,
+    FreelancerGlobal,
+    Notificacao,
+    PlanoContratacao,
+)
+from app_eventos.services.vencimento_documentos import avisar_vencimentos, executar_varredura
+
+User = get_user_model()
+
+
+class VencimentoDocumentosTest(TestCase):
+    def setUp(self):
+        plano = PlanoContratacao.objects.create(
+            nome="Plano Documentos",
+            tipo_plano="profissional",
+            descricao="",
+            max_eventos_mes=100,
+            max_usuarios=100,
+            max_freelancers=1000,
+            max_equipamentos=1000,
+            max_locais=100,
+            valor_mensal=Decimal("500.00"),
+            valor_anual=Decimal("5400.00"),
+            desconto_anual=Decimal("10.00"),
+            percentual_comissao=Decimal("6.00"),
+            ativo=True,
+        )
+        self.empresa = EmpresaContratante.objects.create(
+            nome="Empresa Documentos",
+            nome_fantasia="Empresa Documentos",
+            razao_social="Empresa Documentos LTDA",
+            cnpj="12.345.678/0001-35",
+            email="documentos@empresa.com",
+            data_vencimento="2030-12-31",
+            plano_contratado=plano,
+            valor_mensal=Decimal("500.00"),
+        )
+        self.agora = timezone.make_aware(timezone.datetime(2030, 3, 1, 9))
+        self.tipos = iter(dict(DocumentoFreelancerEmpresa.TIPO_DOCUMENTO_CHOICES))
+        self.freelancer = self._freelancer("docs")
+
+    def _freelancer(self, nome):
+        usuario = User.objects.create_user(
+            username=f"{nome}@test.com", email=f"{nome}@test.com", password="teste12345", tipo_usuario="freelancer"
+        )
+        return FreelancerGlobal.objects.create(usuario=usuario)
+
+    def _documento(self, dias, status='aprovado', freelancer=None):
+        return DocumentoFreelancerEmpresa.objects.create(
+            empresa_contratante=self.empresa,
+            freelancer=freelancer or self.freelancer,
+            tipo_documento=next(self.tipos),
+            arquivo="documentos/teste.pdf",
+            status=status,
+            data_vencimento=self.agora + timedelta(days=dias),
+        )
+
+    def _titulos(self):
+        return sorted(
+            Notificacao.objects.filter(usuario=self.freelancer.usuario).values_list('titulo', flat=True)
+        )
+
+    def test_um_aviso_por_marco_e_expiracao(self):
+        em_3, em_10, em_25 = self._documento(3), self._documento(10), self._documento(25)
+        self._documento(40)
+        self._documento(3, status='pendente')
+        vencido = self._documento(-1)
+
+        stats = executar_varredura(self.agora)
+        self.assertEqual(stats, {'avisos': 3, 'expirados': 1, 'notificacoes_expirados': 1})
+        self.assertEqual(self._titulos(), [
+            'Documento Expirado', 'Documento vence em 30 dias',
+            '⚠️ Documento vence em 15 dias', '🚨 URGENTE: Documento vence em 7 dias',
+        ])
+        self.assertIn(f'Doc ID: {em_3.pk}', Notificacao.objects.get(prioridade='alta', titulo__startswith='🚨').mensagem)
+        vencido.refresh_from_db()
+        self.assertEqual(vencido.status, 'expirado')
+
+        # Repetir a varredura no mesmo dia não reenvia nada
+        self.assertEqual(executar_varredura(self.agora), {'avisos': 0, 'expirados': 0, 'notificacoes_expirados': 0})
+
+        # 20 dias depois: o de 25 entra no marco de 7, o de 40 no de 30 e o de 10 (já avisado em 15) vence
+        stats = executar_varredura(self.agora + timedelta(days=20))
+        self.assertEqual(stats, {'avisos': 2, 'expirados': 2, 'notificacoes_expirados': 2})
+        self.assertEqual(
+            set(em_25.avisos_vencimento.values_list('marco', flat=True)), {30, 7}
+        )
+        self.assertEqual(set(em_10.avisos_vencimento.values_list('marco', flat=True)), {15, 0})
+
+        # Documento renovado abre um novo ciclo de avisos
+        em_3.status, em_3.data_vencimento = 'aprovado', self.agora + timedelta(days=50)
+        em_3.save()
+        self.assertEqual(avisar_vencimentos(self.agora + timedelta(days=21)), 1)
+        self.assertEqual(em_3.avisos_vencimento.count(), 3)
+
+    def test_consultas_nao_crescem_com_o_numero_de_documentos(self):
+        def consultas():
+            AvisoVencimentoDocumento.objects.all().delete()
+            with CaptureQueriesContext(connection) as contexto:
+                avisar_vencimentos(self.agora)
+            return len(contexto.captured_queries)
+
+        self._documento(5)
+        poucos = consultas()
+        for i in range(6):
+            freelancer = self._freelancer(f"docs{i}")
+            self.tipos = iter(dict(DocumentoFreelancerEmpresa.TIPO_DOCUMENTO_CHOICES))
+            for dias in (2, 12, 28):
+                self._documento(dias, freelancer=freelancer)
+        self.assertEqual(consultas(), poucos)
+        self.assertEqual(AvisoVencimentoDocumento.objects.count(), 19)
+
+        # Lotes pequenos: todos avisados, uma rodada extra por lote
+        AvisoVencimentoDocumento.objects.all().delete()
+        self.assertEqual(avisar_vencimentos(self.agora, tamanho_lote=4), 19)
+
+    def test_agendador_uma_vez(self):
+        self.agora = timezone.now()
+        self._documento(-2)
+        saida = StringIO()
+        call_command('agendador_documentos', '--uma-vez', stdout=saida)
+        self.assertIn('expirados=1', saida.getvalue())
+        self.assertFalse(DocumentoFreelancerEmpresa.objects.filter(status='aprovado').exists())
@@ -0,0 +1,117 @@
+"""Entrega de webhooks: fila pós-commit, assinatura HMAC, lotes, backoff e fila de mortos."""
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from app_eventos.models_globais import IntegracaoGlobal, WebhookGlobal
+from app_eventos.models_webhooks import EntregaWebhook
+from app_eventos.services.webhooks import ClienteWebhooks, ProcessadorWebhooks, assinar, disparar_webhook, reenviar_falhas
+
+
+class _Receptor(BaseHTTPRequestHandler):
+    def do_POST(self):
+        corpo = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.recebidas.append((dict(self.headers), corpo))
+        self.send_response(self.server.status)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class WebhooksTest(TestCase):
+    def setUp(self):
+        self.servidor = ThreadingHTTPServer(('127.0.0.1', 0), _Receptor)
+        self.servidor.recebidas = []
+        self.servidor.status = 200
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        self.addCleanup(self.servidor.server_close)
+        self.addCleanup(self.servidor.shutdown)
+
+        integracao = IntegracaoGlobal.objects.create(nome='ERP', descricao='', tipo='webhook')
+        self.webhook = WebhookGlobal.objects.create(
+            integracao=integracao,
+            evento='vaga_criada',
+            url=f'http://127.0.0.1:{self.servidor.server_port}/hooks',
+            segredo='s3gr3do',
+        )
+        self.processador = ProcessadorWebhooks(max_workers=2)
+        self.addCleanup(self.processador.cliente.fechar)
+
+    def _disparar(self, quantidade=1):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(quantidade):
+                disparar_webhook('vaga_criada', vaga_id=i)
+                disparar_webhook('evento_sem_inscritos', vaga_id=i)
+
+    def test_entrega_assinada_depois_do_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            disparar_webhook('vaga_criada', vaga_id=7)
+        self.assertFalse(EntregaWebhook.objects.exists())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.servidor.recebidas, [])
+
+        stats = self.processador.processar_pendentes()
+        self.assertEqual(stats['entregues'], 1)
+        headers, corpo = self.servidor.recebidas[0]
+        self.assertEqual(json.loads(corpo)['dados'], {'vaga_id': 7})
+        self.assertEqual(
+            headers['X-Eventix-Assinatura'], assinar('s3gr3do', headers['X-Eventix-Timestamp'], corpo)
+        )
+        entrega = EntregaWebhook.objects.get()
+        self.assertEqual((entrega.status, entrega.tentativas, entrega.status_http), ('entregue', 1, 200))
+
+    def test_agrupa_eventos_do_mesmo_webhook(self):
+        self.webhook.max_lote = 10
+        self.webhook.save()
+        self._disparar(3)
+
+        self.assertEqual(self.processador.processar_pendentes()['entregues'], 3)
+        self.assertEqual(len(self.servidor.recebidas), 1)
+        eventos = json.loads(self.servidor.recebidas[0][1])['eventos']
+        self.assertEqual([e['dados']['vaga_id'] for e in eventos], [0, 1, 2])
+
+    def test_erro_temporario_reagenda_com_backoff(self):
+        self.servidor.status = 503
+        self._disparar()
+
+        stats = self.processador.processar_pendentes()
+        self.assertEqual((stats['reagendadas'], stats['falhas']), (1, 0))
+        entrega = EntregaWebhook.objects.get()
+        self.assertEqual((entrega.status, entrega.tentativas, entrega.status_http), ('pendente', 1, 503))
+        self.assertGreater(entrega.proxima_tentativa, entrega.data_criacao)
+        # Ainda não venceu o backoff: nada a processar agora
+        self.assertEqual(self.processador.processar_pendentes()['processadas'], 0)
+
+    def test_erro_definitivo_vai_para_fila_de_mortos(self):
+        self.servidor.status = 400
+        self._disparar()
+
+        with self.assertLogs('app_eventos.services.webhooks', 'ERROR'):
+            self.assertEqual(self.processador.processar_pendentes()['falhas'], 1)
+        self.assertEqual(EntregaWebhook.objects.get().status, 'falhou')
+
+        self.servidor.status = 200
+        self.assertEqual(reenviar_falhas(), 1)
+        call_command('processar_webhooks', '--uma-vez', stdout=io.StringIO())
+        entrega = EntregaWebhook.objects.get()
+        self.assertEqual((entrega.status, entrega.tentativas), ('entregue', 1))
+
+    def test_reserva_cobre_o_pior_caso_do_lote(self):
+        processador = ProcessadorWebhooks(
+            cliente=ClienteWebhooks(concorrencia_por_host=4, timeout=10), max_workers=8, tamanho_lote=200
+        )
+        self.addCleanup(processador.cliente.fechar)
+        self._disparar(200)
+
+        antes = timezone.now()
+        processador._reservar_lote()
+        reservado_ate = EntregaWebhook.objects.values_list('reservado_ate', flat=True).first()
+        # 200 entregas lentas ao mesmo host, 4 por vez, 10s cada: 500s de envio
+        self.assertGreaterEqual((reservado_ate - antes).total_seconds(), 500)
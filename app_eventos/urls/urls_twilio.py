@@ -6,6 +6,7 @@ from app_eventos.views.views_twilio import (
     VerifyStartView,
     VerifyCheckView,
     BroadcastView,
+    BroadcastStatusView,
     TwilioStatusWebhook,
     NotificarFreelancersVagaView
 )
@@ -19,6 +20,7 @@ urlpatterns = [
     
     # Broadcast (envio em massa)
     path('broadcast/', BroadcastView.as_view(), name='broadcast'),
+    path('broadcast/<int:broadcast_id>/', BroadcastStatusView.as_view(), name='broadcast_status'),
     
     # Notificações específicas
     path('notificar-vaga/', NotificarFreelancersVagaView.as_view(), name='notificar_vaga'),
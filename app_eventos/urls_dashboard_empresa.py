@@ -59,6 +59,7 @@ urlpatterns = [
     # Notificações
     path('eventos/<int:evento_id>/notificar-freelancers/', views_dashboard_empresa.notificar_freelancers_evento, name='notificar_freelancers_evento'),
     path('notificar-vaga/<int:vaga_id>/', views_dashboard_empresa.notificar_freelancers_vaga_especifica, name='notificar_freelancers_vaga'),
+    path('notificacoes/jobs/<int:job_id>/', views_dashboard_empresa.status_notificacao_job, name='status_notificacao_job'),
     path('financeiro/', views_dashboard_empresa.financeiro_empresa, name='financeiro_empresa'),
     path(
         'pagamento-freelancer/',
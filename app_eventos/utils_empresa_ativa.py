@@ -4,8 +4,9 @@ Empresa efetiva no dashboard: utilizadores de empresa (FK) ou gestor de grupo (s
 from django.contrib import messages
 from django.shortcuts import redirect
 from django.conf import settings
+from django.utils.functional import cached_property
 
-from .models import EmpresaContratante
+from .services.cache_acesso import empresa_do_usuario, empresa_por_id
 
 SESSION_EMPRESA_GESTOR_KEY = 'empresa_contexto_gestor_id'
 
@@ -18,6 +19,14 @@ def limpar_contexto_gestor_sessao(request):
     request.session.pop(SESSION_EMPRESA_GESTOR_KEY, None)
 
 
+def _empresa_do_grupo(empresa_id, grupo_empresarial_id):
+    """Empresa ativa do grupo (via cache de tenant) ou None."""
+    empresa = empresa_por_id(empresa_id)
+    if empresa is None or not empresa.ativo or empresa.grupo_empresarial_id != grupo_empresarial_id:
+        return None
+    return empresa
+
+
 def empresa_ativa(request):
     user = getattr(request, 'user', None)
     if not user or not user.is_authenticated:
@@ -27,16 +36,14 @@ def empresa_ativa(request):
         if not eid:
             return None
         try:
-            return EmpresaContratante.objects.get(
-                pk=int(eid),
-                grupo_empresarial_id=user.grupo_empresarial_id,
-                ativo=True,
-            )
-        except (EmpresaContratante.DoesNotExist, ValueError, TypeError):
+            empresa = _empresa_do_grupo(int(eid), user.grupo_empresarial_id)
+        except (ValueError, TypeError):
+            empresa = None
+        if empresa is None:
             limpar_contexto_gestor_sessao(request)
             request.session.modified = True
-            return None
-    ec = getattr(user, 'empresa_contratante', None)
+        return empresa
+    ec = empresa_do_usuario(user)
     if ec and getattr(ec, 'ativo', True):
         return ec
     return None
@@ -103,7 +110,7 @@ def empresa_contexto_api(request):
     if not user or not user.is_authenticated:
         return None
     if user.tipo_usuario in ('admin_empresa', 'operador_empresa'):
-        ec = getattr(user, 'empresa_contratante', None)
+        ec = empresa_do_usuario(user)
         if ec and getattr(ec, 'ativo', True):
             return ec
         return None
@@ -114,12 +121,8 @@ def empresa_contexto_api(request):
         if raw is None or str(raw).strip() == '':
             return None
         try:
-            return EmpresaContratante.objects.get(
-                pk=int(str(raw).strip()),
-                grupo_empresarial_id=user.grupo_empresarial_id,
-                ativo=True,
-            )
-        except (ValueError, TypeError, EmpresaContratante.DoesNotExist):
+            return _empresa_do_grupo(int(str(raw).strip()), user.grupo_empresarial_id)
+        except (ValueError, TypeError):
             return None
     return None
 
@@ -146,3 +149,56 @@ def is_api_empresa_actor(request):
     if empresa_contexto_api(request) is None:
         return False
     return bool(getattr(user, 'is_empresa_user', False) or (_grupo_enabled() and getattr(user, 'is_gestor_grupo', False)))
+
+
+class ContextoEmpresa:
+    """
+    Empresa ativa e plano do request, resolvidos só quando alguém lê (``request.contexto_empresa``,
+    definido pelo EmpresaContextMiddleware). Requests que não usam o contexto não tocam cache nem banco.
+    """
+
+    def __init__(self, request):
+        self._request = request
+
+    @cached_property
+    def empresa(self):
+        return empresa_ativa(self._request)
+
+    def __bool__(self):
+        return self.empresa is not None
+
+    @property
+    def plano(self):
+        return self.empresa.plano_contratado if self.empresa else None
+
+    @cached_property
+    def plano_limites(self):
+        plano = self.plano
+        if not plano:
+            return {}
+        return {
+            'max_eventos_mes': plano.max_eventos_mes,
+            'max_usuarios': plano.max_usuarios,
+            'max_freelancers': plano.max_freelancers,
+            'max_equipamentos': plano.max_equipamentos,
+            'max_locais': plano.max_locais,
+        }
+
+    @cached_property
+    def plano_recursos(self):
+        plano = self.plano
+        if not plano:
+            return {}
+        return {
+            'suporte_24h': plano.suporte_24h,
+            'relatorios_avancados': plano.relatorios_avancados,
+            'integracao_api': plano.integracao_api,
+            'backup_automatico': plano.backup_automatico,
+            'ssl_certificado': plano.ssl_certificado,
+            'dominio_personalizado': plano.dominio_personalizado,
+        }
+
+    @property
+    def empresas_parceiras(self):
+        from .models import Empresa
+        return Empresa.objects.filter(ativo=True)
@@ -11,6 +11,7 @@ from django.shortcuts import get_object_or_404
 from app_eventos.models_twilio import UserContact, OtpLog, BroadcastLog, BroadcastMessage
 from app_eventos.models import EmpresaContratante, Freelance, Vaga, Evento
 from app_eventos.services.twilio_service import TwilioService
+from app_eventos.services.fila_mensagens import enfileirar_broadcast, progresso_broadcast
 
 
 class VerifyStartView(APIView):
@@ -201,48 +202,55 @@ class BroadcastView(APIView):
             except Evento.DoesNotExist:
                 pass
         
-        # Criar log de broadcast
-        broadcast_log = BroadcastLog.objects.create(
+        # Enfileirar (o worker processar_fila_mensagens faz o envio)
+        broadcast_log = enfileirar_broadcast(
             empresa_contratante=empresa,
             campaign_name=campaign_name,
-            body_template=body,
+            mensagens=[(target, body) for target in targets],
             channel_preferred=preferred_channel,
             evento=evento,
-            total_targets=len(targets),
-            created_by=request.user
+            created_by=request.user,
+            chave_job=(
+                f"broadcast:{empresa.id}:{request.headers['Idempotency-Key']}"
+                if request.headers.get('Idempotency-Key') else None
+            ),
+            body_template=body,
         )
         
-        # Enviar mensagens
-        twilio = TwilioService()
-        results = twilio.send_broadcast(targets, body, preferred_channel, evento)
-        
-        # Atualizar estatísticas
-        broadcast_log.sent = results['sent']
-        broadcast_log.delivered = results['delivered']
-        broadcast_log.failed = results['failed']
-        broadcast_log.completed_at = timezone.now()
-        broadcast_log.save()
-        
-        # Salvar mensagens individuais
-        for result in results['results']:
-            if result['success']:
-                BroadcastMessage.objects.create(
-                    broadcast=broadcast_log,
-                    to_address=result['phone'],
-                    channel_used=result['channel'],
-                    message_sid=result['sid'],
-                    status='sent'
-                )
-        
+        progresso = progresso_broadcast(broadcast_log)
         return Response({
             'success': True,
             'broadcast_id': broadcast_log.id,
             'stats': {
-                'total': results['total'],
-                'sent': results['sent'],
-                'failed': results['failed']
+                # Chaves do envio síncrono mantidas para clientes antigos (sent/failed = 0 enquanto na fila)
+                'total': progresso['total'],
+                'sent': progresso['enviados'],
+                'failed': progresso['falhas'],
+                **progresso,
             }
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class BroadcastStatusView(APIView):
+    """
+    GET /api/v1/twilio/broadcast/<id>/
+    
+    Progresso de um broadcast enfileirado
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, broadcast_id):
+        broadcast_log = get_object_or_404(BroadcastLog, id=broadcast_id)
+        if (
+            request.user.tipo_usuario != 'admin_sistema'
+            and broadcast_log.empresa_contratante_id != request.user.empresa_contratante_id
+        ):
+            return Response(
+                {'error': 'Permissão negada'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        return Response(progresso_broadcast(broadcast_log), status=status.HTTP_200_OK)
 
 
 class TwilioStatusWebhook(APIView):
@@ -14,6 +14,7 @@ from app_eventos.models import (
     Freelance, Fornecedor, SetorEvento, Equipamento, CategoriaEquipamento,
     DespesaEvento, ReceitaEvento, CategoriaFinanceira
 )
+from app_eventos.services.busca import CAMPO_RELEVANCIA, aplicar_busca, termos_busca
 
 
 def web_dashboard(request):
@@ -124,15 +125,13 @@ def web_eventos_list(request):
     elif status == 'inativos':
         eventos = eventos.filter(ativo=False)
     
-    if search:
-        eventos = eventos.filter(
-            Q(nome__icontains=search) | 
-            Q(descricao__icontains=search) |
-            Q(local__nome__icontains=search)
-        )
+    eventos = aplicar_busca(eventos, 'evento', busca=search)
+    ordem = ['-data_inicio']
+    if termos_busca(search):
+        ordem.insert(0, f'-{CAMPO_RELEVANCIA}')
     
     # Paginação
-    paginator = Paginator(eventos.order_by('-data_inicio'), 10)
+    paginator = Paginator(eventos.order_by(*ordem), 10)
     page_number = request.GET.get('page')
     eventos_page = paginator.get_page(page_number)
     
@@ -318,15 +317,13 @@ def web_vagas_list(request):
     if evento_id:
         vagas = vagas.filter(setor__evento_id=evento_id)
     
-    if search:
-        vagas = vagas.filter(
-            Q(titulo__icontains=search) | 
-            Q(descricao__icontains=search) |
-            Q(setor__nome__icontains=search)
-        )
+    vagas = aplicar_busca(vagas, 'vaga', busca=search)
+    ordem = ['-data_criacao']
+    if termos_busca(search):
+        ordem.insert(0, f'-{CAMPO_RELEVANCIA}')
     
     # Paginação
-    paginator = Paginator(vagas.select_related('setor__evento', 'funcao').order_by('-data_criacao'), 10)
+    paginator = Paginator(vagas.select_related('setor__evento', 'funcao').order_by(*ordem), 10)
     page_number = request.GET.get('page')
     vagas_page = paginator.get_page(page_number)
     
@@ -454,10 +451,7 @@ def web_financeiro_dashboard(request):
     eventos_financeiro = Evento.objects.filter(
         empresa_contratante=empresa,
         data_inicio__gte=data_inicio
-    ).annotate(
-        total_despesas=Sum('despesas__valor'),
-        total_receitas=Sum('receitas__valor')
-    ).order_by('-data_inicio')[:10]
+    ).com_resumo_financeiro().order_by('-data_inicio')[:10]
     
     # Categorias financeiras
     categorias_despesas = CategoriaFinanceira.objects.filter(
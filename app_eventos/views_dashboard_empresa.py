@@ -19,6 +19,9 @@ from .models import (
     User, GrupoPermissaoEmpresa, LocalEvento, Empresa, Funcao
 )
 from .mixins import EmpresaContratanteRequiredMixin
+from .services.agenda_freelancer import ConflitoAgenda
+from .services.busca import CAMPO_RELEVANCIA, aplicar_busca, termos_busca
+from .services.metricas_empresa import obter_metricas
 
 
 def _parse_turno_inicio_or_none(value):
@@ -264,17 +267,16 @@ def dashboard_empresa(request):
     
     empresa = request.user.empresa_contratante
     
-    # Estatísticas gerais
+    # Estatísticas gerais (snapshot materializado em MetricasEmpresa)
+    metricas = obter_metricas(empresa)
     stats = {
-        'total_eventos': Evento.objects.filter(empresa_contratante=empresa).count(),
-        'eventos_ativos': Evento.objects.filter(empresa_contratante=empresa, ativo=True).count(),
-        'total_vagas': Vaga.objects.filter(empresa_contratante=empresa).aggregate(Sum('quantidade'))['quantidade__sum'] or 0,
-        'vagas_ativas': Vaga.objects.filter(empresa_contratante=empresa, ativa=True).aggregate(Sum('quantidade'))['quantidade__sum'] or 0,
-        'total_candidaturas': Candidatura.objects.filter(vaga__empresa_contratante=empresa).count(),
-        'candidaturas_pendentes': Candidatura.objects.filter(vaga__empresa_contratante=empresa, status='pendente').count(),
-        'total_freelancers': Freelance.objects.filter(
-            candidaturas__vaga__empresa_contratante=empresa
-        ).distinct().count(),
+        'total_eventos': metricas.total_eventos,
+        'eventos_ativos': metricas.eventos_ativos,
+        'total_vagas': metricas.vagas_quantidade,
+        'vagas_ativas': metricas.vagas_ativas_quantidade,
+        'total_candidaturas': metricas.total_candidaturas,
+        'candidaturas_pendentes': metricas.candidaturas_pendentes,
+        'total_freelancers': metricas.total_freelancers,
         'total_equipamentos': Equipamento.objects.filter(empresa_contratante=empresa).count(),
         'equipamentos_ativos': Equipamento.objects.filter(empresa_contratante=empresa, ativo=True).count(),
         'total_usuarios': User.objects.filter(empresa_contratante=empresa).count(),
@@ -1094,10 +1096,15 @@ def aprovar_candidatura(request, candidatura_id):
         vaga__empresa_contratante=empresa
     )
     
-    # Aprovar candidatura
-    candidatura.status = 'aprovado'
-    candidatura.data_resposta = timezone.now()
-    candidatura.save()
+    # Aprovar candidatura (transição condicional, reserva da posição e contrato)
+    try:
+        aprovada = candidatura.aprovar(usuario_aprovador=request.user, levantar_conflito=True)
+    except ConflitoAgenda as e:
+        messages.error(request, e.messages[0])
+        return redirect('dashboard_empresa:candidaturas_empresa')
+    if not aprovada:
+        messages.error(request, 'Candidatura já respondida ou vaga sem posições disponíveis.')
+        return redirect('dashboard_empresa:candidaturas_empresa')
     
     messages.success(request, f'Candidatura de {candidatura.freelance.nome_completo} aprovada com sucesso!')
     
@@ -1147,6 +1154,8 @@ def freelancers_empresa(request):
     
     # Buscar parâmetro de filtro
     filtro = request.GET.get('filtro', 'todos')  # 'todos' ou 'candidatos'
+    search = request.GET.get('search', '')
+    cidade = request.GET.get('cidade', '')
     
     if filtro == 'candidatos':
         # Apenas freelancers que se candidataram a vagas da empresa
@@ -1163,6 +1172,11 @@ def freelancers_empresa(request):
             'funcoes__funcao'
         ).all().order_by('nome_completo')
     
+    # Busca indexada por nome, funções, habilidades e cidade
+    freelancers = aplicar_busca(freelancers, 'freelance', busca=search, cidade=cidade)
+    if termos_busca(search):
+        freelancers = freelancers.order_by(f'-{CAMPO_RELEVANCIA}', 'nome_completo')
+    
     # Buscar funções disponíveis para o filtro
     funcoes_disponiveis = Funcao.objects.filter(
         Q(empresa_contratante=empresa) | Q(empresa_contratante__isnull=True),
@@ -1182,6 +1196,8 @@ def freelancers_empresa(request):
         'funcoes_disponiveis': funcoes_disponiveis,
         'user': request.user,
         'filtro': filtro,
+        'search': search,
+        'cidade': cidade,
         'total_freelancers': freelancers.count(),
         'url_gerar_convite_publico': url_gerar_convite_publico,
     }
@@ -1312,12 +1328,16 @@ class NotificarFreelancersEventoView(View):
             return self._enviar_notificacoes_form(request, evento)
     
     def _enviar_notificacoes_ajax(self, request, evento):
-        """Envia notificações via AJAX"""
+        """
+        Enfileira as notificações via AJAX e responde na hora com o job.
+        
+        O envio é feito pelo worker ``processar_fila_mensagens``; o front acompanha
+        o progresso em ``status_url``.
+        """
         try:
-            logger.info(f"🌐 RAILWAY: Iniciando notificação AJAX para evento {evento.id}")
+            logger.info(f"🌐 Enfileirando notificação AJAX para evento {evento.id}")
             
             # Verificar se é notificação específica por função
-            import json
             funcao_especifica = None
             if request.content_type == 'application/json':
                 try:
@@ -1325,22 +1345,14 @@ class NotificarFreelancersEventoView(View):
                     funcao_especifica = data.get('funcao')
                     if funcao_especifica:
                         logger.info(f"🎯 Notificação específica para função: {funcao_especifica}")
-                except:
+                except (ValueError, AttributeError):
                     pass
             
-            # Usar serviço Twilio direto (mesmo que funciona no botão)
-            from app_eventos.services.twilio_service_sandbox import TwilioServiceSandbox
-            twilio_service = TwilioServiceSandbox()
-            logger.info("✅ Serviço Twilio direto inicializado")
-            
             # Buscar vagas ativas do evento
-            vagas = Vaga.objects.filter(evento=evento, ativa=True)
+            vagas = Vaga.objects.filter(evento=evento, ativa=True).select_related('funcao')
             if funcao_especifica:
                 # Filtrar apenas vagas da função específica
                 vagas = vagas.filter(funcao__nome=funcao_especifica)
-                logger.info(f"🎯 Filtrado para função específica: {funcao_especifica}")
-            
-            logger.info(f"📋 Encontradas {vagas.count()} vagas ativas no evento {evento.id}")
             
             if not vagas.exists():
                 logger.warning("⚠️ Nenhuma vaga ativa encontrada no evento")
@@ -1348,128 +1360,21 @@ class NotificarFreelancersEventoView(View):
                     'erro': 'Nenhuma vaga ativa encontrada neste evento'
                 })
             
-            # Agrupar vagas por função e valor para evitar SMS duplicados
-            logger.info(f"🔄 Agrupando {vagas.count()} vagas por função e valor...")
-            
-            # Agrupar vagas por função e remuneração
-            vagas_agrupadas = {}
-            for vaga in vagas:
-                if vaga.funcao:
-                    chave = f"{vaga.funcao.nome}_{vaga.remuneracao}_{vaga.get_tipo_remuneracao_display()}"
-                    logger.info(f"🔍 Vaga {vaga.id}: Função={vaga.funcao.nome}, Valor={vaga.remuneracao}, Tipo={vaga.get_tipo_remuneracao_display()}")
-                    logger.info(f"🔑 Chave: {chave}")
-                    
-                    if chave not in vagas_agrupadas:
-                        vagas_agrupadas[chave] = {
-                            'funcao': vaga.funcao,
-                            'remuneracao': vaga.remuneracao,
-                            'tipo_remuneracao': vaga.get_tipo_remuneracao_display(),
-                            'vagas': []
-                        }
-                        logger.info(f"📝 Criando novo grupo: {vaga.funcao.nome}")
-                    else:
-                        logger.info(f"➕ Adicionando ao grupo existente: {vaga.funcao.nome}")
-                    
-                    vagas_agrupadas[chave]['vagas'].append(vaga)
-            
-            logger.info(f"📊 Encontrados {len(vagas_agrupadas)} grupos únicos de função/valor")
-            
-            resultados = {}
-            total_enviados = 0
-            total_erros = 0
-            
-            # Enviar 1 SMS por grupo (função + valor)
-            for chave, grupo in vagas_agrupadas.items():
-                funcao = grupo['funcao']
-                remuneracao = grupo['remuneracao']
-                tipo_remuneracao = grupo['tipo_remuneracao']
-                vagas_grupo = grupo['vagas']
-                
-                logger.info(f"📤 Processando grupo: {funcao.nome} - R$ {remuneracao:.2f}/{tipo_remuneracao} ({len(vagas_grupo)} vagas)")
-                logger.info(f"🔍 Função do grupo: {funcao.nome} (ID: {funcao.id})")
-                
-                # Buscar freelancers para esta função
-                from app_eventos.models import Freelance
-                freelancers = Freelance.objects.filter(
-                    funcoes__funcao=funcao,
-                    notificacoes_ativas=True,
-                    telefone__isnull=False,
-                    telefone__gt=''
-                ).distinct()
-                
-                logger.info(f"👥 Encontrados {freelancers.count()} freelancers para função {funcao.nome}")
-                
-                grupo_enviados = 0
-                grupo_erros = 0
-                
-                for freelancer in freelancers:
-                    try:
-                        # Criar mensagem com link curto
-                        from app_eventos.views_links_curtos import gerar_link_curto
-                        link_curto = gerar_link_curto('vaga', vagas_grupo[0].id)  # Usar primeira vaga do grupo
-                        mensagem = f"🎉 NOVA VAGA: {funcao.nome} - R$ {remuneracao:.2f}/{tipo_remuneracao} - Eventix\n{link_curto}"
-                        logger.info(f"💬 Mensagem criada: {mensagem}")
-                        
-                        # Formatar telefone usando código do país
-                        telefone = freelancer.telefone
-                        codigo_pais = freelancer.codigo_telefonico_pais or '55'
-                        
-                        if telefone.startswith('+'):
-                            telefone_e164 = telefone
-                        else:
-                            telefone_e164 = f"+{codigo_pais}{telefone}"
-                        
-                        logger.info(f"📱 Enviando SMS para {freelancer.nome_completo} ({telefone_e164})")
-                        logger.info(f"💬 Mensagem: {mensagem}")
-                        
-                        # Enviar SMS sem timeout (como no botão teste)
-                        try:
-                            resultado = twilio_service.send_sms(telefone_e164, mensagem)
-                            
-                            logger.info(f"📊 RESULTADO SMS: {resultado}")
-                            if resultado:
-                                grupo_enviados += 1
-                                logger.info(f"✅ SMS enviado para {freelancer.nome_completo} (SID: {resultado.sid})")
-                                logger.info(f"📊 STATUS: {resultado.status}")
-                            else:
-                                grupo_erros += 1
-                                logger.error(f"❌ Falha ao enviar para {freelancer.nome_completo} - resultado None")
-                                
-                        except Exception as e:
-                            grupo_erros += 1
-                            logger.error(f"💥 ERRO ao enviar para {freelancer.nome_completo}: {str(e)}")
-                            
-                    except Exception as e:
-                        grupo_erros += 1
-                        logger.error(f"💥 Erro ao enviar para {freelancer.nome_completo}: {str(e)}")
-                
-                resultados[funcao.nome] = {
-                    'enviados': grupo_enviados,
-                    'erros': grupo_erros,
-                    'total_freelancers': freelancers.count(),
-                    'vagas_processadas': len(vagas_grupo)
-                }
-                
-                total_enviados += grupo_enviados
-                total_erros += grupo_erros
-                logger.info(f"✅ Grupo {funcao.nome} processado: {grupo_enviados} enviados, {grupo_erros} erros ({len(vagas_grupo)} vagas agrupadas)")
-            
-            logger.info(f"📊 RESULTADO FINAL: {total_enviados} enviados, {total_erros} erros")
-            logger.info(f"📊 RESULTADOS: {resultados}")
+            job, resultados = self._enfileirar_por_grupo(request, evento, vagas, funcao_especifica)
             
             response_data = {
                 'sucesso': True,
-                'total_enviados': total_enviados,
-                'total_erros': total_erros,
+                'job_id': job.id,
+                'status_url': reverse('dashboard_empresa:status_notificacao_job', args=[job.id]),
+                'total_enfileirados': job.total_targets,
                 'resultados': resultados,
-                'mensagem': f'Notificações enviadas: {total_enviados} sucessos, {total_erros} erros'
+                'mensagem': f'{job.total_targets} notificações enfileiradas para envio'
             }
-            
-            logger.info(f"📤 ENVIANDO RESPOSTA: {response_data}")
-            return JsonResponse(response_data)
+            logger.info(f"📤 Job {job.id} criado: {job.total_targets} mensagens")
+            return JsonResponse(response_data, status=202)
             
         except Exception as e:
-            logger.error(f"Erro ao enviar notificações: {str(e)}")
+            logger.error(f"Erro ao enfileirar notificações: {str(e)}")
             return JsonResponse({
                 'sucesso': False,
                 'erro': f'Erro interno: {str(e)}',
@@ -1477,47 +1382,88 @@ class NotificarFreelancersEventoView(View):
                 'total_erros': 1
             })
     
+    def _enfileirar_por_grupo(self, request, evento, vagas, funcao_especifica=None):
+        """
+        Agrupa vagas por função e valor (1 SMS por grupo, evitando duplicados)
+        e cria um único job com todas as mensagens.
+        """
+        from app_eventos.services.fila_mensagens import enfileirar_broadcast
+        from app_eventos.services.notificacao_vagas import telefone_e164_freelancer
+        from app_eventos.views_links_curtos import gerar_link_curto
+        
+        vagas_agrupadas = {}
+        for vaga in vagas:
+            if vaga.funcao:
+                chave = f"{vaga.funcao.nome}_{vaga.remuneracao}_{vaga.get_tipo_remuneracao_display()}"
+                vagas_agrupadas.setdefault(chave, {
+                    'funcao': vaga.funcao,
+                    'remuneracao': vaga.remuneracao,
+                    'tipo_remuneracao': vaga.get_tipo_remuneracao_display(),
+                    'vagas': []
+                })['vagas'].append(vaga)
+        
+        logger.info(f"📊 {len(vagas_agrupadas)} grupos únicos de função/valor")
+        
+        mensagens = []
+        resultados = {}
+        for grupo in vagas_agrupadas.values():
+            funcao = grupo['funcao']
+            link_curto = gerar_link_curto('vaga', grupo['vagas'][0].id)  # Usar primeira vaga do grupo
+            mensagem = f"🎉 NOVA VAGA: {funcao.nome} - R$ {grupo['remuneracao']:.2f}/{grupo['tipo_remuneracao']} - Eventix\n{link_curto}"
+            
+            telefones = Freelance.objects.filter(
+                funcoes__funcao=funcao,
+                notificacoes_ativas=True,
+                telefone__isnull=False,
+                telefone__gt=''
+            ).distinct().values_list('telefone', 'codigo_telefonico_pais')
+            
+            destinos = [(telefone_e164_freelancer(tel, pais), mensagem) for tel, pais in telefones]
+            mensagens.extend(destinos)
+            resultados[funcao.nome] = {
+                'enfileirados': len(destinos),
+                'total_freelancers': len(destinos),
+                'vagas_processadas': len(grupo['vagas'])
+            }
+        
+        # Mesmo Idempotency-Key reenviado pelo front não duplica o envio
+        chave_cliente = request.headers.get('Idempotency-Key')
+        job = enfileirar_broadcast(
+            empresa_contratante=evento.empresa_contratante,
+            campaign_name=(f"Vagas do evento {evento.nome}" + (f" - {funcao_especifica}" if funcao_especifica else ''))[:200],
+            mensagens=mensagens,
+            channel_preferred='sms',
+            evento=evento,
+            created_by=request.user if request.user.is_authenticated else None,
+            chave_job=f"evento:{evento.id}:{chave_cliente}" if chave_cliente else None,
+            provedor='sandbox',  # mesmo número que enviava as notificações de vagas
+        )
+        return job, resultados
+    
     def _enviar_notificacoes_form(self, request, evento):
-        """Envia notificações via formulário tradicional"""
+        """Enfileira notificações via formulário tradicional"""
         try:
-            # Usar serviço real do Twilio
-            from app_eventos.services.notificacao_vagas import NotificacaoVagasService
-            notificacao_service = NotificacaoVagasService()
-            
             # Buscar vagas ativas do evento
-            vagas = Vaga.objects.filter(evento=evento, ativa=True)
+            vagas = Vaga.objects.filter(evento=evento, ativa=True).select_related('funcao')
             
             if not vagas.exists():
                 messages.warning(request, 'Nenhuma vaga ativa encontrada neste evento.')
                 return redirect('dashboard_empresa:notificar_freelancers_evento', evento_id=evento.id)
             
-            # Enviar notificações
-            total_enviados = 0
-            total_erros = 0
+            job, _resultados = self._enfileirar_por_grupo(request, evento, vagas)
             
-            for vaga in vagas:
-                if vaga.funcao:
-                    resultado = notificacao_service.notificar_nova_vaga(vaga)
-                    
-                    if 'erro' not in resultado:
-                        total_enviados += resultado.get('enviados', 0)
-                        total_erros += resultado.get('erros', 0)
-            
-            if total_enviados > 0:
+            if job.total_targets > 0:
                 messages.success(
                     request, 
-                    f'✅ Notificações enviadas com sucesso! {total_enviados} freelancers notificados.'
+                    f'✅ {job.total_targets} notificações enfileiradas. O envio acontece em segundo plano.'
                 )
             else:
-                messages.warning(request, '⚠️ Nenhuma notificação foi enviada.')
-            
-            if total_erros > 0:
-                messages.warning(request, f'⚠️ {total_erros} notificações falharam.')
+                messages.warning(request, '⚠️ Nenhum freelancer para notificar.')
             
             return redirect('dashboard_empresa:notificar_freelancers_evento', evento_id=evento.id)
             
         except Exception as e:
-            logger.error(f"Erro ao enviar notificações: {str(e)}")
+            logger.error(f"Erro ao enfileirar notificações: {str(e)}")
             messages.error(request, f'❌ Erro ao enviar notificações: {str(e)}')
             return redirect('dashboard_empresa:notificar_freelancers_evento', evento_id=evento.id)
 
@@ -1525,28 +1471,31 @@ class NotificarFreelancersEventoView(View):
 @require_http_methods(["POST"])
 @login_required(login_url='/empresa/login/')
 def notificar_freelancers_vaga_especifica(request, vaga_id):
-    """Notifica freelancers sobre uma vaga específica"""
+    """Enfileira notificação aos freelancers sobre uma vaga específica"""
     try:
         from app_eventos.models import Vaga
         
-        vaga = get_object_or_404(Vaga, id=vaga_id)
-        
-        # Enviar notificação via Twilio real
-        from app_eventos.services.notificacao_vagas import NotificacaoVagasService
-        notificacao_service = NotificacaoVagasService()
-        resultado = notificacao_service.notificar_nova_vaga(vaga)
+        vaga = get_object_or_404(Vaga.objects.select_related('funcao', 'evento', 'setor'), id=vaga_id)
         
-        if 'erro' in resultado:
+        if not vaga.funcao:
             return JsonResponse({
-                'erro': resultado['erro']
+                'erro': 'Vaga sem função definida'
             }, status=400)
         
+        chave_cliente = request.headers.get('Idempotency-Key')
+        job = NotificacaoVagasService().enfileirar_nova_vaga(
+            vaga,
+            criado_por=request.user,
+            chave_job=f"vaga:{vaga.id}:{chave_cliente}" if chave_cliente else None,
+        )
+        
         return JsonResponse({
             'sucesso': True,
-            'enviados': resultado.get('enviados', 0),
-            'erros': resultado.get('erros', 0),
-            'mensagem': f'Notificação enviada para {resultado.get("enviados", 0)} freelancers'
-        })
+            'job_id': job.id,
+            'status_url': reverse('dashboard_empresa:status_notificacao_job', args=[job.id]),
+            'enfileirados': job.total_targets,
+            'mensagem': f'Notificação enfileirada para {job.total_targets} freelancers'
+        }, status=202)
         
     except Exception as e:
         logger.error(f"Erro ao notificar vaga específica: {str(e)}")
@@ -1555,6 +1504,19 @@ def notificar_freelancers_vaga_especifica(request, vaga_id):
         }, status=500)
 
 
+@login_required(login_url='/empresa/login/')
+def status_notificacao_job(request, job_id):
+    """Progresso de um job de notificações enfileiradas (polling do front)"""
+    from app_eventos.models_twilio import BroadcastLog
+    from app_eventos.services.fila_mensagens import progresso_broadcast
+    
+    job = get_object_or_404(BroadcastLog, id=job_id)
+    if not request.user.is_superuser and job.empresa_contratante_id != request.user.empresa_contratante_id:
+        return JsonResponse({'erro': 'Sem permissão'}, status=403)
+    
+    return JsonResponse(progresso_broadcast(job))
+
+
 @require_http_methods(["POST"])
 @login_required(login_url='/empresa/login/')
 def gerar_link_cadastro_freelancer(request):
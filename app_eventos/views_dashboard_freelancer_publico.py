@@ -11,6 +11,7 @@ from django.db import IntegrityError, transaction
 from django.core import signing
 from django.conf import settings
 from app_eventos.models import Freelance, Vaga, Candidatura, Evento, Funcao, User, EmpresaContratante, FreelancerFuncao
+from app_eventos.services.cache_respostas import resposta_condicional
 import secrets
 import logging
 
@@ -537,6 +538,7 @@ def perfil_freelancer(request):
         messages.error(request, 'Erro ao carregar perfil')
         return redirect('freelancer_publico:dashboard')
 
+@resposta_condicional('vaga_publica', chave='vaga_id', somente_anonimo=True)
 def vaga_publica(request, vaga_id):
     """Página pública da vaga (sem login)"""
     try:
@@ -558,6 +560,7 @@ def vaga_publica(request, vaga_id):
             'mensagem': 'Vaga não encontrada ou inativa'
         })
 
+@resposta_condicional('evento_publico', chave='evento_id', somente_anonimo=True)
 def evento_publico(request, evento_id):
     """Página pública do evento (sem login) com busca e status de candidaturas"""
     try:
@@ -4,7 +4,7 @@ CRUD de operação contínua no dashboard da empresa (pontos, unidades, regras,
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
@@ -28,6 +28,7 @@ from app_eventos.models_operacao_continua import (
     UnidadeOperacional,
     VagaTurno,
 )
+from app_eventos.services.agenda_freelancer import ConflitoAgenda, garantir_disponibilidade, janela_turno
 from app_eventos.services.carga_semanal_operacao import (
     agrupar_carga_para_regras,
     dias_dataclass_para_contexto,
@@ -727,20 +728,30 @@ def operacao_alocacao_nova(request):
         if form.is_valid():
             vaga = form.cleaned_data['vaga_turno']
             fl = form.cleaned_data['freelance']
-            with transaction.atomic():
-                vaga_locked = VagaTurno.objects.select_for_update().get(pk=vaga.pk)
-                if vaga_locked.turno.unidade.empresa_contratante_id != empresa.pk:
-                    form.add_error(None, 'Vaga inválida para esta empresa.')
-                elif vaga_locked.quantidade_preenchida >= vaga_locked.quantidade_total:
-                    form.add_error('vaga_turno', 'Esta vaga já está completa.')
-                elif AlocacaoTurno.objects.filter(vaga_turno_id=vaga_locked.pk, freelance_id=fl.pk).exists():
+            if vaga.turno.unidade.empresa_contratante_id != empresa.pk:
+                form.add_error(None, 'Vaga inválida para esta empresa.')
+            elif AlocacaoTurno.objects.filter(vaga_turno_id=vaga.pk, freelance_id=fl.pk).exists():
+                form.add_error('freelance', 'Este freelancer já está alocado nesta vaga.')
+            else:
+                try:
+                    with transaction.atomic():
+                        if form.cleaned_data['status'] != AlocacaoTurno.STATUS_CANCELADO:
+                            garantir_disponibilidade(fl.pk, janela_turno(vaga.turno))
+                        # Reserva atômica do lugar (UPDATE condicional, sem lock na vaga)
+                        reservou = vaga.reservar_preenchida()
+                        if reservou:
+                            form.save()
+                except ConflitoAgenda as e:
+                    form.add_error('freelance', e.messages[0])
+                except IntegrityError:
+                    # Alocação duplicada criada em paralelo; a reserva foi desfeita no rollback
                     form.add_error('freelance', 'Este freelancer já está alocado nesta vaga.')
                 else:
-                    aloc = form.save(commit=False)
-                    aloc.save()
-                    vaga_locked.incrementar_preenchida()
-                    messages.success(request, 'Alocação registada.')
-                    return redirect('dashboard_empresa:operacao_alocacoes_lista')
+                    if not reservou:
+                        form.add_error('vaga_turno', 'Esta vaga já está completa.')
+                    else:
+                        messages.success(request, 'Alocação registada.')
+                        return redirect('dashboard_empresa:operacao_alocacoes_lista')
     else:
         form = AlocacaoTurnoNovaForm(empresa=empresa, initial=initial)
     return render(
@@ -770,9 +781,18 @@ def operacao_alocacao_editar(request, pk):
     if request.method == 'POST':
         form = AlocacaoTurnoEditForm(request.POST, instance=obj)
         if form.is_valid():
-            form.save()
-            messages.success(request, 'Alocação atualizada.')
-            return redirect('dashboard_empresa:operacao_alocacoes_lista')
+            try:
+                with transaction.atomic():
+                    if obj.status != AlocacaoTurno.STATUS_CANCELADO:
+                        garantir_disponibilidade(
+                            obj.freelance_id, janela_turno(obj.vaga_turno.turno), ignorar=('alocacao', obj.pk)
+                        )
+                    form.save()
+            except ConflitoAgenda as e:
+                form.add_error('status', e.messages[0])
+            else:
+                messages.success(request, 'Alocação atualizada.')
+                return redirect('dashboard_empresa:operacao_alocacoes_lista')
     else:
         form = AlocacaoTurnoEditForm(instance=obj)
     return render(
@@ -802,10 +822,9 @@ def operacao_alocacao_excluir(request, pk):
     )
     if request.method == 'POST':
         with transaction.atomic():
-            vaga = VagaTurno.objects.select_for_update().get(pk=obj.vaga_turno_id)
             nome = obj.freelance.nome_completo
             obj.delete()
-            vaga.decrementar_preenchida()
+            obj.vaga_turno.liberar_preenchida()
         messages.success(request, f'Alocação de «{nome}» removida.')
         return redirect('dashboard_empresa:operacao_alocacoes_lista')
     return render(
@@ -0,0 +1,36 @@
+"""
+Métricas do perfil de consultas (Prometheus) e requests lentos recentes
+"""
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+
+from .services.perfil_consultas import registro
+
+
+def _autorizado(request):
+    """Staff logado ou ``Authorization: Bearer <PERFIL_CONSULTAS_TOKEN>`` (para o coletor)."""
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = getattr(settings, 'PERFIL_CONSULTAS_TOKEN', '')
+    cabecalho = request.headers.get('Authorization', '')
+    return bool(token) and hmac.compare_digest(cabecalho, f'Bearer {token}')
+
+
+def metricas(request):
+    """
+    Histogramas por rota no formato texto do Prometheus (/metrics)
+    """
+    if not _autorizado(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registro().exportar_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def requests_lentos(request):
+    """
+    Buffer circular dos requests lentos ou com N+1, do mais recente ao mais antigo (/metrics/lentos)
+    """
+    if not _autorizado(request):
+        return HttpResponseForbidden()
+    return JsonResponse({'lentos': list(reversed(registro().lentos))})
@@ -106,6 +106,7 @@ AUTHENTICATION_BACKENDS = [
 
 # ========== MIDDLEWARE ==========
 MIDDLEWARE = [
+    "app_eventos.middleware_perfil.PerfilConsultasMiddleware",  # só entra na cadeia com PERFIL_CONSULTAS_ATIVO
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # <- antes de CommonMiddleware
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -247,15 +248,76 @@ except Exception:  # pragma: no cover
 # Quando False, fluxo gestor_grupo e cabeçalho X-Empresa-Context-Id ficam inativos.
 MULTI_EMPRESA_GRUPO_ENABLED = os.getenv("MULTI_EMPRESA_GRUPO_ENABLED", "False").lower() == "true"
 
+# Cache (framework do Django). Por padrão LocMem por processo; com CACHE_ACESSO_DIR o cache de
+# tenant/permissões passa a FileBasedCache, compartilhado entre os workers do mesmo host
+# (invalidação por signals vale para todos). Ver app_eventos/services/cache_acesso.py.
+# Em produção com mais de um worker, defina CACHE_ACESSO_DIR: sem ele uma permissão revogada
+# continua valendo nos outros workers até o TTL local (ACESSO_CACHE_TIMEOUT_LOCAL) expirar.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "eventix-default",
+    },
+}
+if os.getenv("CACHE_ACESSO_DIR"):
+    CACHES["acesso"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("CACHE_ACESSO_DIR"),
+    }
+ACESSO_CACHE_ALIAS = "acesso" if "acesso" in CACHES else "default"
+ACESSO_CACHE_TIMEOUT = int(os.getenv("ACESSO_CACHE_TIMEOUT", "120"))  # segundos
+ACESSO_CACHE_TIMEOUT_LOCAL = int(os.getenv("ACESSO_CACHE_TIMEOUT_LOCAL", "5"))  # segundos; teto do TTL quando o alias é LocMem (por processo)
+
 # Integrações
 MERCADOPAGO_ACCESS_TOKEN = os.getenv("MERCADOPAGO_ACCESS_TOKEN", "")  # do painel Mercado Pago
 
 # Firebase Cloud Messaging (FCM) para notificações push
 FCM_SERVER_KEY = os.getenv("FCM_SERVER_KEY", "")  # Chave do servidor FCM do Firebase Console
+FCM_URL = os.getenv("FCM_URL", "https://fcm.googleapis.com/fcm/send")
+FCM_CONCORRENCIA = int(os.getenv("FCM_CONCORRENCIA", "4"))  # lotes enviados em paralelo
+FCM_LOTE_MAX = 500  # tokens por requisição multicast (limite do FCM)
 
 # Twilio (WhatsApp + SMS)
 TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID", "")
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN", "")
 TWILIO_VERIFY_SID = os.getenv("TWILIO_VERIFY_SID", "")  # Serviço Verify para OTP
 TWILIO_MESSAGING_SERVICE_SID = os.getenv("TWILIO_MESSAGING_SERVICE_SID", "")  # Para broadcast
-TWILIO_NOTIFICACOES_ATIVAS = os.getenv("TWILIO_NOTIFICACOES_ATIVAS", "True").lower() == "true"  # Notificações automáticas
\ No newline at end of file
+TWILIO_NOTIFICACOES_ATIVAS = os.getenv("TWILIO_NOTIFICACOES_ATIVAS", "True").lower() == "true"  # Notificações automáticas
+
+# Fila de mensagens WhatsApp/SMS (worker: python manage.py processar_fila_mensagens)
+FILA_MENSAGENS_CLIENTE = os.getenv("FILA_MENSAGENS_CLIENTE", "twilio")  # 'twilio' ou 'fake' (sem envio real)
+FILA_MENSAGENS_WORKERS = int(os.getenv("FILA_MENSAGENS_WORKERS", "8"))  # threads de envio
+FILA_MENSAGENS_MAX_TENTATIVAS = int(os.getenv("FILA_MENSAGENS_MAX_TENTATIVAS", "5"))
+FILA_MENSAGENS_RATE_LIMITS = {  # mensagens por segundo, por canal
+    "sms": float(os.getenv("FILA_MENSAGENS_RATE_SMS", "10")),
+    "whatsapp": float(os.getenv("FILA_MENSAGENS_RATE_WHATSAPP", "20")),
+}
+# Renderização de PDFs (contratos, documentos gerados) — app_eventos/services/renderizacao_pdf.py
+RENDERIZACAO_PDF_MODO = os.getenv("RENDERIZACAO_PDF_MODO", "thread")  # 'thread', 'fila' (python manage.py processar_renderizacoes) ou 'sincrono'
+RENDERIZACAO_PDF_WORKERS = int(os.getenv("RENDERIZACAO_PDF_WORKERS", "2"))  # threads por processo no modo 'thread'
+RENDERIZACAO_PDF_TIMEOUT_PROCESSANDO = int(os.getenv("RENDERIZACAO_PDF_TIMEOUT_PROCESSANDO", "600"))  # segundos em 'processando' até o pedido voltar para a fila
+# Último acesso dos usuários (User.data_ultimo_acesso) — app_eventos/services/ultimo_acesso.py
+ULTIMO_ACESSO_GRANULARIDADE = int(os.getenv("ULTIMO_ACESSO_GRANULARIDADE", "300"))  # segundos entre registros do mesmo usuário
+ULTIMO_ACESSO_INTERVALO = int(os.getenv("ULTIMO_ACESSO_INTERVALO", "60"))  # segundos entre gravações em lote (0 = a cada request)
+# Perfil de consultas por request (app_eventos/services/perfil_consultas.py; métricas em /metrics)
+PERFIL_CONSULTAS_ATIVO = os.getenv("PERFIL_CONSULTAS_ATIVO", "False").lower() == "true"
+PERFIL_CONSULTAS_AMOSTRAGEM = float(os.getenv("PERFIL_CONSULTAS_AMOSTRAGEM", "0.1"))  # fração dos requests com contagem de SQL
+PERFIL_CONSULTAS_LIMIAR_REPETICAO = int(os.getenv("PERFIL_CONSULTAS_LIMIAR_REPETICAO", "5"))  # mesma forma de SQL N vezes = N+1
+PERFIL_CONSULTAS_LENTO_MS = int(os.getenv("PERFIL_CONSULTAS_LENTO_MS", "500"))
+PERFIL_CONSULTAS_BUFFER = int(os.getenv("PERFIL_CONSULTAS_BUFFER", "100"))  # requests lentos guardados
+PERFIL_CONSULTAS_TOKEN = os.getenv("PERFIL_CONSULTAS_TOKEN", "")  # Bearer do coletor Prometheus
+# Cache de respostas com ETag (catálogo de funções, páginas públicas) — app_eventos/services/cache_respostas.py
+RESPOSTAS_CACHE_ALIAS = ACESSO_CACHE_ALIAS  # compartilhado entre workers com CACHE_ACESSO_DIR; em locmem cada processo só vê as próprias invalidações
+RESPOSTAS_CACHE_TIMEOUT = int(os.getenv("RESPOSTAS_CACHE_TIMEOUT", "300"))  # segundos; limita o atraso entre workers sem cache compartilhado
+# Registro de parâmetros globais (ParametroSistema/ConfiguracaoSistema) — app_eventos/services/parametros_sistema.py
+PARAMETROS_SISTEMA_CACHE_ALIAS = ACESSO_CACHE_ALIAS  # onde fica a versão compartilhada entre workers
+PARAMETROS_SISTEMA_VERIFICACAO = int(os.getenv("PARAMETROS_SISTEMA_VERIFICACAO", "10"))  # segundos entre consultas da versão
+PARAMETROS_SISTEMA_TIMEOUT = int(os.getenv("PARAMETROS_SISTEMA_TIMEOUT", "300"))  # versão expira e força recarga (sem cache compartilhado)
+# Entrega dos webhooks globais (worker: python manage.py processar_webhooks) — app_eventos/services/webhooks.py
+WEBHOOKS_WORKERS = int(os.getenv("WEBHOOKS_WORKERS", "8"))  # threads de envio
+WEBHOOKS_CONCORRENCIA_POR_HOST = int(os.getenv("WEBHOOKS_CONCORRENCIA_POR_HOST", "4"))  # requisições simultâneas por destino
+WEBHOOKS_TIMEOUT = float(os.getenv("WEBHOOKS_TIMEOUT", "10"))  # segundos por requisição
+WEBHOOKS_MAX_TENTATIVAS = int(os.getenv("WEBHOOKS_MAX_TENTATIVAS", "8"))  # depois disso vai para a fila de mortos
+WEBHOOKS_SEGREDO_PADRAO = os.getenv("WEBHOOKS_SEGREDO_PADRAO", "")  # HMAC dos webhooks sem segredo próprio
+# Exportações assíncronas (worker: python manage.py processar_exportacoes) — app_eventos/services/exportacao.py
+EXPORTACOES_TIMEOUT_PROCESSANDO = int(os.getenv("EXPORTACOES_TIMEOUT_PROCESSANDO", "3600"))  # segundos em 'processando' até voltar para a fila
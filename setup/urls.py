@@ -12,6 +12,7 @@ from app_eventos.views.views_dashboard import (
     dashboard_admin_sistema, fluxo_caixa_evento, fornecedores_list
 )
 from app_eventos.views_pwa import service_worker, manifest_json
+from app_eventos.views_perfil import metricas, requests_lentos
 
 
 urlpatterns = [
@@ -20,6 +21,10 @@ urlpatterns = [
     # PWA - Service Worker e Manifest (devem estar na raiz)
     path("service-worker.js", service_worker, name="service_worker"),
     path("manifest.json", manifest_json, name="manifest_json"),
+
+    # Perfil de consultas (PERFIL_CONSULTAS_ATIVO) - Prometheus e requests lentos
+    path("metrics", metricas, name="metricas"),
+    path("metrics/lentos", requests_lentos, name="metricas_lentos"),
     
     path("", views.home, name="home"),
     path("eventos/", views.evento_list, name="evento_list"),